@@ -43,22 +43,25 @@ from core.constants import (
     GITHUB_REPO,
     DEFAULT_WEB_PORT,
     DEFAULT_WEB_HOST,
-    SCHEDULER_CHECK_INTERVAL,
     UPDATE_CHECK_INTERVAL,
     MIN_PYTHON_MAJOR,
     MIN_PYTHON_MINOR,
     VALID_FILENAME_PATTERN
 )
-from core.enums import InstanceMode, NotificationEvent, StatusColor, RunType, RunTrigger, RunOutcome
+from core.enums import InstanceMode, NotificationEvent, StatusColor, RunType, RunTrigger, RunOutcome, WorkLane, QueueResult
 from services import (
     BulkFileService,
     ImageService,
     WebhookService,
     UtilityService,
-    RunHistory
+    RunHistory,
+    AppliedLedger
 )
 from services.artwork_processor import ArtworkProcessor
 from services.scheduler_service import SchedulerService, BulkSchedule
+from services.bulk_queue import shared_bulk_queue
+from services.folder_watcher import shared_folder_watcher
+from services.run_worker import RunWorker
 from models.callbacks import ProcessingCallbacks
 from services.update_service import UpdateService
 
@@ -196,6 +199,16 @@ def parse_bulk_file_from_cli(instance: Instance, file_path):
 
 # * UI helper functions ---
 
+def reconcile_applied_ledger(instance: Instance) -> int:
+    """Rebuild the applied artwork ledger from the artwork ID labels in the configured libraries.
+       Run after restoring a backup, pointing at a different Plex server or editing labels by hand."""
+    update_log(instance, "📒 Reading artwork ID labels from Plex to rebuild the applied artwork ledger")
+    entries = globals.plex.tracked_labels()
+    written = AppliedLedger().rebuild(entries)
+    update_log(instance, f"📒 Applied artwork ledger rebuilt with {written} entr{'y' if written == 1 else 'ies'}")
+    return written
+
+
 def get_exe_dir():
     """Get the directory of the executable or script file."""
     return UtilityService.get_exe_dir()
@@ -204,6 +217,9 @@ def get_exe_dir():
 def request_scrape_stop() -> bool:
     """Ask any in-flight scrape to stop. Returns True if a run was flagged to stop, or
     False when nothing is running - a stale click must not arm the next run."""
+    if globals.run_worker and globals.run_worker.running():
+        globals.run_worker.stop_scrape()
+        return True
     if globals.scrapes_running:
         globals.cancel_scrape = True
         return True
@@ -221,6 +237,12 @@ def process_scrape_url_from_web(instance: Instance, url: str) -> None:
         url: The URL to scrape.  Note that due to options, this may not be the only URL that we end up scraping!
     """
 
+    if globals.run_worker:
+        error = globals.run_worker.run("scrape", instance, url)
+        if error:
+            update_status(instance, f"Scrape failed: {error}", color=StatusColor.DANGER.value)
+        return
+
     title = None
 
     # A single scrape is a run like any other, so it gets the same counters a bulk import
@@ -278,7 +300,80 @@ def process_scrape_url_from_web(instance: Instance, url: str) -> None:
 
 def run_bulk_import_scrape_in_thread(instance: Instance, web_list = None, filename = None, schedule_id: str = None, notify: bool = False) -> None:
 
-    """Run the bulk import scrape in a separate thread."""
+    """
+    Queue a bulk import and run it on this thread once its turn comes.
+
+    A run for a file that is already waiting in the queue is folded into that one, which
+    takes these contents, and this returns straight away. A run that finds the queue full
+    is refused, and a scheduled one isn't stamped, so catch-up can still put it right.
+    """
+
+    display_filename = filename if filename else "bulk_import.txt"
+    queue = shared_bulk_queue()
+    result, job = queue.enqueue(filename, web_list, schedule_id, notify)
+
+    if result == QueueResult.FULL:
+        message = f"⚠️ Bulk import of '{display_filename}' refused - {queue.max_depth} bulk import(s) are already waiting to run"
+        update_log(instance, message)
+        update_status(instance, "Bulk import refused: the bulk import queue is full", color=StatusColor.WARNING.value)
+        if schedule_id:
+            send_notification(instance, message)
+        return
+
+    if schedule_id:
+        # Stamped as soon as it is queued: the queue outlives a restart, so a queued run
+        # will run, and a catch-up for it as well would run the file twice.
+        record_schedule_run(schedule_id)
+    notify_bulk_queue(instance)
+
+    if result == QueueResult.COALESCED:
+        update_log(instance, f"⏳ Bulk import of '{display_filename}' is already queued (position {queue.position(job['id'])}) • it will run once, with the latest contents")
+        return
+
+    run_queued_bulk_import(instance, job)
+
+
+def run_queued_bulk_import(instance: Instance, job: dict) -> None:
+
+    """Wait for a queued bulk import's turn, then run it and take it off the queue."""
+
+    queue = shared_bulk_queue()
+    try:
+        started = queue.start(job["id"], timeout=0)
+        if started is None:
+            position = queue.position(job["id"])
+            update_log(instance, f"⏳ Bulk import of '{job['file']}' queued • position {position}, it will start when the run(s) ahead of it finish")
+            update_status(instance, f"Bulk import of '{job['file']}' queued (position {position})", color=StatusColor.INFO.value)
+            started = queue.start(job["id"])
+        notify_bulk_queue(instance)
+        if started is not None:
+            run_bulk_import(instance, started["content"], started["file"], started["schedule_id"], started["notify"])
+    finally:
+        queue.finish(job["id"])
+        notify_bulk_queue(instance)
+
+
+def notify_bulk_queue(instance: Instance) -> None:
+    """Tell the web UI what is in the bulk import queue, so it can show each run's place in it."""
+    notify_web(instance, "bulk_queue", {"jobs": shared_bulk_queue().jobs()})
+
+
+def resume_bulk_queue(instance: Instance) -> None:
+    """Run whatever was left in the bulk import queue when the app last stopped."""
+    for job in shared_bulk_queue().recover():
+        update_log(instance, f"🔁 Resuming queued bulk import of '{job['file']}'")
+        threading.Thread(target=run_queued_bulk_import, args=(instance, job)).start()
+
+
+def run_bulk_import(instance: Instance, web_list: str, filename: str = None, schedule_id: str = None, notify: bool = False) -> None:
+
+    """Parse the contents of a bulk import file and run it, in the worker process if there is one."""
+
+    if globals.run_worker:
+        error = globals.run_worker.run("bulk", instance, web_list, filename, schedule_id, notify)
+        if error:
+            update_status(instance, f"Bulk import failed: {error}", color=StatusColor.DANGER.value)
+        return
 
     parsed_urls = []
 
@@ -303,8 +398,6 @@ def run_bulk_import_scrape_in_thread(instance: Instance, web_list = None, filena
     if len(parsed_urls) == 0:
         update_status(instance, "No valid bulk import entries found. Check logs for details", color=StatusColor.DANGER.value, icon="x-circle")
         now = datetime.now(timezone.utc).isoformat()
-        if schedule_id:
-            record_schedule_run(schedule_id)
         RunHistory().add_run(
             run_type=RunType.BULK.value,
             label=filename if filename else "bulk_import.txt",
@@ -342,28 +435,17 @@ def process_bulk_import_from_ui(instance: Instance, parsed_urls: list, filename:
 
     display_filename = filename if filename else "bulk_import.txt"
 
-    # Single-flight guard: two bulk imports racing against the same Plex library is worse than
-    # a skipped one - the artwork ID label and locked-field logic both assume a single writer.
-    # A second run is refused rather than queued, so it doesn't silently pile up if schedules
-    # collide repeatedly; the caller (a schedule or the user) simply tries again later.
-    if not globals.bulk_import_lock.acquire(blocking=False):
-        message = f"⚠️ Bulk import of '{display_filename}' refused - another bulk import is already running"
-        update_log(instance, message)
-        update_status(instance, "Bulk import refused: another bulk import is already running", color=StatusColor.WARNING.value)
-        if schedule_id:
-            send_notification(instance, message)
-        return
-
-    if schedule_id and filename:
-        # Stamp the run only once it holds the lock: a refused run has not run,
-        # and stamping it would hide the miss from catch-up.
-        record_schedule_run(schedule_id)
+    # Nothing stops two different files running at once here: the bulk import queue never runs
+    # the same file twice at a time, and their Plex writes share one executor that keeps two
+    # writes to the same item apart, which the artwork ID label and locked-field logic rely on.
 
     # Track successful poster uploads (those with ✅ or ♻️)
     tally = ProcessingCallbacks()
     errors = 0
     started_at = datetime.now(timezone.utc).isoformat()
     trigger = RunTrigger.SCHEDULED.value if schedule_id else RunTrigger.MANUAL.value
+    # A scheduled run gives way to anything somebody is waiting on; one started by hand doesn't
+    lane = WorkLane.BULK if schedule_id else WorkLane.MANUAL
     notify_enabled = schedule_id or notify
 
     try:
@@ -406,7 +488,7 @@ def process_bulk_import_from_ui(instance: Instance, parsed_urls: list, filename:
                 break
 
             try:
-                scrape_and_upload(instance, parsed_line.url, parsed_line.options, True, tally)
+                scrape_and_upload(instance, parsed_line.url, parsed_line.options, True, tally, lane)
                 #time.sleep(1)
             except ScraperException as e:
                 update_log(instance, f"❌ Error processing line: '{parsed_line.url}'")
@@ -513,10 +595,9 @@ def process_bulk_import_from_ui(instance: Instance, parsed_urls: list, filename:
             globals.cancel_scrape = False
             notify_web(instance, "scrape_state", {"running": False, "type": globals.scrape_type})
             globals.scrape_type = "stopped"
-        globals.bulk_import_lock.release()
 
 # Scraped the URL then uploads what it's scraped to Plex or download to Kometa asset directory
-def scrape_and_upload(instance: Instance, url, options, bulk=False, tally: ProcessingCallbacks = None):
+def scrape_and_upload(instance: Instance, url, options, bulk=False, tally: ProcessingCallbacks = None, lane: WorkLane = WorkLane.MANUAL):
     """
     Scrape artwork from a URL and upload to Plex.
 
@@ -525,6 +606,8 @@ def scrape_and_upload(instance: Instance, url, options, bulk=False, tally: Proce
 
     The caller owns the tally, so one run's counters survive across every URL in it.
     A caller that wants no counting can leave it out and get a throwaway one.
+
+    The lane sets how the run's Plex writes are prioritised against other runs'.
     """
     # Create callbacks for UI updates
     def status_callback(message: str, color: str, spinner: bool, sticky: bool):
@@ -564,7 +647,7 @@ def scrape_and_upload(instance: Instance, url, options, bulk=False, tally: Proce
     # Use the service to do the actual work
     try:
         processor = ArtworkProcessor(globals.plex, callbacks)
-        title, author = processor.scrape_and_process(url, bulk, options)
+        title, author = processor.scrape_and_process(url, bulk, options, lane)
         return title, author
     except PlexConnectorException as not_connected:
         debug_me(f"PlexConnectorException: {str(not_connected)}")
@@ -578,7 +661,8 @@ def scrape_and_upload(instance: Instance, url, options, bulk=False, tally: Proce
         raise
 
 
-def process_uploaded_artwork(instance: Instance, file_list, skipped, zip_title, zip_author, zip_source, options, filters, plex_title = None, plex_year = None):
+def process_uploaded_artwork(instance: Instance, file_list, skipped, zip_title, zip_author, zip_source, options, filters, plex_title = None, plex_year = None,
+                             trigger: str = RunTrigger.MANUAL.value, label: str = None):
     """
     Process uploaded artwork files and upload to Plex or save to Kometa asset directory.
 
@@ -630,7 +714,7 @@ def process_uploaded_artwork(instance: Instance, file_list, skipped, zip_title,
     # An uploaded ZIP is a run too, so it lands in the history alongside the scrapes and
     # the bulk imports. There is no cache crawl behind an upload, so cached stays at zero.
     started_at = datetime.now(timezone.utc).isoformat()
-    label = plex_title or zip_title or "Uploaded artwork"
+    label = plex_title or zip_title or label or "Uploaded artwork"
     outcome = RunOutcome.FAILED.value
     try:
         processor.process_uploaded_files(file_list, skipped, zip_title, zip_author, zip_source, opts, override_title=plex_title)
@@ -641,7 +725,7 @@ def process_uploaded_artwork(instance: Instance, file_list, skipped, zip_title,
             label=label,
             started_at=started_at,
             ended_at=datetime.now(timezone.utc).isoformat(),
-            trigger=RunTrigger.MANUAL.value,
+            trigger=trigger,
             outcome=outcome,
             assets_processed=callbacks.assets_processed[0],
             success_count=callbacks.success_counter[0],
@@ -1055,7 +1139,7 @@ if __name__ == "__main__":
 
     # Create services
     globals.bulk_file_service = BulkFileService(get_exe_dir())
-    globals.scheduler_service = SchedulerService(check_interval=SCHEDULER_CHECK_INTERVAL)
+    globals.scheduler_service = SchedulerService()
     globals.webhook_service = WebhookService()
     globals.update_service = UpdateService(
         github_repo=GITHUB_REPO,
@@ -1114,6 +1198,31 @@ if __name__ == "__main__":
             # Process using the bulk filename if supplied, else the bulk file set in the config
             parse_bulk_file_from_cli(cli_instance, args.bulk_file if args.bulk_file else os.path.join("bulk_imports", config.bulk_txt))
 
+        elif cli_command == 'folder':
+            # The same as uploading the folder's artwork in a ZIP, but read where it is
+            from web_routes import process_folder
+            if not args.bulk_file or not os.path.isdir(args.bulk_file):
+                sys.exit("Please give the folder of artwork to process, e.g. 'folder /artwork/Heat'.")
+            upload_options = [option for option, enabled in (
+                ("force", cli_options.force),
+                ("skip-locked", cli_options.skip_locked),
+                ("stage", cli_options.stage),
+                ("temp", cli_options.temp)
+            ) if enabled]
+            try:
+                process_folder(cli_instance, os.path.abspath(args.bulk_file), upload_options, cli_options.filters, None,
+                               cli_options.year, filename_pattern, check_image_orientation, sort_key, trigger=RunTrigger.CLI.value)
+            except Exception as e:
+                debug_me(f"Error processing folder from CLI: {str(e)}", "__main__")
+                update_status(cli_instance, str(e), color=StatusColor.DANGER.value)
+
+        elif cli_command == 'reconcile-ledger':
+            try:
+                reconcile_applied_ledger(cli_instance)
+            except Exception as e:
+                debug_me(f"Error rebuilding the applied artwork ledger: {str(e)}", "__main__")
+                update_status(cli_instance, str(e), color=StatusColor.DANGER.value)
+
         # Now we're looking at URLs - firstly one containing a TPDb user
         elif "/user/" in cli_command:
 
@@ -1150,6 +1259,11 @@ if __name__ == "__main__":
                 update_log(cli_instance, "🗓️ Setting up scheduler for scheduled tasks")
                 debug_me("This is the main process - setting up scheduler")
                 setup_scheduler_on_first_load(cli_instance)
+                # The watched folder is looked at from here on, whenever watch_folder is set
+                from web_routes import process_watched_files
+                if config.watch_folder:
+                    update_log(cli_instance, f"👀 Watching '{config.watch_folder}' for new artwork")
+                shared_folder_watcher().start(process_watched_files)
             else:
                 debug_me("Not the main process - skipping scheduler setup")
                 update_log(cli_instance, "⚠️ Skipping scheduler setup in debug mode")            
@@ -1178,8 +1292,17 @@ if __name__ == "__main__":
                     print("The web UI will still start, but you won't be able to upload artwork")
                     print("until you fix the Plex connection in Settings.\n")
 
-            # Catch up missed schedules only now that the libraries are connected
+            # Runs go to a worker process, if asked, so they can't hold up the web server. Started
+            # before the queue is resumed below, so resumed runs go to the worker too.
+            if config.use_worker_process:
+                globals.run_worker = RunWorker(config.path)
+                globals.run_worker.start()
+                update_log(cli_instance, "⚙️ Scrapes and bulk imports will run in a separate worker process")
+
+            # Catch up missed schedules only now that the libraries are connected, after resuming
+            # the queue so a catch-up for a file that is still queued joins that run
             if plex_connected and (os.getenv("WERKZEUG_RUN_MAIN") == "true" or not globals.debug):
+                resume_bulk_queue(cli_instance)
                 catch_up_missed_schedules(cli_instance)
 
             # Create the app and web server
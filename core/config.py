@@ -10,6 +10,14 @@ from core.constants import (
     DEFAULT_KOMETA_DOWNLOAD_TIMEOUT,
     DEFAULT_UPLOAD_RETRY_ATTEMPTS,
     DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS,
+    DEFAULT_APPLIED_LEDGER_TTL_DAYS,
+    DEFAULT_IMAGE_CACHE_MAX_MB,
+    DEFAULT_PLEX_WRITE_WORKERS,
+    DEFAULT_KOMETA_DOWNLOAD_WORKERS,
+    DEFAULT_BULK_QUEUE_MAX_DEPTH,
+    DEFAULT_TPDB_PARSE_WORKERS,
+    DEFAULT_WATCH_FOLDER_POLL_SECONDS,
+    DEFAULT_WATCH_FOLDER_SETTLE_SECONDS,
     DEFAULT_NOTIFICATION_EVENTS
 )
 from core.exceptions import ConfigLoadError, ConfigSaveError, ConfigCreationError
@@ -66,6 +74,11 @@ class Config:
         allow_artist_updates: Whether to update locked artwork we applied when the same artist has posted a newer version (requires skip_locked_artwork and track_artwork_ids)
         cache_user_scrapes: Whether to keep a persistent index of ThePosterDB users' uploads so repeat scrapes only fetch new ones
         user_cache_refresh_days: Days between full re-crawls of a cached user's uploads (catches edits and deletions)
+        use_applied_ledger: Whether to keep a local record of applied artwork so unchanged artwork skips reading Plex labels (requires track_artwork_ids)
+        applied_ledger_ttl_days: Days a ledger entry is trusted before the item's labels are read from Plex again
+        use_kometa_manifest: Whether to record the assets saved for Kometa, so only changed artwork is replaced
+        use_image_cache: Whether to keep downloaded artwork on disk so the same image isn't downloaded again
+        image_cache_max_mb: Size budget of the image cache in MB; the least recently used images are deleted beyond it
         auto_manage_bulk_files: Whether to auto-organize bulk files
         reset_overlay: Whether to reset Kometa overlay labels on upload
         schedules: List of scheduled bulk import jobs
@@ -79,9 +92,18 @@ class Config:
         webhook_tpdb_users: ThePosterDB users to apply cached artwork from on import, in priority order
         webhook_apply_delay: Seconds to wait after an import before applying artwork (lets Plex scan first)
         plex_connect_timeout: Timeout for connecting to the Plex server (also applies to uploads)
-        kometa_download_timeout: Timeout for downloading artwork to save to the Kometa asset directory
+        kometa_download_timeout: Timeout for downloading artwork, whether to save to the Kometa asset directory or to upload to Plex
         upload_retry_attempts: Total attempts (including the first) made for a transient upload failure
         upload_retry_backoff_seconds: Seconds to wait before the first retry, doubling after each attempt
+        plex_write_workers: Most titles applied to Plex at once (1 applies them one at a time)
+        kometa_download_workers: Most Kometa assets saved at once (1 saves them one at a time)
+        bulk_queue_max_depth: Most bulk imports waiting to run at once; beyond it a new run is refused
+        use_worker_process: Whether scrapes, bulk imports and webhook imports run in a separate process from the web server
+        tpdb_parse_workers: Worker processes that parse ThePosterDB user pages during a crawl (0 parses them in the crawl thread)
+        extract_zip_uploads: Whether an uploaded ZIP is extracted to disk before its artwork is uploaded, rather than read from in place
+        watch_folder: Folder whose new and changed artwork files are processed as they arrive (blank to watch none)
+        watch_folder_poll_seconds: Seconds between looks at the watched folder
+        watch_folder_settle_seconds: Seconds the watched folder must stay unchanged before new files in it are processed
     """
 
     def __init__(self, config_path: str = "config/config.json") -> None:
@@ -103,6 +125,11 @@ class Config:
         self.allow_artist_updates: bool = False
         self.cache_user_scrapes: bool = False
         self.user_cache_refresh_days: int = 7
+        self.use_applied_ledger: bool = False
+        self.applied_ledger_ttl_days: int = DEFAULT_APPLIED_LEDGER_TTL_DAYS
+        self.use_kometa_manifest: bool = False
+        self.use_image_cache: bool = False
+        self.image_cache_max_mb: int = DEFAULT_IMAGE_CACHE_MAX_MB
         self.auto_manage_bulk_files: bool = True
         self.reset_overlay: bool = False
         self.schedules: List[Dict[str, Any]] = []
@@ -119,6 +146,15 @@ class Config:
         self.kometa_download_timeout: int = DEFAULT_KOMETA_DOWNLOAD_TIMEOUT
         self.upload_retry_attempts: int = DEFAULT_UPLOAD_RETRY_ATTEMPTS
         self.upload_retry_backoff_seconds: float = DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS
+        self.plex_write_workers: int = DEFAULT_PLEX_WRITE_WORKERS
+        self.kometa_download_workers: int = DEFAULT_KOMETA_DOWNLOAD_WORKERS
+        self.bulk_queue_max_depth: int = DEFAULT_BULK_QUEUE_MAX_DEPTH
+        self.use_worker_process: bool = False
+        self.tpdb_parse_workers: int = DEFAULT_TPDB_PARSE_WORKERS
+        self.extract_zip_uploads: bool = False
+        self.watch_folder: str = ""
+        self.watch_folder_poll_seconds: int = DEFAULT_WATCH_FOLDER_POLL_SECONDS
+        self.watch_folder_settle_seconds: int = DEFAULT_WATCH_FOLDER_SETTLE_SECONDS
 
 
     def load(self) -> None:
@@ -154,6 +190,11 @@ class Config:
             self.allow_artist_updates = config.get("allow_artist_updates", False)
             self.cache_user_scrapes = config.get("cache_user_scrapes", False)
             self.user_cache_refresh_days = config.get("user_cache_refresh_days", 7)
+            self.use_applied_ledger = config.get("use_applied_ledger", False)
+            self.applied_ledger_ttl_days = config.get("applied_ledger_ttl_days", DEFAULT_APPLIED_LEDGER_TTL_DAYS)
+            self.use_kometa_manifest = config.get("use_kometa_manifest", False)
+            self.use_image_cache = config.get("use_image_cache", False)
+            self.image_cache_max_mb = config.get("image_cache_max_mb", DEFAULT_IMAGE_CACHE_MAX_MB)
             self.auto_manage_bulk_files = config.get("auto_manage_bulk_files", True)
             self.reset_overlay = config.get("reset_overlay", False)
             self.schedules, schedules_migrated = self._migrate_schedules(config.get("schedules", []))
@@ -170,6 +211,15 @@ class Config:
             self.kometa_download_timeout = config.get("kometa_download_timeout", DEFAULT_KOMETA_DOWNLOAD_TIMEOUT)
             self.upload_retry_attempts = config.get("upload_retry_attempts", DEFAULT_UPLOAD_RETRY_ATTEMPTS)
             self.upload_retry_backoff_seconds = config.get("upload_retry_backoff_seconds", DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS)
+            self.plex_write_workers = config.get("plex_write_workers", DEFAULT_PLEX_WRITE_WORKERS)
+            self.kometa_download_workers = config.get("kometa_download_workers", DEFAULT_KOMETA_DOWNLOAD_WORKERS)
+            self.bulk_queue_max_depth = config.get("bulk_queue_max_depth", DEFAULT_BULK_QUEUE_MAX_DEPTH)
+            self.use_worker_process = config.get("use_worker_process", False)
+            self.tpdb_parse_workers = config.get("tpdb_parse_workers", DEFAULT_TPDB_PARSE_WORKERS)
+            self.extract_zip_uploads = config.get("extract_zip_uploads", False)
+            self.watch_folder = config.get("watch_folder", "")
+            self.watch_folder_poll_seconds = config.get("watch_folder_poll_seconds", DEFAULT_WATCH_FOLDER_POLL_SECONDS)
+            self.watch_folder_settle_seconds = config.get("watch_folder_settle_seconds", DEFAULT_WATCH_FOLDER_SETTLE_SECONDS)
 
         except Exception as e:
             raise ConfigLoadError(f"Error loading configuration from '{self.path}': {e}") from e
@@ -221,6 +271,11 @@ class Config:
             "allow_artist_updates": False,
             "cache_user_scrapes": False,
             "user_cache_refresh_days": 7,
+            "use_applied_ledger": False,
+            "applied_ledger_ttl_days": DEFAULT_APPLIED_LEDGER_TTL_DAYS,
+            "use_kometa_manifest": False,
+            "use_image_cache": False,
+            "image_cache_max_mb": DEFAULT_IMAGE_CACHE_MAX_MB,
             "auto_manage_bulk_files": True,
             "reset_overlay": True,
             "schedules": [],
@@ -233,7 +288,16 @@ class Config:
             "plex_connect_timeout": DEFAULT_PLEX_CONNECT_TIMEOUT,
             "kometa_download_timeout": DEFAULT_KOMETA_DOWNLOAD_TIMEOUT,
             "upload_retry_attempts": DEFAULT_UPLOAD_RETRY_ATTEMPTS,
-            "upload_retry_backoff_seconds": DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS
+            "upload_retry_backoff_seconds": DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS,
+            "plex_write_workers": DEFAULT_PLEX_WRITE_WORKERS,
+            "kometa_download_workers": DEFAULT_KOMETA_DOWNLOAD_WORKERS,
+            "bulk_queue_max_depth": DEFAULT_BULK_QUEUE_MAX_DEPTH,
+            "use_worker_process": False,
+            "tpdb_parse_workers": DEFAULT_TPDB_PARSE_WORKERS,
+            "extract_zip_uploads": False,
+            "watch_folder": "",
+            "watch_folder_poll_seconds": DEFAULT_WATCH_FOLDER_POLL_SECONDS,
+            "watch_folder_settle_seconds": DEFAULT_WATCH_FOLDER_SETTLE_SECONDS
         }
 
         if globals.docker:
@@ -275,6 +339,11 @@ class Config:
             "allow_artist_updates": self.allow_artist_updates,
             "cache_user_scrapes": self.cache_user_scrapes,
             "user_cache_refresh_days": self.user_cache_refresh_days,
+            "use_applied_ledger": self.use_applied_ledger,
+            "applied_ledger_ttl_days": self.applied_ledger_ttl_days,
+            "use_kometa_manifest": self.use_kometa_manifest,
+            "use_image_cache": self.use_image_cache,
+            "image_cache_max_mb": self.image_cache_max_mb,
             "auto_manage_bulk_files": self.auto_manage_bulk_files,
             "reset_overlay": self.reset_overlay,
             "schedules": self.schedules,
@@ -290,7 +359,16 @@ class Config:
             "plex_connect_timeout": self.plex_connect_timeout,
             "kometa_download_timeout": self.kometa_download_timeout,
             "upload_retry_attempts": self.upload_retry_attempts,
-            "upload_retry_backoff_seconds": self.upload_retry_backoff_seconds
+            "upload_retry_backoff_seconds": self.upload_retry_backoff_seconds,
+            "plex_write_workers": self.plex_write_workers,
+            "kometa_download_workers": self.kometa_download_workers,
+            "bulk_queue_max_depth": self.bulk_queue_max_depth,
+            "use_worker_process": self.use_worker_process,
+            "tpdb_parse_workers": self.tpdb_parse_workers,
+            "extract_zip_uploads": self.extract_zip_uploads,
+            "watch_folder": self.watch_folder,
+            "watch_folder_poll_seconds": self.watch_folder_poll_seconds,
+            "watch_folder_settle_seconds": self.watch_folder_settle_seconds
         }
 
         try:
@@ -21,9 +21,14 @@ DEFAULT_WEB_HOST = "0.0.0.0"
 # File paths
 DEFAULT_CONFIG_PATH = "config.json"
 ASSET_INDEX_PATH = "config/asset_index.db"
+APPLIED_LEDGER_PATH = "config/applied_ledger.db"
+KOMETA_MANIFEST_PATH = "config/kometa_manifest.db"
+IMAGE_CACHE_DIR = "config/image_cache"
 DEFAULT_BULK_IMPORTS_DIR = "bulk_imports"
 DEFAULT_BULK_IMPORT_FILE = "bulk_import.txt"
 RUN_HISTORY_PATH = "config/run_history.json"
+BULK_QUEUE_PATH = "config/bulk_queue.json"
+WATCH_MANIFEST_PATH = "config/watch_manifest.json"
 
 # Run history retention (whichever limit is hit first prunes the record).
 # The entry cap is per run type, so frequent webhook imports can't crowd out bulk runs.
@@ -144,16 +149,38 @@ KOMETA_OVERLAY_LABEL = "Overlay"
 # Update check interval (seconds)
 UPDATE_CHECK_INTERVAL = 1800  # 30 minutes
 
-# Scheduler check interval (seconds)
-SCHEDULER_CHECK_INTERVAL = 60  # 1 minute
+# Longest the scheduler sleeps between looking at the clock (seconds). It wakes when the next
+# schedule is due, or when one is added or removed; this only bounds how long a change to the
+# system clock can go unnoticed.
+SCHEDULER_MAX_SLEEP = 60 * 60  # 1 hour
 
-# File upload
-UPLOAD_CHUNK_SIZE = 1024 * 512  # bytes
-UPLOAD_CHUNK_TIMEOUT = 10 # seconds
+# File upload: uploads arrive over HTTP and are written to disk a buffer at a time. One that has
+# had nothing for the timeout is dropped, which leaves a browser that lost its connection that
+# long to come back and carry on. Progress is reported at most once per interval.
+UPLOAD_BUFFER_SIZE = 1024 * 256  # bytes
+UPLOAD_TIMEOUT = 60  # seconds
+UPLOAD_PROGRESS_SECONDS = 0.5
+
+# Kometa asset saves: buffer for streaming a download, or an asset out of an uploaded ZIP, to disk
+KOMETA_COPY_BUFFER_SIZE = 1024 * 1024  # bytes
+
+# Kometa asset saves: how many run at once, how many of those may download from the same host,
+# and the spacing kept between downloads from ThePosterDB
+DEFAULT_KOMETA_DOWNLOAD_WORKERS = 8
+KOMETA_DOWNLOADS_PER_HOST = 4
+KOMETA_TPDB_DOWNLOAD_INTERVAL = 1  # seconds
+
+# Uploaded ZIPs: how many members are extracted (and their titles looked up in Plex) at once
+ZIP_MEMBER_WORKERS = 4
+
+# Watched folder: how often it is looked at, and how long it has to stay unchanged after files
+# arrive before they are processed, so a large copy is handled as one run rather than many
+DEFAULT_WATCH_FOLDER_POLL_SECONDS = 30
+DEFAULT_WATCH_FOLDER_SETTLE_SECONDS = 60
 
 # Network timeouts (seconds)
 DEFAULT_PLEX_CONNECT_TIMEOUT = 10  # PlexConnector.connect()
-DEFAULT_KOMETA_DOWNLOAD_TIMEOUT = 10  # Downloading artwork to save to the Kometa asset directory
+DEFAULT_KOMETA_DOWNLOAD_TIMEOUT = 10  # Downloading artwork to save to the Kometa asset directory or upload to Plex
 
 # Upload retry behaviour: a transient failure (timeout, connection error, 5xx) is retried this many
 # times in total, waiting backoff seconds and doubling that wait after each attempt. A 401 or 404
@@ -161,6 +188,45 @@ DEFAULT_KOMETA_DOWNLOAD_TIMEOUT = 10  # Downloading artwork to save to the Komet
 DEFAULT_UPLOAD_RETRY_ATTEMPTS = 3
 DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS = 1
 
+# Applied artwork ledger: how long an entry is trusted before Plex's labels are read again
+DEFAULT_APPLIED_LEDGER_TTL_DAYS = 7
+
+# Plex writes: how many titles are applied at once at most. Below that, concurrency adapts to how
+# quickly Plex answers - a write slower than the latency target (seconds) counts against it.
+DEFAULT_PLEX_WRITE_WORKERS = 4
+PLEX_WRITE_LATENCY_TARGET = 5
+
+# Share of the Plex write slots each lane gets while they are all waiting (see WorkLane). A lane
+# with nothing waiting gives its share to the others, so a webhook import jumps a nightly bulk
+# run without the bulk run ever stopping altogether.
+PLEX_LANE_WEIGHTS = {"webhook": 8, "manual": 4, "bulk": 1}
+
+# Bulk import queue: how many runs may wait at once (a file already waiting doesn't count twice),
+# and how many different files run side by side. Two runs of the same file never overlap. One at
+# a time while the web UI has a single bulk progress bar (globals.bulk_bar) for them to share.
+DEFAULT_BULK_QUEUE_MAX_DEPTH = 10
+BULK_QUEUE_MAX_RUNNING = 1
+
+# ThePosterDB user crawls: how many worker processes parse user pages (0 parses them in the
+# crawl thread). As many pages as there are workers are fetched ahead of the crawl.
+DEFAULT_TPDB_PARSE_WORKERS = 0
+
+# Browser events: progress, log lines and status updates are collected and sent at most once per
+# frame of this many seconds (see WebEventBus)
+WEB_EVENT_FRAME_SECONDS = 0.25
+
+# Session log: how many lines the server keeps for a browser to catch up on (the same number the
+# browser's log shows), and the Socket.IO room of the browsers showing it
+LOG_BUFFER_LINES = 500
+LOG_ROOM = "log"
+
+# Browser events every page reacts to, whichever page started what they are about. Every other
+# event goes only to the pages of the instance it is for, unless that instance is broadcasting.
+BROADCAST_EVENTS = ("scrape_state", "bulk_queue", "run_history_updated", "backend_restarting")
+
+# Image cache: the least recently used images are deleted once it grows past this size
+DEFAULT_IMAGE_CACHE_MAX_MB = 1024
+
 # Web UI colors (Bootstrap)
 BOOTSTRAP_COLORS = {
     'primary': {'bg': '#0d6efd', 'fg': '#ffffff', 'ansi': '\033[0m'},
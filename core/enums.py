@@ -106,6 +106,7 @@ class RunTrigger(str, Enum):
     CLI = "cli"
     RADARR = "radarr"
     SONARR = "sonarr"
+    WATCH = "watch"     # files dropped into the watched folder
 
 class RunOutcome(str, Enum):
     SUCCESS = "success"
@@ -121,3 +122,15 @@ class WebhookSource(str, Enum):
 class IntervalUnit(str, Enum):
     DAYS = "days"
     HOURS = "hours"
+
+class WorkLane(str, Enum):
+    """Priority lanes for Plex work, most urgent first"""
+    WEBHOOK = "webhook"  # a Radarr/Sonarr import, waiting to be seen
+    MANUAL = "manual"    # a scrape, ZIP upload or bulk import somebody started
+    BULK = "bulk"        # a scheduled bulk import
+
+class QueueResult(str, Enum):
+    """What became of a bulk import handed to the queue"""
+    QUEUED = "queued"        # added; it runs when its turn comes
+    COALESCED = "coalesced"  # the same file was already waiting, so that run takes the new contents
+    FULL = "full"            # refused, the queue is at its maximum depth
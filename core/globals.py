@@ -1,4 +1,3 @@
-import threading
 from typing import Literal
 # Application globals
 config = None  # Config object
@@ -13,6 +12,7 @@ bulk_file_service = None
 scheduler_service = None
 update_service = None
 webhook_service = None
+run_worker = None  # RunWorker, when runs execute in a separate worker process (use_worker_process)
 
 # Scrape cancellation (user-initiated "Stop" from the web UI)
 cancel_scrape: bool = False   # Set when the user asks to stop; long loops check it and stop cleanly
@@ -21,6 +21,3 @@ scrape_type: Literal['scrape', 'bulk', 'upload', 'stopped'] = 'stopped'
 main_bar: dict = {}
 bulk_bar: dict = {}
 
-# Single-flight guard for bulk imports (scheduled or manual). A second bulk import that starts
-# while one is already running is refused rather than queued - see process_bulk_import_from_ui.
-bulk_import_lock = threading.Lock()
@@ -0,0 +1,64 @@
+"""
+The assets already in each Kometa asset folder, listed once per run.
+
+Before saving an asset, KometaSaver checks whether the item already has one, under any of the
+image extensions. That used to be an os.path.exists for each extension, for every asset saved:
+up to four stats per title card, each a round trip on an asset directory mounted from a NAS.
+Each folder is now listed once, with a single scandir, and what the run saves or removes is
+kept in step with the listing, so a season's worth of title cards costs one listing of the
+season's folder.
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Set
+
+from core.constants import IMAGE_EXTENSIONS
+
+
+class AssetFolderListing:
+    """
+    The file names in each asset folder a run saves to, listed the first time it is asked about.
+    Shared by the savers of one run, which can run on several threads.
+    """
+
+    def __init__(self) -> None:
+        self._folders: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _names(self, folder: str) -> Set[str]:
+        # Called with the lock held
+        folder = os.path.normpath(folder)
+        names = self._folders.get(folder)
+        if names is None:
+            try:
+                with os.scandir(folder) as scan:
+                    names = {entry.name for entry in scan}
+            except FileNotFoundError:
+                names = set()  # Not created yet: it is when the first asset is saved to it
+            self._folders[folder] = names
+        return names
+
+    def existing(self, folder: str, file_name: str) -> Optional[str]:
+        """The path of the asset already saved in a folder under this name, with whichever image
+           extension it has, or None. Raises OSError if the folder can't be listed."""
+        with self._lock:
+            names = self._names(folder)
+            for ext in IMAGE_EXTENSIONS:
+                if f"{file_name}{ext}" in names:
+                    return os.path.join(folder, f"{file_name}{ext}")
+        return None
+
+    def saved(self, path: str) -> None:
+        """Note a file the run has written."""
+        with self._lock:
+            names = self._folders.get(os.path.normpath(os.path.dirname(path)))
+            if names is not None:
+                names.add(os.path.basename(path))
+
+    def removed(self, path: str) -> None:
+        """Note a file the run has deleted."""
+        with self._lock:
+            names = self._folders.get(os.path.normpath(os.path.dirname(path)))
+            if names is not None:
+                names.discard(os.path.basename(path))
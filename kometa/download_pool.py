@@ -0,0 +1,84 @@
+"""
+Saves Kometa assets on a small pool of threads.
+
+Kometa saves used to run one after another inside each title, so saving a MediUX boxset of a
+couple of thousand title cards took one download's round trip per card, with a second's sleep
+after every ThePosterDB download on top. While a title's artwork is processed inside
+UploadProcessor.kometa_saves(), each save is handed to this pool instead, and the title's
+thread goes on to the next piece of artwork:
+
+- At most kometa_download_workers saves run at once, and at most KOMETA_DOWNLOADS_PER_HOST of
+  them download from the same host.
+- ThePosterDB's spacing is kept by a rate limiter shared by every thread (see KometaSaver), not
+  a sleep after each download.
+- Each save still writes to a .tmp file and moves it into place, so a half-written asset is
+  never left where Kometa would pick it up.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from core import globals
+from core.constants import DEFAULT_KOMETA_DOWNLOAD_WORKERS, KOMETA_DOWNLOADS_PER_HOST
+
+
+class KometaDownloadPool:
+    """
+    Runs KometaSaver.save_to_kometa for many savers at once, a limited number per host.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_KOMETA_DOWNLOAD_WORKERS,
+                 per_host: int = KOMETA_DOWNLOADS_PER_HOST) -> None:
+        self.max_workers = max(int(max_workers), 1)
+        self.per_host = max(int(per_host), 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="kometa-download")
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_slots(self, url: Optional[str]) -> Optional[threading.BoundedSemaphore]:
+        host = urlparse(url).hostname if url else None
+        if not host:
+            return None  # An uploaded file: copied, not downloaded
+        with self._lock:
+            slots = self._hosts.get(host)
+            if slots is None:
+                slots = self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return slots
+
+    def _save(self, saver, on_result: Optional[Callable[[str], None]]) -> Optional[str]:
+        if globals.cancel_scrape:
+            return None  # Stopped while it was waiting its turn
+        slots = self._host_slots((saver.artwork or {}).get("url"))
+        if slots is None:
+            result = saver.save_to_kometa()
+        else:
+            with slots:
+                result = saver.save_to_kometa()
+        if on_result is not None:
+            on_result(result)  # Before the future is done, so whoever waits on it sees the result counted
+        return result
+
+    def submit(self, saver, on_result: Optional[Callable[[str], None]] = None) -> Future:
+        """Save a set-up KometaSaver's asset on the pool, calling on_result with the saver's
+           result message. The future's result is that message, or None if the run was stopped
+           before its turn came."""
+        return self._executor.submit(self._save, saver, on_result)
+
+
+_shared: Optional[KometaDownloadPool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_kometa_download_pool(max_workers: Optional[int] = None) -> KometaDownloadPool:
+    """The pool every run shares, so concurrent runs stay under one limit per host between them.
+       Sized by kometa_download_workers unless told otherwise, and replaced when that changes."""
+    global _shared
+    if max_workers is None:
+        max_workers = getattr(globals.config, "kometa_download_workers", DEFAULT_KOMETA_DOWNLOAD_WORKERS)
+    with _shared_lock:
+        if _shared is None or _shared.max_workers != max(int(max_workers), 1):
+            # Not shut down: it still has to finish whatever is queued on it
+            _shared = KometaDownloadPool(max_workers)
+        return _shared
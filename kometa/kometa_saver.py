@@ -1,11 +1,20 @@
-import os, requests, mimetypes, time
+import os, requests, mimetypes, shutil, time, hashlib
 from typing import Optional
 from utils.notifications import debug_me
 from models.options import Options
 from core.enums import ScraperSource
-from core.constants import IMAGE_EXTENSIONS, DEFAULT_KOMETA_DOWNLOAD_TIMEOUT, DEFAULT_UPLOAD_RETRY_ATTEMPTS, DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS
+from core.constants import KOMETA_COPY_BUFFER_SIZE, KOMETA_TPDB_DOWNLOAD_INTERVAL, DEFAULT_KOMETA_DOWNLOAD_TIMEOUT, DEFAULT_UPLOAD_RETRY_ATTEMPTS, DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS
 from core.retry import call_with_retry
 from models.artwork_types import AnyArtwork
+from kometa.asset_listing import AssetFolderListing
+from services.kometa_manifest import file_hash, source_hash
+from utils.image_fetcher import HostRateLimiter
+from utils.zip_member import open_artwork
+
+# Downloads from ThePosterDB are kept apart across every thread saving assets, rather than each
+# save sleeping after its download
+download_limiter = HostRateLimiter({"theposterdb.com": KOMETA_TPDB_DOWNLOAD_INTERVAL},
+                                   sleep=lambda seconds: time.sleep(seconds))
 
 class KometaSaver:
 
@@ -28,6 +37,9 @@ class KometaSaver:
         self.download_timeout: int = DEFAULT_KOMETA_DOWNLOAD_TIMEOUT
         self.retry_attempts: int = DEFAULT_UPLOAD_RETRY_ATTEMPTS
         self.retry_backoff: float = DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS
+        self.image_cache = None  # An ImageCache: asked before downloading, and given what is downloaded
+        self.asset_listing: AssetFolderListing = AssetFolderListing()  # Shared by the savers of a run, so each folder is listed once
+        self.manifest = None  # A KometaManifest: tells our own unchanged assets from changed and unknown ones
 
     def set_artwork(self, artwork: AnyArtwork) -> None:
         self.artwork = artwork
@@ -62,17 +74,21 @@ class KometaSaver:
 
         replaced_file: bool = False
         existing_file: Optional[str] = None
+        saved = None
 
-        # Check if an asset already exists for this item, skip if so (unless force is specified, in which case delete existing asset first)
+        # Check if an asset already exists for this item, skip if so (unless force is specified, in which case delete existing asset first).
+        # An asset the manifest says we saved from other artwork is replaced without force.
         try:
-            for check_ext in IMAGE_EXTENSIONS:
-                existing_file = os.path.join(self.dest_dir, f"{self.dest_file_name}{check_ext}")
-                if os.path.exists(existing_file) and not self.options.force:
-                    return f"⏩ {self.description} | {self.artwork_type} skipped (already exists) for {self.library}"
-                elif os.path.exists(existing_file) and self.options.force:
-                    #os.remove(existing_file)
+            existing_file = self.asset_listing.existing(self.dest_dir, self.dest_file_name)
+            if existing_file is not None:
+                saved = self._saved_entry(existing_file)
+                if saved is not None and saved["source_hash"] != source_hash(self.artwork):
+                    replaced_file = True
+                elif not self.options.force:
+                    reason = "unchanged" if saved is not None else "already exists"
+                    return f"⏩ {self.description} | {self.artwork_type} skipped ({reason}) for {self.library}"
+                else:
                     replaced_file = True
-                    break
         except OSError as e:
             return f"❌ {self.description} | Error checking existing {self.artwork_type.lower()} asset: {e}"
 
@@ -80,15 +96,23 @@ class KometaSaver:
             return f"⚠️ {self.description} | {self.artwork_type} skipped for {self.library} - artwork is for a different title"
 
         if self.type == "file":
-            # Save from local file path
+            # Save from local file path, or straight out of the uploaded ZIP
             source_file = self.artwork['path']
             self.dest_file_ext = os.path.splitext(source_file)[1]  # Use the original file extension
             dest_file = os.path.join(self.dest_dir, f"{self.dest_file_name}{self.dest_file_ext}")
+            temp_file = f"{dest_file}.tmp"
             try:
                 os.makedirs(self.dest_dir, exist_ok=True)
-                with open(source_file, 'rb') as src_f:
-                    with open(dest_file, 'wb') as dest_f:
-                        dest_f.write(src_f.read())
+                if self.artwork.get("zip_member") is not None:
+                    with open_artwork(self.artwork) as src_f:
+                        with open(temp_file, 'wb') as dest_f:
+                            shutil.copyfileobj(src_f, dest_f, KOMETA_COPY_BUFFER_SIZE)
+                else:
+                    # Left to the OS (sendfile on Linux), so the file doesn't pass through Python
+                    shutil.copyfile(source_file, temp_file)
+                content_hash = (self.artwork.get("checksum") or file_hash(temp_file)) if self.manifest is not None else ""
+                if self._put_in_place(temp_file, dest_file, content_hash, replaced_file, existing_file, saved):
+                    return f"⏩ {self.description} | {self.artwork_type} skipped (unchanged) for {self.library}"
                 if replaced_file:
                     return f"♻️ {self.description} | {self.artwork_type} replaced at '{dest_file}' in {self.library}"
                 else:
@@ -97,11 +121,17 @@ class KometaSaver:
                 return f"❌ {self.description} | Error saving {self.artwork_type.lower()} (invalid path): '{self.dest_dir}'"
             except Exception as e:
                 return f"❌ {self.description} | Failed to save {self.artwork_type.lower()}: {e}"
+
+        url = self.artwork["url"]
+        cached = self._cached_image(url)
+        if cached is not None:
+            return self._save_cached(cached, replaced_file, existing_file, saved)
+
         try:
-            url = self.artwork["url"]
             debug_me(f"Downloading {self.artwork_type.lower()} from URL: {url}")
 
             def _fetch():
+                download_limiter.wait(url)
                 response = requests.get(url, headers=headers, stream=True, timeout=self.download_timeout)
                 response.raise_for_status()
                 return response
@@ -140,14 +170,14 @@ class KometaSaver:
         temp_file = f"{dest_file}.tmp"
         try:
             os.makedirs(self.dest_dir, exist_ok=True)
+            digest = hashlib.md5()
             with open(temp_file, 'wb') as f:
-                for chunk in r.iter_content(1024):
+                for chunk in r.iter_content(KOMETA_COPY_BUFFER_SIZE):
                     f.write(chunk)
-            if replaced_file and existing_file != dest_file:
-                os.remove(existing_file)
-            os.replace(temp_file, dest_file)
-            if self.artwork['source'] == ScraperSource.THEPOSTERDB:
-                time.sleep(1)
+                    digest.update(chunk)
+            self._cache_download(url, temp_file, content_type)
+            if self._put_in_place(temp_file, dest_file, digest.hexdigest(), replaced_file, existing_file, saved):
+                return f"⏩ {self.description} | {self.artwork_type} skipped (unchanged) for {self.library}"
             if replaced_file:
                 return f"♻️ {self.description} | {self.artwork_type} replaced at '{dest_file}' in {self.library}"
             else:
@@ -157,3 +187,78 @@ class KometaSaver:
         except Exception as e:
             return f"❌ {self.description} | Failed to save {self.artwork_type.lower()}: {e}"
 
+
+    def _cached_image(self, url: str):
+        if self.image_cache is None:
+            return None
+        try:
+            return self.image_cache.get(url)
+        except Exception as e:
+            debug_me(f"Image cache could not be read, downloading instead: {e}", "KometaSaver")
+            return None
+
+    def _cache_download(self, url: str, downloaded_file: str, content_type: str) -> None:
+        if self.image_cache is None:
+            return
+        try:
+            self.image_cache.put_file(url, downloaded_file, content_type or None)
+        except Exception as e:
+            debug_me(f"Could not add '{url}' to the image cache: {e}", "KometaSaver")
+
+    def _saved_entry(self, existing_file: str):
+        """The manifest's entry for the asset already on disk, when it is one we saved and it is
+           unchanged since, or None (no manifest, or a file the manifest doesn't know)."""
+        if self.manifest is None:
+            return None
+        try:
+            return self.manifest.saved_file(self.dest_dir, self.dest_file_name, existing_file)
+        except Exception as e:
+            debug_me(f"Kometa asset manifest could not be read, treating '{existing_file}' as unknown: {e}", "KometaSaver")
+            return None
+
+    def _record(self, dest_file: str, content_hash: str) -> None:
+        if self.manifest is None:
+            return
+        try:
+            self.manifest.record(self.dest_dir, self.dest_file_name, dest_file, source_hash(self.artwork), content_hash)
+        except Exception as e:
+            debug_me(f"Could not record '{dest_file}' in the Kometa asset manifest: {e}", "KometaSaver")
+
+    def _put_in_place(self, temp_file: str, dest_file: str, content_hash: str, replaced_file: bool,
+                      existing_file: Optional[str], saved) -> bool:
+        """Move a fetched asset into place, replacing the existing one. When the existing asset is
+           ours and already this image (the artwork's URL changed but not the image), it is left
+           alone so Kometa doesn't see a change, and True is returned."""
+        if saved is not None and saved["content_hash"] == content_hash and existing_file == dest_file:
+            os.remove(temp_file)
+            self._record(dest_file, content_hash)
+            return True
+        if replaced_file and existing_file != dest_file:
+            os.remove(existing_file)
+            self.asset_listing.removed(existing_file)
+        os.replace(temp_file, dest_file)
+        self.asset_listing.saved(dest_file)
+        self._record(dest_file, content_hash)
+        return False
+
+    def _save_cached(self, cached, replaced_file: bool, existing_file: Optional[str], saved=None) -> str:
+        """Save the asset from the image cache rather than downloading it again."""
+        debug_me(f"Saving {self.artwork_type.lower()} from the image cache: {cached.path}")
+        ext = mimetypes.guess_extension((cached.content_type or '').split(';')[0])
+        self.dest_file_ext = ext if ext is not None else self.dest_file_ext
+        dest_file = os.path.join(self.dest_dir, f"{self.dest_file_name}{self.dest_file_ext}")
+        temp_file = f"{dest_file}.tmp"
+        try:
+            os.makedirs(self.dest_dir, exist_ok=True)
+            shutil.copyfile(cached.path, temp_file)
+            content_hash = file_hash(temp_file) if self.manifest is not None else ""
+            if self._put_in_place(temp_file, dest_file, content_hash, replaced_file, existing_file, saved):
+                return f"⏩ {self.description} | {self.artwork_type} skipped (unchanged) for {self.library}"
+            if replaced_file:
+                return f"♻️ {self.description} | {self.artwork_type} replaced at '{dest_file}' in {self.library}"
+            else:
+                return f"✅ {self.description} | {self.artwork_type} saved at '{dest_file}' in {self.library}"
+        except OSError:
+            return f"❌ {self.description} | Error saving {self.artwork_type.lower()} (invalid path): '{self.dest_dir}'"
+        except Exception as e:
+            return f"❌ {self.description} | Failed to save {self.artwork_type.lower()}: {e}"
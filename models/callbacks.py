@@ -1,3 +1,4 @@
+import threading
 from dataclasses import dataclass, field
 from typing import Optional, Callable
 
@@ -12,7 +13,8 @@ class ProcessingCallbacks:
     when processing events occur.
 
     The counters are always present, so a caller that forgets one still gets a working
-    counter rather than a number that stays at zero.
+    counter rather than a number that stays at zero. Titles can be applied on several threads
+    at once, so the counters are only changed under a lock.
     """
     on_status_update: Optional[Callable[[str, str, bool, bool], None]] = None  # (message, color, spinner, sticky)
     on_log_update: Optional[Callable[[str], None]] = None  # (message)
@@ -23,6 +25,7 @@ class ProcessingCallbacks:
     cached_counter: list = field(default_factory=lambda: [0])  # Mutable list to track assets newly added to the user cache (contains count as single element)
     locked_counter: list = field(default_factory=lambda: [0])  # Mutable list to track artwork skipped because the Plex field was locked (contains count as single element)
     failed_counter: list = field(default_factory=lambda: [0])  # Mutable list to track uploads that failed after exhausting their retries (contains count as single element)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def status(self, message: str, color: str = "info", spinner: bool = False, sticky: bool = False):
         if self.on_status_update:
@@ -42,23 +45,28 @@ class ProcessingCallbacks:
 
     def success(self, count: int):
         if self.success_counter:
-            self.success_counter[0] += count
+            with self._lock:
+                self.success_counter[0] += count
 
     def assets(self, count: int):
         if self.assets_processed:
-            self.assets_processed[0] += count
+            with self._lock:
+                self.assets_processed[0] += count
 
     def cached(self, count: int):
         if self.cached_counter:
-            self.cached_counter[0] += count
+            with self._lock:
+                self.cached_counter[0] += count
 
     def locked(self, count: int):
         if self.locked_counter:
-            self.locked_counter[0] += count
+            with self._lock:
+                self.locked_counter[0] += count
 
     def failed(self, count: int):
         if self.failed_counter:
-            self.failed_counter[0] += count
+            with self._lock:
+                self.failed_counter[0] += count
 
     def record_result(self, result: str) -> Optional[str]:
         """Count one upload result and say what it was.
@@ -0,0 +1,77 @@
+from typing import Callable, List
+
+
+class LabelEdits:
+    """
+    Label changes for one Plex item, collected while it's being processed and written in one
+    go afterwards. Each removeLabel/addLabel is a request to Plex, and the uploader used to
+    follow every removal with a full reload of the item's metadata, so an item with a few
+    stale labels cost several round trips for what is a single change.
+
+    Additions and removals go to Plex as one batched edit. plexapi's addLabel sends the item's
+    whole label set, built from the labels it already holds, which would put back the labels
+    being removed in the same request, so the new set is sent as the labels the item keeps plus
+    the new ones, and the removals by name alongside it.
+
+    Several uploaders can share one LabelEdits when they write to the same item (a poster and a
+    background for one movie, say), so `labels` gives the item's labels as they will be once
+    the pending changes are written, not as Plex last reported them.
+    """
+
+    def __init__(self, target) -> None:
+        self.target = target
+        self.to_add: List[str] = []
+        self.to_remove: List[str] = []
+        self.after_commit: List[Callable[[], None]] = []
+
+    @property
+    def labels(self) -> List[str]:
+        current = [str(label) for label in self.target.labels if str(label) not in self.to_remove]
+        return current + [label for label in self.to_add if label not in current]
+
+    def add(self, label: str) -> None:
+        label = str(label)
+        if label in self.to_remove:
+            self.to_remove.remove(label)
+        if label not in self.to_add:
+            self.to_add.append(label)
+
+    def remove(self, label: str) -> None:
+        label = str(label)
+        if label in self.to_add:
+            self.to_add.remove(label)
+            if label not in (str(existing) for existing in self.target.labels):
+                return  # Only ever queued here, so there is nothing on the item to remove
+        if label not in self.to_remove:
+            self.to_remove.append(label)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.to_add or self.to_remove)
+
+    def discard(self) -> None:
+        self.to_add = []
+        self.to_remove = []
+        self.after_commit = []
+
+    def commit(self, reload: bool = False) -> None:
+        """Write the collected changes in a single request to Plex. The item is only reloaded
+           when asked to, for a caller that goes on to read its labels again. Anything waiting in
+           after_commit runs once the changes are on the item."""
+        labels = self.labels
+        to_add, to_remove, after_commit = self.to_add, self.to_remove, self.after_commit
+        self.discard()
+        if to_add or to_remove:
+            self.target.batchEdits()
+            if to_add:
+                # The label[n].tag.tag parameters plexapi's addLabel would send, less the removals
+                edits = {f"label[{i}].tag.tag": label for i, label in enumerate(labels)}
+                edits["label.locked"] = 1
+                self.target.edit(**edits)
+            if to_remove:
+                self.target.removeLabel(to_remove, False)
+            self.target.saveEdits()
+        if reload and (to_add or to_remove):
+            self.target.reload()
+        for callback in after_commit:
+            callback()
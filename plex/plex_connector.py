@@ -1,7 +1,7 @@
-import requests, plexapi.exceptions, xml.etree.ElementTree, re
+import requests, plexapi.exceptions, xml.etree.ElementTree, re, threading
 from typing import Optional, List, Tuple, Union, Literal
 from core import globals
-from core.enums import MediaType
+from core.enums import MediaType, ArtworkIDPrefix
 from core.constants import DEFAULT_PLEX_CONNECT_TIMEOUT
 from plexapi.server import PlexServer
 from plexapi.library import MovieSection, ShowSection
@@ -24,12 +24,14 @@ class PlexConnector:
         self.movie_libraries: List[MovieSection] = []
         self.options: Options = Options()
         self._index: PlexLibraryIndex = PlexLibraryIndex(self.movie_libraries, self.tv_libraries)
+        self._index_lock = threading.Lock()  # Titles processed in parallel would otherwise each build the index
 
     def set_options(self, options: Options) -> None:
         self.options = options
 
     def _initialize_index(self):
-        self._index._initialize_index(self.movie_libraries, self.tv_libraries)
+        with self._index_lock:
+            self._index._initialize_index(self.movie_libraries, self.tv_libraries)
 
     def reconnect(self, updated_config: Config) -> None:
         self.plex = None
@@ -258,6 +260,41 @@ class PlexConnector:
             return items, lib_names
         return None, None
     
+    def tracked_labels(self) -> List[Tuple[str, str, str]]:
+        """
+        Reads the artwork ID labels off every item in the configured libraries: movies, shows,
+        seasons, episodes and collections. Used to rebuild the applied artwork ledger.
+
+        An item carrying more than one label of the same type is left out, as it's not clear which
+        one is current. The next run then reads that item from Plex and sorts it out.
+
+        Returns:
+            A list of (ratingKey, artwork ID prefix, label) tuples.
+        """
+        if not self.plex:
+            self.connect()
+
+        prefixes = [prefix.value for prefix in ArtworkIDPrefix]
+        entries = []
+        sections = [(library, False) for library in self.movie_libraries] + [(library, True) for library in self.tv_libraries]
+        for library, is_tv in sections:
+            groups = [library.all(), library.collections()]
+            if is_tv:
+                groups += [library.searchSeasons(), library.searchEpisodes()]
+            for group in groups:
+                for item in group:
+                    found = {}
+                    for label in item.labels:
+                        label = str(label)
+                        prefix = next((p for p in prefixes if label.startswith(p)), None)
+                        if prefix:
+                            found.setdefault(prefix, []).append(label)
+                    for prefix, labels in found.items():
+                        if len(labels) == 1:
+                            entries.append((str(item.ratingKey), prefix, labels[0]))
+            debug_me(f"Read artwork ID labels from '{library.title}'")
+        return entries
+
     def movie_or_show(self, title:str, year:Optional[int] = None) -> Tuple[Optional[str], Optional[int], Optional[str], Optional[int]]:
         """
         Looks up a title in the Plex libraries.
@@ -1,13 +1,18 @@
+import sqlite3
 import time
-from typing import Union, Optional
+from typing import Callable, Union, Optional
 from plexapi.video import Movie, Show, Season, Episode
 from plexapi.collection import Collection
 from utils import utils
 from models.options import Options
 from core.enums import ScraperSource, ArtworkIDPrefix
-from core.constants import TPDB_RATE_LIMIT_DELAY, KOMETA_OVERLAY_LABEL, DEFAULT_UPLOAD_RETRY_ATTEMPTS, DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS
-from core.retry import call_with_retry
+from core.constants import TPDB_RATE_LIMIT_DELAY, KOMETA_OVERLAY_LABEL, DEFAULT_UPLOAD_RETRY_ATTEMPTS, DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS, DEFAULT_APPLIED_LEDGER_TTL_DAYS
+from core.retry import call_with_retry, is_transient_error
+from plex.label_edits import LabelEdits
+from utils.image_fetcher import RemoteImage
+from utils.zip_member import artwork_source
 from models.artwork_types import AnyArtwork
+from utils.notifications import debug_me
 
 class PlexUploader:
 
@@ -34,6 +39,12 @@ class PlexUploader:
         self.stale_labels: list = []
         self.retry_attempts: int = DEFAULT_UPLOAD_RETRY_ATTEMPTS
         self.retry_backoff: float = DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS
+        self.ledger = None  # AppliedLedger, when use_applied_ledger is on
+        self.label_edits: LabelEdits = LabelEdits(upload_target)
+        self.image: Optional[RemoteImage] = None  # The URL's image, fetched once and shared by every library
+        self.owns_label_edits: bool = True  # False when an item session shares the edits and writes them at the end
+        self.ledger_ttl_days: float = DEFAULT_APPLIED_LEDGER_TTL_DAYS
+        self.write_observer: Optional[Callable[[float, bool], None]] = None  # Told how each write went, to pace concurrent writes
 
     def set_artwork(self, artwork: AnyArtwork) -> None:
         self.artwork = artwork
@@ -53,13 +64,17 @@ class PlexUploader:
 
     def process_overlay_label(self) -> None:
         if self.reset_overlay:
-            for label in self.upload_target.labels:
-                if str(label) == KOMETA_OVERLAY_LABEL:
-                    self.upload_target.removeLabel(label, False)  # Remove the Overlay label
-                    self.upload_target.reload()
+            for label in self.label_edits.labels:
+                if label == KOMETA_OVERLAY_LABEL:
+                    self.label_edits.remove(label)  # Remove the Overlay label now the new artwork is on
 
     def upload_to_plex(self) -> str:
         try:
+            # The ledger is checked before anything is read from Plex. If it confirms this label
+            # was applied recently, the item is left alone and Plex is never read. A locked item
+            # skipped this way is reported as unchanged rather than locked, which is true either way.
+            if self.track_artwork_ids and not self.options.force and self.ledger_says_applied():
+                return f'⏩ {self.description} | {self.artwork_type} unchanged in {self.upload_target.librarySectionTitle}'
             if self.skip_locked and not self.options.force and self.artwork_field_is_locked():
                 # A locked field is normally left alone. But if we applied its current artwork
                 # from this same artist and the artist has since posted a newer version,
@@ -71,63 +86,122 @@ class PlexUploader:
 
                 if self.confirm_match is not None and not self.confirm_match():
                     return f'⚠️ {self.description} | {self.artwork_type} skipped in {self.upload_target.librarySectionTitle} - artwork is for a different title'
-                self.process_overlay_label()
 
-                if self.artwork_id == ArtworkIDPrefix.BACKGROUND.value:
-                    if self.type == "file":
-                        upload_call = lambda: self.upload_target.uploadArt(filepath = self.artwork['path'])
-                    else:
-                        upload_call = lambda: self.upload_target.uploadArt(url = self.artwork["url"])
+                # With a shared image the bytes are fetched here (or already were, for another
+                # library) and uploaded as a file, so Plex never fetches the URL itself
+                if self.type == "file":
+                    source = {"filepath": artwork_source(self.artwork)}  # Read from the ZIP for an upload that wasn't extracted
+                elif self.image is not None:
+                    source = {"filepath": self.image.content()}
+                else:
+                    source = {"url": self.artwork["url"]}
 
+                if self.artwork_id == ArtworkIDPrefix.BACKGROUND.value:
+                    upload_call = lambda: self.upload_target.uploadArt(**source)
                 elif self.artwork_id == ArtworkIDPrefix.SQUARE_ART.value:
-                    if self.type == "file":
-                        upload_call = lambda: self.upload_target.uploadSquareArt(filepath = self.artwork['path'])
-                    else:
-                        upload_call = lambda: self.upload_target.uploadSquareArt(url = self.artwork["url"])
-
+                    upload_call = lambda: self.upload_target.uploadSquareArt(**source)
                 else:
-                    if self.type == "file":
-                        upload_call = lambda: self.upload_target.uploadPoster(filepath = self.artwork['path'])
-                    else:
-                        upload_call = lambda: self.upload_target.uploadPoster(url = self.artwork["url"])
+                    upload_call = lambda: self.upload_target.uploadPoster(**source)
 
                 # A timeout, dropped connection, or 5xx from Plex is worth trying again; anything
                 # else (a 401, a 404) fails immediately rather than burning the retry budget.
-                call_with_retry(upload_call, self.retry_attempts, self.retry_backoff)
+                call_with_retry(self.observed(upload_call), self.retry_attempts, self.retry_backoff)
 
+                # Label changes are only queued once the new artwork is on the item, so a failed
+                # upload leaves the old label in place and the item stays recognisable as ours,
+                # rather than looking like artwork set by hand
+                self.process_overlay_label()
                 if self.track_artwork_ids:
-                    self.upload_target.addLabel(self.label)
-                # Remove the labels for the artwork we just replaced only AFTER the new one is on
-                # the item, so a failed upload leaves the old label in place and the item stays
-                # recognisable as ours, rather than looking like artwork set by hand
+                    self.label_edits.add(self.label)
+                    self.label_edits.after_commit.append(lambda: self.ledger_record(applied=True))
                 self.remove_stale_labels()
-                if self.artwork["source"] == ScraperSource.THEPOSTERDB.value and self.type == "url":
+                if self.owns_label_edits:
+                    self.label_edits.commit()
+                # Plex fetched the URL itself, so space out the next one. A shared image went through
+                # the fetcher's rate limiter instead.
+                if self.artwork["source"] == ScraperSource.THEPOSTERDB.value and self.type == "url" and self.image is None:
                     time.sleep(TPDB_RATE_LIMIT_DELAY)
                 return f'{"♻️" if self.options.force else "✅"} {self.description} | {self.artwork_type} {"forced update" if self.options.force else "updated"} in {self.upload_target.librarySectionTitle}'
             else:
+                if self.owns_label_edits:
+                    self.label_edits.commit()  # Only holds the label removed because tracking is off
+                if self.track_artwork_ids:
+                    self.ledger_record(applied=False)  # Plex confirmed it, so the entry is good for another TTL
                 return f'⏩ {self.description} | {self.artwork_type} unchanged in {self.upload_target.librarySectionTitle}'
         except Exception as e:
+            if self.owns_label_edits:
+                self.label_edits.discard()  # Nothing changed on the item, so its labels stay as they were
             attempts = getattr(e, "attempts", 1)
             attempts_note = f" after {attempts} attempt(s)" if attempts > 1 else ""
             return f'❌ {self.description} | Failed to update {self.artwork_type} in {self.upload_target.librarySectionTitle}{attempts_note}: {str(e)}'
 
+    def observed(self, write: Callable) -> Callable:
+        """write, timed and reported to write_observer on every attempt, with a timeout or 5xx
+           counted as a sign that Plex is struggling."""
+        if self.write_observer is None:
+            return write
+
+        def timed_write():
+            started = time.monotonic()
+            try:
+                result = write()
+            except Exception as e:
+                self.write_observer(time.monotonic() - started, is_transient_error(e))
+                raise
+            self.write_observer(time.monotonic() - started, False)
+            return result
+        return timed_write
+
     def artwork_exists_on_plex(self) -> bool:
         existing_artwork = False
         self.stale_labels = []
 
-        for label in self.upload_target.labels:
-            existing_label = str(label)  # Convert the label object to a string if it's not already
+        for existing_label in self.label_edits.labels:  # Includes changes queued by earlier artwork for this item
             if existing_label.startswith(self.artwork_id): # Only check this type of ID, could be multiple IDs per item (e.g. background + cover)
                 if existing_label == self.label:
                     existing_artwork = True
                     if not self.track_artwork_ids:
-                        self.upload_target.removeLabel(existing_label, False)  # Remove the existing label as we're no longer tracking the artwork IDs
-                        self.upload_target.reload()
+                        self.label_edits.remove(existing_label)  # Remove the existing label as we're no longer tracking the artwork IDs
+                        self.ledger_forget()
                 else:
                     self.stale_labels.append(existing_label)  # Defer removal until the replacement is on the item (see remove_stale_labels)
 
         return existing_artwork
 
+    def ledger_says_applied(self) -> bool:
+        """True when the applied artwork ledger has this label on this item, confirmed within
+           the TTL. Without a ledger, or if it cannot be read, the answer is False and the item's
+           labels are read from Plex as usual."""
+        rating_key = getattr(self.upload_target, "ratingKey", None)
+        if self.ledger is None or rating_key is None or not self.label:
+            return False
+        try:
+            return self.ledger.is_current(rating_key, self.artwork_id, self.label, self.ledger_ttl_days)
+        except sqlite3.Error as e:
+            debug_me(f"Applied artwork ledger could not be read, checking Plex instead: {e}", "PlexUploader")
+            self.ledger = None
+            return False
+
+    def ledger_record(self, applied: bool) -> None:
+        rating_key = getattr(self.upload_target, "ratingKey", None)
+        if self.ledger is None or rating_key is None or not self.label:
+            return
+        asset_id = self.artwork.get("id") if self.artwork else None
+        try:
+            self.ledger.record(rating_key, self.artwork_id, self.label, asset_id, applied=applied)
+        except sqlite3.Error as e:
+            # The artwork is on the item either way. A missed entry only means Plex is read next time.
+            debug_me(f"Applied artwork ledger could not be updated: {e}", "PlexUploader")
+
+    def ledger_forget(self) -> None:
+        rating_key = getattr(self.upload_target, "ratingKey", None)
+        if self.ledger is None or rating_key is None:
+            return
+        try:
+            self.ledger.forget(rating_key, self.artwork_id)
+        except sqlite3.Error as e:
+            debug_me(f"Applied artwork ledger could not be updated: {e}", "PlexUploader")
+
     def artwork_field_is_locked(self) -> bool:
         # Backgrounds lock the art field, square art locks squareArt, all poster types lock thumb
         locked_field = "art" if self.artwork_id == ArtworkIDPrefix.BACKGROUND.value else "squareArt" if self.artwork_id == ArtworkIDPrefix.SQUARE_ART.value else "thumb"
@@ -137,11 +211,10 @@ class PlexUploader:
         return False
 
     def remove_stale_labels(self) -> None:
-        # Remove same-type labels for artwork we've now replaced. Called after the new artwork and
-        # its label are on the item, so a failed upload never strips the old label.
+        # Queue the removal of same-type labels for artwork we've now replaced. Called after the new
+        # artwork is on the item, so a failed upload never strips the old label.
         for existing_label in self.stale_labels:
-            self.upload_target.removeLabel(existing_label, False)
-            self.upload_target.reload()
+            self.label_edits.remove(existing_label)
         self.stale_labels = []
 
     def current_artwork_id(self) -> Optional[int]:
@@ -149,8 +222,7 @@ class PlexUploader:
            the artist being processed. None if it was set by hand or by a different artist."""
         if not self.artist_assets:
             return None
-        for label in self.upload_target.labels:
-            existing_label = str(label)
+        for existing_label in self.label_edits.labels:
             if existing_label.startswith(self.artwork_id):
                 return self.artist_assets.get(existing_label[len(self.artwork_id):])
         return None
@@ -0,0 +1,176 @@
+"""
+Schedules every Plex write the tool makes, whichever run it comes from.
+
+Bulk imports, scheduled runs, webhook applies, ZIP uploads and single scrapes used to write to
+Plex independently, each from its own thread, so a nightly bulk run could keep a just-imported
+Sonarr episode waiting for an hour and several runs together could put any amount of load on
+Plex. All of them submit their work here instead, and it runs on one small pool of threads:
+
+- Work is submitted to a lane (webhook, manual, scheduled bulk). While several lanes are
+  waiting, each gets a share of the slots by its weight, the most urgent first, so a webhook
+  import goes ahead of a bulk run without the bulk run ever stopping. Runs in the same lane
+  take turns, so two bulk files progress side by side rather than one after the other.
+- Two pieces of work that share a key never run at once, so the label read-modify-write in
+  PlexUploader never races another write to the same item.
+- How many run at once adapts to Plex (additive increase, multiplicative decrease): every write
+  that comes back quickly raises the limit a little, towards the worker count; a slow write,
+  a timeout or a 5xx halves it, at most once per latency target so that a burst of failures
+  from writes that were already in flight counts as one.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Hashable, Iterable, Optional, Set
+
+from core.constants import DEFAULT_PLEX_WRITE_WORKERS, PLEX_WRITE_LATENCY_TARGET, PLEX_LANE_WEIGHTS
+from core import globals
+from core.enums import WorkLane
+
+
+class _Work:
+    __slots__ = ("func", "keys", "future")
+
+    def __init__(self, func: Callable, keys: frozenset, future: Future) -> None:
+        self.func = func
+        self.keys = keys
+        self.future = future
+
+
+class _Lane:
+    """The work waiting in one lane, queued per run. pass_value is the lane's place in the
+       weighted rotation (stride scheduling): it advances by 1/weight for each piece of work
+       started, and the lane furthest behind goes next."""
+
+    def __init__(self, lane: WorkLane, order: int, weight: float) -> None:
+        self.lane = lane
+        self.order = order
+        self.weight = weight
+        self.pass_value = 0.0
+        self.runs: "OrderedDict[Hashable, Deque[_Work]]" = OrderedDict()
+
+
+class PlexWriteExecutor:
+    """
+    A thread pool with priority lanes, an adaptive concurrency limit and per-key serialization.
+    Work waiting for a busy key doesn't hold up work behind it that touches something else.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_PLEX_WRITE_WORKERS, min_workers: int = 1,
+                 latency_target: float = PLEX_WRITE_LATENCY_TARGET,
+                 clock: Callable[[], float] = time.monotonic,
+                 lane_weights: Optional[Dict[str, float]] = None) -> None:
+        self.max_workers = max(int(max_workers), 1)
+        self.min_workers = max(min(int(min_workers), self.max_workers), 1)
+        self.latency_target = latency_target
+        self.clock = clock
+        self.limit: float = float(self.min_workers)
+        weights = lane_weights or PLEX_LANE_WEIGHTS
+        self._lanes = [_Lane(lane, order, float(weights.get(lane.value, 1))) for order, lane in enumerate(WorkLane)]
+        self._virtual_time = 0.0
+        self._busy_keys: Set[Hashable] = set()
+        self._active = 0
+        self._last_decrease: Optional[float] = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plex-write")
+
+    def submit(self, func: Callable, keys: Iterable[Hashable] = (), lane: WorkLane = WorkLane.MANUAL,
+               run: Optional[Hashable] = None) -> Future:
+        """Queue func() to run in lane once it has a slot and none of its keys are in use. Work
+           for the same run starts in the order it was submitted, keys permitting."""
+        future: Future = Future()
+        work = _Work(func, frozenset(keys), future)
+        with self._lock:
+            queue = self._lane(lane)
+            if not queue.runs:
+                # A lane that was idle rejoins at the current point in the rotation rather than
+                # cashing in the turns it didn't need while it was empty
+                queue.pass_value = max(queue.pass_value, self._virtual_time)
+            queue.runs.setdefault(run if run is not None else object(), deque()).append(work)
+            self._dispatch()
+        return future
+
+    def waiting(self, lane: Optional[WorkLane] = None) -> int:
+        """How much work is queued and not yet started, in one lane or all of them."""
+        with self._lock:
+            return sum(len(queue) for each in self._lanes if lane in (None, each.lane) for queue in each.runs.values())
+
+    def observe(self, latency: float, congested: bool = False) -> None:
+        """Feed back one Plex write: how long it took, and whether it timed out or got a 5xx."""
+        with self._lock:
+            if congested or latency > self.latency_target:
+                now = self.clock()
+                if self._last_decrease is None or now - self._last_decrease >= self.latency_target:
+                    self._last_decrease = now
+                    self.limit = max(float(self.min_workers), self.limit / 2)
+            else:
+                self.limit = min(float(self.max_workers), self.limit + 1 / self.limit)
+            self._dispatch()
+
+    def _lane(self, lane: WorkLane) -> _Lane:
+        return next(each for each in self._lanes if each.lane == WorkLane(lane))
+
+    def _next_work(self) -> Optional[_Work]:
+        """Take the next piece of work that can start now. Called with the lock held."""
+        for lane in sorted((each for each in self._lanes if each.runs), key=lambda each: (each.pass_value, each.order)):
+            for run, queue in list(lane.runs.items()):
+                for work in queue:
+                    if work.keys & self._busy_keys:
+                        continue
+                    queue.remove(work)
+                    if queue:
+                        lane.runs.move_to_end(run)  # The other runs in the lane go next
+                    else:
+                        del lane.runs[run]
+                    self._virtual_time = lane.pass_value
+                    lane.pass_value += 1 / lane.weight
+                    return work
+        return None
+
+    def _dispatch(self) -> None:
+        """Start whatever can start. Called with the lock held."""
+        while self._active < int(self.limit):
+            work = self._next_work()
+            if work is None:
+                return
+            if not work.future.set_running_or_notify_cancel():
+                continue
+            self._busy_keys |= work.keys
+            self._active += 1
+            self._pool.submit(self._run, work)
+
+    def _run(self, work: _Work) -> None:
+        try:
+            result = work.func()
+        except BaseException as e:
+            work.future.set_exception(e)
+        else:
+            work.future.set_result(result)
+        finally:
+            with self._lock:
+                self._busy_keys -= work.keys
+                self._active -= 1
+                self._dispatch()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+_shared: Optional[PlexWriteExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def shared_write_executor(max_workers: Optional[int] = None) -> PlexWriteExecutor:
+    """The executor every run shares, so the concurrency learned from Plex carries from one run
+       to the next and concurrent runs stay under one limit between them. Sized by
+       plex_write_workers unless told otherwise, and replaced when that changes."""
+    global _shared
+    if max_workers is None:
+        max_workers = getattr(globals.config, "plex_write_workers", DEFAULT_PLEX_WRITE_WORKERS)
+    with _shared_lock:
+        if _shared is None or _shared.max_workers != max(int(max_workers), 1):
+            # Not shut down: it still has to start whatever is queued on it, and its threads
+            # go once that is done and nothing refers to it
+            _shared = PlexWriteExecutor(max_workers)
+        return _shared
@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional, Tuple
+
+from plexapi.exceptions import NotFound
+
+from core.enums import MediaType
+from plex.label_edits import LabelEdits
+from utils.notifications import debug_me
+
+
+class ItemSession:
+    """
+    State shared by all the artwork for one Plex title while it's processed together: the
+    library lookup, the show's seasons and episodes, and the label edits for each item. A
+    movie with a poster, a background and square art is then looked up once, its labels are
+    read once and its label changes are written once, rather than three times over.
+
+    Opened by UploadProcessor.item_session(). The label edits are written when it closes.
+    """
+
+    def __init__(self) -> None:
+        self.lookups: Dict[tuple, tuple] = {}
+        self.collections: Dict[str, tuple] = {}
+        self.tmdb_ids: Dict[tuple, Tuple[Optional[int], bool]] = {}
+        self._seasons: Dict[str, list] = {}
+        self._episodes: Dict[str, list] = {}
+        self._edits: Dict[str, LabelEdits] = {}
+        self.problems: List[str] = []
+
+    @staticmethod
+    def _key(item) -> str:
+        return str(getattr(item, "ratingKey", id(item)))
+
+    def find_in_library(self, plex, media_type: MediaType, artwork) -> tuple:
+        key = (media_type, artwork.get("tmdb_id"))
+        if key not in self.lookups:
+            self.lookups[key] = plex.find_in_library(media_type, artwork)
+        return self.lookups[key]
+
+    def seasons(self, show) -> list:
+        key = self._key(show)
+        if key not in self._seasons:
+            self._seasons[key] = show.seasons()
+        return self._seasons[key]
+
+    def season(self, show, index: int):
+        for season in self.seasons(show):
+            if season.index == index:
+                return season
+        raise NotFound(f"Season {index} not found in '{show.title}'")
+
+    def episodes(self, season) -> list:
+        key = self._key(season)
+        if key not in self._episodes:
+            self._episodes[key] = season.episodes()
+        return self._episodes[key]
+
+    def episode(self, season, index: int):
+        for episode in self.episodes(season):
+            if episode.index == index:
+                return episode
+        raise NotFound(f"Episode {index} not found in season {season.index}")
+
+    def label_edits(self, target) -> LabelEdits:
+        key = self._key(target)
+        if key not in self._edits:
+            self._edits[key] = LabelEdits(target)
+        return self._edits[key]
+
+    def commit(self) -> None:
+        """Write the label changes for every item. One item failing doesn't stop the rest; its
+           artwork is already on the item, so it's noted in problems as a warning."""
+        for edits in self._edits.values():
+            if not (edits.pending or edits.after_commit):
+                continue
+            try:
+                edits.commit()
+            except Exception as e:
+                title = getattr(edits.target, "title", "item")
+                debug_me(f"Could not update the labels on '{title}': {e}", "ItemSession")
+                self.problems.append(f"⚠️ {title} | Artwork applied but its artwork ID labels could not be updated: {e}")
+        self._edits = {}
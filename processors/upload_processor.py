@@ -1,5 +1,8 @@
 import os
-from typing import Optional, Literal
+import threading
+from concurrent.futures import wait
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Literal
 from core.config import Config
 from core.exceptions import CollectionNotFound, MovieNotFound, ShowNotFound, PlexConnectorException
 from core.enums import ScraperSource, MediaType
@@ -10,11 +13,18 @@ from plex.plex_connector import PlexConnector
 from plex.plex_uploader import PlexUploader
 from plexapi.exceptions import NotFound
 from kometa.kometa_saver import KometaSaver
+from kometa.asset_listing import AssetFolderListing
+from kometa.download_pool import shared_kometa_download_pool
 from utils import soup_utils
 from utils.utils import is_numeric, get_path_parts
 from models.artwork_types import MovieArtwork, TVArtwork, CollectionArtwork
 from core import globals
 from utils.notifications import debug_me
+from services.applied_ledger import AppliedLedger
+from services.kometa_manifest import KometaManifest
+from services.image_cache import ImageCache
+from processors.item_session import ItemSession
+from utils.image_fetcher import RemoteImage
 
 class UploadProcessor:
 
@@ -24,7 +34,36 @@ class UploadProcessor:
         self.config: Config = Config()
         self.config.load()
         self._match_confirm_cache: dict = {}
+        self._tpdb_media_ids: dict = {}  # {poster id: the TMDb id its poster page gives, or None}
+        self._tpdb_page_locks: dict = {}  # {poster id: lock held while its poster page is fetched}
         self.artist_assets: Optional[dict] = None  # {md5(asset url): asset id} for the artist being processed
+        self._ledger: Optional[AppliedLedger] = None
+        self._ledger_opened: bool = False
+        self._cache: Optional[ImageCache] = None
+        self._cache_opened: bool = False
+        self._manifest: Optional[KometaManifest] = None
+        self._manifest_opened: bool = False
+        self._asset_listing = AssetFolderListing()  # Each Kometa asset folder, listed once for the run
+        self._opening = threading.Lock()
+        # Titles can be processed on several threads at once, each in its own item session
+        self._local = threading.local()
+        self.write_observer: Optional[Callable[[float, bool], None]] = None
+
+    @property
+    def _session(self) -> Optional[ItemSession]:
+        return getattr(self._local, "session", None)
+
+    @_session.setter
+    def _session(self, session: Optional[ItemSession]) -> None:
+        self._local.session = session
+
+    @property
+    def _kometa_saves(self) -> Optional[tuple]:
+        return getattr(self._local, "kometa_saves", None)
+
+    @_kometa_saves.setter
+    def _kometa_saves(self, saves: Optional[tuple]) -> None:
+        self._local.kometa_saves = saves
 
 
     def set_options(self, options: Options) -> None:
@@ -41,7 +80,93 @@ class UploadProcessor:
                      "artwork IDs there's no way to tell artwork we applied from artwork set by "
                      "hand, so locked items are all left alone.", "UploadProcessor/set_options")
 
+    @contextmanager
+    def item_session(self) -> Iterator[ItemSession]:
+        """
+        Process several pieces of artwork for the same title as one unit. Inside the block, the
+        library lookup, the show's seasons and episodes, and each item's label edits are shared,
+        and the label edits are written when the block ends. Anything that went wrong writing
+        them is left in the session's problems for the caller to report.
+        """
+        session = ItemSession()
+        self._session = session
+        try:
+            yield session
+        finally:
+            self._session = None
+            session.commit()
+
+    @contextmanager
+    def kometa_saves(self, on_result: Callable[[str], None]) -> Iterator[None]:
+        """
+        Save Kometa assets in the background while the block runs. Inside it, each save is handed
+        to the shared download pool rather than made there and then, so the results returned by
+        the process methods leave those saves out: on_result is called with each one instead, on
+        the pool's thread, as it finishes. The block ends once every save made inside it has, and
+        a save that raised is passed to on_result as an error, as it would have been logged.
+        """
+        pending: list = []
+        self._kometa_saves = (pending, on_result)
+        try:
+            yield
+        finally:
+            self._kometa_saves = None
+            wait(pending)
+            for future in pending:
+                if future.exception() is not None:
+                    on_result(f"❌ {str(future.exception())}")
+
+    def _save_to_kometa(self, saver: KometaSaver) -> Optional[str]:
+        """Save an asset now and return the result, or inside kometa_saves(), queue it on the
+           download pool and return None."""
+        saves = self._kometa_saves
+        if saves is None:
+            return saver.save_to_kometa()
+        pending, on_result = saves
+        pending.append(shared_kometa_download_pool(self.config.kometa_download_workers).submit(saver, on_result))
+        return None
+
+    def _find_in_library(self, media_type: MediaType, artwork) -> tuple:
+        if self._session is not None:
+            return self._session.find_in_library(self.plex, media_type, artwork)
+        return self.plex.find_in_library(media_type, artwork)
+
+    def _find_collection(self, title: str) -> tuple:
+        """Exact title match first, then fuzzy"""
+        if self._session is not None and title in self._session.collections:
+            return self._session.collections[title]
+        collection_items, libraries = self.plex.find_collection(title)
+        if not collection_items:
+            collection_items, libraries = self.plex.find_collection(title, fuzzy=True)
+        if self._session is not None:
+            self._session.collections[title] = (collection_items, libraries)
+        return collection_items, libraries
+
+    def _seasons(self, show) -> list:
+        return self._session.seasons(show) if self._session is not None else show.seasons()
+
+    def _season(self, show, index: int):
+        return self._session.season(show, index) if self._session is not None else show.season(index)
+
+    def _episodes(self, season) -> list:
+        return self._session.episodes(season) if self._session is not None else season.episodes()
+
+    def _episode(self, season, index: int):
+        return self._session.episode(season, index) if self._session is not None else season.episode(index)
+
     def _resolve_tmdb_id(self, artwork, description: str, kind: Literal[MediaType.TV_SHOW, MediaType.MOVIE]) -> bool:
+        # Within an item session every piece of artwork is for the same title, so the first one
+        # resolved answers for the rest
+        cache_key = (kind, artwork.get("title"), artwork.get("year"))
+        if self._session is not None and not artwork.get("tmdb_id") and cache_key in self._session.tmdb_ids:
+            artwork["tmdb_id"], locally_matched = self._session.tmdb_ids[cache_key]
+            return locally_matched
+        locally_matched = self._resolve_tmdb_id_uncached(artwork, description, kind)
+        if self._session is not None and artwork.get("tmdb_id"):
+            self._session.tmdb_ids[cache_key] = (artwork["tmdb_id"], locally_matched)
+        return locally_matched
+
+    def _resolve_tmdb_id_uncached(self, artwork, description: str, kind: Literal[MediaType.TV_SHOW, MediaType.MOVIE]) -> bool:
         """
         Resolve the TMDb ID for a TPDb artwork item before matching it to the library.
 
@@ -73,21 +198,37 @@ class UploadProcessor:
         self._fetch_tmdb_id_from_tpdb(artwork, description)
         return False
 
+    def _tpdb_media_id(self, poster_id) -> Optional[int]:
+        """The TMDb ID on a ThePosterDB poster page (data-media-id), or None if the page doesn't
+           expose one. Each page is fetched once per run, even when titles processed at the same
+           time ask for it together; a fetch that failed is tried again by the next to ask."""
+        with self._opening:
+            page_lock = self._tpdb_page_locks.setdefault(poster_id, threading.Lock())
+        with page_lock:
+            if poster_id not in self._tpdb_media_ids:
+                poster_page_soup = soup_utils.cook_soup(f"https://theposterdb.com/poster/{poster_id}")
+                try:
+                    media_id = int(poster_page_soup.find('div', {"data-media-id": True})['data-media-id'])
+                except (KeyError, TypeError, ValueError) as e:
+                    debug_me(f"No TMDb ID on the poster page for poster '{poster_id}': {e}")
+                    media_id = None
+                self._tpdb_media_ids[poster_id] = media_id
+            return self._tpdb_media_ids[poster_id]
+
     def _fetch_tmdb_id_from_tpdb(self, artwork, description: str) -> None:
         """Fetch the poster page from ThePosterDB to read its TMDb ID (data-media-id), falling back
            to a local Plex title/year search if the page doesn't expose one."""
         poster_id = artwork.get("id", None)
-        poster_page_url = f"https://theposterdb.com/poster/{poster_id}"
-        debug_me(f"Fetching TMDb ID from '{poster_page_url}'")
+        debug_me(f"Fetching TMDb ID from 'https://theposterdb.com/poster/{poster_id}'")
         try:
-            poster_page_soup = soup_utils.cook_soup(poster_page_url)
+            media_id = self._tpdb_media_id(poster_id)
         except ScraperException as e:
             debug_me(f"Unable to fetch TMDb ID due to error: {str(e)}")
             raise ScraperException(f"{description} | {str(e)}") from None
-        try:
-            artwork["tmdb_id"] = int(poster_page_soup.find('div', {"data-media-id": True})['data-media-id'])
-        except (KeyError, TypeError, ValueError) as e:
-            debug_me(f"Failed to extract TMDb ID from poster page, trying another way. Error was: {e}")
+        if media_id is not None:
+            artwork["tmdb_id"] = media_id
+        else:
+            debug_me("Failed to extract TMDb ID from poster page, trying another way.")
             _, artwork["tmdb_id"], _, _ = self.plex.movie_or_show(artwork.get("title"), artwork.get("year"))
             debug_me(f"Found TMDb ID '{artwork['tmdb_id']}' for '{artwork.get('title')}' using Plex search.")
 
@@ -103,26 +244,90 @@ class UploadProcessor:
         cached = self._match_confirm_cache.get(cache_key)
         if cached is not None:
             return cached
-        poster_page_url = f"https://theposterdb.com/poster/{artwork.get('id')}"
-        debug_me(f"Confirming local match for '{artwork.get('title')}' from '{poster_page_url}'")
-        try:
-            poster_page_soup = soup_utils.cook_soup(poster_page_url)
-        except ScraperException:
-            raise
-        try:
-            tpdb_tmdb_id = int(poster_page_soup.find('div', {"data-media-id": True})['data-media-id'])
-            matches = any(guid.id == f"tmdb://{tpdb_tmdb_id}" for guid in plex_item.guids)
-        except (KeyError, TypeError, ValueError):
+        debug_me(f"Confirming local match for '{artwork.get('title')}' from 'https://theposterdb.com/poster/{artwork.get('id')}'")
+        tpdb_tmdb_id = self._tpdb_media_id(artwork.get("id"))
+        if tpdb_tmdb_id is None:
             matches = True  # No media id on the page - trust the local title and year match, same as the existing Plex-search fallback
+        else:
+            matches = any(guid.id == f"tmdb://{tpdb_tmdb_id}" for guid in plex_item.guids)
         self._match_confirm_cache[cache_key] = matches
         return matches
 
+    def _applied_ledger(self) -> Optional[AppliedLedger]:
+        """The applied artwork ledger, opened on first use, or None when use_applied_ledger is
+           off or the ledger can't be opened (uploads then read the labels from Plex as usual)."""
+        with self._opening:
+            if not self._ledger_opened:
+                self._ledger_opened = True
+                if self.config.use_applied_ledger:
+                    try:
+                        self._ledger = AppliedLedger()
+                    except Exception as e:
+                        debug_me(f"Applied artwork ledger is unavailable, checking Plex labels instead: {e}", "UploadProcessor")
+        return self._ledger
+
+    def _image_cache(self) -> Optional[ImageCache]:
+        """The image cache, opened on first use, or None when use_image_cache is off or the cache
+           can't be opened (images are then downloaded every time, as before)."""
+        with self._opening:
+            if not self._cache_opened:
+                self._cache_opened = True
+                if self.config.use_image_cache:
+                    try:
+                        self._cache = ImageCache(max_mb=self.config.image_cache_max_mb)
+                    except Exception as e:
+                        debug_me(f"Image cache is unavailable, downloading images instead: {e}", "UploadProcessor")
+        return self._cache
+
+    def _kometa_manifest(self) -> Optional[KometaManifest]:
+        """The Kometa asset manifest, opened on first use, or None when use_kometa_manifest is off
+           or the manifest can't be opened (existing assets are then skipped unless forced, as before)."""
+        with self._opening:
+            if not self._manifest_opened:
+                self._manifest_opened = True
+                if self.config.use_kometa_manifest:
+                    try:
+                        self._manifest = KometaManifest()
+                    except Exception as e:
+                        debug_me(f"Kometa asset manifest is unavailable, skipping existing assets instead: {e}", "UploadProcessor")
+        return self._manifest
+
+    def _remote_image(self, artwork) -> Optional[RemoteImage]:
+        """The image for URL artwork, fetched once on first use and shared by the uploaders for
+           every library the item is in. None for an uploaded file, which is already local."""
+        if artwork.get("id") == ScraperSource.UPLOAD.value or not artwork.get("url"):
+            return None
+        return RemoteImage(artwork["url"], self.config.kometa_download_timeout,
+                           self.config.upload_retry_attempts, self.config.upload_retry_backoff_seconds,
+                           cache=self._image_cache())
+
+    def _build_uploader(self, upload_target, artwork, artwork_type: str, artwork_id: str, description: str, confirm_match=None, image: Optional[RemoteImage] = None) -> PlexUploader:
+        """A PlexUploader for one target, set up from the config and this run's options."""
+        uploader = PlexUploader(upload_target, artwork_type, artwork_id)
+        uploader.set_artwork(artwork)
+        uploader.track_artwork_ids = self.config.track_artwork_ids
+        uploader.reset_overlay = self.config.reset_overlay
+        uploader.skip_locked = self.skip_locked
+        uploader.allow_artist_updates = self.allow_artist_updates
+        uploader.artist_assets = self.artist_assets
+        uploader.retry_attempts = self.config.upload_retry_attempts
+        uploader.retry_backoff = self.config.upload_retry_backoff_seconds
+        uploader.ledger = self._applied_ledger()
+        uploader.ledger_ttl_days = self.config.applied_ledger_ttl_days
+        uploader.confirm_match = confirm_match
+        uploader.image = image
+        uploader.write_observer = self.write_observer
+        if self._session is not None:
+            uploader.label_edits = self._session.label_edits(upload_target)
+            uploader.owns_label_edits = False
+        uploader.set_description(description)
+        uploader.set_options(self.options)
+        return uploader
+
     def process_collection_artwork(self, artwork: CollectionArtwork) -> Optional[str]:
 
         try:
-            collection_items, libraries = self.plex.find_collection(artwork['title'])
-            if not collection_items:
-                collection_items, libraries = self.plex.find_collection(artwork['title'], fuzzy=True)
+            collection_items, libraries = self._find_collection(artwork['title'])
 
         except PlexConnectorException as e:
             raise PlexConnectorException(f"Error searching Plex for {artwork['title']}")
@@ -137,6 +342,7 @@ class UploadProcessor:
 
         if collection_items:
             debug_me(f"Found collection '{artwork['title']}' in {len(libraries)} libraries.")
+            image = self._remote_image(artwork)
             for collection_item, library in zip(collection_items, libraries):
                 if self.kometa:
                     asset_folder = collection_item.title.replace("/", "").replace(":", "")
@@ -144,6 +350,9 @@ class UploadProcessor:
                     saver.download_timeout = self.config.kometa_download_timeout
                     saver.retry_attempts = self.config.upload_retry_attempts
                     saver.retry_backoff = self.config.upload_retry_backoff_seconds
+                    saver.image_cache = self._image_cache()
+                    saver.asset_listing = self._asset_listing
+                    saver.manifest = self._kometa_manifest()
                     saver.set_artwork(artwork)
                     base_dir = ("/temp" if self.options.temp else "/assets") if globals.docker else getattr(globals.config, "temp_dir" if self.options.temp else "kometa_base", None)
                     saver.dest_dir = os.path.join(base_dir, library, asset_folder)
@@ -152,20 +361,11 @@ class UploadProcessor:
                     saver.dest_file_ext = ".jpg"
                     saver.set_description(description)
                     saver.set_options(self.options)
-                    result = saver.save_to_kometa()
-                    results.append(result)
+                    result = self._save_to_kometa(saver)
+                    if result is not None:
+                        results.append(result)
                 else:
-                    uploader = PlexUploader(collection_item, artwork_type, artwork_id)
-                    uploader.set_artwork(artwork)
-                    uploader.track_artwork_ids = self.config.track_artwork_ids
-                    uploader.reset_overlay = self.config.reset_overlay
-                    uploader.skip_locked = self.skip_locked
-                    uploader.allow_artist_updates = self.allow_artist_updates
-                    uploader.artist_assets = self.artist_assets
-                    uploader.retry_attempts = self.config.upload_retry_attempts
-                    uploader.retry_backoff = self.config.upload_retry_backoff_seconds
-                    uploader.set_description(description)
-                    uploader.set_options(self.options)
+                    uploader = self._build_uploader(collection_item, artwork, artwork_type, artwork_id, description, image=image)
                     result = uploader.upload_to_plex()
                     results.append(result)
         else:
@@ -186,7 +386,7 @@ class UploadProcessor:
         locally_matched = self._resolve_tmdb_id(artwork, description, MediaType.MOVIE)
 
         try:
-            movie_items, libraries = self.plex.find_in_library(MediaType.MOVIE, artwork)
+            movie_items, libraries = self._find_in_library(MediaType.MOVIE, artwork)
         except PlexConnectorException as e:
             raise PlexConnectorException(str(e))
         except Exception as e:
@@ -194,6 +394,7 @@ class UploadProcessor:
 
         if movie_items:
             debug_me(f"Found TMDb ID '{artwork.get('tmdb_id')}' in {len(libraries)} libraries.")
+            image = self._remote_image(artwork)
             for movie_item, library in zip(movie_items, libraries):
                 # Use the actual movie title from Plex in case it differs from the artwork title (if it's a foreign title, etc.)
                 desc = description.replace(artwork["title"], movie_item.title) if movie_item.title != artwork["title"] else description
@@ -206,6 +407,9 @@ class UploadProcessor:
                     saver.download_timeout = self.config.kometa_download_timeout
                     saver.retry_attempts = self.config.upload_retry_attempts
                     saver.retry_backoff = self.config.upload_retry_backoff_seconds
+                    saver.image_cache = self._image_cache()
+                    saver.asset_listing = self._asset_listing
+                    saver.manifest = self._kometa_manifest()
                     saver.set_artwork(artwork)
                     base_dir = ("/temp" if self.options.temp else "/assets") if globals.docker else getattr(globals.config, "temp_dir" if self.options.temp else "kometa_base", None)
                     saver.dest_dir = os.path.join(base_dir, library, asset_folder)
@@ -216,22 +420,12 @@ class UploadProcessor:
                     saver.set_options(self.options)
                     if locally_matched:
                         saver.confirm_match = lambda a=artwork, item=movie_item: self._artwork_matches_item(a, item, "movie")
-                    result = saver.save_to_kometa()
-                    results.append(result)
+                    result = self._save_to_kometa(saver)
+                    if result is not None:
+                        results.append(result)
                 else:
-                    uploader = PlexUploader(movie_item, artwork_type, artwork_id)
-                    uploader.set_artwork(artwork)
-                    uploader.track_artwork_ids = self.config.track_artwork_ids
-                    uploader.reset_overlay = self.config.reset_overlay
-                    uploader.skip_locked = self.skip_locked
-                    uploader.allow_artist_updates = self.allow_artist_updates
-                    uploader.artist_assets = self.artist_assets
-                    uploader.retry_attempts = self.config.upload_retry_attempts
-                    uploader.retry_backoff = self.config.upload_retry_backoff_seconds
-                    if locally_matched:
-                        uploader.confirm_match = lambda a=artwork, item=movie_item: self._artwork_matches_item(a, item, "movie")
-                    uploader.set_description(desc)
-                    uploader.set_options(self.options)
+                    confirm_match = (lambda a=artwork, item=movie_item: self._artwork_matches_item(a, item, "movie")) if locally_matched else None
+                    uploader = self._build_uploader(movie_item, artwork, artwork_type, artwork_id, desc, confirm_match, image)
                     result = uploader.upload_to_plex()
                     results.append(result)
         else:
@@ -271,7 +465,7 @@ class UploadProcessor:
         locally_matched = self._resolve_tmdb_id(artwork, description, MediaType.TV_SHOW)
 
         try:
-            tv_show_items, libraries = self.plex.find_in_library(MediaType.TV_SHOW, artwork)
+            tv_show_items, libraries = self._find_in_library(MediaType.TV_SHOW, artwork)
         except PlexConnectorException as e:
             raise PlexConnectorException(str(e))
         except Exception as e:
@@ -279,12 +473,13 @@ class UploadProcessor:
 
         if tv_show_items:
             debug_me(f"Found TMDb ID '{artwork.get('tmdb_id')}' in {len(libraries)} libraries.")
+            image = self._remote_image(artwork)
             for tv_show, library in zip(tv_show_items, libraries):
                 # Use the actual TV show title from Plex in case it differs from the artwork title (if it's a foreign title, etc.)
                 desc = description.replace(artwork['title'], tv_show.title.split(' (')[0]) if tv_show.title.split(' (')[0] != artwork['title'] else description
                 # Use the year from Plex if it differs
                 desc = desc.replace(f"({artwork['year']})", f"({tv_show.year})") if tv_show.year and artwork['year'] != tv_show.year else desc
-                item_path = tv_show.seasons()[0].episodes()[0].media[0].parts[0].file
+                item_path = self._episodes(self._seasons(tv_show)[0])[0].media[0].parts[0].file
                 path_parts = []
                 path_parts = get_path_parts(item_path)
                 asset_folder = path_parts[-3] if path_parts[-2].lower().startswith("season") or path_parts[-2].lower().startswith("specials") else path_parts[-2]
@@ -315,21 +510,21 @@ class UploadProcessor:
                     elif is_numeric(artwork['season']):
                         if artwork['season'] >= 0:
                             if artwork['episode'] == "Cover" or artwork['episode'] is None:
-                                if artwork['season'] in [S.index for S in tv_show.seasons()] or (self.staging and season != "Specials"):
+                                if artwork['season'] in [S.index for S in self._seasons(tv_show)] or (self.staging and season != "Specials"):
                                     debug_me(f"Staging is {'enabled' if self.staging else 'disabled'}.")
                                     file_name = f"Season{artwork['season']:02}"
                                     if not self.kometa:
-                                        upload_target = tv_show.season(artwork['season'])
+                                        upload_target = self._season(tv_show, artwork['season'])
                                 else:
                                     result = f"⚠️ {desc} | {season} not available in {library}"
                                     results.append(result)
                                     continue
                             elif is_numeric(artwork['episode']) and artwork['episode'] >= 0:
-                                if (artwork['season'] in [S.index for S in tv_show.seasons()]) or (self.staging and season != "Specials"):
-                                    if ((artwork['season'] in [S.index for S in tv_show.seasons()]) and (artwork['episode'] in [E.index for E in tv_show.season(artwork['season']).episodes()])) or self.staging:
+                                if (artwork['season'] in [S.index for S in self._seasons(tv_show)]) or (self.staging and season != "Specials"):
+                                    if ((artwork['season'] in [S.index for S in self._seasons(tv_show)]) and (artwork['episode'] in [E.index for E in self._episodes(self._season(tv_show, artwork['season']))])) or self.staging:
                                         file_name = f"S{artwork['season']:02}E{artwork['episode']:02}"
                                         if not self.kometa:
-                                            upload_target = tv_show.season(artwork['season']).episode(artwork['episode'])
+                                            upload_target = self._episode(self._season(tv_show, artwork['season']), artwork['episode'])
                                     else:
                                         result = f"⚠️ {desc} | {season}, Episode {artwork['episode']:02} not available in {library}"
                                         results.append(result)
@@ -348,6 +543,9 @@ class UploadProcessor:
                         saver.download_timeout = self.config.kometa_download_timeout
                         saver.retry_attempts = self.config.upload_retry_attempts
                         saver.retry_backoff = self.config.upload_retry_backoff_seconds
+                        saver.image_cache = self._image_cache()
+                        saver.asset_listing = self._asset_listing
+                        saver.manifest = self._kometa_manifest()
                         saver.set_artwork(artwork)
                         base_dir = ("/temp" if self.options.temp else "/assets") if globals.docker else getattr(globals.config, 'temp_dir' if self.options.temp else 'kometa_base', None)
                         saver.dest_dir = os.path.join(base_dir, library, asset_folder)
@@ -358,23 +556,13 @@ class UploadProcessor:
                         saver.set_options(self.options)
                         if locally_matched:
                             saver.confirm_match = lambda a=artwork, item=tv_show: self._artwork_matches_item(a, item, "tv")
-                        result = saver.save_to_kometa()
-                        results.append(result)
+                        result = self._save_to_kometa(saver)
+                        if result is not None:
+                            results.append(result)
                     elif upload_target:
                         artwork_id = ARTWORK_ID_MAP.get(artwork.get('file_type'))
-                        uploader = PlexUploader(upload_target, artwork_type, artwork_id)
-                        uploader.set_artwork(artwork)
-                        uploader.track_artwork_ids = self.config.track_artwork_ids
-                        uploader.reset_overlay = self.config.reset_overlay
-                        uploader.skip_locked = self.skip_locked
-                        uploader.allow_artist_updates = self.allow_artist_updates
-                        uploader.artist_assets = self.artist_assets
-                        uploader.retry_attempts = self.config.upload_retry_attempts
-                        uploader.retry_backoff = self.config.upload_retry_backoff_seconds
-                        if locally_matched:
-                            uploader.confirm_match = lambda a=artwork, item=tv_show: self._artwork_matches_item(a, item, "tv")
-                        uploader.set_description(desc)
-                        uploader.set_options(self.options)
+                        confirm_match = (lambda a=artwork, item=tv_show: self._artwork_matches_item(a, item, "tv")) if locally_matched else None
+                        uploader = self._build_uploader(upload_target, artwork, artwork_type, artwork_id, desc, confirm_match, image)
                         result = uploader.upload_to_plex()
                         results.append(result)
                 except Exception:
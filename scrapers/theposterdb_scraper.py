@@ -1,5 +1,6 @@
 import math, time
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
+from bs4 import BeautifulSoup
 from processors import media_metadata
 from utils import soup_utils
 from utils.utils import calculate_md5
@@ -13,9 +14,45 @@ from core.constants import TPDB_API_ASSETS_URL, TPDB_USER_UPLOADS_PER_PAGE, RECO
 from models.artwork_types import MovieArtworkList, TVArtworkList, CollectionArtworkList
 
 import sqlite3
+from collections import deque
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 from services.asset_index import AssetIndex, page_is_fully_known, full_crawl_due
+from services.page_parse_pool import shared_page_parse_pool
+
+
+def poster_records(poster_div: Any) -> List[Dict[str, Any]]:
+    """
+    The posters in a page's poster grid, in page order, as plain records of the tile's media
+    type, asset id and title text - small and picklable, so a page can be parsed in another
+    process and only these sent back.
+    """
+    # The uploads counter can be higher than the number of assets actually listed, so a user
+    # crawl can request a page past the last one. Such a page has no poster grid - treat it as
+    # empty rather than an error.
+    posters = poster_div.find_all('div', class_='col-6 col-lg-2 p-1') if poster_div else []
+
+    if not posters:
+        return []
+
+    if posters[-1].find('a', class_='rounded view_all'):
+        posters.pop()
+
+    records = []
+    for poster in posters:
+        title = poster.find('p', class_='p-0 mb-1 text-break').string
+        records.append({
+            "media_type": poster.find('a', class_="text-white", attrs={'data-toggle': 'tooltip', 'data-placement': 'top'}).get('title'),
+            "id": poster.find('div', class_='overlay').get('data-poster-id'),
+            "title": str(title) if title is not None else None,
+        })
+    return records
+
+
+def parse_user_page(page: bytes) -> List[Dict[str, Any]]:
+    """The poster records on a user uploads page, from the page's raw bytes."""
+    soup = BeautifulSoup(page, 'html.parser')
+    return poster_records(soup.find('div', class_='row d-flex flex-wrap m-0 w-100 mx-n1 mt-n1'))
 
 
 class ThePosterDBScraper:
@@ -93,12 +130,12 @@ class ThePosterDBScraper:
                         self._reset_user_collections()
 
                 collected = 0
-                for user_page in range(self.user_pages):
+                for user_page, parsed in self._user_page_results():
                     if globals.cancel_scrape:
                         break
                     self.callbacks.progress(user_page + 1, self.user_pages, f"Collecting assets from TPDb user {self.author} • {user_page + 1} of {self.user_pages} pages • {collected} assets collected of {self.user_uploads}")
                     assets_before = self.total
-                    page_scraped = self.scrape_user_page(user_page)
+                    page_scraped = self.scrape_user_page(user_page, parsed=parsed)
                     movies = len(self.movie_artwork)
                     collections = len(self.collection_artwork)
                     shows = len(self.tv_artwork)
@@ -180,16 +217,52 @@ class ThePosterDBScraper:
         except (AttributeError, KeyError, ValueError, TypeError) as e:
             raise ScraperException(f"Can't get user information, please check the URL you're using") from e
 
-    def scrape_user_page(self, page, catalog=None) -> bool:
+    def _user_page_url(self, page: int) -> str:
+        return f"{self.url}?section=uploads&page={page + 1}"
+
+    def _user_page_results(self):
+        """Yields (page, parsed) for each of the user's pages, in order. With tpdb_parse_workers
+           set, pages are fetched and parsed ahead in the page parse pool and parsed is a Future
+           of the page's poster records; otherwise it is None and scrape_user_page fetches and
+           parses the page itself."""
+        pool = shared_page_parse_pool(self.config.tpdb_parse_workers)
+        if pool is None:
+            for user_page in range(self.user_pages):
+                yield user_page, None
+            return
+
+        pending = deque()
+        next_page = 0
+        try:
+            while True:
+                while next_page < self.user_pages and len(pending) < pool.workers:
+                    pending.append((next_page, pool.fetch_and_parse(self._user_page_url(next_page))))
+                    next_page += 1
+                if not pending:
+                    return
+                yield pending.popleft()
+        finally:
+            # The crawl stopped early: drop the pages fetched ahead that it won't use
+            for _, future in pending:
+                future.cancel()
+
+    def scrape_user_page(self, page, catalog=None, parsed=None) -> bool:
         
         try:
-            page_url = f"{self.url}?section=uploads&page={page + 1}"
-            child_scraper = ThePosterDBScraper(page_url, self.callbacks)
+            child_scraper = ThePosterDBScraper(self._user_page_url(page), self.callbacks)
             child_scraper.set_options(self.options)
             child_scraper.is_child = True
             if catalog is not None:
                 child_scraper.catalog = catalog
-            child_scraper.scrape()
+            if parsed is None:
+                child_scraper.scrape()
+            else:
+                # Already fetched and parsed in the page parse pool, so only filtering is left
+                child_scraper.author = self.author
+                child_scraper.apply_posters(parsed.result())
+                child_scraper.skipped = child_scraper.exclusions + child_scraper.filtered + child_scraper.errored
+                child_scraper.total = (len(child_scraper.movie_artwork) + len(child_scraper.tv_artwork)
+                                       + len(child_scraper.collection_artwork) + child_scraper.skipped)
 
             for artwork in child_scraper.collection_artwork:
                 self.collection_artwork.append(artwork)
@@ -246,26 +319,30 @@ class ThePosterDBScraper:
         Returns:
             None
         """
-        cache_buster = f"&_cb={int(time.time())}"
+        self.apply_posters(poster_records(poster_div))
 
-        # The uploads counter can be higher than the number of assets actually listed, so a user
-        # crawl can request a page past the last one. Such a page has no poster grid - treat it as
-        # empty rather than an error.
-        posters = poster_div.find_all('div', class_='col-6 col-lg-2 p-1') if poster_div else []
+    def apply_posters(self, records: List[Dict[str, Any]]) -> None:
 
-        if not posters:
-            return
+        """
+        Filters parsed poster records (see poster_records) into the artwork lists, counting what
+        is skipped. Records parsed in the page parse pool come here too, so a page parsed in
+        another process is applied exactly as one parsed here.
+
+        Args:
+            records: The page's posters, in page order.
 
-        if posters[-1].find('a', class_='rounded view_all'):
-            posters.pop()
+        Returns:
+            None
+        """
+        cache_buster = f"&_cb={int(time.time())}"
 
-        for i, poster in enumerate(posters):
+        for i, record in enumerate(records):
 
-            media_type = poster.find('a', class_="text-white", attrs={'data-toggle': 'tooltip', 'data-placement': 'top'}).get('title')
-            poster_id = poster.find('div', class_='overlay').get('data-poster-id')
+            media_type = record["media_type"]
+            poster_id = record["id"]
 
             poster_url = f"{TPDB_API_ASSETS_URL}/{poster_id}{cache_buster}"
-            title_p = poster.find('p', class_='p-0 mb-1 text-break').string
+            title_p = record["title"]
 
             if media_type == "Show": 
                 title, season, year = media_metadata.parse_show(title_p)
@@ -509,7 +586,7 @@ class ThePosterDBScraper:
         new_rows = 0
         clean = True
         collected = 0
-        for user_page in range(self.user_pages):
+        for user_page, parsed in self._user_page_results():
             # A Stop during a cached crawl must also mark the crawl unclean. The `if clean:` block in
             # _scrape_user_cached gates both reconcile() and record_crawl(), so breaking out without
             # this would tombstone every asset the crawl never reached and advance last_full_crawl
@@ -519,7 +596,7 @@ class ThePosterDBScraper:
                 break
             self.callbacks.progress(user_page + 1, self.user_pages, f"Collecting assets from TPDb user {self.author} • {user_page + 1} of {self.user_pages} pages • {collected} assets collected of {self.user_uploads}")
             page_catalog = []
-            ok = self.scrape_user_page(user_page, catalog=page_catalog)
+            ok = self.scrape_user_page(user_page, catalog=page_catalog, parsed=parsed)
             page_ids = {int(asset["id"]) for asset in page_catalog if str(asset.get("id", "")).isdigit()}
             if ok:
                 new_rows += index.record(user_key, page_catalog)
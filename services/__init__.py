@@ -12,7 +12,17 @@ from .utility_service import UtilityService
 from .authentication_service import AuthenticationService
 from .notify_service import NotifyService
 from .asset_index import AssetIndex
+from .applied_ledger import AppliedLedger
+from .kometa_manifest import KometaManifest
+from .image_cache import ImageCache
 from .run_history import RunHistory
+from .bulk_queue import BulkQueue
+from .run_worker import RunWorker
+from .page_parse_pool import PageParsePool
+from .web_event_bus import WebEventBus
+from .log_buffer import LogBuffer
+from .upload_store import UploadStore
+from .folder_watcher import FolderWatcher
 from .webhook_service import WebhookService  # imports run_history, so it comes after it
 
 __all__ = [
@@ -23,6 +33,16 @@ __all__ = [
     'AuthenticationService',
     'NotifyService',
     'AssetIndex',
+    'AppliedLedger',
+    'KometaManifest',
+    'ImageCache',
     'WebhookService',
-    'RunHistory'
+    'RunHistory',
+    'BulkQueue',
+    'RunWorker',
+    'PageParsePool',
+    'WebEventBus',
+    'LogBuffer',
+    'UploadStore',
+    'FolderWatcher'
 ]
@@ -0,0 +1,173 @@
+"""
+Local record of the artwork applied to each Plex item.
+
+A small SQLite database (one file in the config directory) holding, per Plex item and
+artwork type, the artwork ID label we last applied. The uploader checks it before reading
+the item's labels from Plex, so a repeat run over artwork that has not changed can skip
+Plex for most items. An entry is only trusted for a limited time. After that, Plex is read
+again and the entry is refreshed, so a label removed by hand is noticed eventually.
+"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Tuple
+
+from core.constants import APPLIED_LEDGER_PATH
+
+
+def _now() -> str:
+    """Current time as an ISO-8601 UTC string - sortable and comparable as plain text."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+_CREATE_APPLIED = """
+    CREATE TABLE IF NOT EXISTS applied_artwork (
+        rating_key  TEXT NOT NULL,
+        prefix      TEXT NOT NULL,
+        label       TEXT NOT NULL,
+        asset_id    TEXT,
+        applied_at  TEXT,
+        checked_at  TEXT,
+        PRIMARY KEY (rating_key, prefix)
+    )
+"""
+
+
+class AppliedLedger:
+    """
+    What we last applied to each Plex item, keyed by the item's ratingKey and the artwork ID
+    prefix (PID:, BID:, ...). Uploads can run on more than one thread, so the connection is
+    short-lived per call and the database runs in WAL mode.
+    """
+
+    def __init__(self, path: str = APPLIED_LEDGER_PATH) -> None:
+        self.path = path
+        try:
+            self._ensure_schema()
+        except sqlite3.DatabaseError as e:
+            # Lazily imported for the same reason as in AssetIndex: utils.notifications pulls in
+            # the services package, so a top-level import would cycle.
+            from utils.notifications import debug_me
+            # Nothing in the ledger is lost for good. Plex still carries the labels, and the next
+            # run (or the reconcile-ledger command) writes the entries back.
+            corrupt = f"{self.path}.corrupt-{int(time.time())}"
+            try:
+                os.rename(self.path, corrupt)
+            except OSError:
+                debug_me(f"Applied artwork ledger at '{self.path}' is unreadable ({e}) and could "
+                         f"not be moved aside; giving up on the ledger.", "AppliedLedger")
+                raise
+            debug_me(f"Applied artwork ledger at '{self.path}' was unreadable ({e}); moved it to "
+                     f"'{corrupt}' and started a fresh ledger.", "AppliedLedger")
+            self._ensure_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA user_version = 1")
+            conn.execute(_CREATE_APPLIED)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def entry(self, rating_key, prefix: str) -> Optional[sqlite3.Row]:
+        """The ledger row for this item and artwork type, or None."""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT * FROM applied_artwork WHERE rating_key = ? AND prefix = ?",
+                (str(rating_key), prefix),
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def is_current(self, rating_key, prefix: str, label: str, ttl_days: float) -> bool:
+        """True when the ledger says this label is already on the item and the entry was last
+           confirmed against Plex within ttl_days. Anything else - no entry, a different label,
+           an entry past its time - means Plex has to be read."""
+        if ttl_days is None or ttl_days <= 0:
+            return False
+        row = self.entry(rating_key, prefix)
+        if row is None or row["label"] != label or not row["checked_at"]:
+            return False
+        try:
+            checked_at = datetime.fromisoformat(row["checked_at"])
+        except (TypeError, ValueError):
+            return False
+        return datetime.now(timezone.utc) - checked_at < timedelta(days=ttl_days)
+
+    def record(self, rating_key, prefix: str, label: str, asset_id=None, applied: bool = True) -> None:
+        """Note that label is on the item. applied is True right after an upload. It is False
+           when Plex was read and already had the label, which only refreshes checked_at and
+           keeps the original applied_at."""
+        now = _now()
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                INSERT INTO applied_artwork (rating_key, prefix, label, asset_id, applied_at, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(rating_key, prefix) DO UPDATE SET
+                    applied_at=CASE WHEN ? OR applied_artwork.label != excluded.label
+                                    THEN excluded.applied_at ELSE applied_artwork.applied_at END,
+                    label=excluded.label,
+                    asset_id=COALESCE(excluded.asset_id, applied_artwork.asset_id),
+                    checked_at=excluded.checked_at
+                """,
+                (str(rating_key), prefix, label, None if asset_id is None else str(asset_id),
+                 now, now, 1 if applied else 0),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def forget(self, rating_key, prefix: str) -> None:
+        """Drop the entry, e.g. when the label has been taken off because tracking is off."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "DELETE FROM applied_artwork WHERE rating_key = ? AND prefix = ?",
+                (str(rating_key), prefix),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def rebuild(self, entries: Iterable[Tuple[object, str, str]]) -> int:
+        """Replace the whole ledger with (rating_key, prefix, label) entries read from Plex, all
+           marked as checked now. Returns how many entries were written."""
+        now = _now()
+        rows = [(str(rating_key), prefix, label, now, now) for rating_key, prefix, label in entries]
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM applied_artwork")
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO applied_artwork (rating_key, prefix, label, applied_at, checked_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return len(rows)
+
+    def count(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM applied_artwork").fetchone()[0]
+        finally:
+            conn.close()
@@ -5,15 +5,19 @@ This service handles the business logic of scraping artwork and processing
 it for upload to Plex, separating it from UI/notification concerns.
 """
 
-import os, time
-from typing import Optional, Callable, Tuple
+import itertools, os, time
+from concurrent.futures import wait
+from typing import Optional, Callable, Tuple, List
 from scrapers.scraper import Scraper
 from processors.upload_processor import UploadProcessor
 from plex.plex_connector import PlexConnector
+from plex.write_executor import shared_write_executor
 from models.options import Options
 from models.callbacks import ProcessingCallbacks
 from utils.utils import elapsed_time
 from core import globals
+from core.enums import WorkLane
+from services.asset_index import normalize_title
 from core.exceptions import (
     PlexConnectorException,
     ScraperException,
@@ -24,6 +28,38 @@ from core.exceptions import (
     NotProcessedByExclusion
 )
 
+def target_key(artwork: dict, kind: str) -> tuple:
+    """The Plex title a piece of artwork is for: its TMDb ID when the scraper has one, otherwise
+       its normalised title and year. Collections only have a title."""
+    title = normalize_title(artwork.get("title") or "")
+    if kind == "collection":
+        return kind, title
+    if artwork.get("tmdb_id"):
+        return kind, str(artwork["tmdb_id"])
+    return kind, title, artwork.get("year")
+
+
+def group_by_target(artwork_list: List[dict], kind: str) -> List[List[dict]]:
+    """Group artwork for the same title together, in the order each title first appears and
+       keeping the scrape's order within each group."""
+    groups = {}
+    for artwork in artwork_list:
+        groups.setdefault(target_key(artwork, kind), []).append(artwork)
+    return list(groups.values())
+
+
+def conflict_keys(group: List[dict], kind: str) -> set:
+    """Keys for the Plex items a group of artwork can write to. Two groups that share one may
+       land on the same item (a title-and-year group whose TMDb ID is resolved to one another
+       group already has, say), so they are never applied at the same time."""
+    keys = set()
+    for artwork in group:
+        keys.add((kind, normalize_title(artwork.get("title") or "")))
+        if artwork.get("tmdb_id"):
+            keys.add((kind, str(artwork["tmdb_id"])))
+    return keys
+
+
 class ArtworkProcessor:
     """Coordinates scraping and uploading of artwork."""
 
@@ -36,6 +72,7 @@ class ArtworkProcessor:
         url: str,
         bulk: bool,
         options: Options,
+        lane: WorkLane = WorkLane.MANUAL,
     ) -> Tuple[Optional[str], Optional[str]]:
         """
         Scrape artwork from a URL and process it for upload to Plex.
@@ -44,6 +81,7 @@ class ArtworkProcessor:
             url: URL to scrape
             options: Processing options
             callbacks: Optional callbacks for UI updates
+            lane: Priority of this run's Plex writes against other runs' (see PlexWriteExecutor)
 
         Returns:
             Title of the scraped content, or None if no title found
@@ -92,40 +130,54 @@ class ArtworkProcessor:
         if scraper.total - scraper.skipped == 0:
             self.callbacks.progress(1, 1, f"{description} • All assets skipped", "main")
         
-        # Process collections
-        n = 1
+        # Process collections, then movies, then TV shows. Artwork for the same title is processed
+        # together in one item session, so the title is looked up once and each item's labels are
+        # read and written once, whatever mix of posters, backgrounds and title cards it gets.
         title = f"for {scraper.title}" if scraper.title else ""
-        for artwork in scraper.collection_artwork:
-            if globals.cancel_scrape:
-                break
-            self.callbacks.progress(n, scraper.total - scraper.skipped, f"{description} • {n} of {scraper.total - scraper.skipped}", "main")
-            n += 1
-            self._process_single_artwork(
-                artwork,
-                processor.process_collection_artwork
-            )
-
-        # Process movies
-        for artwork in scraper.movie_artwork:
-            if globals.cancel_scrape:
-                break
-            self.callbacks.progress(n, scraper.total - scraper.skipped, f"{description} • {n} of {scraper.total - scraper.skipped}", "main")
-            n += 1
-            self._process_single_artwork(
-                artwork,
-                processor.process_movie_artwork
-            )
-
-        # Process TV shows
-        for artwork in scraper.tv_artwork:
-            if globals.cancel_scrape:
-                break
-            self.callbacks.progress(n, scraper.total - scraper.skipped, f"{description} • {n} of {scraper.total - scraper.skipped}", "main")
-            n += 1
-            self._process_single_artwork(
-                artwork,
-                processor.process_tv_artwork
+        to_process = scraper.total - scraper.skipped
+        counter = itertools.count(1)  # Shared by the write threads; next() on it is atomic
+
+        def report_save(result):
+            self.callbacks.record_result(result)
+            self.callbacks.log(result)
+
+        def process_group(group, process_func):
+            # Kometa saves go on in the background while the rest of the title's artwork is
+            # looked up, and the title only finishes once they all have
+            with processor.item_session() as session, processor.kometa_saves(report_save):
+                for artwork in group:
+                    if globals.cancel_scrape:
+                        break
+                    n = next(counter)
+                    self.callbacks.progress(n, to_process, f"{description} • {n} of {to_process}", "main")
+                    self._process_single_artwork(artwork, process_func)
+            for problem in session.problems:
+                self.callbacks.record_result(problem)
+                self.callbacks.log(problem)
+
+        work = [
+            (group, kind, process_func)
+            for artwork_list, kind, process_func in (
+                (scraper.collection_artwork, "collection", processor.process_collection_artwork),
+                (scraper.movie_artwork, "movie", processor.process_movie_artwork),
+                (scraper.tv_artwork, "tv", processor.process_tv_artwork),
             )
+            for group in group_by_target(artwork_list, kind)
+        ]
+        # Titles are applied in parallel, as many at once as Plex keeps up with, and take turns
+        # with the titles of any other run by the run's lane. A title only waits for another when
+        # they could write to the same item.
+        executor = shared_write_executor()
+        processor.write_observer = executor.observe
+        run = object()
+        futures = [
+            executor.submit(lambda group=group, process_func=process_func: process_group(group, process_func),
+                            keys=conflict_keys(group, kind), lane=lane, run=run)
+            for group, kind, process_func in work
+        ]
+        wait(futures)
+        for future in futures:
+            future.result()  # Anything not already reported by the title itself is raised here, as before
 
         end_time = time.time()
         elapsed = elapsed_time(end_time - start_time)
@@ -213,7 +265,8 @@ class ArtworkProcessor:
         zip_author: Optional[str],
         zip_source: Optional[str],
         options: Options,
-        override_title: Optional[str] = None
+        override_title: Optional[str] = None,
+        lane: WorkLane = WorkLane.MANUAL
     ) -> None:
         """
         Process a list of uploaded artwork files.
@@ -223,9 +276,13 @@ class ArtworkProcessor:
             options: Processing options
             callbacks: Optional callbacks for UI updates
             override_title: Optional title to override in all files
+            lane: Priority of this run's Plex writes against other runs' (see PlexWriteExecutor)
         """
         processor = UploadProcessor(self.plex)
         processor.set_options(options)
+        executor = shared_write_executor()
+        processor.write_observer = executor.observe
+        run = object()
 
         total_files = len(file_list)
         title = override_title if override_title else zip_title if zip_title else "Unknown"
@@ -275,13 +332,7 @@ class ArtworkProcessor:
                 process_func = processor.process_tv_artwork
             elif media_type == "unavailable":
                 self.callbacks.log(f"⚠️ {artwork['title']} {f"({artwork['year']})" if artwork.get('year') else ''} : {artwork['author']} | Movie or TV Show not available on Plex")
-                os.remove(artwork['path'])  # Remove the temporary file after processing
-                try:
-                    os.rmdir(os.path.dirname(artwork['path']))  # Remove the temporary directory if empty
-                    self.callbacks.debug(f"Deleted temporary directory: {os.path.dirname(artwork['path'])}")
-                except OSError as e:
-                    self.callbacks.debug(f"Error deleting temporary directory: {os.path.dirname(artwork['path'])} - {str(e)}")
-                    pass
+                self._remove_extracted_file(artwork)
                 continue
             else:
                 self.callbacks.log(f"❌ Unknown media type: {media_type}")
@@ -307,7 +358,11 @@ class ArtworkProcessor:
             if media_type != "unavailable":
                 try:
                     processed_files += 1
-                    results = process_func(artwork)
+                    # One file at a time, in order, but through the shared executor so the upload
+                    # takes its turn with other runs' writes to Plex
+                    kind = {"Collection": "collection", "Movie": "movie"}.get(media_type, "tv")
+                    results = executor.submit(lambda artwork=artwork, process_func=process_func: process_func(artwork),
+                                              keys=conflict_keys([artwork], kind), lane=lane, run=run).result()
 
                     for result in results:
                         counted = self.callbacks.record_result(result)
@@ -334,17 +389,7 @@ class ArtworkProcessor:
 
                 except Exception as e:
                     self.callbacks.log(f"❌ {str(e)}")
-            try:
-                os.remove(artwork['path'])  # Remove the temporary file after processing
-                self.callbacks.debug(f"Deleted temporary file: {artwork['path']}")
-            except OSError as e:
-                self.callbacks.debug(f"Failed to delete temporary file: {artwork['path']} - {str(e)}")
-                pass
-            try:
-                os.rmdir(os.path.dirname(artwork['path']))  # Remove the temporary directory if empty
-                self.callbacks.debug(f"Deleted temporary directory: {os.path.dirname(artwork['path'])}")
-            except OSError:
-                pass
+            self._remove_extracted_file(artwork)
         # Final progress update
         self.callbacks.assets(count=processed_files)
         failed_note = f" • {failed_counter} asset(s) failed" if failed_counter else ""
@@ -355,3 +400,20 @@ class ArtworkProcessor:
         else:
             self.callbacks.log(f"✔️ {title}{f' ({year})' if year else ''} • {author} | {total_files} file(s) processed • {success_counter} asset(s) updated{failed_note}.")
             self.callbacks.progress(total_files, total_files, f"Processing ZIP file • {total_files} of {total_files}")
+
+    def _remove_extracted_file(self, artwork: dict) -> None:
+        """Delete an uploaded artwork's temporary file once it has been processed, and its folder
+           once that is empty. Artwork read straight from its ZIP has no file of its own, and
+           artwork processed from a folder on the server is the user's own file, so it's kept."""
+        if artwork.get("zip_member") is not None or artwork.get("keep_file"):
+            return
+        try:
+            os.remove(artwork['path'])  # Remove the temporary file after processing
+            self.callbacks.debug(f"Deleted temporary file: {artwork['path']}")
+        except OSError as e:
+            self.callbacks.debug(f"Failed to delete temporary file: {artwork['path']} - {str(e)}")
+        try:
+            os.rmdir(os.path.dirname(artwork['path']))  # Remove the temporary directory if empty
+            self.callbacks.debug(f"Deleted temporary directory: {os.path.dirname(artwork['path'])}")
+        except OSError:
+            pass
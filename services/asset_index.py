@@ -10,6 +10,7 @@ artwork up by title.
 import os
 import re
 import sqlite3
+import threading
 import time
 import unicodedata
 from datetime import datetime, timezone
@@ -65,15 +66,36 @@ _CREATE_CRAWLS = """
 """
 
 
+# Each thread keeps one connection per database file open for as long as it lives, shared by
+# every AssetIndex on that file. A crawl used to connect, set the PRAGMAs up and close again for
+# every call, a few hundred times for a user with 300 pages; now it connects once, and sqlite3's
+# per-connection statement cache means the same queries aren't prepared again on every call.
+# Connections are never shared between threads, and the database stays in WAL mode, so the
+# webhook's lookups still read alongside a crawl that is writing.
+_connections = threading.local()
+
+# The database files whose schema this process has already checked, so constructing an
+# AssetIndex for each scrape or webhook import doesn't check it again
+_schema_checked: Set[str] = set()
+_schema_lock = threading.Lock()
+
+
 class AssetIndex:
     """
     Persistent index of ThePosterDB users' uploads (SQLite, one file in the config
-    directory). Writers are the scrape thread; readers may run on other threads, so the
-    connection is short-lived per call and the database runs in WAL mode.
+    directory). Writers are the scrape thread; readers may run on other threads, so each
+    thread has a connection of its own and the database runs in WAL mode.
     """
 
     def __init__(self, path: str = ASSET_INDEX_PATH) -> None:
         self.path = path
+        self._key = os.path.abspath(path)
+        with _schema_lock:
+            if self._key not in _schema_checked:
+                self._check_schema()
+                _schema_checked.add(self._key)
+
+    def _check_schema(self) -> None:
         try:
             self._ensure_schema()
         except sqlite3.DatabaseError as e:
@@ -84,6 +106,7 @@ class AssetIndex:
             # write on a flaky filesystem, ...). Preserve it for inspection and start clean:
             # the next crawl repopulates it, nothing is lost that a scrape can't rebuild.
             corrupt = f"{self.path}.corrupt-{int(time.time())}"
+            self.close()
             try:
                 os.rename(self.path, corrupt)
             except OSError:
@@ -95,33 +118,45 @@ class AssetIndex:
             self._ensure_schema()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.path, timeout=30)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=30000")
-        conn.row_factory = sqlite3.Row
+        """This thread's connection to the index, opened the first time the thread needs it.
+           Writes go through it as `with conn:`, so one that fails is rolled back rather than
+           left open on a connection that lives on."""
+        open_connections = getattr(_connections, "by_path", None)
+        if open_connections is None:
+            open_connections = _connections.by_path = {}
+        conn = open_connections.get(self._key)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA busy_timeout=30000")
+            except sqlite3.Error:
+                conn.close()
+                raise
+            conn.row_factory = sqlite3.Row
+            open_connections[self._key] = conn
         return conn
 
+    def close(self) -> None:
+        """Close this thread's connection to the index, if it has one. The next call opens a new one."""
+        conn = getattr(_connections, "by_path", {}).pop(self._key, None)
+        if conn is not None:
+            conn.close()
+
     def _ensure_schema(self) -> None:
         conn = self._connect()
-        try:
+        with conn:
             conn.execute("PRAGMA user_version = 1")
             conn.execute(_CREATE_ASSETS)
             conn.execute(_CREATE_ASSETS_INDEX)
             conn.execute(_CREATE_CRAWLS)
-            conn.commit()
-        finally:
-            conn.close()
 
     def known_ids(self, user_key: str) -> Set[int]:
         """Every asset id on record for the user, tombstoned ones included, so the stop rule
            stays conservative (a re-listed deleted asset still counts as already known)."""
-        conn = self._connect()
-        try:
-            rows = conn.execute(
-                "SELECT asset_id FROM user_assets WHERE user_key = ?", (user_key,)
-            ).fetchall()
-        finally:
-            conn.close()
+        rows = self._connect().execute(
+            "SELECT asset_id FROM user_assets WHERE user_key = ?", (user_key,)
+        ).fetchall()
         return {row["asset_id"] for row in rows}
 
     def record(self, user_key: str, assets: List[dict]) -> int:
@@ -151,7 +186,7 @@ class AssetIndex:
         if not rows:
             return 0
         conn = self._connect()
-        try:
+        with conn:
             conn.executemany(
                 """
                 INSERT INTO user_assets
@@ -166,46 +201,36 @@ class AssetIndex:
                 """,
                 rows,
             )
-            conn.commit()
-        finally:
-            conn.close()
         return new_count
 
     def assets_for_user(self, user_key: str) -> List[sqlite3.Row]:
         """Live (non-tombstoned, known-media-type) assets for the user, newest first - the
            order a full crawl produces."""
-        conn = self._connect()
-        try:
-            return conn.execute(
-                """
-                SELECT * FROM user_assets
-                WHERE user_key = ? AND missing_since IS NULL AND media_type != 'unknown'
-                ORDER BY asset_id DESC
-                """,
-                (user_key,),
-            ).fetchall()
-        finally:
-            conn.close()
+        return self._connect().execute(
+            """
+            SELECT * FROM user_assets
+            WHERE user_key = ? AND missing_since IS NULL AND media_type != 'unknown'
+            ORDER BY asset_id DESC
+            """,
+            (user_key,),
+        ).fetchall()
 
     def owned_asset_urls(self, user_key: str) -> List[sqlite3.Row]:
         """(asset_id, url) for every asset ever recorded for the user, tombstoned ones included,
            so artwork we applied stays recognisable as this artist's even after they delete or
            replace the upload. Used to decide allow_artist_updates ownership."""
-        conn = self._connect()
-        try:
-            return conn.execute(
-                "SELECT asset_id, url FROM user_assets WHERE user_key = ? AND url IS NOT NULL",
-                (user_key,),
-            ).fetchall()
-        finally:
-            conn.close()
+        return self._connect().execute(
+            "SELECT asset_id, url FROM user_assets WHERE user_key = ? AND url IS NOT NULL",
+            (user_key,),
+        ).fetchall()
 
     def reconcile(self, user_key: str, seen_ids: Set[int], crawl_started_at: str) -> int:
         """After a clean full crawl, tombstone assets that weren't seen (deleted from the
            user's uploads), sparing any row inserted since the crawl began so an overlapping
            scrape's fresh uploads are never tombstoned. Returns the number tombstoned."""
         conn = self._connect()
-        try:
+        with conn:
+            # The temporary table stays with the connection, so it is emptied before each use
             conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (asset_id INTEGER PRIMARY KEY)")
             conn.execute("DELETE FROM seen")
             conn.executemany("INSERT OR IGNORE INTO seen (asset_id) VALUES (?)",
@@ -219,26 +244,19 @@ class AssetIndex:
                 """,
                 (_now(), user_key, crawl_started_at),
             )
-            conn.commit()
-            return cursor.rowcount
-        finally:
-            conn.close()
+        return cursor.rowcount
 
     def crawl_state(self, user_key: str) -> Optional[sqlite3.Row]:
         """The user's crawl bookkeeping row (last full/any crawl, last upload count), or None."""
-        conn = self._connect()
-        try:
-            return conn.execute(
-                "SELECT * FROM user_crawls WHERE user_key = ?", (user_key,)
-            ).fetchone()
-        finally:
-            conn.close()
+        return self._connect().execute(
+            "SELECT * FROM user_crawls WHERE user_key = ?", (user_key,)
+        ).fetchone()
 
     def record_crawl(self, user_key: str, full: bool, seen_count: int) -> None:
         """Update the crawl ledger. last_full_crawl only advances on a full crawl."""
         now = _now()
         conn = self._connect()
-        try:
+        with conn:
             existing = conn.execute(
                 "SELECT last_full_crawl FROM user_crawls WHERE user_key = ?", (user_key,)
             ).fetchone()
@@ -254,9 +272,6 @@ class AssetIndex:
                 """,
                 (user_key, last_full, now, seen_count),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def lookup(self, user_keys: List[str], title: str, year: Optional[int],
                media_types: List[str], season: Optional[int] = None) -> Optional[sqlite3.Row]:
@@ -273,20 +288,16 @@ class AssetIndex:
         title_keys = [key for key in title_keys if key]
         if not title_keys or not user_keys or not media_types:
             return None
-        conn = self._connect()
-        try:
-            sql = (
-                "SELECT * FROM user_assets WHERE missing_since IS NULL "
-                f"AND media_type IN ({','.join('?' * len(media_types))}) "
-                f"AND title_key IN ({','.join('?' * len(title_keys))})"
-            )
-            params = list(media_types) + title_keys
-            if season is not None:
-                sql += " AND season = ?"
-                params.append(season)
-            rows = conn.execute(sql, params).fetchall()
-        finally:
-            conn.close()
+        sql = (
+            "SELECT * FROM user_assets WHERE missing_since IS NULL "
+            f"AND media_type IN ({','.join('?' * len(media_types))}) "
+            f"AND title_key IN ({','.join('?' * len(title_keys))})"
+        )
+        params = list(media_types) + title_keys
+        if season is not None:
+            sql += " AND season = ?"
+            params.append(season)
+        rows = self._connect().execute(sql, params).fetchall()
         for user_key in user_keys:
             chosen = _best_by_year([row for row in rows if row["user_key"] == user_key], year)
             if chosen is not None:
@@ -0,0 +1,210 @@
+"""
+Queue of bulk imports waiting to run.
+
+A bulk import used to be refused outright while another one was running, so two schedules
+landing on the same minute lost one of their runs, and catch-up couldn't put it right because
+the refused run was never stamped. Every bulk import (manual, scheduled or caught up) now goes
+through this queue instead:
+
+- The same file queued twice runs once. A run for a file that is already waiting is folded into
+  that one, which takes the newer contents.
+- Different files can run side by side, up to BULK_QUEUE_MAX_RUNNING, and their Plex writes
+  only wait for each other where they touch the same item. That limit is 1 for now: the web UI
+  has one bulk progress bar, which two runs would take turns to overwrite.
+- The same file never runs twice at once.
+- The queue is kept in a small JSON file in the config directory, so a restart picks up the runs
+  that were waiting (or running) when the app stopped rather than losing them.
+"""
+
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from core import globals
+from core.constants import BULK_QUEUE_PATH, BULK_QUEUE_MAX_RUNNING, DEFAULT_BULK_QUEUE_MAX_DEPTH, DEFAULT_BULK_IMPORT_FILE
+from core.enums import QueueResult
+
+WAITING = "waiting"
+RUNNING = "running"
+
+
+class BulkQueue:
+    """
+    The bulk imports waiting or running in this process, in the order they were queued. The
+    caller that queued a run waits for its turn with start(), runs it, and calls finish().
+    """
+
+    def __init__(
+        self,
+        path: str = BULK_QUEUE_PATH,
+        max_depth: int = DEFAULT_BULK_QUEUE_MAX_DEPTH,
+        max_running: int = BULK_QUEUE_MAX_RUNNING,
+    ) -> None:
+        self.path = path
+        self.max_depth = max_depth
+        self.max_running = max(int(max_running), 1)
+        self._changed = threading.Condition()
+        self._jobs: List[Dict[str, Any]] = self._load()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if not os.path.isfile(self.path):
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as queue_file:
+                jobs = json.load(queue_file)
+            return [job for job in jobs if isinstance(job, dict) and job.get("id")] if isinstance(jobs, list) else []
+        except (OSError, json.JSONDecodeError) as e:
+            # Lazily imported: utils.notifications pulls in the services package, and this
+            # module is imported from services/__init__.py, so a top-level import would cycle.
+            from utils.notifications import debug_me
+            debug_me(f"Bulk import queue at '{self.path}' could not be read, starting empty: {e}")
+            return []
+
+    def _save(self) -> None:
+        # Called with the condition held. Written to a temporary file and moved into place, as
+        # RunHistory does, so a crash mid-write leaves the previous queue rather than half of one.
+        temp_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as queue_file:
+                json.dump(self._jobs, queue_file, indent=4)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            from utils.notifications import debug_me
+            debug_me(f"Bulk import queue could not be saved to '{self.path}': {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return next((job for job in self._jobs if job["id"] == job_id), None)
+
+    def _waiting(self) -> List[Dict[str, Any]]:
+        return [job for job in self._jobs if job["state"] == WAITING]
+
+    def enqueue(self, filename: Optional[str], content: str, schedule_id: Optional[str] = None,
+                notify: bool = False) -> Tuple[QueueResult, Optional[Dict[str, Any]]]:
+        """
+        Queue a run of a bulk file.
+
+        Returns:
+            What happened to it, and the job that will run it: a new one, or the one already
+            waiting for the same file (which now has these contents). No job if it was refused.
+        """
+        filename = filename or DEFAULT_BULK_IMPORT_FILE
+        with self._changed:
+            waiting = self._waiting()
+            already_waiting = next((job for job in waiting if job["file"] == filename), None)
+            if already_waiting:
+                already_waiting["content"] = content
+                already_waiting["notify"] = already_waiting["notify"] or notify
+                already_waiting["schedule_id"] = already_waiting["schedule_id"] or schedule_id
+                self._save()
+                return QueueResult.COALESCED, dict(already_waiting)
+
+            if len(waiting) >= self.max_depth:
+                return QueueResult.FULL, None
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "file": filename,
+                "content": content,
+                "schedule_id": schedule_id,
+                "notify": notify,
+                "state": WAITING,
+                "queued_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._jobs.append(job)
+            self._save()
+            self._changed.notify_all()
+            return QueueResult.QUEUED, dict(job)
+
+    def _can_start(self, job: Dict[str, Any]) -> bool:
+        running = [each for each in self._jobs if each["state"] == RUNNING]
+        running_files = {each["file"] for each in running}
+        if len(running) >= self.max_running or job["file"] in running_files:
+            return False
+        # First come, first served, except that a run held back only because its file is
+        # already running doesn't hold up the files behind it
+        for earlier in self._waiting():
+            if earlier is job:
+                return True
+            if earlier["file"] not in running_files:
+                return False
+        return False
+
+    def start(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for a queued job's turn and mark it running.
+
+        Returns:
+            The job, with the latest contents queued for its file, or None if it is still
+            waiting when the timeout runs out.
+        """
+        with self._changed:
+            job = self._job(job_id)
+            if job is None:
+                return None
+            if not self._changed.wait_for(lambda: self._can_start(job), timeout=timeout):
+                return None
+            job["state"] = RUNNING
+            job["started_at"] = datetime.now(timezone.utc).isoformat()
+            self._save()
+            return dict(job)
+
+    def finish(self, job_id: str) -> None:
+        """Take a job off the queue once it has run (or failed to), letting the next one start."""
+        with self._changed:
+            self._jobs = [job for job in self._jobs if job["id"] != job_id]
+            self._save()
+            self._changed.notify_all()
+
+    def position(self, job_id: str) -> int:
+        """Where a job is among those waiting, from 1. 0 if it is running or no longer queued."""
+        with self._changed:
+            for position, job in enumerate(self._waiting(), 1):
+                if job["id"] == job_id:
+                    return position
+            return 0
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """Everything queued, running first and then by position, without the file contents."""
+        with self._changed:
+            running = [job for job in self._jobs if job["state"] == RUNNING]
+            return ([{"file": job["file"], "state": RUNNING, "position": 0} for job in running]
+                    + [{"file": job["file"], "state": WAITING, "position": position}
+                       for position, job in enumerate(self._waiting(), 1)])
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """
+        Put back in the queue whatever was running when the app last stopped, and return every
+        job that now needs a caller to run it. Only called once, at startup, before anything
+        new has been queued.
+        """
+        with self._changed:
+            for job in self._jobs:
+                job["state"] = WAITING
+                job.pop("started_at", None)
+            self._save()
+            return [dict(job) for job in self._jobs]
+
+
+_shared: Optional[BulkQueue] = None
+_shared_lock = threading.Lock()
+
+
+def shared_bulk_queue() -> BulkQueue:
+    """The queue every bulk import in this process goes through, with its depth taken from
+    bulk_queue_max_depth each time so a change in the settings applies to the next run queued."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = BulkQueue()
+        _shared.max_depth = int(getattr(globals.config, "bulk_queue_max_depth", DEFAULT_BULK_QUEUE_MAX_DEPTH))
+        return _shared
@@ -0,0 +1,181 @@
+"""
+A folder watched for artwork, so it can be dropped onto a share rather than uploaded.
+
+The watched folder (watch_folder) is looked at every watch_folder_poll_seconds. A look only lists
+the folder: each image file's path, modification time and size are compared with a manifest of
+the files already processed, kept in a small JSON file in the config directory, so nothing is
+read unless it is new or has changed, and a restart doesn't process everything again.
+
+- New and changed files are held back until the folder has stayed the same for
+  watch_folder_settle_seconds, so a large copy into it, or a file still being written, is
+  handled once it has finished and as a single run.
+- Once a batch has been processed its files are added to the manifest. A batch that fails is
+  tried again after the folder next settles.
+- Files that are deleted from the folder are dropped from the manifest, so putting one back
+  processes it again.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core import globals
+from core.constants import (
+    IMAGE_EXTENSIONS,
+    WATCH_MANIFEST_PATH,
+    DEFAULT_WATCH_FOLDER_POLL_SECONDS,
+    DEFAULT_WATCH_FOLDER_SETTLE_SECONDS,
+)
+
+# (modification time in nanoseconds, size in bytes): enough to tell a file has changed without reading it
+FileStamp = Tuple[int, int]
+
+
+def scan_images(folder: str) -> Dict[str, FileStamp]:
+    """The image files in a folder and the folders below it, leaving out hidden ones, with the
+       stamp of each."""
+    images = {}
+    folders = [folder]
+    while folders:
+        with os.scandir(folders.pop()) as scan:
+            for entry in scan:
+                if entry.name.startswith(".") or entry.name.lower() == "__macosx":
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.path)
+                elif entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file():
+                    stat = entry.stat()
+                    images[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return images
+
+
+class FolderWatcher:
+    """
+    Notices new and changed image files in a folder, and hands them over in batches once the
+    folder has settled.
+    """
+
+    def __init__(self, path: str = WATCH_MANIFEST_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, FileStamp] = self._load()
+        self._pending: Dict[str, FileStamp] = {}
+        self._changed_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load(self) -> Dict[str, FileStamp]:
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as manifest_file:
+                files = json.load(manifest_file)
+            return {path: tuple(stamp) for path, stamp in files.items()} if isinstance(files, dict) else {}
+        except (OSError, json.JSONDecodeError, TypeError, ValueError) as e:
+            # Lazily imported: utils.notifications pulls in the services package, and this
+            # module is imported from services/__init__.py, so a top-level import would cycle.
+            from utils.notifications import debug_me
+            debug_me(f"Watched folder manifest at '{self.path}' could not be read, starting empty: {e}")
+            return {}
+
+    def _save(self) -> None:
+        # Called with the lock held. Written to a temporary file and moved into place, as the
+        # bulk import queue is, so a crash mid-write leaves the previous manifest.
+        temp_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as manifest_file:
+                json.dump(self._manifest, manifest_file)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            from utils.notifications import debug_me
+            debug_me(f"Watched folder manifest could not be saved to '{self.path}': {e}")
+
+    def poll(self, folder: str, settle_seconds: float, now: Optional[float] = None) -> List[str]:
+        """
+        Look at the folder once. Returns the new and changed files, in path order, once the
+        folder has stayed unchanged for settle_seconds since they arrived; until then, and when
+        there is nothing new, an empty list.
+        """
+        now = time.monotonic() if now is None else now
+        folder = os.path.abspath(folder)
+        images = scan_images(folder)
+        with self._lock:
+            removed = [path for path in self._manifest
+                       if path not in images and path.startswith(os.path.join(folder, ""))]
+            for path in removed:
+                del self._manifest[path]
+            if removed:
+                self._save()
+
+            changed = {path: stamp for path, stamp in images.items() if self._manifest.get(path) != stamp}
+            if changed != self._pending:
+                # Something arrived, or is still being written: wait for the folder to settle
+                self._pending = changed
+                self._changed_at = now
+                return []
+            if changed and now - self._changed_at >= settle_seconds:
+                # Handed over once: if it isn't processed, it is tried again after another settle
+                self._changed_at = now
+                return sorted(changed)
+            return []
+
+    def processed(self, files: List[str]) -> None:
+        """Record a batch as processed, so its files aren't processed again unless they change."""
+        with self._lock:
+            for path in files:
+                stamp = self._pending.pop(path, None)
+                if stamp is not None:
+                    self._manifest[path] = stamp
+            self._save()
+
+    def start(self, on_batch: Callable[[str, List[str]], bool]) -> None:
+        """
+        Watch the folder set in watch_folder on a thread of its own, calling on_batch with the
+        folder and the files of each batch. A batch is only recorded as processed when on_batch
+        returns True, so one whose run was stopped is handed over again. The settings are read on
+        every look, so a change to them applies without a restart.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, args=(on_batch,), name="folder-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _watch(self, on_batch: Callable[[str, List[str]], bool]) -> None:
+        from utils.notifications import debug_me
+        while True:
+            folder = getattr(globals.config, "watch_folder", "") or ""
+            poll_seconds = float(getattr(globals.config, "watch_folder_poll_seconds", DEFAULT_WATCH_FOLDER_POLL_SECONDS))
+            settle_seconds = float(getattr(globals.config, "watch_folder_settle_seconds", DEFAULT_WATCH_FOLDER_SETTLE_SECONDS))
+            if folder and os.path.isdir(folder):
+                try:
+                    batch = self.poll(folder, settle_seconds)
+                    if batch:
+                        debug_me(f"Processing {len(batch)} new or changed file(s) in the watched folder '{folder}'")
+                        if on_batch(os.path.abspath(folder), batch):
+                            self.processed(batch)
+                except Exception as e:
+                    debug_me(f"Error processing the watched folder '{folder}': {e}")
+            if self._stop.wait(max(poll_seconds, 1)):
+                return
+
+
+_shared: Optional[FolderWatcher] = None
+_shared_lock = threading.Lock()
+
+
+def shared_folder_watcher() -> FolderWatcher:
+    """The watcher of the folder set in watch_folder, for this process."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = FolderWatcher()
+        return _shared
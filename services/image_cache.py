@@ -0,0 +1,231 @@
+"""
+On-disk cache of artwork images.
+
+The scrapers add a cache buster (&_cb=...) to every image URL, so neither Plex nor a plain HTTP
+cache can reuse anything, and an asset fetched yesterday is downloaded again today for every
+Kometa save and every upload. This cache keys images by the URL with the cache buster removed,
+and stores each image once by the SHA-256 of its content, so the same image reached through
+two URLs takes the space of one. A size budget is enforced by evicting the least recently used
+images.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.constants import IMAGE_CACHE_DIR, DEFAULT_IMAGE_CACHE_MAX_MB
+
+
+def canonical_url(url: str) -> str:
+    """The asset URL without the scrapers' cache buster, which is the same across runs."""
+    return url.split("&_cb=")[0].split("?_cb=")[0]
+
+
+def _now() -> str:
+    """Current time as an ISO-8601 UTC string - sortable and comparable as plain text."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+_CREATE_BLOBS = """
+    CREATE TABLE IF NOT EXISTS blobs (
+        sha256       TEXT PRIMARY KEY,
+        size         INTEGER NOT NULL,
+        content_type TEXT,
+        last_used    TEXT
+    )
+"""
+
+_CREATE_URLS = """
+    CREATE TABLE IF NOT EXISTS urls (
+        url        TEXT PRIMARY KEY,
+        sha256     TEXT NOT NULL,
+        fetched_at TEXT
+    )
+"""
+
+_CREATE_URLS_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_urls_sha256 ON urls (sha256)
+"""
+
+
+@dataclass
+class CachedImage:
+    path: str
+    sha256: str
+    content_type: Optional[str]
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as image_file:
+            return image_file.read()
+
+
+class ImageCache:
+    """
+    Content-addressed image store (one directory in the config directory, with a SQLite index).
+    Kometa saves and Plex uploads can run on different threads, so the index connection is
+    short-lived per call and runs in WAL mode, and image files are written to a temporary name
+    and moved into place so a reader never sees half an image.
+    """
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_mb: float = DEFAULT_IMAGE_CACHE_MAX_MB) -> None:
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.index_path = os.path.join(directory, "index.db")
+        os.makedirs(directory, exist_ok=True)
+        try:
+            self._ensure_schema()
+        except sqlite3.DatabaseError as e:
+            # Lazily imported: utils.notifications pulls in the services package.
+            from utils.notifications import debug_me
+            # Only the index is lost; the images are fetched again as they're needed.
+            corrupt = f"{self.index_path}.corrupt-{int(time.time())}"
+            try:
+                os.rename(self.index_path, corrupt)
+            except OSError:
+                debug_me(f"Image cache index at '{self.index_path}' is unreadable ({e}) and could "
+                         f"not be moved aside; giving up on the cache.", "ImageCache")
+                raise
+            debug_me(f"Image cache index at '{self.index_path}' was unreadable ({e}); moved it to "
+                     f"'{corrupt}' and started a fresh index.", "ImageCache")
+            self._ensure_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA user_version = 1")
+            conn.execute(_CREATE_BLOBS)
+            conn.execute(_CREATE_URLS)
+            conn.execute(_CREATE_URLS_INDEX)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.directory, sha256[:2], sha256)
+
+    def get(self, url: str) -> Optional[CachedImage]:
+        """The cached image for url, or None. A hit counts as a use for eviction."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                """
+                SELECT blobs.sha256, blobs.content_type FROM urls
+                JOIN blobs ON blobs.sha256 = urls.sha256
+                WHERE urls.url = ?
+                """,
+                (canonical_url(url),),
+            ).fetchone()
+            if row is None:
+                return None
+            path = self._blob_path(row["sha256"])
+            if not os.path.isfile(path):
+                # Removed from under us (a cleared folder, say): forget it and fetch it again
+                conn.execute("DELETE FROM urls WHERE sha256 = ?", (row["sha256"],))
+                conn.execute("DELETE FROM blobs WHERE sha256 = ?", (row["sha256"],))
+                conn.commit()
+                return None
+            conn.execute("UPDATE blobs SET last_used = ? WHERE sha256 = ?", (_now(), row["sha256"]))
+            conn.commit()
+            return CachedImage(path, row["sha256"], row["content_type"])
+        finally:
+            conn.close()
+
+    def put(self, url: str, content: bytes, content_type: Optional[str] = None) -> CachedImage:
+        """Store an image fetched from url and return where it is. Storing content that is
+           already cached under another URL only records the new URL."""
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(sha256)
+        if not os.path.isfile(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as blob_file:
+                blob_file.write(content)
+            os.replace(temp_path, path)
+        self._record(url, sha256, len(content), content_type)
+        return CachedImage(path, sha256, content_type)
+
+    def put_file(self, url: str, source_path: str, content_type: Optional[str] = None) -> CachedImage:
+        """Store an image that has already been downloaded to source_path (which is left as is)."""
+        sha = hashlib.sha256()
+        with open(source_path, "rb") as source_file:
+            while chunk := source_file.read(1024 * 64):
+                sha.update(chunk)
+        sha256 = sha.hexdigest()
+        path = self._blob_path(sha256)
+        if not os.path.isfile(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+        self._record(url, sha256, os.path.getsize(path), content_type)
+        return CachedImage(path, sha256, content_type)
+
+    def _record(self, url: str, sha256: str, size: int, content_type: Optional[str]) -> None:
+        now = _now()
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                INSERT INTO blobs (sha256, size, content_type, last_used) VALUES (?, ?, ?, ?)
+                ON CONFLICT(sha256) DO UPDATE SET last_used=excluded.last_used,
+                    content_type=COALESCE(excluded.content_type, blobs.content_type)
+                """,
+                (sha256, size, content_type, now),
+            )
+            conn.execute(
+                """
+                INSERT INTO urls (url, sha256, fetched_at) VALUES (?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET sha256=excluded.sha256, fetched_at=excluded.fetched_at
+                """,
+                (canonical_url(url), sha256, now),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self.evict()
+
+    def size(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        finally:
+            conn.close()
+
+    def evict(self) -> int:
+        """Delete the least recently used images until the cache fits its budget. Returns how
+           many were deleted."""
+        conn = self._connect()
+        removed = 0
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            for row in conn.execute("SELECT sha256, size FROM blobs ORDER BY last_used ASC").fetchall():
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self._blob_path(row["sha256"]))
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue  # In use on Windows, most likely; try the next one
+                conn.execute("DELETE FROM urls WHERE sha256 = ?", (row["sha256"],))
+                conn.execute("DELETE FROM blobs WHERE sha256 = ?", (row["sha256"],))
+                total -= row["size"]
+                removed += 1
+            conn.commit()
+        finally:
+            conn.close()
+        return removed
@@ -5,7 +5,8 @@ Extracted from artwork_uploader.py to reduce file size and improve
 maintainability.
 """
 
-from typing import Literal
+import io
+from typing import Literal, Optional
 from PIL import Image
 
 
@@ -30,6 +31,20 @@ class ImageService:
         with Image.open(image_path) as img:
             width, height = img.size
 
+        return ImageService.orientation(width, height)
+
+    @staticmethod
+    def orientation(width: int, height: int) -> Literal["landscape", "portrait", "square"]:
+        """
+        The orientation of an image of the given size.
+
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+
+        Returns:
+            "landscape", "portrait", or "square"
+        """
         if width > height:
             return "landscape"
         elif width < height:
@@ -54,3 +69,21 @@ class ImageService:
         """
         with Image.open(image_path) as img:
             return img.size
+
+    @staticmethod
+    def dimensions_from_header(header: bytes) -> Optional[tuple[int, int]]:
+        """
+        Get the dimensions of an image from the first bytes of its file, without decoding it.
+
+        Args:
+            header: The start of the image file
+
+        Returns:
+            Tuple of (width, height), or None if the dimensions aren't within those bytes or the
+            bytes aren't an image
+        """
+        try:
+            with Image.open(io.BytesIO(header)) as img:
+                return img.size
+        except Exception:
+            return None
@@ -0,0 +1,161 @@
+"""
+Local record of the assets saved to the Kometa asset directory.
+
+Kometa mode used to skip an item whenever some poster.* file was already there, without knowing
+whether it was the artwork wanted, so the only way to pick up changed artwork was --force, which
+downloads everything again. This small SQLite database (one file in the config directory) holds,
+for each asset saved, a hash of where it came from (its URL, or the checksum of an uploaded file)
+and a hash of its content, with the file's size and modification time when it was saved.
+
+- An asset whose source hasn't changed is skipped, as before.
+- An asset whose source has changed is replaced, without --force. If the new download turns out
+  to be the same image, the file on disk is left alone.
+- A file the manifest doesn't know about (saved by hand, or before the manifest was on), or one
+  changed on disk since it was saved, is treated as it always was: skipped unless --force.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.constants import KOMETA_MANIFEST_PATH
+
+
+def _now() -> str:
+    """Current time as an ISO-8601 UTC string - sortable and comparable as plain text."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def source_hash(artwork: dict) -> Optional[str]:
+    """The hash of where an artwork comes from: the MD5 of its URL, or the checksum (the MD5 of
+       the content) of an uploaded file. None when there is neither."""
+    if artwork.get("url"):
+        return hashlib.md5(artwork["url"].encode("utf-8")).hexdigest()
+    return artwork.get("checksum") or None
+
+
+def file_hash(path: str) -> str:
+    """The MD5 of a file's content, the same hash uploaded files are checked with."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_CREATE_ASSETS = """
+    CREATE TABLE IF NOT EXISTS kometa_assets (
+        asset_dir     TEXT NOT NULL,
+        asset_name    TEXT NOT NULL,
+        file_name     TEXT NOT NULL,
+        source_hash   TEXT,
+        content_hash  TEXT NOT NULL,
+        size          INTEGER,
+        mtime_ns      INTEGER,
+        saved_at      TEXT,
+        PRIMARY KEY (asset_dir, asset_name)
+    )
+"""
+
+
+class KometaManifest:
+    """
+    What was saved under each asset name in each asset folder, keyed by the folder and the file
+    name without its extension (the extension can change when the artwork does). Assets are saved
+    on more than one thread, so the connection is short-lived per call and the database runs in
+    WAL mode, the same as AppliedLedger.
+    """
+
+    def __init__(self, path: str = KOMETA_MANIFEST_PATH) -> None:
+        self.path = path
+        try:
+            self._ensure_schema()
+        except sqlite3.DatabaseError as e:
+            # Lazily imported for the same reason as in AssetIndex: utils.notifications pulls in
+            # the services package, so a top-level import would cycle.
+            from utils.notifications import debug_me
+            # Nothing in the manifest is lost for good: the assets are still on disk, and are
+            # recorded again as they are replaced.
+            corrupt = f"{self.path}.corrupt-{int(time.time())}"
+            try:
+                os.rename(self.path, corrupt)
+            except OSError:
+                debug_me(f"Kometa asset manifest at '{self.path}' is unreadable ({e}) and could "
+                         f"not be moved aside; giving up on the manifest.", "KometaManifest")
+                raise
+            debug_me(f"Kometa asset manifest at '{self.path}' was unreadable ({e}); moved it to "
+                     f"'{corrupt}' and started a fresh manifest.", "KometaManifest")
+            self._ensure_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA user_version = 1")
+            conn.execute(_CREATE_ASSETS)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def entry(self, asset_dir: str, asset_name: str) -> Optional[sqlite3.Row]:
+        """The manifest row for this asset, or None."""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT * FROM kometa_assets WHERE asset_dir = ? AND asset_name = ?",
+                (os.path.normpath(asset_dir), asset_name),
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def saved_file(self, asset_dir: str, asset_name: str, existing_file: str) -> Optional[sqlite3.Row]:
+        """The manifest row for this asset when existing_file is the file it records, unchanged
+           since it was saved, or None. A file whose size or modification time differ is hashed,
+           so one that was only copied or touched is still recognised."""
+        row = self.entry(asset_dir, asset_name)
+        if row is None or row["file_name"] != os.path.basename(existing_file):
+            return None
+        stat = os.stat(existing_file)
+        if (stat.st_size, stat.st_mtime_ns) == (row["size"], row["mtime_ns"]):
+            return row
+        if file_hash(existing_file) != row["content_hash"]:
+            return None
+        self.record(asset_dir, asset_name, existing_file, row["source_hash"], row["content_hash"])
+        return self.entry(asset_dir, asset_name)
+
+    def record(self, asset_dir: str, asset_name: str, saved_file: str, source: Optional[str], content_hash: str) -> None:
+        """Note the file just saved (or kept) for this asset, with the stat it has now."""
+        stat = os.stat(saved_file)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO kometa_assets
+                    (asset_dir, asset_name, file_name, source_hash, content_hash, size, mtime_ns, saved_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (os.path.normpath(asset_dir), asset_name, os.path.basename(saved_file), source, content_hash,
+                 stat.st_size, stat.st_mtime_ns, _now()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM kometa_assets").fetchone()[0]
+        finally:
+            conn.close()
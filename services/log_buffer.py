@@ -0,0 +1,64 @@
+"""
+The recent session log, kept on the server so a browser can catch up on it.
+
+The session log used to exist only as the log events sent while a browser was connected, so a
+page reloaded mid-run (which is what the browser does when it loses its connection) came back
+to an empty log. Every line logged for the web UI now also goes in a ring buffer here, numbered
+in order:
+
+- A browser asks for the lines after the last one it has when it loads, and again when a hidden
+  tab is shown, then takes new lines as they are sent.
+- Only browsers that asked are sent new lines, so a hidden tab isn't sent lines nobody sees. It
+  catches up when it is shown again.
+- The buffer keeps the same number of lines the browser's log does, so it stays the same size
+  however long the app runs.
+"""
+
+import itertools
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from core.constants import LOG_BUFFER_LINES
+
+
+class LogBuffer:
+    """
+    The last lines logged, each with the sequence number it was logged under and who it was for.
+    """
+
+    def __init__(self, max_lines: int = LOG_BUFFER_LINES) -> None:
+        self._lines: deque = deque(maxlen=max(int(max_lines), 1))
+        self._sequence = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def in_order(self) -> threading.RLock:
+        """Held while a line is numbered and handed on to be sent, so that lines logged on
+           several threads at once are still queued for the browser in the order of their numbers."""
+        return self._lock
+
+    def append(self, message: str, instance_id: Optional[str] = None, broadcast: bool = False) -> int:
+        """Keep a line, and return its sequence number."""
+        with self._lock:
+            seq = next(self._sequence)
+            self._lines.append({"seq": seq, "message": message, "instance_id": instance_id, "broadcast": broadcast})
+            return seq
+
+    def since(self, after: int = 0, instance_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The lines after sequence number `after` that were for this browser or for every browser, oldest first."""
+        with self._lock:
+            return [{"seq": line["seq"], "message": line["message"]} for line in self._lines
+                    if line["seq"] > after and (line["broadcast"] or line["instance_id"] == instance_id)]
+
+
+_shared: Optional[LogBuffer] = None
+_shared_lock = threading.Lock()
+
+
+def shared_log_buffer() -> LogBuffer:
+    """The buffer every line logged for the web UI in this process goes in."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = LogBuffer()
+        return _shared
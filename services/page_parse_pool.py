@@ -0,0 +1,96 @@
+"""
+Parses ThePosterDB user pages in other processes during a large crawl.
+
+A user crawl fetches and parses one page of 24 uploads at a time, and for a prolific user the
+BeautifulSoup parse of each page costs as much as fetching it - all of it on one core, holding
+the GIL the web server needs too. With tpdb_parse_workers set, the crawl hands pages to this pool
+instead:
+
+- Pages are fetched a few at a time on threads, and each page's raw bytes go to a worker process
+  to parse. Only the page's poster records come back (see poster_records), never a soup.
+- The crawl takes the results in page order, so filtering, the asset index and the early stop at
+  the first empty (or already indexed) page behave exactly as they do without the pool. It keeps
+  only as many pages in flight as there are workers, so stopping early fetches at most that many
+  pages more than it needed.
+- Parsing the same bytes gives the same records, whichever process parses them.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _parse(page: bytes) -> List[Dict[str, Any]]:
+    # Imported here: the scrapers import the services package, which imports this module
+    from scrapers.theposterdb_scraper import parse_user_page
+    return parse_user_page(page)
+
+
+class PageParsePool:
+    """
+    Worker processes that parse user pages, and the threads that fetch pages for them.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(int(workers), 1)
+        self.broken = False
+        self._processes = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._fetchers = ThreadPoolExecutor(self.workers, thread_name_prefix="page-fetch")
+
+    def parse(self, page: bytes) -> "Future[List[Dict[str, Any]]]":
+        """Parse a page's raw bytes in a worker process."""
+        try:
+            return self._processes.submit(_parse, page)
+        except BrokenProcessPool:
+            self.broken = True
+            raise
+
+    def parse_all(self, pages: Iterable[bytes]) -> List[List[Dict[str, Any]]]:
+        """Parse every page, and return their records in the order the pages were given."""
+        return [future.result() for future in [self.parse(page) for page in pages]]
+
+    def fetch_and_parse(self, url: str) -> "Future[List[Dict[str, Any]]]":
+        """Fetch a page on a thread and parse it in a worker process."""
+        return self._fetchers.submit(self._fetch_and_parse, url)
+
+    def _fetch_and_parse(self, url: str) -> List[Dict[str, Any]]:
+        from utils import soup_utils
+        try:
+            return self.parse(soup_utils.fetch_page(url)).result()
+        except BrokenProcessPool:
+            # A worker process died: this page fails, and the next crawl gets a new pool
+            self.broken = True
+            raise
+
+    def shutdown(self) -> None:
+        self._fetchers.shutdown(wait=False, cancel_futures=True)
+        self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+_shared: Optional[PageParsePool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_page_parse_pool(workers: int) -> Optional[PageParsePool]:
+    """
+    The pool every crawl in this process shares, so its worker processes are started once rather
+    than for every crawl. Replaced when tpdb_parse_workers changes or a worker process has died.
+
+    Returns:
+        The pool, or None to parse in the crawl thread: when workers is 0, or when this process
+        can't start processes of its own (the run worker process is a daemon process).
+    """
+    global _shared
+    workers = int(workers or 0)
+    if workers < 1 or multiprocessing.current_process().daemon:
+        return None
+    with _shared_lock:
+        if _shared is None or _shared.broken or _shared.workers != workers:
+            # A replaced pool that isn't broken is left to finish the pages a running crawl has
+            # in flight on it, and its processes exit once nothing refers to it
+            if _shared is not None and _shared.broken:
+                _shared.shutdown()
+            _shared = PageParsePool(workers)
+        return _shared
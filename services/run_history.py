@@ -29,9 +29,8 @@ _write_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
 class RunHistory:
     """
     Append-only log of runs, capped by both count and age so it cannot grow without
-    limit. Readers and writers each open the file for the duration of the call, matching
-    the short-lived-connection approach used by AssetIndex; writes are serialized per path
-    so two runs finishing at once can't clobber each other.
+    limit. Readers and writers each open the file for the duration of the call; writes are
+    serialized per path so two runs finishing at once can't clobber each other.
     """
 
     def __init__(
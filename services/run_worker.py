@@ -0,0 +1,272 @@
+"""
+Runs scrapes and bulk imports in a worker process, away from the web server.
+
+The web server (Flask-SocketIO in threading mode) shares its process with everything a run
+does, and the CPU-heavy parts of a run - parsing scraped pages, building Plex requests - hold
+the GIL long enough to make the web UI, socket events and the webhook endpoint lag. With
+use_worker_process on, the web process hands each run to a single worker process instead:
+
+- A run is sent over a local queue and the web process waits for it to finish, so the bulk
+  import queue and its single-file guarantee work as before.
+- Everything the run would have sent to the browser (log lines, status, progress bars, scrape
+  state) is sent back over a second queue and emitted from the web process, unchanged. Log lines
+  go in the web process's log buffer on the way, so a browser can catch up on them there.
+- The Stop button is passed on to the worker.
+- If the worker process dies, the runs waiting on it fail and the next run starts a new one.
+- Webhook imports are applied in the worker too. Plex writes are scheduled by each process's own
+  write executor, so this keeps webhook applies in the same executor as the runs they have to go
+  ahead of, and never writing an item at the same time as one of those runs.
+
+ZIP uploads, folders picked on the upload tab and the watched folder still run in the web
+process, where their files are, and so write to Plex through the web process's executor: one of
+them and a run in the worker can write at the same time, and to the same item.
+"""
+
+import itertools
+import multiprocessing
+import queue
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from core import globals
+from services.log_buffer import shared_log_buffer
+from services.web_event_bus import send_to_browser, shared_web_event_bus
+
+# What the worker's scrape state looks like before it has sent any
+_IDLE_STATE = {"scrapes_running": 0, "scrape_type": "stopped", "main_bar": {}, "bulk_bar": {}}
+
+
+class _QueueSocket:
+    """Stands in for the web socket in the worker process: notify_web emits to this, and the
+       event goes back to the web process along with the worker's scrape state."""
+
+    def __init__(self, events: Any) -> None:
+        self.events = events
+
+    def emit(self, event: str, data: Dict[str, Any], to: Optional[str] = None) -> None:
+        state = {
+            "scrapes_running": globals.scrapes_running,
+            "scrape_type": globals.scrape_type,
+            "main_bar": dict(globals.main_bar),
+            "bulk_bar": dict(globals.bulk_bar),
+        }
+        self.events.put(("emit", event, data, state, to))
+
+
+def _instance(fields: Tuple[Optional[str], str, bool]):
+    from models.instance import Instance
+    instance_id, mode, broadcast = fields
+    return Instance(instance_id, mode, broadcast=broadcast)
+
+
+def _run_task(events: Any, task_id: int, kind: str, instance_fields: Tuple, args: Tuple) -> None:
+    import artwork_uploader
+    error = None
+    try:
+        instance = _instance(instance_fields)
+        if kind == "scrape":
+            artwork_uploader.process_scrape_url_from_web(instance, *args)
+        elif kind == "bulk":
+            artwork_uploader.run_bulk_import(instance, *args)
+        elif kind == "webhook":
+            globals.webhook_service.enqueue(*args)  # Queued on the worker's own threads: returns at once
+        else:
+            error = f"Unknown run type '{kind}'"
+    except Exception as e:
+        error = str(e)
+    events.put(("done", task_id, error))
+
+
+def _plex_settings(config: Any) -> Tuple[Any, ...]:
+    """The settings the worker's Plex connection was made with."""
+    return config.base_url, config.token, config.tv_library, config.movie_library
+
+
+def _follow_plex_settings(previous: Tuple[Any, ...]) -> None:
+    """Bring the worker's Plex connection in line with settings changed since `previous`: connect
+       again for a new server or token, or just pick the libraries again for new libraries."""
+    from core.exceptions import PlexConnectorException
+    from utils.notifications import debug_me
+
+    base_url, token, tv_library, movie_library = _plex_settings(globals.config)
+    try:
+        if (base_url, token) != previous[:2]:
+            globals.plex.reconnect(globals.config)
+            return
+        if tv_library != previous[2]:
+            globals.plex.set_tv_libraries(tv_library)
+        if movie_library != previous[3]:
+            globals.plex.set_movie_libraries(movie_library)
+    except PlexConnectorException as e:
+        # As at start-up: the run resolves the libraries again before it starts
+        debug_me(f"Worker process could not connect to the Plex libraries with the new settings: {e}")
+
+
+def worker_main(tasks: Any, events: Any, config_path: str, debug: bool, docker: bool) -> None:
+    """Entry point of the worker process: connect to Plex, then run what the web process sends
+       until it sends None. Each run gets its own thread, as it would in the web process."""
+    from core.config import Config
+    from core.exceptions import PlexConnectorException
+    from plex.plex_connector import PlexConnector
+    from services.webhook_service import WebhookService
+    from utils.notifications import debug_me
+
+    globals.debug = debug
+    globals.docker = docker
+    globals.web_socket = _QueueSocket(events)
+    globals.config = Config(config_path)
+    globals.config.load()
+    globals.webhook_service = WebhookService()
+    globals.plex = PlexConnector(globals.config.base_url, globals.config.token)
+    try:
+        globals.plex.set_tv_libraries(globals.config.tv_library)
+        globals.plex.set_movie_libraries(globals.config.movie_library)
+    except PlexConnectorException as e:
+        # A run resolves the libraries again before it starts, and says so if it can't
+        debug_me(f"Worker process could not connect to the Plex libraries yet: {e}")
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        if task[0] == "stop":
+            if globals.scrapes_running:
+                globals.cancel_scrape = True
+            continue
+        _, task_id, kind, instance_fields, args = task
+        # Settings saved in the web UI since the last run apply to this one, Plex ones included
+        previous = _plex_settings(globals.config)
+        try:
+            globals.config.load()
+        except Exception as e:
+            debug_me(f"Worker process could not reload the config, using the previous one: {e}")
+        else:
+            if _plex_settings(globals.config) != previous:
+                _follow_plex_settings(previous)
+        threading.Thread(target=_run_task, args=(events, task_id, kind, instance_fields, args), daemon=True).start()
+
+
+class RunWorker:
+    """
+    The web process's side of the worker: starts the process, sends it runs, and forwards what
+    it sends back.
+    """
+
+    def __init__(self, config_path: str) -> None:
+        self.config_path = config_path
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._tasks = None
+        self._events = None
+        self._forwarder: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._state: Dict[str, Any] = dict(_IDLE_STATE)
+
+    def start(self) -> None:
+        """Start the worker process, if it isn't already running."""
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                return
+            self._tasks = self._context.Queue()
+            self._events = self._context.Queue()
+            self._process = self._context.Process(
+                target=worker_main,
+                args=(self._tasks, self._events, self.config_path, globals.debug, globals.docker),
+                name="run-worker",
+                daemon=True,
+            )
+            self._process.start()
+            self._state = dict(_IDLE_STATE)
+            self._forwarder = threading.Thread(target=self._forward, args=(self._process, self._events), daemon=True)
+            self._forwarder.start()
+
+    def run(self, kind: str, instance: Any, *args: Any) -> Optional[str]:
+        """
+        Run a scrape ("scrape", url) or a bulk import ("bulk", contents, filename, schedule_id,
+        notify) in the worker process, and wait for it to finish. A webhook import ("webhook",
+        event) is only queued there, so that waits no longer than it takes to queue it.
+
+        Returns:
+            None if the run finished, or why it didn't
+        """
+        self.start()
+        done = threading.Event()
+        with self._lock:
+            task_id = next(self._ids)
+            self._pending[task_id] = {"done": done, "error": None, "process": self._process}
+            self._tasks.put(("run", task_id, kind, (instance.id, instance.mode, instance.broadcast), args))
+        done.wait()
+        with self._lock:
+            return self._pending.pop(task_id)["error"]
+
+    def running(self) -> bool:
+        """Whether the worker has a scrape in flight, as of the last event it sent."""
+        return self._state.get("scrapes_running", 0) > 0
+
+    def scrape_state(self) -> Dict[str, Any]:
+        """The worker's scrape state as of the last event it sent, for a browser that has just
+           connected and needs to catch up."""
+        return dict(self._state)
+
+    def stop_scrape(self) -> None:
+        """Pass the Stop button on to the worker."""
+        if self._tasks is not None:
+            self._tasks.put(("stop",))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                self._tasks.put(None)
+                self._process.join(timeout=5)
+
+    def _forward(self, process: Any, events: Any) -> None:
+        """Emit what the worker sends, and release each run it finishes, until it exits."""
+        while True:
+            try:
+                message = events.get(timeout=1)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                self._release_all(process)
+                return
+            except (EOFError, OSError):
+                self._release_all(process)
+                return
+
+            if message[0] == "emit":
+                _, event, data, state, room = message
+                self._state = state
+                if event == "log_update":
+                    # Numbered again in this process's log buffer, which is the one browsers catch up from
+                    buffer = shared_log_buffer()
+                    with buffer.in_order():
+                        for line in data.get("lines", []):
+                            line["seq"] = buffer.append(line["message"], data.get("instance_id"), data.get("broadcast"))
+                        # Lines this process logged before them are sent first, not with the next frame
+                        shared_web_event_bus().flush()
+                        send_to_browser(event, data, room)
+                else:
+                    send_to_browser(event, data, room)
+            elif message[0] == "done":
+                _, task_id, error = message
+                with self._lock:
+                    pending = self._pending.get(task_id)
+                    if pending:
+                        pending["error"] = error
+                        pending["done"].set()
+
+    def _release_all(self, process: Any) -> None:
+        """Fail the runs a dead worker process had, and tell the browser nothing is running."""
+        from models.instance import Instance
+        from utils.notifications import notify_web
+        with self._lock:
+            was_running = self.running()
+            self._state = dict(_IDLE_STATE)
+            for pending in self._pending.values():
+                if pending["process"] is process:
+                    pending["error"] = "The worker process stopped unexpectedly"
+                    pending["done"].set()
+        if was_running and globals.web_socket is not None:
+            notify_web(Instance(broadcast=True), "scrape_state", {"running": False, "type": "stopped"})
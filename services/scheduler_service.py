@@ -5,12 +5,49 @@ Extracted from artwork_uploader.py to reduce file size and improve
 maintainability.
 """
 
-import threading, schedule, time
+import heapq, itertools, threading
 from datetime import datetime, timedelta
 from typing import Dict, Callable, List, Optional, Set, Tuple
 from models.bulk_schedule import BulkSchedule
+from core.constants import SCHEDULER_MAX_SLEEP
 from core.enums import IntervalUnit
 
+
+class ScheduledJob:
+    """One schedule's timing: a daily time of day, or a repeating interval.
+
+    next_run and last_run are naive local times, as the schedules in config.json are."""
+
+    def __init__(self, job_func: Callable[[], None], time_of_day: Optional[Tuple[int, int, int]] = None,
+                 interval: Optional[timedelta] = None) -> None:
+        self.job_func = job_func
+        self.time_of_day = time_of_day
+        self.interval = interval
+        self.next_run: Optional[datetime] = None
+        self.last_run: Optional[datetime] = None
+
+    def following(self, now: datetime) -> datetime:
+        """When the job runs next after now: the next occurrence of its time of day, or one interval on."""
+        if self.time_of_day:
+            hour, minute, second = self.time_of_day
+            next_run = now.replace(hour=hour, minute=minute, second=second, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            return next_run
+        return now + self.interval
+
+
+def parse_time_of_day(value: str) -> Tuple[int, int, int]:
+    """Parse a daily schedule's "HH:MM" (or "HH:MM:SS") into hour, minute and second."""
+    for time_format in ("%H:%M", "%H:%M:%S"):
+        try:
+            parsed = datetime.strptime(value, time_format)
+            return parsed.hour, parsed.minute, parsed.second
+        except (ValueError, TypeError):
+            continue
+    raise ValueError(f"'{value}' is not a valid time of day, expected HH:MM")
+
+
 class SchedulerService:
     """Handles scheduling of bulk import jobs.
 
@@ -19,38 +56,50 @@ class SchedulerService:
     schedule is tracked by its own id rather than by filename, so a file
     can have any number of schedules and renaming a file does not require
     tearing down and recreating its jobs.
+
+    The jobs are kept in a heap ordered by their next run, and the scheduler
+    thread sleeps until the earliest of them is due rather than checking on a
+    fixed interval. Adding or removing a schedule wakes it to look again.
     """
 
-    def __init__(self, check_interval: int = 1) -> None:
+    def __init__(self, max_sleep: float = SCHEDULER_MAX_SLEEP,
+                 clock: Optional[Callable[[], datetime]] = None) -> None:
         """
         Initialize the scheduler service.
 
         Args:
-            check_interval: Seconds between scheduler checks (default: 1)
+            max_sleep: Longest the scheduler thread sleeps before checking the clock
+                again, whatever is scheduled, so a change to the system clock (or the
+                machine waking from sleep) is noticed
+            clock: Returns the current local time (default: datetime.now)
         """
-        self.check_interval = check_interval
+        self.max_sleep = max_sleep
+        self.clock = clock or (lambda: datetime.now())
         self.scheduler_thread: Optional[threading.Thread] = None
-        self.scheduled_jobs: Dict[str, schedule.Job] = {}
+        self.scheduled_jobs: Dict[str, ScheduledJob] = {}
         # job_id -> {"file": str, "time": str} or {"file": str, "interval_value": int, "interval_unit": str}
         self.schedule_meta: Dict[str, Dict] = {}
         self.is_running = False
         self._running_lock = threading.Lock()
         self._running_files: Set[str] = set()
+        # (next_run, sequence, job_id). An entry is only current while _entries holds it for
+        # its job; removing or rescheduling a job leaves the old entry to be skipped when it
+        # reaches the top, rather than searching the heap for it.
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._entries: Dict[str, Tuple[datetime, int, str]] = {}
+        self._sequence = itertools.count()
+        self._changed = threading.Condition()
+        self._version = 0
 
     def add_schedule(self, sched: BulkSchedule, callback: Callable[[str], None]) -> str:
         """
         Add a new scheduled job, either a daily time or a repeating interval.
 
         Args:
-            filename: Name of the bulk file to process
+            sched: The schedule: its id, the bulk file to process, and either a daily
+                time (e.g. "14:30") or an interval_value/interval_unit ("hours" or
+                "days"). A restored interval schedule keeps its next_run.
             callback: Function to call with filename when job runs
-            schedule_id: Reuse this id instead of generating one (used when
-                restoring schedules from config on load)
-            time: Time of day to run daily (e.g., "14:30"). Mutually
-                exclusive with interval_value/interval_unit.
-            interval_value: Repeat every this many hours/days. Requires
-                interval_unit.
-            interval_unit: "hours" or "days".
 
         Returns:
             Unique job ID for this schedule
@@ -69,8 +118,11 @@ class SchedulerService:
             if meta:
                 callback(meta["file"])
 
+        now = self.clock()
+
         if sched.time:
-            job = schedule.every().day.at(sched.time).do(run_job)
+            job = ScheduledJob(run_job, time_of_day=parse_time_of_day(sched.time))
+            job.next_run = job.following(now)
             sched.next_run = job.next_run.isoformat()
             meta = {
                 "file": sched.file,
@@ -81,15 +133,15 @@ class SchedulerService:
             }
 
         elif sched.interval_value and sched.interval_unit in [u.value for u in IntervalUnit]:
-            interval_job = getattr(schedule.every(sched.interval_value), sched.interval_unit)
-            job = interval_job.do(run_job)
+            job = ScheduledJob(run_job, interval=timedelta(**{sched.interval_unit: sched.interval_value}))
+            job.next_run = job.following(now)
             if sched.next_run:
                 try:
                     job.next_run = datetime.fromisoformat(sched.next_run)
                 except (ValueError, TypeError):
                     pass
             else:
-                sched.next_run = job.next_run
+                sched.next_run = job.next_run.isoformat()
             meta = {
                 "file": sched.file,
                 "interval_value": sched.interval_value,
@@ -105,8 +157,11 @@ class SchedulerService:
         if sched.last_run:
             job.last_run = datetime.fromisoformat(sched.last_run)
 
-        self.scheduled_jobs[job_id] = job
-        self.schedule_meta[job_id] = meta
+        with self._changed:
+            self.scheduled_jobs[job_id] = job
+            self.schedule_meta[job_id] = meta
+            self._push(job_id, job)
+            self._wake()
 
         return job_id
 
@@ -120,13 +175,14 @@ class SchedulerService:
         Returns:
             True if job was removed, False if not found
         """
-        if job_id not in self.scheduled_jobs:
-            return False
-
-        schedule.cancel_job(self.scheduled_jobs[job_id])
+        with self._changed:
+            if job_id not in self.scheduled_jobs:
+                return False
 
-        del self.scheduled_jobs[job_id]
-        self.schedule_meta.pop(job_id, None)
+            del self.scheduled_jobs[job_id]
+            self.schedule_meta.pop(job_id, None)
+            self._entries.pop(job_id, None)
+            self._wake()
 
         return True
 
@@ -181,21 +237,80 @@ class SchedulerService:
 
     def stop(self) -> None:
         """Stop the scheduler thread."""
-        self.is_running = False
+        with self._changed:
+            self.is_running = False
+            self._wake()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=2)
 
+    def _push(self, job_id: str, job: ScheduledJob) -> None:
+        """Put a job's next run on the heap. Called with the condition held."""
+        entry = (job.next_run, next(self._sequence), job_id)
+        self._entries[job_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _peek(self) -> Optional[Tuple[datetime, int, str]]:
+        """The earliest current entry, dropping any stale ones above it. Called with the condition held."""
+        while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0]:
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    def _wake(self) -> None:
+        """Tell the scheduler thread the heap changed. Called with the condition held."""
+        self._version += 1
+        self._changed.notify_all()
+
+    def run_pending(self) -> Optional[float]:
+        """
+        Run every job that is due and schedule its next run.
+
+        Returns:
+            Seconds until the next job is due, or None if nothing is scheduled
+        """
+        due: List[ScheduledJob] = []
+        with self._changed:
+            now = self.clock()
+            while (entry := self._peek()) is not None and entry[0] <= now:
+                heapq.heappop(self._heap)
+                job = self.scheduled_jobs[entry[2]]
+                job.last_run = now
+                job.next_run = job.following(now)
+                self._push(entry[2], job)
+                due.append(job)
+
+        # Outside the condition: a callback is free to add or remove schedules
+        for job in due:
+            try:
+                job.job_func()
+            except Exception as e:
+                # Lazily imported: utils.notifications pulls in the services package
+                from utils.notifications import debug_me
+                debug_me(f"Scheduled job failed: {e}")
+
+        with self._changed:
+            entry = self._peek()
+            if entry is None:
+                return None
+            return max((entry[0] - self.clock()).total_seconds(), 0.0)
+
     def _run_scheduler(self) -> None:
         """Internal method that runs in the scheduler thread."""
         while self.is_running:
-            schedule.run_pending()
-            time.sleep(self.check_interval)
+            with self._changed:
+                seen = self._version
+            delay = self.run_pending()
+            timeout = self.max_sleep if delay is None else min(delay, self.max_sleep)
+            with self._changed:
+                self._changed.wait_for(lambda: self._version != seen or not self.is_running, timeout=timeout)
 
     def clear_all_schedules(self) -> None:
         """Clear all scheduled jobs."""
-        schedule.clear()
-        self.scheduled_jobs.clear()
-        self.schedule_meta.clear()
+        with self._changed:
+            self.scheduled_jobs.clear()
+            self.schedule_meta.clear()
+            self._heap.clear()
+            self._entries.clear()
+            self._wake()
 
     def get_all_job_ids(self) -> list[str]:
         """
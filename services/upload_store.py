@@ -0,0 +1,183 @@
+"""
+Files being uploaded from the browser, written to disk as they arrive.
+
+Uploads used to come in over socket.io as base64 chunks of half a megabyte: a third bigger than
+the file on the wire, each one decoded on the server thread and each one starting a new timer
+thread to notice the browser going away. They now come over HTTP as raw bytes instead:
+
+- The browser sends the file in large slices, each with a Content-Range saying where it goes.
+  Each slice is streamed straight into the upload's temporary file, a buffer at a time.
+- A slice that doesn't start where the file has got to is refused with the number of bytes the
+  server has, so a browser that lost its connection carries on from there rather than starting
+  again.
+- One reaper thread looks after every upload, and drops (and deletes) any that has had nothing
+  for UPLOAD_TIMEOUT seconds.
+"""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+from core.constants import UPLOAD_BUFFER_SIZE, UPLOAD_PROGRESS_SECONDS, UPLOAD_TIMEOUT
+
+# Upload ids are made up by the browser and end up in a URL, so only a plain token is accepted
+UPLOAD_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+@dataclass
+class PartialUpload:
+    """An upload the browser is part-way through sending, and the temporary file it goes in."""
+
+    upload_id: str
+    file_name: str
+    total: int
+    instance_id: Optional[str]
+    path: str
+    received: int = 0
+    started: float = field(default_factory=time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
+    writing: bool = False
+
+    @property
+    def complete(self) -> bool:
+        return self.received >= self.total
+
+
+class UploadStore:
+    """
+    The uploads in progress in this process, by the id the browser gave them.
+    """
+
+    def __init__(
+        self,
+        timeout: float = UPLOAD_TIMEOUT,
+        on_expired: Optional[Callable[[PartialUpload], None]] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.on_expired = on_expired
+        self._uploads: Dict[str, PartialUpload] = {}
+        self._changed = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+
+    def start(self, upload_id: str, file_name: str, total: int, instance_id: Optional[str] = None) -> Tuple[PartialUpload, bool]:
+        """The upload with this id, and whether it was only just started (which creates its file)."""
+        with self._changed:
+            upload = self._uploads.get(upload_id)
+            if upload is not None:
+                return upload, False
+            handle, path = tempfile.mkstemp(suffix=".upload")
+            os.close(handle)
+            upload = PartialUpload(upload_id, file_name, int(total), instance_id, path)
+            self._uploads[upload_id] = upload
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper = threading.Thread(target=self._reap, name="upload-reaper", daemon=True)
+                self._reaper.start()
+            return upload, True
+
+    def write(
+        self,
+        upload: PartialUpload,
+        start: int,
+        stream: BinaryIO,
+        on_progress: Optional[Callable[[PartialUpload], None]] = None,
+    ) -> int:
+        """
+        Write the bytes in a stream to an upload's file from offset `start`, and return how many
+        bytes of the file have now been received. Nothing is written when `start` isn't where the
+        file has got to, so the caller can tell the browser where to carry on from.
+
+        on_progress is called at most every UPLOAD_PROGRESS_SECONDS while the bytes come in.
+        """
+        with self._changed:
+            if upload.writing or start != upload.received or self._uploads.get(upload.upload_id) is not upload:
+                return upload.received
+            upload.writing = True
+        reported = time.monotonic()
+        try:
+            with open(upload.path, "r+b") as upload_file:
+                upload_file.seek(start)
+                while upload.received < upload.total:
+                    buffer = stream.read(min(UPLOAD_BUFFER_SIZE, upload.total - upload.received))
+                    if not buffer:
+                        break
+                    upload_file.write(buffer)
+                    upload.received += len(buffer)
+                    upload.last_activity = time.monotonic()
+                    if on_progress and upload.last_activity - reported >= UPLOAD_PROGRESS_SECONDS:
+                        reported = upload.last_activity
+                        on_progress(upload)
+        finally:
+            with self._changed:
+                upload.writing = False
+                upload.last_activity = time.monotonic()
+        return upload.received
+
+    def status(self, upload_id: str) -> Optional[PartialUpload]:
+        """The upload with this id, if it is still in progress."""
+        with self._changed:
+            return self._uploads.get(upload_id)
+
+    def take(self, upload_id: str) -> Optional[PartialUpload]:
+        """Stop tracking an upload and hand its file over to the caller, which deletes it when done."""
+        with self._changed:
+            upload = self._uploads.pop(upload_id, None)
+            self._changed.notify_all()  # The reaper stops when there is nothing left to look after
+            return upload
+
+    def discard(self, upload_id: str) -> Optional[PartialUpload]:
+        """Stop tracking an upload and delete its file."""
+        upload = self.take(upload_id)
+        if upload is not None:
+            _remove(upload.path)
+        return upload
+
+    def _reap(self) -> None:
+        while True:
+            with self._changed:
+                if not self._uploads:
+                    self._reaper = None
+                    return
+                now = time.monotonic()
+                expired = [upload for upload in self._uploads.values()
+                           if not upload.writing and now - upload.last_activity >= self.timeout]
+                for upload in expired:
+                    del self._uploads[upload.upload_id]
+                if not expired:
+                    oldest = min(upload.last_activity for upload in self._uploads.values())
+                    self._changed.wait(timeout=max(oldest + self.timeout - now, 0.05))
+                    continue
+            for upload in expired:
+                _remove(upload.path)
+                if self.on_expired:
+                    try:
+                        self.on_expired(upload)
+                    except Exception as e:
+                        # Lazily imported: utils.notifications pulls in the services package
+                        from utils.notifications import debug_me
+                        debug_me(f"Error cleaning up after the upload of '{upload.file_name}' timed out: {e}")
+
+
+def _remove(path: str) -> None:
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except OSError as e:
+        from utils.notifications import debug_me
+        debug_me(f"Error removing temp upload file '{path}': {e}")
+
+
+_shared: Optional[UploadStore] = None
+_shared_lock = threading.Lock()
+
+
+def shared_upload_store() -> UploadStore:
+    """The store every upload from the browser to this process goes through."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = UploadStore()
+        return _shared
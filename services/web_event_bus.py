@@ -0,0 +1,146 @@
+"""
+Sends events to the browser, coalescing the chatty ones.
+
+Every log line, progress tick and upload chunk used to be its own socket.io event, so a run of a
+few thousand assets sent the browser tens of thousands of them, each one taking a turn on the
+server thread. notify_web now sends through this bus:
+
+- Progress bar updates are kept per bar and sent at most once a frame, with the latest percent
+  and message. A bar reaching 100% is sent straight away.
+- Log lines are collected and sent once a frame as one log_update carrying every line, in order,
+  with its sequence number in the log buffer. They only go to browsers showing the log (see
+  LogBuffer), which catch up from the buffer when they come back.
+- A status update replaces any status still waiting to be sent, as it would replace it on screen.
+- Everything else is sent straight away, after whatever is waiting, so the browser sees events in
+  the order they were sent.
+
+Updates for different browsers (or for a broadcast) are never merged into each other, and each
+goes only to the browser it is for: every page joins a room for its instance id when it connects
+(see instance_room). Only a broadcast goes to every page.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core import globals
+from core.constants import WEB_EVENT_FRAME_SECONDS, LOG_ROOM
+
+LOG_EVENT = "log_update"
+STATUS_EVENT = "status_update"
+PROGRESS_EVENT = "progress_bar"
+
+
+def instance_room(instance_id: Any) -> str:
+    """The Socket.IO room of the pages with this instance id."""
+    return f"instance:{instance_id}"
+
+
+def log_room(instance_id: Any, broadcast: bool) -> str:
+    """The room log lines for this instance id go to: the pages with that id that are showing
+       the log, or every page showing it for a line logged for everyone."""
+    return LOG_ROOM if broadcast or instance_id is None else f"{LOG_ROOM}:{instance_id}"
+
+
+def send_to_browser(event: str, data: Dict[str, Any], room: Optional[str] = None) -> None:
+    """Emit an event on the web socket, to a room or (without one) to every page."""
+    if globals.web_socket is None:
+        return
+    try:
+        if room:
+            globals.web_socket.emit(event, data, to=room)
+        else:
+            globals.web_socket.emit(event, data)
+    except Exception as e:
+        from utils.notifications import debug_me
+        debug_me(f"Could not send '{event}' to the browser: {e}")
+
+
+def _audience(data: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    return data.get("instance_id"), data.get("instance_mode"), data.get("broadcast")
+
+
+class WebEventBus:
+    """
+    The events waiting for the next frame, and the thread that sends them.
+    """
+
+    def __init__(self, frame_seconds: float = WEB_EVENT_FRAME_SECONDS) -> None:
+        self.frame_seconds = frame_seconds
+        self._changed = threading.Condition()
+        self._logs: Dict[Tuple, List[Dict[str, Any]]] = {}
+        self._statuses: Dict[Tuple, Tuple[Dict[str, Any], Optional[str]]] = {}
+        self._progress: Dict[Tuple, Tuple[Dict[str, Any], Optional[str]]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def emit(self, event: str, data: Dict[str, Any], room: Optional[str] = None) -> None:
+        """Send an event to a room (or, without one, to every page), now or with the next frame.
+           Log lines go to the log room for their instance id instead."""
+        with self._changed:
+            was_waiting = self._waiting()
+            audience = _audience(data)
+            if event == LOG_EVENT:
+                self._logs.setdefault(audience, []).append({"seq": data.get("seq"), "message": data.get("message")})
+            elif event == STATUS_EVENT:
+                self._statuses[audience] = (data, room)
+            elif event == PROGRESS_EVENT and (data.get("percent") or 0) < 100:
+                self._progress[audience + (data.get("bar_type") or "main",)] = (data, room)
+            else:
+                if event == PROGRESS_EVENT:
+                    # Finished: drop the tick it supersedes rather than send it after
+                    self._progress.pop(audience + (data.get("bar_type") or "main",), None)
+                self._flush()
+                send_to_browser(event, data, room)
+                return
+            self._start()
+            if not was_waiting:
+                self._changed.notify_all()
+
+    def flush(self) -> None:
+        """Send everything waiting for the next frame now."""
+        with self._changed:
+            self._flush()
+
+    def _waiting(self) -> bool:
+        return bool(self._logs or self._statuses or self._progress)
+
+    def _flush(self) -> None:
+        # Called with the condition held, so frames and events that aren't coalesced go out in order
+        logs, self._logs = self._logs, {}
+        statuses, self._statuses = self._statuses, {}
+        progress, self._progress = self._progress, {}
+        for (instance_id, instance_mode, broadcast), lines in logs.items():
+            send_to_browser(LOG_EVENT, {"lines": lines, "instance_id": instance_id, "instance_mode": instance_mode,
+                                        "broadcast": broadcast}, log_room(instance_id, broadcast))
+        for data, room in statuses.values():
+            send_to_browser(STATUS_EVENT, data, room)
+        for data, room in progress.values():
+            send_to_browser(PROGRESS_EVENT, data, room)
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="web-event-bus", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        with self._changed:
+            while True:
+                self._changed.wait_for(self._waiting)
+                # Let the rest of the frame's updates arrive, then send them together
+                frame_ends = time.monotonic() + self.frame_seconds
+                while (remaining := frame_ends - time.monotonic()) > 0:
+                    self._changed.wait(timeout=remaining)
+                self._flush()
+
+
+_shared: Optional[WebEventBus] = None
+_shared_lock = threading.Lock()
+
+
+def shared_web_event_bus() -> WebEventBus:
+    """The bus every event to the browser from this process goes through."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = WebEventBus()
+        return _shared
@@ -16,7 +16,7 @@ from typing import FrozenSet, List, Optional, Union
 
 from core import globals
 from core.constants import WEBHOOK_RETRY_DELAYS
-from core.enums import ScraperSource, RunType, RunTrigger, RunOutcome, WebhookSource, FileType
+from core.enums import ScraperSource, RunType, RunTrigger, RunOutcome, WebhookSource, FileType, WorkLane
 from core.exceptions import MovieNotFound, ShowNotFound
 from models.callbacks import ProcessingCallbacks
 from models.instance import Instance
@@ -151,6 +151,8 @@ class WebhookService:
         # UploadProcessor pulls in the processors -> plex chain; import it here so the services
         # package does not drag that in at start-up (mirrors the app's own lazy-import pattern).
         from processors.upload_processor import UploadProcessor
+        from plex.write_executor import shared_write_executor
+        from services.artwork_processor import conflict_keys
         outcome = RunOutcome.FAILED.value
         try:
             if artwork is None:
@@ -171,28 +173,37 @@ class WebhookService:
             # artists from its own configured list rather than from the scrape, so letting it replace
             # a locked field would re-sort artwork nobody asked it to touch.
             processor.allow_artist_updates = False
-            pending = []
-            for item in artwork:
-                try:
-                    if event.kind == "movie":
-                        results = processor.process_movie_artwork(item)
-                    else:
-                        results = processor.process_tv_artwork(item)
-                    results = results or []
-                    # A season/episode whose show is in Plex but which Plex has not scanned in yet
-                    # comes back as a "not available" result rather than an exception; treat that
-                    # the same as not-found so it retries once Plex catches up.
-                    if any("not available" in str(result).lower() for result in results):
-                        pending.append(item)
-                    else:
-                        for result in results:
-                            tally.record_result(result)
-                            _log(result)
-                except (MovieNotFound, ShowNotFound):
-                    pending.append(item)          # not in Plex yet, retry it
-                except Exception as error:
-                    tally.failed(1)
-                    _log(f"❌ Webhook | {event.label()}: {error}")
+
+            def apply() -> List[dict]:
+                pending = []
+                for item in artwork:
+                    try:
+                        if event.kind == "movie":
+                            results = processor.process_movie_artwork(item)
+                        else:
+                            results = processor.process_tv_artwork(item)
+                        results = results or []
+                        # A season/episode whose show is in Plex but which Plex has not scanned in yet
+                        # comes back as a "not available" result rather than an exception; treat that
+                        # the same as not-found so it retries once Plex catches up.
+                        if any("not available" in str(result).lower() for result in results):
+                            pending.append(item)
+                        else:
+                            for result in results:
+                                tally.record_result(result)
+                                _log(result)
+                    except (MovieNotFound, ShowNotFound):
+                        pending.append(item)          # not in Plex yet, retry it
+                    except Exception as error:
+                        tally.failed(1)
+                        _log(f"❌ Webhook | {event.label()}: {error}")
+                return pending
+
+            # A just-imported title is what somebody is waiting to see, so it goes in the webhook
+            # lane, ahead of any bulk run that is writing to Plex at the same time
+            executor = shared_write_executor()
+            processor.write_observer = executor.observe
+            pending = executor.submit(apply, keys=conflict_keys(artwork, event.kind), lane=WorkLane.WEBHOOK).result()
             if pending and attempt < len(WEBHOOK_RETRY_DELAYS):
                 delay = WEBHOOK_RETRY_DELAYS[attempt]
                 _debug(f"{event.label()} not in Plex yet, retrying in {delay}s")
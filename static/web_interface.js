@@ -16,10 +16,13 @@ let currentBrowseTargetInput = null;
 let currentDirectoryPath = "/";
 let initialConfig = ''
 
-const socket = io();
 const instanceId = getInstanceId();
+// The instance id puts this page in its own room, so it is only sent its own events and broadcasts
+const socket = io({ auth: { instance_id: instanceId } });
 const bootstrapColors = ['primary', 'secondary', 'success', 'danger', 'warning', 'info', 'light', 'dark'];
-const CHUNK_SIZE = 1024 * 512; // 512 KB per chunk for uploads
+const UPLOAD_SLICE_SIZE = 1024 * 1024 * 8; // 8 MB per request for uploads
+const UPLOAD_MAX_RETRIES = 5; // Attempts to carry on an upload after losing the connection
+const MAX_LOG_LINES = 500; // Lines kept in the session log, the same as the server keeps
 
 function initInteractiveTooltip(tooltipTriggerEl) {
     if (!tooltipTriggerEl || bootstrap.Tooltip.getInstance(tooltipTriggerEl)) return; // Already initialized
@@ -298,6 +301,7 @@ document.addEventListener("DOMContentLoaded", function () {
     toggleWebhookSettings();
     detectEnvironment();
     getScrapeState();
+    getLog();
 });
 
 // Specific event listeners
@@ -379,6 +383,7 @@ async function loadDirectory(path = "/") {
 // any ongoing process, including disabling buttons, adding scrapers, updating progress bars...
 function getScrapeState() {
     socket.on("get_scrape_state", (data) => {
+        bulkQueue(data.bulk_queue);
         if (data.type == "stopped") return;
 
         scrapeState(data.running, data.type)
@@ -405,6 +410,7 @@ function scrapeState(running, type) {
     } else if (type == "upload") {
         cancelBtnId = "upload-cancel";
         tabId = "uploader-tab";
+        btnId = "process_folder_button";
     }
     const cancelBtnElement = document.getElementById(cancelBtnId);
     const tabElement = document.getElementById(tabId).querySelector("i");
@@ -416,7 +422,7 @@ function scrapeState(running, type) {
     // Shows or hides the spinner on the appropriate tab
     // and disables or enables the file drop area
     if (running) {
-        disableElement(["scrape_url", "scrape_button", "bulk_button"], true);
+        disableElement(["scrape_url", "scrape_button", "bulk_button", "process_folder_button"], true);
         dropArea.classList.add("disabled");
 
         if (!tabElement.dataset.originalIcon) {
@@ -430,7 +436,7 @@ function scrapeState(running, type) {
             btnElement.querySelector("i").className = "spinner-border spinner-border-sm";
         }
     } else {
-        disableElement(["scrape_url", "scrape_button", "bulk_button"], false);
+        disableElement(["scrape_url", "scrape_button", "bulk_button", "process_folder_button"], false);
         dropArea.classList.remove("disabled");
 
         tabElement.className = tabElement.dataset.originalIcon || "bi bi-gear";
@@ -446,6 +452,18 @@ socket.on("scrape_state", (data) => {
     scrapeState(data.running, data.type)
 });
 
+// Bulk imports waiting for their turn, shown next to the Run button with each file's place in the queue
+function bulkQueue(jobs) {
+    const badge = document.getElementById("bulk_queue");
+    const waiting = (jobs || []).filter((job) => job.state == "waiting");
+    badge.classList.toggle("d-none", waiting.length == 0);
+    badge.textContent = waiting.length + " queued";
+    badge.title = waiting.map((job) => job.position + ". " + job.file).join("\n");
+}
+socket.on("bulk_queue", (data) => {
+    bulkQueue(data.jobs);
+});
+
 // A webhook import finishes without a scrape_state change, so it says so itself
 socket.on("run_history_updated", () => {
     loadRunHistory();
@@ -842,14 +860,51 @@ function updateLog(message, color = null) {
     entry.innerHTML = message;
     statusElement.prepend(entry);
 
-    const MAX_LOG_LINES = 500;
     while (statusElement.childElementCount > MAX_LOG_LINES) {
         statusElement.removeChild(statusElement.lastElementChild);
     }
 }
+// Sequence numbers of the log lines shown, and the highest of them. The server keeps the recent
+// log, so the page asks for what it missed when it loads or a hidden tab is shown again, and skips
+// lines it already has. Its own lines and everyone's come in separate frames, so a line can arrive
+// after one numbered above it: it is still shown, as long as it hasn't been already.
+const seenLogSeqs = new Set();
+let lastLogSeq = 0;
+
+function logLines(lines) {
+    [...lines].sort((a, b) => a.seq - b.seq).forEach((line) => {
+        if (!seenLogSeqs.has(line.seq)) {
+            seenLogSeqs.add(line.seq);
+            updateLog(line.message);
+            lastLogSeq = Math.max(lastLogSeq, line.seq);
+        }
+    });
+    // Lines older than the server keeps can't come again
+    seenLogSeqs.forEach((seq) => {
+        if (seq <= lastLogSeq - MAX_LOG_LINES) {
+            seenLogSeqs.delete(seq);
+        }
+    });
+}
+function getLog() {
+    socket.emit("get_log", { instance_id: instanceId, after: lastLogSeq });
+}
 socket.on("log_update", (data) => {
     if (validResponse(data, true)) {
-        updateLog(data.message);
+        // The server sends the lines logged since its last frame together, oldest first
+        logLines(data.lines);
+    }
+});
+socket.on("log_replay", (data) => {
+    if (validResponse(data)) {
+        logLines(data.lines);
+    }
+});
+document.addEventListener("visibilitychange", () => {
+    if (document.hidden) {
+        socket.emit("hide_log", { instance_id: instanceId });
+    } else {
+        getLog();
     }
 });
 
@@ -1682,7 +1737,8 @@ const RUN_HISTORY_TRIGGER_LABELS = {
     scheduled: "Scheduled",
     cli: "Command line",
     radarr: "Radarr",
-    sonarr: "Sonarr"
+    sonarr: "Sonarr",
+    watch: "Watched folder"
 };
 
 const RUN_HISTORY_TRIGGER_ICONS = {
@@ -1690,7 +1746,8 @@ const RUN_HISTORY_TRIGGER_ICONS = {
     scheduled: "alarm",
     cli: "code-square",
     radarr: "film",
-    sonarr: "tv"
+    sonarr: "tv",
+    watch: "eye"
 }
 
 function formatRunDuration(startedAt, endedAt) {
@@ -2294,7 +2351,40 @@ dropArea.addEventListener("click", () => {
     input.click();
 });
 
-function uploadFile(file) {
+// Uploads still sending slices. While there are any, losing the connection doesn't reload the
+// page, which would lose the file and the upload it is carrying on.
+let uploadsInProgress = 0;
+
+// Resolves once the socket is connected, straight away if it already is
+function socketConnected() {
+    return socket.connected ? Promise.resolve() : new Promise(resolve => socket.once("connect", resolve));
+}
+
+// How much of an upload the server has, or the given offset if it can't say
+async function uploadReceived(uploadUrl, offset) {
+    try {
+        const status = await fetch(uploadUrl);
+        if (status.ok) return (await status.json()).received;
+    } catch (statusError) {
+        // Still unreachable: try the same slice again
+    }
+    return offset;
+}
+
+async function uploadFile(file) {
+    if (file.size === 0) {
+        updateStatus(`'${file.name}' is empty, so there is nothing to upload`, "danger", false, false, "x-circle");
+        return;
+    }
+    uploadsInProgress++;
+    try {
+        await sendUpload(file);
+    } finally {
+        uploadsInProgress--;
+    }
+}
+
+async function sendUpload(file) {
     socket.emit("display_message", {
         "instance_id": instanceId,
         "message": `Uploading '${file.name}'...`,
@@ -2308,97 +2398,117 @@ function uploadFile(file) {
         "broadcast": true
     });
 
-    const reader = new FileReader();
-
+    // The file goes up as raw bytes, a slice per request, each saying where it goes in the file.
+    // If the connection drops, the server says how much it has and the upload carries on from there.
+    const uploadId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+    const uploadUrl = `/api/upload/${uploadId}`;
     let offset = 0;
-    let isAborted = false;
-
-    reader.onload = function (event) {
-        const arrayBuffer = event.target.result;
-        const totalChunks = Math.ceil(arrayBuffer.byteLength / CHUNK_SIZE);
-        let startTime = performance.now();
-
-        function arrayBufferToBase64(buffer) {
-            return new Promise((resolve) => {
-                const blob = new Blob([buffer]);
-                const reader = new FileReader();
-                reader.onloadend = () => {
-                    let base64Data = reader.result.split(",")[1]; // Extract only the Base64 part
-                    resolve(base64Data);
-                };
-                reader.readAsDataURL(blob);
+    let failures = 0;
+
+    while (offset < file.size) {
+        const end = Math.min(offset + UPLOAD_SLICE_SIZE, file.size);
+        let response;
+        try {
+            response = await fetch(uploadUrl, {
+                method: "PUT",
+                headers: {
+                    "Content-Type": "application/octet-stream",
+                    "Content-Range": `bytes ${offset}-${end - 1}/${file.size}`,
+                    "X-File-Name": encodeURIComponent(file.name),
+                    "X-Instance-Id": instanceId
+                },
+                body: file.slice(offset, end)
             });
+        } catch (error) {
+            if (++failures > UPLOAD_MAX_RETRIES) {
+                if (socket.connected) {
+                    console.error(`Upload of ${file.name} failed: ${error}`);
+                    return;
+                }
+                // The server is away, restarting say: wait for Socket.IO to reconnect, then ask
+                // the server where the upload has got to (nowhere, if it lost it) and carry on
+                await socketConnected();
+                failures = 0;
+            } else {
+                await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+            }
+            offset = await uploadReceived(uploadUrl, offset);
+            continue;
         }
 
-        function sendChunk() {
-            if (isAborted) return;
+        if (response.status === 410) return; // Canceled by the user
+        if (!response.ok && response.status !== 409) {
+            console.error(`Backend refused upload slice: ${response.status}`);
+            return;
+        }
+        const received = (await response.json()).received; // On a 409, where the server has got to
+        if (response.status === 409 && received === offset) {
+            // No further than before: the server is still writing an earlier attempt at this
+            // slice. Wait as for a lost connection, rather than sending all of it again at once.
+            if (++failures > UPLOAD_MAX_RETRIES) {
+                console.error(`Upload of ${file.name} failed: the server made no progress on the slice at ${offset}`);
+                return;
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+            offset = await uploadReceived(uploadUrl, offset);
+            continue;
+        }
+        if (response.ok) failures = 0;
+        offset = received;
+    }
 
-            if (offset >= arrayBuffer.byteLength) {
-                console.log("All chunks sent, emitting upload_complete event.");
+    console.log("All slices sent, emitting upload_complete event.");
 
-                // Collect checked input fields with ids starting with "upload-option-"
-                let options = [];
-                document.querySelectorAll('[id^="upload-option-"]:checked').forEach(checkbox => {
-                    options.push(checkbox.value);
-                });   
-                
-                // Collect checked checkboxes with ids starting with "upload-filter-"
-                let filters = [];
-                if (!document.getElementById("upload-filters-global").checked) {
-                    document.querySelectorAll('[id^=upload-filter-]:checked').forEach(checkbox => {
-                        filters.push(checkbox.value);
-                    });
-                }
+    socket.emit("upload_complete", {
+        instance_id: instanceId,
+        upload_id: uploadId,
+        fileName: file.name,
+        ...uploadSettings()
+    });
+}
 
-                const plex_year = document.getElementById("plex_year").value;
-                const plex_title = document.getElementById("plex_title").value;
+// The options, filters and Plex title and year set on the upload tab
+function uploadSettings() {
+    // Collect checked input fields with ids starting with "upload-option-"
+    let options = [];
+    document.querySelectorAll('[id^="upload-option-"]:checked').forEach(checkbox => {
+        options.push(checkbox.value);
+    });
 
-                socket.emit("upload_complete", {
-                    instance_id: instanceId,
-                    fileName: file.name,
-                    options: options,
-                    filters: filters,
-                    plex_title: plex_title,
-                    plex_year: plex_year
-                });
+    // Collect checked checkboxes with ids starting with "upload-filter-"
+    let filters = [];
+    if (!document.getElementById("upload-filters-global").checked) {
+        document.querySelectorAll('[id^=upload-filter-]:checked').forEach(checkbox => {
+            filters.push(checkbox.value);
+        });
+    }
 
-                return; // Ensure no further execution in this function
-            }
+    return {
+        options: options,
+        filters: filters,
+        plex_title: document.getElementById("plex_title").value,
+        plex_year: document.getElementById("plex_year").value
+    };
+}
 
-            const chunk = arrayBuffer.slice(offset, offset + CHUNK_SIZE);
+// Process the artwork in a folder on the server where it is, rather than uploading a ZIP of it
+function processFolder() {
+    const form = document.getElementById("upload_form");
+    const folderPath = document.getElementById("folder_path").value.trim();
 
-            arrayBufferToBase64(chunk).then(base64Chunk => {
-                if (isAborted) return;
-                
-                let currentTime = performance.now();
-                let totalSize = arrayBuffer.byteLength / 1000000;
-                socket.emit("upload_artwork_chunk", {
-                    instance_id: instanceId,
-                    fileName: file.name,
-                    chunkData: base64Chunk,
-                    chunkIndex: offset / CHUNK_SIZE,
-                    totalChunks: totalChunks,
-                    totalSize: totalSize,
-                    startTime: startTime,
-                    currentTime: currentTime
-                }, (ack) => {
-                    if (ack === "ok") {
-                        if (isAborted) return;
-
-                        offset += CHUNK_SIZE; // Offset is in bytes
-                        sendChunk();
-                    } else if (ack === "abort") {
-                        isAborted = true;
-                        return;
-                    } else {
-                        console.error("Backend failed to acknowledge chunk.")
-                    }
-                });
-            });
-        }
-        sendChunk();
-    };
-    reader.readAsArrayBuffer(file);
+    if (!form.checkValidity()) {
+        form.classList.add('was-validated');
+        return;
+    }
+    if (!folderPath) {
+        alert("Please choose a folder on the server.");
+        return;
+    }
+    socket.emit("process_folder", {
+        instance_id: instanceId,
+        path: folderPath,
+        ...uploadSettings()
+    });
 }
 
 socket.on("upload_progress", function (data) {
@@ -2780,6 +2890,16 @@ socket.on("backend_restarting", function() {
 socket.on("disconnect", function() {
     console.log("WebSocket disconnected, attempting to reconnect...");
     updateStatus("Connection to server lost, reconnecting...", "warning", true, true, "arrow-counterclockwise")
+    if (uploadsInProgress > 0) {
+        // Socket.IO reconnects by itself, and the upload carries on once it has (see sendUpload).
+        // The log and scrape state missed meanwhile are fetched again, as a reload would have.
+        socket.once("connect", () => {
+            updateStatus("Reconnected to server", "success", false, false, "check2-circle");
+            getLog();
+            socket.emit("get_scrape_state", { instance_id: instanceId });
+        });
+        return;
+    }
     // Refresh the page to reconnect to the WebSocket
     setTimeout(() => {
         location.reload();  // Reload to attempt reconnection
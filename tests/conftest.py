@@ -0,0 +1,27 @@
+"""Fixtures shared by the tests that run bulk imports end to end.
+
+A bulk import records its run in the run history and goes through the shared bulk import queue,
+both of which are files in the config directory. These point them at the test's own temporary
+directory, so running the tests never rewrites config/run_history.json or leaves a
+config/bulk_queue.json behind.
+"""
+
+import pytest
+
+import services.bulk_queue as bulk_queue
+from services.bulk_queue import BulkQueue
+from services.run_history import RunHistory
+
+
+@pytest.fixture
+def run_history(tmp_path, monkeypatch):
+    history = RunHistory(str(tmp_path / "run_history.json"))
+    monkeypatch.setattr("artwork_uploader.RunHistory", lambda: history)
+    return history
+
+
+@pytest.fixture
+def shared_bulk_queue(tmp_path, monkeypatch):
+    queue = BulkQueue(str(tmp_path / "bulk_queue.json"))
+    monkeypatch.setattr(bulk_queue, "_shared", queue)
+    return queue
@@ -0,0 +1,201 @@
+"""Tests for the applied artwork ledger and how the uploader uses it.
+
+The ledger lets a repeat run skip artwork it applied recently without reading the item's
+labels from Plex. It must never hide a change. Different artwork, an entry past its TTL or
+a forced run all have to go back to Plex as before.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from models.options import Options
+from plex.plex_uploader import PlexUploader
+from services.applied_ledger import AppliedLedger
+from utils import utils
+
+ASSETS = "https://theposterdb.com/api/assets"
+
+
+@pytest.fixture(autouse=True)
+def _no_rate_limit_sleep(monkeypatch):
+    monkeypatch.setattr("plex.plex_uploader.time.sleep", lambda *a: None)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return AppliedLedger(str(tmp_path / "applied_ledger.db"))
+
+
+def _url(asset_id):
+    return f"{ASSETS}/{asset_id}"
+
+
+def _label(asset_id):
+    return "PID:" + utils.calculate_md5(_url(asset_id))
+
+
+class _Target:
+    """Stand-in for a plexapi Movie that counts how often its labels are read."""
+
+    def __init__(self, labels=(), rating_key=101):
+        self._labels = list(labels)
+        self.fields = []
+        self.librarySectionTitle = "Movies"
+        self.ratingKey = rating_key
+        self.uploaded = []
+        self.label_reads = 0
+
+    @property
+    def labels(self):
+        self.label_reads += 1
+        return list(self._labels)
+
+    def uploadPoster(self, url=None, filepath=None):
+        self.uploaded.append(url or filepath)
+
+    def batchEdits(self):
+        pass
+
+    def edit(self, **edits):
+        # LabelEdits sends the whole label set as label[0].tag.tag, label[1].tag.tag, ...
+        self._labels = [value for key, value in edits.items() if key.startswith("label[") and key.endswith("].tag.tag")]
+
+    def saveEdits(self):
+        pass
+
+    def removeLabel(self, labels, *args):
+        removed = {str(label) for label in (labels if isinstance(labels, list) else [labels])}
+        self._labels = [existing for existing in self._labels if str(existing) not in removed]
+
+    def reload(self):
+        pass
+
+
+def _uploader(target, asset_id, ledger, force=False):
+    uploader = PlexUploader(target, "Poster", "PID:")
+    uploader.set_options(Options(force=force))
+    uploader.set_artwork({"id": str(asset_id), "url": _url(asset_id), "source": "theposterdb"})
+    uploader.set_description("Heat")
+    uploader.ledger = ledger
+    return uploader
+
+
+def _age_entry(ledger, days):
+    checked_at = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    conn = sqlite3.connect(ledger.path)
+    conn.execute("UPDATE applied_artwork SET checked_at = ?", (checked_at,))
+    conn.commit()
+    conn.close()
+
+
+def test_a_recorded_label_is_current_within_the_ttl(ledger):
+    ledger.record(101, "PID:", _label(1), 1)
+    assert ledger.is_current(101, "PID:", _label(1), ttl_days=7)
+    assert not ledger.is_current(101, "PID:", _label(2), ttl_days=7)
+    assert not ledger.is_current(102, "PID:", _label(1), ttl_days=7)
+    assert not ledger.is_current(101, "BID:", _label(1), ttl_days=7)
+
+
+def test_an_entry_past_the_ttl_is_not_trusted(ledger):
+    ledger.record(101, "PID:", _label(1), 1)
+    _age_entry(ledger, 8)
+    assert not ledger.is_current(101, "PID:", _label(1), ttl_days=7)
+
+
+def test_a_zero_ttl_never_trusts_the_ledger(ledger):
+    ledger.record(101, "PID:", _label(1), 1)
+    assert not ledger.is_current(101, "PID:", _label(1), ttl_days=0)
+
+
+def test_confirming_keeps_the_applied_time_but_refreshes_the_check(ledger):
+    ledger.record(101, "PID:", _label(1), 1)
+    applied_at = ledger.entry(101, "PID:")["applied_at"]
+    _age_entry(ledger, 8)
+    ledger.record(101, "PID:", _label(1), applied=False)
+    row = ledger.entry(101, "PID:")
+    assert row["applied_at"] == applied_at
+    assert row["asset_id"] == "1"
+    assert ledger.is_current(101, "PID:", _label(1), ttl_days=7)
+
+
+def test_rebuild_replaces_every_entry(ledger):
+    ledger.record(101, "PID:", _label(1), 1)
+    written = ledger.rebuild([("202", "PID:", _label(2)), ("202", "BID:", "BID:abc")])
+    assert written == 2
+    assert ledger.entry(101, "PID:") is None
+    assert ledger.is_current("202", "PID:", _label(2), ttl_days=7)
+    assert ledger.count() == 2
+
+
+def test_an_unreadable_file_is_moved_aside(tmp_path):
+    path = tmp_path / "applied_ledger.db"
+    path.write_bytes(b"not a database at all" * 100)
+    ledger = AppliedLedger(str(path))
+    assert ledger.count() == 0
+    assert list(tmp_path.glob("applied_ledger.db.corrupt-*"))
+
+
+def test_a_current_entry_skips_plex_entirely(ledger):
+    target = _Target(labels=[_label(1)])
+    ledger.record(101, "PID:", _label(1), 1)
+
+    result = _uploader(target, 1, ledger).upload_to_plex()
+
+    assert result.startswith("⏩")
+    assert target.label_reads == 0
+    assert target.uploaded == []
+
+
+def test_an_upload_is_recorded_in_the_ledger(ledger):
+    target = _Target(labels=[_label(1)])
+
+    result = _uploader(target, 2, ledger).upload_to_plex()
+
+    assert result.startswith("✅")
+    assert ledger.is_current(101, "PID:", _label(2), ttl_days=7)
+    assert ledger.entry(101, "PID:")["asset_id"] == "2"
+
+
+def test_different_artwork_still_goes_to_plex(ledger):
+    target = _Target(labels=[_label(1)])
+    ledger.record(101, "PID:", _label(1), 1)
+
+    result = _uploader(target, 2, ledger).upload_to_plex()
+
+    assert result.startswith("✅")
+    assert target.uploaded == [_url(2)]
+
+
+def test_a_stale_entry_is_checked_against_plex_and_refreshed(ledger):
+    target = _Target(labels=[_label(1)])
+    ledger.record(101, "PID:", _label(1), 1)
+    _age_entry(ledger, 30)
+
+    result = _uploader(target, 1, ledger).upload_to_plex()
+
+    assert result.startswith("⏩")
+    assert target.label_reads > 0
+    assert ledger.is_current(101, "PID:", _label(1), ttl_days=7)
+
+
+def test_force_ignores_the_ledger(ledger):
+    target = _Target(labels=[_label(1)])
+    ledger.record(101, "PID:", _label(1), 1)
+
+    result = _uploader(target, 1, ledger, force=True).upload_to_plex()
+
+    assert result.startswith("♻️")
+    assert target.uploaded == [_url(1)]
+
+
+def test_untracking_forgets_the_entry(ledger):
+    target = _Target(labels=[_label(1)])
+    ledger.record(101, "PID:", _label(1), 1)
+    uploader = _uploader(target, 1, ledger)
+    uploader.track_artwork_ids = False
+
+    uploader.upload_to_plex()
+
+    assert ledger.entry(101, "PID:") is None
@@ -1,6 +1,8 @@
 """Unit tests for the persistent ThePosterDB user-uploads index (services/asset_index.py)."""
 
 import glob
+import sqlite3
+import threading
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -137,3 +139,53 @@ def test_corrupt_file_self_heal(tmp_path):
     assert glob.glob(path + ".corrupt-*")
     index.record("user", [_asset(1)])
     assert index.known_ids("user") == {1}
+
+
+@pytest.mark.unit
+def test_a_thread_connects_once_however_many_calls_and_indexes(tmp_path, monkeypatch):
+    path = str(tmp_path / "asset_index.db")
+    opened = []
+    real_connect = sqlite3.connect
+    monkeypatch.setattr("services.asset_index.sqlite3.connect",
+                        lambda *args, **kwargs: opened.append(args) or real_connect(*args, **kwargs))
+
+    for page in range(5):  # A crawl makes a new index and several calls per page
+        index = AssetIndex(path)
+        index.record("user", [_asset(page)])
+        index.known_ids("user")
+        index.crawl_state("user")
+    index.reconcile("user", {0, 1, 2, 3, 4}, FAR_FUTURE)
+
+    assert len(opened) == 1
+    assert AssetIndex(path).known_ids("user") == {0, 1, 2, 3, 4}
+
+
+@pytest.mark.unit
+def test_each_thread_has_its_own_connection_and_reads_alongside_a_writer(index):
+    index.record("user", [_asset(1)])
+    connections, seen = [], []
+
+    def reader():
+        connections.append(index._connect())
+        seen.append(index.known_ids("user"))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    thread.join()
+
+    assert connections[0] is not index._connect()
+    assert seen == [{1}]
+    assert index._connect().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+@pytest.mark.unit
+def test_a_failed_write_is_rolled_back_and_the_connection_stays_usable(index):
+    index.record("user", [_asset(1)])
+
+    with pytest.raises(sqlite3.Error):
+        index.reconcile("user", {"not-an-asset-id"}, FAR_FUTURE)  # Fails part way through
+
+    assert not index._connect().in_transaction
+    assert index.assets_for_user("user")[0]["missing_since"] is None
+    index.record("user", [_asset(2)])
+    assert index.known_ids("user") == {1, 2}
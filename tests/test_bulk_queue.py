@@ -0,0 +1,226 @@
+"""
+Tests for the bulk import queue.
+
+A bulk import that started while another was running used to be refused outright, so two
+schedules landing on the same minute lost a run, and catch-up couldn't help because the refused
+run was never stamped. Bulk imports now go through a persistent queue: the same file queued
+twice runs once, different files run side by side, the same file never runs twice at once, and
+only a full queue refuses a run.
+"""
+
+import threading
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import core.globals as globals
+import services.bulk_queue as bulk_queue
+from artwork_uploader import run_bulk_import_scrape_in_thread
+from core.enums import QueueResult
+from models.instance import Instance
+from services.bulk_queue import BulkQueue
+
+
+# A run counts as scheduled when it carries a schedule id. The value itself is
+# not read by anything under test here, only its presence.
+SCHEDULE_ID = str(uuid.uuid4())
+
+
+@pytest.fixture
+def queue(shared_bulk_queue):
+    return shared_bulk_queue
+
+
+@pytest.fixture(autouse=True)
+def reset_globals():
+    try:
+        yield
+    finally:
+        globals.cancel_scrape = False
+        globals.scrapes_running = 0
+        globals.plex = None
+        globals.config = None
+
+
+@pytest.mark.unit
+def test_the_same_file_queued_twice_runs_once_with_the_latest_contents(tmp_path):
+    queue = BulkQueue(str(tmp_path / "bulk_queue.json"), max_running=2)
+    _, running = queue.enqueue("other.txt", "running")
+    queue.start(running["id"])
+
+    first_result, first = queue.enqueue("nightly.txt", "old contents")
+    queue.enqueue("other.txt", "waits for the first")
+    second_result, second = queue.enqueue("nightly.txt", "new contents", schedule_id=SCHEDULE_ID)
+
+    assert (first_result, second_result) == (QueueResult.QUEUED, QueueResult.COALESCED)
+    assert second["id"] == first["id"]
+    assert queue.position(first["id"]) == 1
+    assert queue.start(first["id"], timeout=0)["content"] == "new contents"
+
+
+@pytest.mark.unit
+def test_a_full_queue_refuses_a_new_run(tmp_path):
+    queue = BulkQueue(str(tmp_path / "bulk_queue.json"), max_depth=2)
+    queue.enqueue("a.txt", "")
+    queue.enqueue("b.txt", "")
+
+    assert queue.enqueue("c.txt", "") == (QueueResult.FULL, None)
+    assert queue.enqueue("a.txt", "")[0] == QueueResult.COALESCED  # Not a new run, so not refused
+
+
+@pytest.mark.unit
+def test_different_files_run_side_by_side_but_the_same_file_waits(tmp_path):
+    queue = BulkQueue(str(tmp_path / "bulk_queue.json"), max_running=2)
+    _, first = queue.enqueue("movies.txt", "")
+    _, second = queue.enqueue("shows.txt", "")
+    assert queue.start(first["id"], timeout=0) is not None
+    assert queue.start(second["id"], timeout=0) is not None
+
+    _, again = queue.enqueue("movies.txt", "")
+    assert queue.start(again["id"], timeout=0) is None
+
+    queue.finish(first["id"])
+    assert queue.start(again["id"], timeout=0) is not None
+
+
+@pytest.mark.unit
+def test_by_default_one_file_runs_at_a_time(queue):
+    # The web UI has one bulk progress bar, so a second file waits rather than share it
+    _, first = queue.enqueue("movies.txt", "")
+    _, second = queue.enqueue("shows.txt", "")
+    queue.start(first["id"])
+
+    assert queue.start(second["id"], timeout=0) is None
+    queue.finish(first["id"])
+    assert queue.start(second["id"], timeout=0) is not None
+
+
+@pytest.mark.unit
+def test_a_run_held_back_by_its_own_file_does_not_hold_up_the_files_behind_it(tmp_path):
+    queue = BulkQueue(str(tmp_path / "bulk_queue.json"), max_running=2)
+    _, running = queue.enqueue("movies.txt", "")
+    queue.start(running["id"])
+    _, same_file = queue.enqueue("movies.txt", "")
+    _, other_file = queue.enqueue("shows.txt", "")
+
+    assert queue.start(same_file["id"], timeout=0) is None
+    assert queue.start(other_file["id"], timeout=0) is not None
+
+
+@pytest.mark.unit
+def test_queued_and_running_imports_survive_a_restart(tmp_path):
+    path = str(tmp_path / "bulk_queue.json")
+    queue = BulkQueue(path)
+    _, running = queue.enqueue("movies.txt", "https://mediux.pro/sets/1")
+    queue.start(running["id"])
+    queue.enqueue("shows.txt", "https://mediux.pro/sets/2")
+
+    recovered = BulkQueue(path).recover()
+
+    assert [(job["file"], job["state"]) for job in recovered] == [("movies.txt", "waiting"), ("shows.txt", "waiting")]
+    assert recovered[0]["content"] == "https://mediux.pro/sets/1"
+
+
+@pytest.mark.unit
+def test_a_second_run_of_the_same_file_waits_and_then_runs(queue, run_history):
+    """Exercise the queue under real thread concurrency: the second run of a file must neither
+    be refused nor overlap the first, and must run once the first finishes."""
+    globals.plex = MagicMock(tv_libraries=MagicMock(), movie_libraries=MagicMock())
+    first_entered = threading.Event()
+    release_first = threading.Event()
+    running = []
+    overlaps = []
+
+    def slow_scrape_and_upload(*args, **kwargs):
+        running.append(1)
+        overlaps.append(len(running))
+        first_entered.set()
+        release_first.wait(timeout=5)
+        running.pop()
+
+    with (
+        patch("artwork_uploader.scrape_and_upload", side_effect=slow_scrape_and_upload) as mock_scrape_and_upload,
+        patch("artwork_uploader.update_log") as mock_update_log,
+        patch("artwork_uploader.update_status"),
+        patch("artwork_uploader.send_notification"),
+        patch("artwork_uploader.notify_web"),
+        patch("artwork_uploader.debug_me"),
+    ):
+        first_thread = threading.Thread(
+            target=run_bulk_import_scrape_in_thread,
+            args=(Instance(mode="cli"), "https://mediux.pro/sets/1", "nightly.txt"),
+        )
+        first_thread.start()
+        assert first_entered.wait(timeout=5), "first run never reached scrape_and_upload"
+
+        second_thread = threading.Thread(
+            target=run_bulk_import_scrape_in_thread,
+            args=(Instance(mode="cli"), "https://mediux.pro/sets/2", "nightly.txt"),
+        )
+        second_thread.start()
+        for _ in range(500):
+            if any(job["state"] == "waiting" for job in queue.jobs()):
+                break
+            threading.Event().wait(0.01)
+        # Queued again while the second is waiting: folded into it, so this returns at once
+        run_bulk_import_scrape_in_thread(Instance(mode="cli"), "https://mediux.pro/sets/3", "nightly.txt")
+
+        release_first.set()
+        first_thread.join(timeout=5)
+        second_thread.join(timeout=5)
+
+    urls = [call.args[1] for call in mock_scrape_and_upload.call_args_list]
+    assert urls == ["https://mediux.pro/sets/1", "https://mediux.pro/sets/3"]
+    assert max(overlaps) == 1
+    assert any("position 1" in call.args[1] for call in mock_update_log.call_args_list)
+    assert queue.jobs() == []
+
+
+@pytest.mark.unit
+def test_a_refused_scheduled_run_is_notified_and_not_stamped(tmp_path, monkeypatch):
+    """A scheduled run refused by a full queue must tell the notification services, and must
+    not be stamped, so catch-up can still run it after a restart."""
+    queue = BulkQueue(str(tmp_path / "bulk_queue.json"))
+    queue.enqueue("waiting.txt", "")
+    monkeypatch.setattr(bulk_queue, "_shared", queue)
+    globals.config = MagicMock(bulk_queue_max_depth=1)
+
+    with (
+        patch("artwork_uploader.scrape_and_upload") as mock_scrape_and_upload,
+        patch("artwork_uploader.record_schedule_run") as mock_record_schedule_run,
+        patch("artwork_uploader.update_log"),
+        patch("artwork_uploader.update_status"),
+        patch("artwork_uploader.send_notification") as mock_send_notification,
+        patch("artwork_uploader.notify_web"),
+    ):
+        run_bulk_import_scrape_in_thread(Instance(mode="cli"), "https://mediux.pro/sets/1", "nightly.txt", schedule_id=SCHEDULE_ID)
+
+    mock_scrape_and_upload.assert_not_called()
+    mock_record_schedule_run.assert_not_called()
+    mock_send_notification.assert_called_once()
+    assert "refused" in mock_send_notification.call_args.args[1].lower()
+
+
+@pytest.mark.unit
+def test_a_run_that_cannot_start_still_leaves_the_queue(queue):
+    """The Plex-incomplete early return must still take the run off the queue, or a single
+    misconfigured run would hold its file's place forever."""
+    globals.plex = MagicMock(tv_libraries=[], movie_libraries=[])
+    globals.plex.ensure_libraries.return_value = False
+
+    with (
+        patch("artwork_uploader.scrape_and_upload") as mock_scrape_and_upload,
+        patch("artwork_uploader.update_log"),
+        patch("artwork_uploader.update_status") as mock_update_status,
+        patch("artwork_uploader.send_notification"),
+        patch("artwork_uploader.notify_web"),
+        patch("artwork_uploader.debug_me"),
+        patch("artwork_uploader.RunHistory"),
+    ):
+        run_bulk_import_scrape_in_thread(Instance(mode="cli"), "https://mediux.pro/sets/1", "nightly.txt")
+
+    mock_scrape_and_upload.assert_not_called()
+    assert "Plex setup incomplete" in mock_update_status.call_args.args[1]
+    assert queue.jobs() == []
+    assert globals.scrapes_running == 0
@@ -0,0 +1,112 @@
+"""Tests for processing a folder of artwork on the server.
+
+Local artwork used to have to be zipped, uploaded through the browser and extracted again. A
+folder on the server (a mounted volume, say) can now be processed where it is, through the same
+parsing, filtering and lookups as a ZIP, without any of it being copied or deleted.
+"""
+
+import hashlib
+import io
+import os
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+import core.globals as globals
+import web_routes
+from core.constants import VALID_FILENAME_PATTERN
+from services.artwork_processor import ArtworkProcessor
+from services.image_service import ImageService
+from services.utility_service import UtilityService
+from web_routes import list_folder_artwork, process_folder, scan_artwork_folder
+
+pytestmark = pytest.mark.unit
+
+PATTERN = re.compile(VALID_FILENAME_PATTERN, re.IGNORECASE)
+
+
+def _image(width, height):
+    image_bytes = io.BytesIO()
+    Image.new("RGB", (width, height), (30, 30, 200)).save(image_bytes, format="JPEG")
+    return image_bytes.getvalue()
+
+
+def _folder(root, files):
+    for name, data in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data if isinstance(data, bytes) else data.encode())
+    return str(root)
+
+
+@pytest.fixture
+def quiet(monkeypatch):
+    for name in ("notify_web", "update_log", "update_status", "debug_me"):
+        monkeypatch.setattr(web_routes, name, MagicMock())
+    monkeypatch.setattr(globals, "cancel_scrape", False)
+    monkeypatch.setattr(globals, "main_bar", {})
+    monkeypatch.setattr(globals, "plex", MagicMock(movie_or_show=lambda title, year: ("Movie", 949, title, year)))
+
+
+def test_the_scan_finds_files_in_subfolders_but_not_hidden_ones(tmp_path):
+    folder = _folder(tmp_path, {"b.jpg": b"", "A/c.jpg": b"", ".hidden/d.jpg": b"", "__MACOSX/e.jpg": b"",
+                                ".DS_Store": b""})
+
+    assert [os.path.relpath(entry.path, folder) for entry in scan_artwork_folder(folder)] == \
+        [os.path.join("A", "c.jpg"), "b.jpg"]
+
+
+def test_artwork_is_listed_where_it_is_without_copying_it(tmp_path, quiet, monkeypatch):
+    poster, background = _image(1000, 1500), _image(1920, 1080)
+    folder = _folder(tmp_path / "Heat set", {"source.txt": "Title: Heat\nAuthor: someone\n",
+                                            "posters/Heat (1995).jpg": poster,
+                                            "Heat (1995) - Background.jpg": background})
+    monkeypatch.setattr(web_routes.tempfile, "mkdtemp", MagicMock(side_effect=AssertionError("Nothing is copied")))
+
+    artwork, skipped, title, author, source = list_folder_artwork(
+        MagicMock(), folder, PATTERN, [], None, None, ImageService.check_orientation, UtilityService.sort_key)
+
+    assert (title, author, skipped) == ("Heat", "someone", 0)
+    by_type = {item["file_type"]: item for item in artwork}
+    assert by_type["movie_poster"]["path"] == os.path.join(folder, "posters", "Heat (1995).jpg")
+    assert by_type["movie_poster"]["checksum"] == hashlib.md5(poster).hexdigest()
+    assert by_type["background"]["checksum"] == hashlib.md5(background).hexdigest()
+    assert all(item["keep_file"] for item in artwork)
+
+
+def test_the_folder_is_processed_and_left_as_it_was(tmp_path, quiet, monkeypatch):
+    folder = _folder(tmp_path / "Heat set", {"Heat (1995).jpg": _image(1000, 1500)})
+    monkeypatch.setattr(globals, "scrapes_running", 1)
+    processed = []
+
+    def process_uploaded_artwork(instance, artwork, *args, **kwargs):
+        processed.extend(artwork)
+        for item in artwork:
+            ArtworkProcessor(MagicMock(), MagicMock())._remove_extracted_file(item)
+
+    monkeypatch.setattr("artwork_uploader.process_uploaded_artwork", process_uploaded_artwork)
+    process_folder(MagicMock(), folder, [], [], None, None, PATTERN, ImageService.check_orientation,
+                   UtilityService.sort_key)
+
+    assert [item["file_type"] for item in processed] == ["movie_poster"]
+    assert os.listdir(folder) == ["Heat (1995).jpg"]
+    assert globals.scrapes_running == 0
+
+
+def test_a_folder_that_is_not_on_the_server_is_refused(tmp_path, quiet, monkeypatch):
+    handlers = {}
+    socket = MagicMock()
+    socket.on = lambda event: lambda func: handlers.setdefault(event, func)
+    monkeypatch.setattr(globals, "web_socket", socket)
+    monkeypatch.setattr(globals, "scrapes_running", 0)
+    web_routes.setup_socket_handlers(config=None, filename_pattern=PATTERN)
+
+    with patch("web_routes.process_folder") as mock_process:
+        handlers["process_folder"]({"instance_id": "browser-1", "path": str(tmp_path / "missing")})
+        handlers["process_folder"]({"instance_id": "browser-1", "path": str(tmp_path), "filters": ["background"]})
+
+    assert mock_process.call_count == 1
+    assert mock_process.call_args.args[1:4] == (str(tmp_path), [], ["background"])
+    assert globals.scrapes_running == 1
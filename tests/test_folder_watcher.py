@@ -0,0 +1,190 @@
+"""Tests for the watched folder.
+
+Artwork dropped onto a share is picked up without a browser upload. The folder is only listed
+on each look, the files already processed are remembered by path, modification time and size,
+and the files of a large copy are held back until it has finished, then processed as one run.
+"""
+
+import io
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+import core.globals as globals
+import web_routes
+from core.enums import RunTrigger, RunType
+from services.folder_watcher import FolderWatcher
+from services.run_history import RunHistory
+
+pytestmark = pytest.mark.unit
+
+SETTLE = 60
+
+
+def _image(width=1000, height=1500):
+    image_bytes = io.BytesIO()
+    Image.new("RGB", (width, height), (30, 200, 30)).save(image_bytes, format="JPEG")
+    return image_bytes.getvalue()
+
+
+@pytest.fixture
+def watched(tmp_path):
+    folder = tmp_path / "watched"
+    folder.mkdir()
+    return folder
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    return FolderWatcher(str(tmp_path / "watch_manifest.json"))
+
+
+def test_new_files_wait_for_the_folder_to_settle_and_are_then_handed_over_once(watched, watcher):
+    (watched / "Heat (1995).jpg").write_bytes(b"poster")
+    (watched / "notes.txt").write_text("not artwork")
+
+    assert watcher.poll(str(watched), SETTLE, now=0) == []
+    (watched / "Heat (1995) - Background.jpg").write_bytes(b"back")  # The copy is still going
+    assert watcher.poll(str(watched), SETTLE, now=50) == []
+    assert watcher.poll(str(watched), SETTLE, now=100) == []
+
+    batch = watcher.poll(str(watched), SETTLE, now=111)
+    assert batch == sorted([str(watched / "Heat (1995) - Background.jpg"), str(watched / "Heat (1995).jpg")])
+    watcher.processed(batch)
+    assert watcher.poll(str(watched), SETTLE, now=500) == []
+
+
+def test_a_batch_that_was_not_processed_is_handed_over_again_after_another_settle(watched, watcher):
+    (watched / "Heat (1995).jpg").write_bytes(b"poster")
+    watcher.poll(str(watched), SETTLE, now=0)
+
+    assert watcher.poll(str(watched), SETTLE, now=60) != []
+    assert watcher.poll(str(watched), SETTLE, now=90) == []
+    assert watcher.poll(str(watched), SETTLE, now=120) == [str(watched / "Heat (1995).jpg")]
+
+
+def test_only_changed_files_come_back_and_the_manifest_survives_a_restart(watched, watcher, tmp_path):
+    poster, background = watched / "Heat (1995).jpg", watched / "sets" / "Heat (1995) - Background.jpg"
+    background.parent.mkdir()
+    poster.write_bytes(b"poster")
+    background.write_bytes(b"back")
+    watcher.poll(str(watched), SETTLE, now=0)
+    watcher.processed(watcher.poll(str(watched), SETTLE, now=SETTLE))
+
+    restarted = FolderWatcher(watcher.path)
+    background.write_bytes(b"a new background")
+    restarted.poll(str(watched), SETTLE, now=0)
+
+    assert restarted.poll(str(watched), SETTLE, now=SETTLE) == [str(background)]
+
+
+def test_a_deleted_file_is_forgotten_so_putting_it_back_processes_it_again(watched, watcher):
+    poster = watched / "Heat (1995).jpg"
+    poster.write_bytes(b"poster")
+    watcher.poll(str(watched), SETTLE, now=0)
+    watcher.processed(watcher.poll(str(watched), SETTLE, now=SETTLE))
+
+    poster.unlink()
+    assert watcher.poll(str(watched), SETTLE, now=100) == []
+    poster.write_bytes(b"poster")
+    watcher.poll(str(watched), SETTLE, now=200)
+
+    assert watcher.poll(str(watched), SETTLE, now=200 + SETTLE) == [str(poster)]
+
+
+def test_a_batch_is_processed_in_place_as_one_watched_folder_run(watched, tmp_path, monkeypatch):
+    set_folder = watched / "Heat set"
+    set_folder.mkdir()
+    files = []
+    for name, size in (("Heat (1995).jpg", (1000, 1500)), ("Heat (1995) - Background.jpg", (1920, 1080))):
+        (set_folder / name).write_bytes(_image(*size))
+        files.append(str(set_folder / name))
+    (set_folder / "source.txt").write_text("Title: Heat\nAuthor: someone\n")
+    history = RunHistory(str(tmp_path / "run_history.json"))
+    monkeypatch.setattr("artwork_uploader.RunHistory", lambda: history)
+    monkeypatch.setattr(globals, "plex", MagicMock(movie_or_show=lambda title, year: ("Movie", 949, title, year)))
+    monkeypatch.setattr(globals, "config", MagicMock(apprise_urls=[]))
+    monkeypatch.setattr(globals, "scrapes_running", 0)
+    monkeypatch.setattr(globals, "main_bar", {})
+    processed = []
+
+    class _FakeProcessor:
+        def __init__(self, _plex, callbacks):
+            self.callbacks = callbacks
+
+        def process_uploaded_files(self, file_list, *args, **kwargs):
+            processed.extend(file_list)
+            self.callbacks.assets(len(file_list))
+
+    with (
+        patch("artwork_uploader.ArtworkProcessor", _FakeProcessor),
+        patch("artwork_uploader.notify_web"), patch("artwork_uploader.update_status"),
+        patch("artwork_uploader.update_log"),
+        patch.multiple(web_routes, notify_web=MagicMock(), update_log=MagicMock(),
+                       update_status=MagicMock(), debug_me=MagicMock()),
+    ):
+        assert web_routes.process_watched_files(str(watched), files) is True
+
+    assert sorted(item["file_type"] for item in processed) == ["background", "movie_poster"]
+    assert all(item["author"] == "someone" and item["keep_file"] for item in processed)
+    assert sorted(os.listdir(set_folder)) == ["Heat (1995) - Background.jpg", "Heat (1995).jpg", "source.txt"]
+    runs = history.get_runs()
+    assert [(run["run_type"], run["trigger"], run["label"]) for run in runs] == \
+        [(RunType.UPLOAD.value, RunTrigger.WATCH.value, "Heat")]
+    assert globals.scrapes_running == 0
+
+
+def _look_once(watcher, watched, monkeypatch, on_batch):
+    """Run the watcher's loop for a single look at a folder whose files have already settled."""
+    monkeypatch.setattr(globals, "config", MagicMock(watch_folder=str(watched), watch_folder_poll_seconds=1,
+                                                     watch_folder_settle_seconds=0))
+    watcher.poll(str(watched), 0)
+    watcher._stop.set()
+    with patch("utils.notifications.debug_me"):
+        watcher._watch(on_batch)
+
+
+def test_a_batch_whose_run_was_stopped_is_handed_over_again(watched, watcher, monkeypatch):
+    (watched / "Heat (1995).jpg").write_bytes(b"poster")
+    batches = []
+
+    _look_once(watcher, watched, monkeypatch, lambda folder, batch: batches.append(batch) and False)
+    _look_once(watcher, watched, monkeypatch, lambda folder, batch: batches.append(batch) or True)
+    _look_once(watcher, watched, monkeypatch, lambda folder, batch: batches.append(batch) or True)
+
+    assert batches == [[str(watched / "Heat (1995).jpg")]] * 2  # Not again once it finished
+
+
+def test_a_watched_folder_run_that_fails_is_still_taken_off_the_running_count(watched, monkeypatch):
+    (watched / "Heat (1995).jpg").write_bytes(_image())
+    monkeypatch.setattr(globals, "scrapes_running", 0)
+    monkeypatch.setattr(globals, "scrape_type", "stopped")
+    monkeypatch.setattr(globals, "main_bar", {})
+
+    with (
+        patch("web_routes.list_folder_artwork", side_effect=OSError("share went away")),
+        patch.multiple(web_routes, notify_web=MagicMock(), update_log=MagicMock(), update_status=MagicMock()),
+        pytest.raises(OSError),
+    ):
+        web_routes.process_watched_files(str(watched), [str(watched / "Heat (1995).jpg")])
+
+    assert globals.scrapes_running == 0
+    assert globals.scrape_type == "stopped"
+
+
+def test_a_batch_waits_for_runs_in_progress_and_leaves_a_stop_in_force(watched, monkeypatch):
+    (watched / "Heat (1995).jpg").write_bytes(_image())
+    monkeypatch.setattr(globals, "scrapes_running", 1)
+    monkeypatch.setattr(globals, "cancel_scrape", True)
+
+    with (
+        patch("web_routes.process_folder") as process_folder,
+        patch.multiple(web_routes, notify_web=MagicMock(), update_log=MagicMock(), debug_me=MagicMock()),
+    ):
+        assert web_routes.process_watched_files(str(watched), [str(watched / "Heat (1995).jpg")]) is False
+
+    process_folder.assert_not_called()
+    assert globals.cancel_scrape is True
+    assert globals.scrapes_running == 1
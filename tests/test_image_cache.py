@@ -0,0 +1,132 @@
+"""Tests for the on-disk image cache.
+
+Every scraped image URL carries a cache buster, so the same asset was downloaded again for each
+Kometa save and each upload, run after run. The cache keys images by the URL without it, stores
+each image once by content, and keeps to its size budget by dropping the least recently used.
+"""
+
+import os
+
+import pytest
+import requests
+
+from kometa.kometa_saver import KometaSaver
+from models.options import Options
+from services.image_cache import ImageCache, canonical_url
+from utils import image_fetcher
+from utils.image_fetcher import RemoteImage
+
+URL = "https://theposterdb.com/api/assets/670744"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ImageCache(str(tmp_path / "cache"), max_mb=1)
+
+
+def test_the_cache_buster_is_not_part_of_the_key(cache):
+    assert canonical_url(f"{URL}?x=1&_cb=abc123") == f"{URL}?x=1"
+    cache.put(f"{URL}&_cb=first", b"poster-bytes", "image/jpeg")
+
+    cached = cache.get(f"{URL}&_cb=second")
+
+    assert cached.read() == b"poster-bytes"
+    assert cached.content_type == "image/jpeg"
+
+
+def test_the_same_image_at_two_urls_is_stored_once(cache):
+    first = cache.put(f"{URL}/a", b"poster-bytes")
+    second = cache.put(f"{URL}/b", b"poster-bytes")
+
+    assert first.path == second.path
+    assert cache.size() == len(b"poster-bytes")
+
+
+def test_least_recently_used_images_are_evicted_over_budget(tmp_path):
+    cache = ImageCache(str(tmp_path / "cache"), max_mb=2.5 / 1024)  # 2560 bytes
+    cache.put(f"{URL}/1", b"1" * 1024)
+    cache.put(f"{URL}/2", b"2" * 1024)
+    cache.get(f"{URL}/1")  # Now more recently used than 2
+
+    cache.put(f"{URL}/3", b"3" * 1024)
+
+    assert cache.get(f"{URL}/2") is None
+    assert cache.get(f"{URL}/1") is not None
+    assert cache.get(f"{URL}/3") is not None
+    assert cache.size() <= 2560
+
+
+def test_an_image_deleted_from_disk_is_a_miss(cache):
+    cached = cache.put(URL, b"poster-bytes")
+    os.remove(cached.path)
+
+    assert cache.get(URL) is None
+    assert cache.size() == 0
+
+
+def test_remote_image_fetches_once_across_runs(cache, monkeypatch):
+    calls = []
+
+    class _Response:
+        content = b"poster-bytes"
+        headers = {"Content-Type": "image/jpeg"}
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return _Response()
+
+    monkeypatch.setattr(image_fetcher.session, "get", fake_get)
+    monkeypatch.setattr(image_fetcher.rate_limiter, "wait", lambda url: None)
+
+    assert RemoteImage(f"{URL}&_cb=1", cache=cache).content() == b"poster-bytes"
+    assert RemoteImage(f"{URL}&_cb=2", cache=cache).content() == b"poster-bytes"
+
+    assert len(calls) == 1
+
+
+def test_kometa_save_with_force_uses_the_cached_image(cache, tmp_path, monkeypatch):
+    def no_download(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("should not download")
+
+    monkeypatch.setattr("kometa.kometa_saver.requests.get", no_download)
+    cache.put(URL, b"poster-bytes", "image/png")
+    dest = tmp_path / "assets"
+    dest.mkdir()
+    (dest / "poster.jpg").write_bytes(b"old")
+
+    saver = KometaSaver("Poster", "Movies")
+    saver.set_artwork({"id": 1, "url": f"{URL}&_cb=9", "source": "theposterdb"})
+    saver.set_description("Heat")
+    saver.set_options(Options(force=True))
+    saver.dest_dir = str(dest)
+    saver.image_cache = cache
+
+    result = saver.save_to_kometa()
+
+    assert result.startswith("♻️")
+    assert (dest / "poster.png").read_bytes() == b"poster-bytes"
+    assert not (dest / "poster.jpg").exists()
+
+
+def test_a_kometa_download_is_added_to_the_cache(cache, tmp_path, monkeypatch):
+    class _Response:
+        headers = {"Content-Type": "image/jpeg"}
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            yield b"poster-bytes"
+
+    monkeypatch.setattr("kometa.kometa_saver.requests.get", lambda *a, **k: _Response())
+    monkeypatch.setattr("kometa.kometa_saver.time.sleep", lambda *a: None)
+    saver = KometaSaver("Poster", "Movies")
+    saver.set_artwork({"id": 1, "url": f"{URL}&_cb=9", "source": "theposterdb"})
+    saver.dest_dir = str(tmp_path / "assets")
+    saver.image_cache = cache
+
+    assert saver.save_to_kometa().startswith("✅")
+    assert cache.get(URL).read() == b"poster-bytes"
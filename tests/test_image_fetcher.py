@@ -0,0 +1,143 @@
+"""Tests for fetching an artwork image once and uploading the bytes to every library.
+
+An item in a 4K and an HD library used to have Plex fetch the image URL once per library, and
+ThePosterDB's rate limit delay applied each time. The tool now fetches it once and hands the
+same bytes to every upload.
+"""
+
+import pytest
+
+from models.options import Options
+from plex.plex_uploader import PlexUploader
+from utils import image_fetcher
+from utils.image_fetcher import HostRateLimiter, RemoteImage
+
+URL = "https://theposterdb.com/api/assets/670744"
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return _Response(b"poster-bytes")
+
+    monkeypatch.setattr(image_fetcher.session, "get", fake_get)
+    monkeypatch.setattr(image_fetcher.rate_limiter, "wait", lambda url: None)
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    slept = []
+    monkeypatch.setattr("plex.plex_uploader.time.sleep", lambda seconds: slept.append(seconds))
+    return slept
+
+
+class _Movie:
+    def __init__(self, library):
+        self.labels = []
+        self.fields = []
+        self.librarySectionTitle = library
+        self.ratingKey = library
+        self.uploads = []
+
+    def uploadPoster(self, url=None, filepath=None):
+        self.uploads.append({"url": url, "filepath": filepath})
+
+    def batchEdits(self):
+        pass
+
+    def edit(self, **edits):
+        # LabelEdits sends the whole label set as label[0].tag.tag, label[1].tag.tag, ...
+        self.labels = [value for key, value in edits.items() if key.startswith("label[") and key.endswith("].tag.tag")]
+
+    def saveEdits(self):
+        pass
+
+    def removeLabel(self, labels, *args):
+        pass
+
+
+def _upload(target, image):
+    uploader = PlexUploader(target, "Poster", "PID:")
+    uploader.set_options(Options())
+    uploader.set_artwork({"id": "670744", "url": URL, "source": "theposterdb"})
+    uploader.image = image
+    return uploader.upload_to_plex()
+
+
+def test_the_image_is_fetched_once_for_every_library(fetches, _no_sleep):
+    image = RemoteImage(URL)
+    movies = [_Movie("Movies"), _Movie("Movies 4K")]
+
+    results = [_upload(movie, image) for movie in movies]
+
+    assert all(result.startswith("✅") for result in results)
+    assert fetches == [URL]
+    assert [movie.uploads for movie in movies] == [[{"url": None, "filepath": b"poster-bytes"}]] * 2
+    assert _no_sleep == []  # the rate limiter spaces the fetches, not a sleep per upload
+
+
+def test_nothing_is_fetched_when_nothing_is_uploaded(fetches):
+    image = RemoteImage(URL)
+    movie = _Movie("Movies")
+    _upload(movie, image)
+    fetches.clear()
+
+    # The label is on the item now, so the second run has nothing to upload
+    assert _upload(movie, RemoteImage(URL)).startswith("⏩")
+    assert fetches == []
+
+
+def test_a_failed_fetch_is_not_repeated_for_the_next_library(monkeypatch):
+    calls = []
+
+    def failing_get(url, timeout=None):
+        calls.append(url)
+        raise ValueError("not an image")
+
+    monkeypatch.setattr(image_fetcher.session, "get", failing_get)
+    monkeypatch.setattr(image_fetcher.rate_limiter, "wait", lambda url: None)
+    image = RemoteImage(URL)
+
+    results = [_upload(_Movie(library), image) for library in ("Movies", "Movies 4K")]
+
+    assert all(result.startswith("❌") for result in results)
+    assert calls == [URL]
+
+
+def test_without_a_shared_image_plex_is_handed_the_url(_no_sleep):
+    movie = _Movie("Movies")
+
+    _upload(movie, None)
+
+    assert movie.uploads == [{"url": URL, "filepath": None}]
+    assert _no_sleep  # Plex fetched from ThePosterDB itself, so the delay still applies
+
+
+def test_rate_limiter_spaces_requests_to_a_host():
+    now = [100.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    limiter = HostRateLimiter({"theposterdb.com": 6}, clock=lambda: now[0], sleep=sleep)
+    limiter.wait("https://theposterdb.com/api/assets/1")
+    limiter.wait("https://theposterdb.com/api/assets/2")
+    now[0] += 10
+    limiter.wait("https://theposterdb.com/api/assets/3")
+    limiter.wait("https://api.mediux.pro/assets/4")
+
+    assert slept == [6]
@@ -0,0 +1,216 @@
+"""Tests for processing all the artwork for one title in a single item session.
+
+A movie with a poster, a background and square art used to be looked up in Plex, label-checked
+and label-edited once per artwork type. Grouped into one session, the lookup happens once and
+the label changes for each item are written together at the end.
+"""
+
+import threading
+
+import pytest
+
+from core.enums import MediaType
+from models.options import Options
+from processors.item_session import ItemSession
+from processors.upload_processor import UploadProcessor
+from services.artwork_processor import group_by_target
+from utils import utils
+
+MEDIUX = "https://api.mediux.pro/assets"
+
+
+@pytest.fixture(autouse=True)
+def _no_rate_limit_sleep(monkeypatch):
+    monkeypatch.setattr("plex.plex_uploader.time.sleep", lambda *a: None)
+
+
+class _Movie:
+    def __init__(self, labels=()):
+        self.labels = list(labels)
+        self.fields = []
+        self.title = "Heat"
+        self.librarySectionTitle = "Movies"
+        self.ratingKey = 101
+        self.uploaded = []
+        self.label_sets = []
+        self.remove_calls = []
+        self.saves = 0
+        self.reloads = 0
+
+    def uploadPoster(self, url=None, filepath=None):
+        self.uploaded.append(("poster", url))
+
+    def uploadArt(self, url=None, filepath=None):
+        self.uploaded.append(("art", url))
+
+    def batchEdits(self):
+        pass
+
+    def edit(self, **edits):
+        self.label_sets.append([value for key, value in edits.items() if key.startswith("label[") and key.endswith("].tag.tag")])
+
+    def removeLabel(self, labels, *args):
+        self.remove_calls.append(list(labels))
+
+    def saveEdits(self):
+        self.saves += 1
+
+    def reload(self):
+        self.reloads += 1
+
+
+class _Plex:
+    def __init__(self, movie):
+        self.movie = movie
+        self.lookups = 0
+
+    def find_in_library(self, media_type, artwork):
+        self.lookups += 1
+        return [self.movie], ["Movies"]
+
+
+class _Config:
+    track_artwork_ids = True
+    reset_overlay = False
+    upload_retry_attempts = 1
+    upload_retry_backoff_seconds = 0
+    applied_ledger_ttl_days = 7
+    use_applied_ledger = False
+    local_library_matching = False
+
+
+def _processor(plex):
+    # UploadProcessor.__init__ loads config.json from disk; set up just what the upload path reads.
+    processor = UploadProcessor.__new__(UploadProcessor)
+    processor.plex = plex
+    processor.options = Options()
+    processor.config = _Config()
+    processor._match_confirm_cache = {}
+    processor.artist_assets = None
+    processor._ledger = None
+    processor._ledger_opened = True
+    processor._opening = threading.Lock()
+    processor._local = threading.local()
+    processor.write_observer = None
+    processor.kometa = False
+    processor.skip_locked = False
+    processor.allow_artist_updates = False
+    processor._remote_image = lambda artwork: None  # Plex is handed the URL; no network in these tests
+    return processor
+
+
+def _artwork(asset_id, file_type):
+    return {"title": "Heat", "year": 1995, "author": "someone", "tmdb_id": 949,
+            "url": f"{MEDIUX}/{asset_id}", "source": "mediux", "id": str(asset_id), "file_type": file_type}
+
+
+def _label(prefix, asset_id):
+    return prefix + utils.calculate_md5(f"{MEDIUX}/{asset_id}")
+
+
+def test_artwork_is_grouped_by_title_in_first_seen_order():
+    artwork = [
+        {"title": "Heat", "year": 1995, "tmdb_id": 949, "id": "1"},
+        {"title": "Ronin", "year": 1998, "tmdb_id": None, "id": "2"},
+        {"title": "Heat", "year": 1995, "tmdb_id": 949, "id": "3"},
+        {"title": "ronin", "year": 1998, "tmdb_id": None, "id": "4"},
+        {"title": "Ronin", "year": 2024, "tmdb_id": None, "id": "5"},
+    ]
+    groups = group_by_target(artwork, "movie")
+    assert [[a["id"] for a in group] for group in groups] == [["1", "3"], ["2", "4"], ["5"]]
+
+
+def test_one_session_looks_up_once_and_writes_labels_once():
+    old_poster = _label("PID:", 1)
+    movie = _Movie(labels=[old_poster, "Favourite"])
+    plex = _Plex(movie)
+    processor = _processor(plex)
+
+    with processor.item_session() as session:
+        poster = processor.process_movie_artwork(_artwork(2, "movie_poster"))
+        background = processor.process_movie_artwork(_artwork(3, "background"))
+        # Nothing is written until the session closes
+        assert movie.saves == 0
+
+    assert poster[0].startswith("✅") and background[0].startswith("✅")
+    assert plex.lookups == 1
+    assert movie.label_sets == [["Favourite", _label("PID:", 2), _label("BID:", 3)]]
+    assert movie.remove_calls == [[old_poster]]
+    assert movie.saves == 1
+    assert movie.reloads == 0
+    assert session.problems == []
+
+
+def test_two_posters_for_one_item_leave_one_label():
+    # The second poster replaces the first within the session; only its label may end up on the item.
+    movie = _Movie()
+    processor = _processor(_Plex(movie))
+
+    with processor.item_session():
+        processor.process_movie_artwork(_artwork(2, "movie_poster"))
+        processor.process_movie_artwork(_artwork(3, "movie_poster"))
+
+    assert movie.label_sets == [[_label("PID:", 3)]]
+    assert movie.remove_calls == []
+    assert movie.saves == 1
+
+
+def test_without_a_session_each_upload_writes_its_own_labels():
+    movie = _Movie()
+    plex = _Plex(movie)
+    processor = _processor(plex)
+
+    processor.process_movie_artwork(_artwork(2, "movie_poster"))
+    processor.process_movie_artwork(_artwork(3, "background"))
+
+    assert plex.lookups == 2
+    assert movie.label_sets == [[_label("PID:", 2)], [_label("BID:", 3)]]
+    assert movie.saves == 2
+
+
+def test_a_failed_label_write_is_reported_not_raised():
+    movie = _Movie()
+
+    def broken():
+        raise RuntimeError("Plex went away")
+    movie.saveEdits = broken
+    session = ItemSession()
+    session.label_edits(movie).add("PID:abc")
+
+    session.commit()
+
+    assert len(session.problems) == 1
+    assert session.problems[0].startswith("⚠️ Heat")
+
+
+def test_seasons_and_episodes_are_fetched_once_per_session():
+    class _Episode:
+        def __init__(self, index):
+            self.index = index
+
+    class _Season:
+        ratingKey = 201
+        index = 1
+        calls = 0
+
+        def episodes(self):
+            _Season.calls += 1
+            return [_Episode(1), _Episode(2)]
+
+    class _Show:
+        ratingKey = 200
+        title = "Heat"
+        calls = 0
+
+        def seasons(self):
+            _Show.calls += 1
+            return [_Season()]
+
+    session = ItemSession()
+    show = _Show()
+    for index in (1, 2):
+        assert session.episode(session.season(show, 1), index).index == index
+    assert _Show.calls == 1
+    assert _Season.calls == 1
+    assert session.find_in_library(_Plex(None), MediaType.MOVIE, {"tmdb_id": 1}) == \
+        session.find_in_library(_Plex(None), MediaType.MOVIE, {"tmdb_id": 1})
@@ -0,0 +1,140 @@
+"""Tests for saving Kometa assets without a stat per extension per asset.
+
+Each asset folder is listed once per run, and the listing is kept in step with what the run saves
+and removes. Uploaded files are copied by the OS, and downloads are written in large chunks.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from core.constants import KOMETA_COPY_BUFFER_SIZE
+from kometa.asset_listing import AssetFolderListing
+from kometa.kometa_saver import KometaSaver
+from models.options import Options
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "image/jpeg"}
+
+    def __init__(self):
+        self.chunk_sizes = []
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        self.chunk_sizes.append(chunk_size)
+        yield b"downloaded-bytes"
+
+
+def _saver(folder, listing, name, artwork, force=False):
+    saver = KometaSaver("Poster", "TV Shows")
+    saver.set_artwork(artwork)
+    saver.set_description(name)
+    saver.set_options(Options(force=force))
+    saver.dest_dir = str(folder)
+    saver.dest_file_name = name
+    saver.asset_listing = listing
+    return saver
+
+
+@pytest.fixture
+def counted_scandir(monkeypatch):
+    listed = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        listed.append(os.path.normpath(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr("kometa.asset_listing.os.scandir", scandir)
+    return listed
+
+
+def test_a_folder_is_listed_once_for_every_asset_saved_to_it(tmp_path, monkeypatch, counted_scandir):
+    monkeypatch.setattr("kometa.kometa_saver.requests.get", lambda *a, **k: _FakeResponse())
+    folder = tmp_path / "Show"
+    folder.mkdir()
+    (folder / "S01E02.png").write_bytes(b"already there")
+    listing = AssetFolderListing()
+
+    results = [_saver(folder, listing, f"S01E0{n}", {"id": n, "url": f"https://example.com/{n}", "source": "mediux"})
+               .save_to_kometa() for n in (1, 2, 3)]
+
+    assert counted_scandir == [str(folder)]
+    assert [result[0] for result in results] == ["✅", "⏩", "✅"]
+    assert sorted(os.listdir(folder)) == ["S01E01.jpg", "S01E02.png", "S01E03.jpg"]
+
+
+def test_a_saved_asset_is_seen_by_the_next_check_without_listing_again(tmp_path, monkeypatch, counted_scandir):
+    monkeypatch.setattr("kometa.kometa_saver.requests.get", lambda *a, **k: _FakeResponse())
+    listing = AssetFolderListing()
+    artwork = {"id": 1, "url": "https://example.com/1", "source": "mediux"}
+
+    assert _saver(tmp_path / "New show", listing, "poster", artwork).save_to_kometa().startswith("✅")
+    assert _saver(tmp_path / "New show", listing, "poster", artwork).save_to_kometa().startswith("⏩")
+    assert counted_scandir == [str(tmp_path / "New show")]
+
+
+def test_force_replaces_an_asset_saved_under_another_extension(tmp_path, monkeypatch):
+    response = _FakeResponse()
+    monkeypatch.setattr("kometa.kometa_saver.requests.get", lambda *a, **k: response)
+    (tmp_path / "poster.png").write_bytes(b"old")
+    listing = AssetFolderListing()
+
+    result = _saver(tmp_path, listing, "poster", {"id": 1, "url": "https://example.com/1", "source": "mediux"},
+                    force=True).save_to_kometa()
+
+    assert result.startswith("♻️")
+    assert os.listdir(tmp_path) == ["poster.jpg"]
+    assert listing.existing(str(tmp_path), "poster") == os.path.join(str(tmp_path), "poster.jpg")
+    assert response.chunk_sizes == [KOMETA_COPY_BUFFER_SIZE]
+
+
+def test_an_uploaded_file_is_copied_by_the_os(tmp_path, monkeypatch):
+    source = tmp_path / "upload" / "Show (2020).jpg"
+    source.parent.mkdir()
+    source.write_bytes(b"uploaded")
+    copied = []
+    real_copyfile = shutil.copyfile
+
+    def copyfile(src, dst):
+        copied.append((src, dst))
+        return real_copyfile(src, dst)
+
+    monkeypatch.setattr("kometa.kometa_saver.shutil.copyfile", copyfile)
+    assets = tmp_path / "assets"
+
+    result = _saver(assets, AssetFolderListing(), "poster", {"id": "Upload", "path": str(source)}).save_to_kometa()
+
+    assert result.startswith("✅")
+    assert copied == [(str(source), os.path.join(str(assets), "poster.jpg.tmp"))]
+    assert os.listdir(assets) == ["poster.jpg"]
+    assert (assets / "poster.jpg").read_bytes() == b"uploaded"
+
+
+def test_a_copy_that_fails_part_way_leaves_the_existing_asset_alone(tmp_path, monkeypatch):
+    source = tmp_path / "upload" / "Show (2020).jpg"
+    source.parent.mkdir()
+    source.write_bytes(b"uploaded")
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "poster.jpg").write_bytes(b"old")
+
+    def copyfile(src, dst):
+        with open(dst, "wb") as f:
+            f.write(b"upl")
+        raise OSError("disk full")
+
+    monkeypatch.setattr("kometa.kometa_saver.shutil.copyfile", copyfile)
+
+    result = _saver(assets, AssetFolderListing(), "poster", {"id": "Upload", "path": str(source)},
+                    force=True).save_to_kometa()
+
+    assert result.startswith("❌")
+    assert (assets / "poster.jpg").read_bytes() == b"old"
@@ -0,0 +1,97 @@
+"""Tests for saving Kometa assets on the download pool.
+
+A title's Kometa saves used to run one after another. Inside kometa_saves() they are handed to a
+shared pool, a limited number per host, and each result is still counted and logged as the save
+finishes, before the title is done.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import core.globals as globals
+from kometa.download_pool import KometaDownloadPool
+from processors.upload_processor import UploadProcessor
+
+pytestmark = pytest.mark.unit
+
+
+class _Saver:
+    """Stand-in for a set-up KometaSaver."""
+
+    def __init__(self, url, save=None, description="Heat (1995)"):
+        self.artwork = {"url": url} if url else {"path": "upload.jpg"}
+        self.description = description
+        self._save = save or (lambda: f"✅ {description} | Poster saved")
+
+    def save_to_kometa(self):
+        return self._save()
+
+
+@pytest.fixture(autouse=True)
+def _not_cancelled(monkeypatch):
+    monkeypatch.setattr(globals, "cancel_scrape", False)
+
+
+def test_saves_run_at_the_same_time(monkeypatch):
+    pool = KometaDownloadPool(max_workers=3)
+    together = threading.Barrier(3, timeout=5)  # Only passes if all three are saving at once
+
+    def save():
+        together.wait()
+        return "✅ saved"
+
+    futures = [pool.submit(_Saver(f"https://images.mediux.pro/{n}", save)) for n in range(3)]
+
+    assert [future.result(timeout=5) for future in futures] == ["✅ saved"] * 3
+
+
+def test_no_more_than_the_per_host_limit_download_from_one_host_at_once():
+    pool = KometaDownloadPool(max_workers=6, per_host=2)
+    running = {"mediux": 0, "most": 0}
+    lock = threading.Lock()
+
+    def save():
+        with lock:
+            running["mediux"] += 1
+            running["most"] = max(running["most"], running["mediux"])
+        time.sleep(0.05)
+        with lock:
+            running["mediux"] -= 1
+        return "✅ saved"
+
+    futures = [pool.submit(_Saver(f"https://images.mediux.pro/{n}", save)) for n in range(6)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert running["most"] == 2
+
+
+def test_a_save_queued_when_the_run_is_stopped_is_dropped(monkeypatch):
+    monkeypatch.setattr(globals, "cancel_scrape", True)
+    reported = []
+
+    future = KometaDownloadPool(max_workers=1).submit(_Saver("https://images.mediux.pro/1"), reported.append)
+
+    assert future.result(timeout=5) is None
+    assert reported == []
+
+
+def test_saves_inside_kometa_saves_are_reported_before_the_block_ends(monkeypatch):
+    processor = UploadProcessor.__new__(UploadProcessor)
+    processor._local = threading.local()
+    processor.config = SimpleNamespace(kometa_download_workers=4)
+    reported = []
+
+    def broken():
+        raise RuntimeError("Kometa asset directory went away")
+
+    with processor.kometa_saves(reported.append):
+        first = processor._save_to_kometa(_Saver("https://images.mediux.pro/1", description="Heat (1995)"))
+        second = processor._save_to_kometa(_Saver("https://images.mediux.pro/2", broken))
+
+    assert (first, second) == (None, None)  # Left out of the title's results: reported instead
+    assert sorted(reported) == ["✅ Heat (1995) | Poster saved", "❌ Kometa asset directory went away"]
+    assert processor._save_to_kometa(_Saver(None)) == "✅ Heat (1995) | Poster saved"  # Outside the block: there and then
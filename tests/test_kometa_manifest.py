@@ -0,0 +1,115 @@
+"""Tests for the Kometa asset manifest and how the saver uses it.
+
+With the manifest on, a nightly Kometa sync needs no --force: assets saved from the same artwork
+are skipped, assets whose artwork has changed are replaced, and a changed URL for the same image
+leaves the file alone. Files the manifest doesn't know about are still only replaced when forced.
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from kometa.asset_listing import AssetFolderListing
+from kometa.kometa_saver import KometaSaver
+from models.options import Options
+from services.kometa_manifest import KometaManifest
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "image/jpeg"}
+
+    def __init__(self, body):
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield self._body
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return KometaManifest(str(tmp_path / "config" / "kometa_manifest.db"))
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    images = {}
+
+    def get(url, *args, **kwargs):
+        images.setdefault("fetched", []).append(url)
+        return _FakeResponse(images[url])
+
+    monkeypatch.setattr("kometa.kometa_saver.requests.get", get)
+    return images
+
+
+def _save(assets, manifest, url, force=False):
+    saver = KometaSaver("Poster", "Movies")
+    saver.set_artwork({"id": 1, "url": url, "source": "mediux"})
+    saver.set_description("Heat (1995)")
+    saver.set_options(Options(force=force))
+    saver.dest_dir = str(assets)
+    saver.dest_file_name = "poster"
+    saver.asset_listing = AssetFolderListing()  # A fresh listing, as each run has
+    saver.manifest = manifest
+    return saver.save_to_kometa()
+
+
+def test_the_same_artwork_is_skipped_and_changed_artwork_replaced_without_force(tmp_path, manifest, downloads):
+    assets = tmp_path / "assets" / "Heat (1995)"
+    downloads.update({"https://example.com/a": b"first", "https://example.com/b": b"second"})
+
+    assert _save(assets, manifest, "https://example.com/a").startswith("✅")
+    assert _save(assets, manifest, "https://example.com/a").startswith("⏩")
+    assert downloads["fetched"] == ["https://example.com/a"]
+
+    assert _save(assets, manifest, "https://example.com/b").startswith("♻️")
+    assert (assets / "poster.jpg").read_bytes() == b"second"
+    row = manifest.entry(str(assets), "poster")
+    assert row["content_hash"] == hashlib.md5(b"second").hexdigest()
+
+
+def test_a_new_url_for_the_same_image_leaves_the_file_alone(tmp_path, manifest, downloads):
+    downloads.update({"https://example.com/a": b"same", "https://example.com/a?v=2": b"same"})
+    _save(tmp_path, manifest, "https://example.com/a")
+    os.utime(tmp_path / "poster.jpg", ns=(1, 1))
+
+    result = _save(tmp_path, manifest, "https://example.com/a?v=2")
+
+    assert "skipped (unchanged)" in result
+    assert os.stat(tmp_path / "poster.jpg").st_mtime_ns == 1
+    assert _save(tmp_path, manifest, "https://example.com/a?v=2").startswith("⏩")
+    assert downloads["fetched"] == ["https://example.com/a", "https://example.com/a?v=2"]
+
+
+def test_an_asset_the_manifest_does_not_know_is_only_replaced_when_forced(tmp_path, manifest, downloads):
+    downloads["https://example.com/a"] = b"ours"
+    (tmp_path / "poster.png").write_bytes(b"made by hand")
+
+    assert "skipped (already exists)" in _save(tmp_path, manifest, "https://example.com/a")
+    assert _save(tmp_path, manifest, "https://example.com/a", force=True).startswith("♻️")
+    assert sorted(os.listdir(tmp_path)) == ["config", "poster.jpg"]
+
+
+def test_an_asset_edited_since_it_was_saved_is_no_longer_treated_as_ours(tmp_path, manifest, downloads):
+    downloads.update({"https://example.com/a": b"first", "https://example.com/b": b"second"})
+    _save(tmp_path, manifest, "https://example.com/a")
+    (tmp_path / "poster.jpg").write_bytes(b"touched up by hand")
+
+    assert "skipped (already exists)" in _save(tmp_path, manifest, "https://example.com/b")
+    assert (tmp_path / "poster.jpg").read_bytes() == b"touched up by hand"
+
+
+def test_a_copied_asset_with_the_same_content_is_still_recognised(tmp_path, manifest, downloads):
+    downloads["https://example.com/a"] = b"first"
+    _save(tmp_path, manifest, "https://example.com/a")
+    os.utime(tmp_path / "poster.jpg", ns=(5, 5))
+
+    assert "skipped (unchanged)" in _save(tmp_path, manifest, "https://example.com/a")
+    assert manifest.entry(str(tmp_path), "poster")["mtime_ns"] == 5
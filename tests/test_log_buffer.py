@@ -0,0 +1,127 @@
+"""Tests for the session log kept on the server.
+
+The session log used to exist only as events sent while a browser was connected, so a page that
+reloaded mid-run came back to an empty log. Lines now also go in a numbered ring buffer, and a
+browser catches up from it by sequence number when it loads or a hidden tab is shown.
+"""
+
+import queue
+import re
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import core.globals as globals
+import services.log_buffer as log_buffer
+import web_routes
+from models.instance import Instance
+from services.log_buffer import LogBuffer
+from services.run_worker import RunWorker
+from utils.notifications import update_log
+
+pytestmark = pytest.mark.unit
+
+
+class _StubSocket:
+    """Records handlers registered via @socket.on(event) instead of a real Socket.IO server."""
+
+    def __init__(self):
+        self.handlers = {}
+        self.emit = MagicMock()
+
+    def on(self, event):
+        def register(func):
+            self.handlers[event] = func
+            return func
+        return register
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = LogBuffer(max_lines=3)
+    monkeypatch.setattr(log_buffer, "_shared", buffer)
+    return buffer
+
+
+@pytest.fixture
+def stub_socket(monkeypatch):
+    socket = _StubSocket()
+    monkeypatch.setattr(globals, "web_socket", socket)
+    web_routes.setup_socket_handlers(config=None, filename_pattern=re.compile(r".*"))
+    return socket
+
+
+def test_the_buffer_keeps_the_latest_lines_in_order(buffer):
+    for n in range(5):
+        buffer.append(f"line {n}", "browser-1")
+
+    assert buffer.since(0, "browser-1") == [{"seq": 3, "message": "line 2"}, {"seq": 4, "message": "line 3"},
+                                            {"seq": 5, "message": "line 4"}]
+    assert buffer.since(4, "browser-1") == [{"seq": 5, "message": "line 4"}]
+
+
+def test_a_browser_only_catches_up_on_its_own_lines_and_broadcasts(buffer):
+    buffer.append("mine", "browser-1")
+    buffer.append("theirs", "browser-2")
+    buffer.append("everyone's", "browser-2", broadcast=True)
+
+    assert [line["message"] for line in buffer.since(0, "browser-1")] == ["mine", "everyone's"]
+
+
+def test_logged_lines_are_numbered_and_replayed_to_a_reloaded_page(buffer, stub_socket):
+    with patch("builtins.print"):
+        update_log(Instance("browser-1", "web"), "🎬 Bulk process started")
+        update_log(Instance("browser-1", "web"), "✅ Heat (1995)")
+
+    with patch("web_routes.join_room") as mock_join_room:
+        stub_socket.handlers["get_log"]({"instance_id": "browser-1", "after": 1})
+
+    assert [call.args[0] for call in mock_join_room.call_args_list] == ["log", "log:browser-1"]
+    event, data = stub_socket.emit.call_args.args
+    assert event == "log_replay"
+    assert data["lines"] == [{"seq": 2, "message": "✅ Heat (1995)"}]
+    assert data["instance_id"] == "browser-1"
+
+
+def test_a_hidden_tab_stops_being_sent_the_log(stub_socket):
+    with patch("web_routes.leave_room") as mock_leave_room:
+        stub_socket.handlers["hide_log"]({"instance_id": "browser-1"})
+
+    assert [call.args[0] for call in mock_leave_room.call_args_list] == ["log", "log:browser-1"]
+
+
+def test_lines_from_the_worker_process_are_numbered_in_the_web_process(buffer, monkeypatch):
+    socket = MagicMock()
+    monkeypatch.setattr(globals, "web_socket", socket)
+    buffer.append("logged by the web process", "browser-1")
+    events = queue.Queue()
+    events.put(("emit", "log_update", {"lines": [{"seq": 1, "message": "from the worker"}],
+                                       "instance_id": "browser-1", "broadcast": False}, {}, "log:browser-1"))
+
+    RunWorker("config/config.json")._forward(MagicMock(is_alive=lambda: False), events)
+
+    assert socket.emit.call_args.args[1]["lines"] == [{"seq": 2, "message": "from the worker"}]
+    assert socket.emit.call_args.kwargs == {"to": "log:browser-1"}
+    assert buffer.since(1, "browser-1") == [{"seq": 2, "message": "from the worker"}]
+
+
+def test_lines_logged_on_several_threads_are_queued_in_the_order_they_are_numbered(buffer, monkeypatch):
+    queued = []
+
+    class _Bus:
+        def emit(self, event, data, room=None):
+            time.sleep(0.001 * (data["seq"] % 3))  # Some threads are slower to hand their line on
+            queued.append(data["seq"])
+
+    monkeypatch.setattr("utils.notifications.shared_web_event_bus", lambda: _Bus())
+    with patch("builtins.print"):
+        threads = [threading.Thread(target=update_log, args=(Instance("browser-1", "web"), f"✅ Title {n}"))
+                   for n in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert queued == sorted(queued) and len(queued) == 12
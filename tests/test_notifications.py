@@ -27,6 +27,11 @@ from utils.notifications import send_notification
 SCHEDULE_ID = str(uuid.uuid4())
 
 
+@pytest.fixture(autouse=True)
+def _runs_stay_out_of_config(run_history, shared_bulk_queue):
+    """Bulk imports run here record their runs and queue their files in tmp_path."""
+
+
 @pytest.mark.unit
 def test_legacy_string_urls_migrate_to_default_events(tmp_path):
     """A pre-existing config.json with a bare list of URL strings must come back as
@@ -355,7 +360,7 @@ def test_mid_run_crash_after_processing_is_not_reported_as_failed_to_start():
 
         call_count = {"n": 0}
 
-        def flaky_scrape_and_upload(inst, url, options, bulk, tally=None):
+        def flaky_scrape_and_upload(inst, url, options, bulk, tally=None, lane=None):
             call_count["n"] += 1
             if call_count["n"] == 1:
                 tally.assets(1)
@@ -432,7 +437,7 @@ def test_an_upload_that_exhausted_its_retries_sends_completed_with_errors():
         def fake_send_notification(inst, message, event=None):
             events_sent.append(event)
 
-        def fake_scrape(instance, url, options, bulk, tally=None):
+        def fake_scrape(instance, url, options, bulk, tally=None, lane=None):
             tally.assets(1)
             tally.failed(1)
 
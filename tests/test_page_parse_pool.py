@@ -0,0 +1,147 @@
+"""Tests for parsing ThePosterDB user pages in worker processes.
+
+With tpdb_parse_workers set, a user crawl fetches pages ahead on threads and has them parsed in a
+pool of worker processes, which send back each page's poster records rather than a soup. The
+crawl must come out exactly as it does when it parses every page itself: same artwork, same
+order, same early stop.
+"""
+
+import os
+import time
+
+import pytest
+from bs4 import BeautifulSoup
+
+import services.page_parse_pool as page_parse_pool
+from models.callbacks import ProcessingCallbacks
+from models.options import Options
+from scrapers.theposterdb_scraper import ThePosterDBScraper, parse_user_page, poster_records
+from services.page_parse_pool import PageParsePool, shared_page_parse_pool
+
+POSTER_GRID_CLASS = "row d-flex flex-wrap m-0 w-100 mx-n1 mt-n1"
+USER_URL = "https://theposterdb.com/user/someone"
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cwd(tmp_path, monkeypatch):
+    # Config.load() writes config/config.json when it's missing; keep that out of the repo.
+    os.makedirs(tmp_path / "config", exist_ok=True)
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def shared_pool(monkeypatch):
+    monkeypatch.setattr(page_parse_pool, "_shared", None)
+    yield
+    if page_parse_pool._shared is not None:
+        page_parse_pool._shared.shutdown()
+
+
+def _tile(poster_id, media_type, title):
+    return f"""
+    <div class="col-6 col-lg-2 p-1">
+      <a class="text-white" data-toggle="tooltip" data-placement="top" title="{media_type}">x</a>
+      <div class="overlay" data-poster-id="{poster_id}"></div>
+      <p class="p-0 mb-1 text-break">{title}</p>
+    </div>
+    """
+
+
+def _page(page, tiles=24):
+    """A user uploads page mixing movies, shows and collections, as raw bytes."""
+    kinds = [("Movie", "Film {id} (2020)"), ("Show", "Series {id} (2019) - Season 2"),
+             ("Collection", "Saga {id} Collection")]
+    html = "".join(_tile(page * 1000 + i, kinds[i % 3][0], kinds[i % 3][1].format(id=page * 1000 + i))
+                   for i in range(tiles))
+    return (f'<html><body><p class="h1 mb-0 mr-md-1"><a>someone</a></p>'
+            f'<main><div class="{POSTER_GRID_CLASS}">{html}</div></main></body></html>').encode("utf-8")
+
+
+def _serve(pages, count):
+    """Fake cook_soup and fetch_page serving the base user page and its numbered upload pages."""
+    base = (f'<span class="numCount" data-count="{count}"></span>'
+            f'<p class="h1 mb-0 mr-md-1"><a>someone</a></p>').encode("utf-8")
+
+    def fetch_page(url):
+        if "page=" not in url:
+            return base
+        return pages[int(url.rsplit("page=", 1)[1]) - 1]
+
+    return fetch_page, lambda url: BeautifulSoup(fetch_page(url), "html.parser")
+
+
+def _crawl(monkeypatch, pages, count, workers):
+    fetch_page, cook_soup = _serve(pages, count)
+    monkeypatch.setattr("utils.soup_utils.fetch_page", fetch_page)
+    monkeypatch.setattr("utils.soup_utils.cook_soup", cook_soup)
+    scraper = ThePosterDBScraper(USER_URL, ProcessingCallbacks())
+    scraper.set_options(Options())
+    scraper.config.tpdb_parse_workers = workers
+    scraper.scrape()
+    return scraper
+
+
+def test_a_page_parses_to_the_same_records_as_its_poster_grid():
+    page = _page(1)
+    soup = BeautifulSoup(page, "html.parser")
+
+    records = parse_user_page(page)
+
+    assert records == poster_records(soup.find("div", class_=POSTER_GRID_CLASS))
+    assert records[0] == {"media_type": "Movie", "id": "1000", "title": "Film 1000 (2020)"}
+    assert all(type(record["title"]) is str for record in records)  # Not a NavigableString
+
+
+def test_pages_parsed_in_the_pool_come_back_in_order():
+    pages = [_page(page, tiles=3 + page) for page in range(6)]
+    pool = PageParsePool(2)
+    try:
+        results = pool.parse_all(pages)
+    finally:
+        pool.shutdown()
+
+    assert results == [parse_user_page(page) for page in pages]
+
+
+def test_a_crawl_through_the_pool_collects_what_an_in_thread_crawl_does(monkeypatch, shared_pool):
+    # Four pages of uploads and an upload count that overshoots them by two pages
+    pages = [_page(page) for page in range(4)] + [_page(4, tiles=0), _page(5)]
+
+    in_thread = _crawl(monkeypatch, pages, 6 * 24, workers=0)
+    pooled = _crawl(monkeypatch, pages, 6 * 24, workers=2)
+
+    assert page_parse_pool._shared is not None
+    for kind in ("movie_artwork", "tv_artwork", "collection_artwork"):
+        strip = lambda artwork: [{k: v for k, v in item.items() if k != "url"} for item in artwork]
+        assert strip(getattr(pooled, kind)) == strip(getattr(in_thread, kind))
+    assert len(pooled.movie_artwork) + len(pooled.tv_artwork) + len(pooled.collection_artwork) == 4 * 24
+    assert (pooled.total, pooled.skipped) == (in_thread.total, in_thread.skipped)
+
+
+def test_no_pool_without_workers_or_inside_a_daemon_process(monkeypatch, shared_pool):
+    assert shared_page_parse_pool(0) is None
+
+    class _Daemon:
+        daemon = True
+
+    monkeypatch.setattr(page_parse_pool.multiprocessing, "current_process", lambda: _Daemon())
+    assert shared_page_parse_pool(2) is None
+
+
+@pytest.mark.slow
+@pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="needs at least two cores to show scaling")
+def test_benchmark_parse_throughput_scales_with_workers():
+    pages = [_page(page, tiles=24) for page in range(96)]
+    throughput = {}
+    for workers in sorted({1, 2, min(os.cpu_count(), 4)}):
+        pool = PageParsePool(workers)
+        try:
+            pool.parse_all(pages[:workers])  # Start the worker processes before timing
+            started = time.perf_counter()
+            pool.parse_all(pages)
+            throughput[workers] = len(pages) / (time.perf_counter() - started)
+        finally:
+            pool.shutdown()
+
+    print("\nPages parsed per second: " + ", ".join(f"{w} worker(s) {rate:.0f}" for w, rate in throughput.items()))
+    assert throughput[max(throughput)] > throughput[1] * 1.3
@@ -43,11 +43,19 @@ class _Target:
     def uploadPoster(self, url=None, filepath=None):
         self.uploaded.append(url or filepath)
 
-    def addLabel(self, label):
-        self.labels.append(str(label))
+    def batchEdits(self):
+        pass
+
+    def edit(self, **edits):
+        # LabelEdits sends the whole label set as label[0].tag.tag, label[1].tag.tag, ...
+        self.labels = [value for key, value in edits.items() if key.startswith("label[") and key.endswith("].tag.tag")]
+
+    def saveEdits(self):
+        pass
 
-    def removeLabel(self, label, *args):
-        self.labels = [existing for existing in self.labels if str(existing) != str(label)]
+    def removeLabel(self, labels, *args):
+        removed = {str(label) for label in (labels if isinstance(labels, list) else [labels])}
+        self.labels = [existing for existing in self.labels if str(existing) not in removed]
 
     def reload(self):
         pass
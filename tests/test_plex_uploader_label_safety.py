@@ -44,20 +44,30 @@ class _Target:
         self.ratingKey = rating_key
         self.uploaded = []
         self.fail_upload = False
+        self.label_calls = 0
+        self.reloads = 0
 
     def uploadPoster(self, url=None, filepath=None):
         if self.fail_upload:
             raise RuntimeError("Plex upload failed")
         self.uploaded.append(url or filepath)
 
-    def addLabel(self, label):
-        self.labels.append(str(label))
+    def batchEdits(self):
+        pass
+
+    def edit(self, **edits):
+        # LabelEdits sends the whole label set as label[0].tag.tag, label[1].tag.tag, ...
+        self.labels = [value for key, value in edits.items() if key.startswith("label[") and key.endswith("].tag.tag")]
 
-    def removeLabel(self, label, *args):
-        self.labels = [existing for existing in self.labels if str(existing) != str(label)]
+    def saveEdits(self):
+        self.label_calls += 1  # One request for the whole batch
+
+    def removeLabel(self, labels, *args):
+        removed = {str(label) for label in (labels if isinstance(labels, list) else [labels])}
+        self.labels = [existing for existing in self.labels if str(existing) not in removed]
 
     def reload(self):
-        pass
+        self.reloads += 1
 
 
 def _uploader(target, candidate_id, *, confirm_match=None):
@@ -107,3 +117,32 @@ def test_declined_match_keeps_the_existing_label():
     assert result.startswith("⚠️")
     assert old in target.labels
     assert target.uploaded == []
+
+
+def test_label_changes_are_written_together_without_reloads():
+    # Two stale labels of our type and Kometa's Overlay label all come off, and the new label goes
+    # on, in one request - not a request and a full reload per label.
+    stale = [_label("PID:", 666275), _label("PID:", 666276)]
+    target = _Target(labels=stale + ["Overlay", "Favourite"])
+    uploader = _uploader(target, 670744)
+    uploader.reset_overlay = True
+
+    result = uploader.upload_to_plex()
+
+    assert result.startswith("✅")
+    assert target.labels == ["Favourite", _label("PID:", 670744)]
+    assert target.label_calls == 1
+    assert target.reloads == 0
+
+
+def test_failed_upload_keeps_the_overlay_label():
+    # The Overlay label is only taken off once the new artwork is on, so Kometa doesn't re-apply
+    # its overlay to artwork that never changed.
+    target = _Target(labels=["Overlay"])
+    target.fail_upload = True
+    uploader = _uploader(target, 670744)
+    uploader.reset_overlay = True
+
+    uploader.upload_to_plex()
+
+    assert target.labels == ["Overlay"]
@@ -0,0 +1,158 @@
+"""Tests for the executor every Plex write goes through.
+
+Titles used to be applied one after another, each waiting on its Plex round trips, and every
+run wrote to Plex on its own. The write executor runs them side by side, never two at once that
+could touch the same item, backs off when Plex slows down or starts failing, and lets urgent
+runs (a webhook import) go ahead of a scheduled bulk run.
+"""
+
+import threading
+
+import pytest
+import requests
+
+from core.enums import WorkLane
+from plex.plex_uploader import PlexUploader
+from plex.write_executor import PlexWriteExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = PlexWriteExecutor(max_workers=4, min_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+def test_work_on_different_items_runs_at_the_same_time(executor):
+    both_running = threading.Barrier(2, timeout=5)
+
+    futures = [executor.submit(both_running.wait, keys={("movie", key)}) for key in ("heat", "ronin")]
+
+    for future in futures:
+        future.result(timeout=5)  # A BrokenBarrierError here means they ran one at a time
+
+
+def test_work_on_the_same_item_never_overlaps(executor):
+    running = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def write():
+        with lock:
+            running.append(1)
+            overlaps.append(len(running))
+        threading.Event().wait(0.01)
+        with lock:
+            running.pop()
+
+    futures = [executor.submit(write, keys={("movie", "heat")}) for _ in range(5)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert max(overlaps) == 1
+
+
+def test_work_waiting_for_an_item_does_not_hold_up_other_items(executor):
+    release = threading.Event()
+    first = executor.submit(lambda: release.wait(5), keys={"heat"})
+    blocked = executor.submit(lambda: "second heat", keys={"heat"})
+    other = executor.submit(lambda: "ronin", keys={"ronin"})
+
+    assert other.result(timeout=5) == "ronin"
+    assert not blocked.done()
+    release.set()
+    assert blocked.result(timeout=5) == "second heat"
+    assert first.result(timeout=5) is True
+
+
+def test_concurrency_grows_while_plex_keeps_up_and_halves_when_it_struggles():
+    now = [0.0]
+    executor = PlexWriteExecutor(max_workers=8, latency_target=2, clock=lambda: now[0])
+    try:
+        for _ in range(60):
+            executor.observe(0.5)
+        assert executor.limit == 8
+
+        executor.observe(0.5, congested=True)
+        assert executor.limit == 4
+        executor.observe(3.0)  # Slow, but from the same burst: not halved again
+        assert executor.limit == 4
+
+        now[0] = 5.0
+        executor.observe(3.0)
+        assert executor.limit == 2
+        for _ in range(5):
+            now[0] += 5
+            executor.observe(0.5, congested=True)
+        assert executor.limit == 1
+    finally:
+        executor.shutdown()
+
+
+def test_the_uploader_reports_each_write_attempt():
+    observed = []
+
+    class _Response:
+        status_code = 503
+
+    def failing_write():
+        raise requests.exceptions.HTTPError("503", response=_Response())
+
+    uploader = PlexUploader(object(), "Poster", "PID:")
+    uploader.write_observer = lambda latency, congested: observed.append(congested)
+
+    assert uploader.observed(lambda: "ok")() == "ok"
+    with pytest.raises(requests.exceptions.HTTPError):
+        uploader.observed(failing_write)()
+
+    assert observed == [False, True]
+
+
+def _run_in_order(executor, submissions):
+    """Queue submissions [(label, lane, run)] behind a blocker on a one-slot executor, then let
+       them go and return the order they ran in."""
+    gate = threading.Event()
+    order = []
+    blocker = executor.submit(lambda: gate.wait(5))
+    futures = [executor.submit(lambda label=label: order.append(label), lane=lane, run=run)
+               for label, lane, run in submissions]
+    gate.set()
+    blocker.result(timeout=5)
+    for future in futures:
+        future.result(timeout=5)
+    return order
+
+
+def test_a_webhook_import_goes_ahead_of_a_queued_bulk_run():
+    executor = PlexWriteExecutor(max_workers=1)
+    try:
+        order = _run_in_order(executor, [("bulk 1", WorkLane.BULK, "nightly"),
+                                         ("bulk 2", WorkLane.BULK, "nightly"),
+                                         ("webhook", WorkLane.WEBHOOK, "sonarr")])
+    finally:
+        executor.shutdown()
+
+    assert order[0] == "webhook"
+
+
+def test_a_flood_of_webhooks_does_not_stop_a_bulk_run():
+    executor = PlexWriteExecutor(max_workers=1)
+    try:
+        order = _run_in_order(executor, [("bulk", WorkLane.BULK, "nightly")] +
+                              [(f"webhook {n}", WorkLane.WEBHOOK, n) for n in range(20)])
+    finally:
+        executor.shutdown()
+
+    assert order.index("bulk") < 12
+
+
+def test_runs_in_the_same_lane_take_turns():
+    executor = PlexWriteExecutor(max_workers=1)
+    try:
+        order = _run_in_order(executor, [("a1", WorkLane.BULK, "a"), ("a2", WorkLane.BULK, "a"),
+                                         ("a3", WorkLane.BULK, "a"), ("b1", WorkLane.BULK, "b"),
+                                         ("b2", WorkLane.BULK, "b")])
+    finally:
+        executor.shutdown()
+
+    assert order == ["a1", "b1", "a2", "b2", "a3"]
@@ -22,10 +22,8 @@ OUTCOME_SKIPPED = RunOutcome.SKIPPED.value
 
 
 @pytest.fixture
-def history(tmp_path, monkeypatch):
-    real_history = RunHistory(str(tmp_path / "run_history.json"))
-    monkeypatch.setattr("artwork_uploader.RunHistory", lambda: real_history)
-    return real_history
+def history(run_history, shared_bulk_queue):
+    return run_history
 
 
 @pytest.fixture(autouse=True)
@@ -44,7 +42,7 @@ def test_successful_run_is_recorded_with_its_counters(history):
     globals.plex = MagicMock(tv_libraries=MagicMock(), movie_libraries=MagicMock())
     globals.config = MagicMock(apprise_urls=[])
 
-    def fake_scrape(instance, url, options, bulk, tally=None):
+    def fake_scrape(instance, url, options, bulk, tally=None, lane=None):
         tally.assets(1)
         tally.success(1)
         tally.cached(1)
@@ -187,7 +185,7 @@ def test_an_upload_that_exhausted_its_retries_is_counted_as_an_error(history):
     globals.plex = MagicMock(tv_libraries=MagicMock(), movie_libraries=MagicMock())
     globals.config = MagicMock(apprise_urls=[])
 
-    def fake_scrape(instance, url, options, bulk, tally=None):
+    def fake_scrape(instance, url, options, bulk, tally=None, lane=None):
         tally.assets(1)
         tally.failed(1)
 
@@ -0,0 +1,198 @@
+"""Tests for running scrapes and bulk imports in a worker process.
+
+With use_worker_process on, the web process sends each run to a worker process over a queue and
+emits what the worker sends back, so the run's CPU-heavy work can't hold up the web server. These
+drive both ends in one process, over ordinary queues, with the worker's Plex connection and runs
+faked.
+"""
+
+import queue
+import threading
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+import core.globals as globals
+from artwork_uploader import process_scrape_url_from_web, request_scrape_stop
+from core.config import Config
+from models.instance import Instance
+from services import run_worker
+from services.run_worker import RunWorker, worker_main
+from services.webhook_service import WebhookEvent
+from services.web_event_bus import shared_web_event_bus
+from utils.notifications import notify_web
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def restore_globals():
+    saved = (globals.web_socket, globals.config, globals.plex, globals.debug, globals.docker,
+             globals.run_worker, globals.scrapes_running, globals.scrape_type, globals.webhook_service)
+    try:
+        yield
+    finally:
+        (globals.web_socket, globals.config, globals.plex, globals.debug, globals.docker,
+         globals.run_worker, globals.scrapes_running, globals.scrape_type, globals.webhook_service) = saved
+        globals.cancel_scrape = False
+
+
+class _FakeProcess:
+    def __init__(self, alive=True):
+        self.alive = alive
+
+    def is_alive(self):
+        return self.alive
+
+
+def test_the_worker_sends_browser_events_back_with_its_scrape_state():
+    events = queue.Queue()
+    globals.web_socket = run_worker._QueueSocket(events)
+    globals.scrapes_running = 1
+    globals.scrape_type = "bulk"
+
+    notify_web(Instance("browser-1", "web"), "log_update", {"message": "🎬 Bulk process started"})
+    shared_web_event_bus().flush()
+
+    kind, event, data, state, room = events.get(timeout=5)
+    assert (kind, event) == ("emit", "log_update")
+    assert [line["message"] for line in data["lines"]] == ["🎬 Bulk process started"]
+    assert data["instance_id"] == "browser-1"
+    assert state["scrapes_running"] == 1 and state["scrape_type"] == "bulk"
+    assert room == "log:browser-1"  # The web process sends it on to the same room
+
+
+def test_the_worker_runs_what_it_is_sent_and_says_when_each_is_done(tmp_path):
+    tasks, events = queue.Queue(), queue.Queue()
+    ran = []
+
+    with patch("plex.plex_connector.PlexConnector"), \
+         patch("artwork_uploader.process_scrape_url_from_web", side_effect=lambda instance, url: ran.append((instance.id, url))), \
+         patch("artwork_uploader.run_bulk_import", side_effect=lambda instance, *args: ran.append((instance.id,) + args)):
+        worker = threading.Thread(target=worker_main, args=(tasks, events, str(tmp_path / "config.json"), False, False))
+        worker.start()
+        tasks.put(("run", 1, "scrape", ("browser-1", "web", False), ("https://mediux.pro/sets/1",)))
+        tasks.put(("run", 2, "bulk", ("browser-2", "web", True), ("https://mediux.pro/sets/2", "nightly.txt", None, False)))
+
+        done = {}
+        while len(done) < 2:
+            message = events.get(timeout=5)
+            if message[0] == "done":
+                done[message[1]] = message[2]
+        tasks.put(None)
+        worker.join(timeout=5)
+
+    assert done == {1: None, 2: None}
+    assert ("browser-1", "https://mediux.pro/sets/1") in ran
+    assert ("browser-2", "https://mediux.pro/sets/2", "nightly.txt", None, False) in ran
+
+
+def test_a_webhook_import_is_queued_in_the_worker_next_to_its_runs(tmp_path):
+    tasks, events = queue.Queue(), queue.Queue()
+    event = WebhookEvent("movie", "Heat", 1995, 949, None, frozenset(), "radarr")
+
+    with patch("plex.plex_connector.PlexConnector"), patch("services.webhook_service.WebhookService") as service:
+        worker = threading.Thread(target=worker_main, args=(tasks, events, str(tmp_path / "config.json"), False, False))
+        worker.start()
+        tasks.put(("run", 1, "webhook", (None, "web", True), (event,)))
+        while events.get(timeout=5)[:2] != ("done", 1):
+            pass
+        tasks.put(None)
+        worker.join(timeout=5)
+
+    service.return_value.enqueue.assert_called_once_with(event)
+
+
+def test_plex_settings_saved_between_runs_reach_the_worker(tmp_path):
+    config_path = str(tmp_path / "config.json")
+    config = Config(config_path)
+    config.load()
+    config.base_url, config.token, config.tv_library = "http://plex:32400", "first-token", ["TV Shows"]
+    config.save()
+    tasks, events = queue.Queue(), queue.Queue()
+
+    def run(task_id):
+        tasks.put(("run", task_id, "scrape", ("browser-1", "web", False), ("https://mediux.pro/sets/1",)))
+        while events.get(timeout=5)[:2] != ("done", task_id):
+            pass
+
+    with patch("plex.plex_connector.PlexConnector") as connector, \
+         patch("artwork_uploader.process_scrape_url_from_web"):
+        plex = connector.return_value
+        worker = threading.Thread(target=worker_main, args=(tasks, events, config_path, False, False))
+        worker.start()
+        run(1)
+        plex.set_tv_libraries.assert_called_once_with(["TV Shows"])  # At start-up only
+
+        config.tv_library = ["TV Shows", "Anime"]
+        config.save()
+        run(2)
+        config.token = "second-token"
+        config.save()
+        run(3)
+        tasks.put(None)
+        worker.join(timeout=5)
+
+    assert plex.set_tv_libraries.call_args_list[1:] == [call(["TV Shows", "Anime"])]
+    plex.set_movie_libraries.assert_called_once()  # The movie libraries didn't change
+    plex.reconnect.assert_called_once()
+    assert plex.reconnect.call_args.args[0].token == "second-token"
+
+
+def test_the_web_process_emits_what_the_worker_sends_and_releases_the_run():
+    socket = MagicMock()
+    globals.web_socket = socket
+    events = queue.Queue()
+    process = _FakeProcess()
+    worker = RunWorker("config/config.json")
+    done = threading.Event()
+    worker._pending[7] = {"done": done, "error": None, "process": process}
+    forwarder = threading.Thread(target=worker._forward, args=(process, events))
+    forwarder.start()
+
+    state = {"scrapes_running": 1, "scrape_type": "scrape", "main_bar": {"percent": 50}, "bulk_bar": {}}
+    events.put(("emit", "progress_bar", {"percent": 50}, state, None))
+    events.put(("done", 7, None))
+
+    assert done.wait(timeout=5)
+    assert worker._pending[7]["error"] is None
+    socket.emit.assert_called_with("progress_bar", {"percent": 50})
+    assert worker.running() is True
+    process.alive = False
+    forwarder.join(timeout=5)
+
+
+def test_runs_fail_rather_than_hang_when_the_worker_dies():
+    globals.web_socket = MagicMock()
+    process = _FakeProcess(alive=False)
+    worker = RunWorker("config/config.json")
+    done = threading.Event()
+    worker._pending[3] = {"done": done, "error": None, "process": process}
+
+    worker._forward(process, queue.Queue())
+
+    assert done.is_set()
+    assert "stopped unexpectedly" in worker._pending[3]["error"]
+    assert worker.running() is False
+
+
+def test_a_scrape_goes_to_the_worker_when_there_is_one():
+    globals.run_worker = MagicMock()
+    globals.run_worker.run.return_value = None
+    instance = Instance("browser-1", "web")
+
+    with patch("artwork_uploader.RunHistory") as mock_run_history:
+        process_scrape_url_from_web(instance, "https://mediux.pro/sets/1")
+
+    globals.run_worker.run.assert_called_once_with("scrape", instance, "https://mediux.pro/sets/1")
+    mock_run_history.assert_not_called()  # The worker records the run, not the web process
+
+
+def test_stop_is_passed_on_to_the_worker():
+    globals.run_worker = MagicMock()
+    globals.run_worker.running.return_value = True
+    globals.scrapes_running = 0
+
+    assert request_scrape_stop() is True
+    globals.run_worker.stop_scrape.assert_called_once()
+    assert globals.cancel_scrape is False
@@ -10,7 +10,6 @@ already in flight, and choosing whether a missed run is caught up or just logged
 from datetime import datetime as real_datetime
 from unittest.mock import MagicMock, patch
 import uuid
-import schedule
 
 import pytest
 
@@ -301,8 +300,7 @@ def test_setup_scheduler_aligns_next_run_on_startup(scheduler):
         def now(cls, tz=None):
             return fake_now
 
-    with patch.object(schedule.datetime, "datetime", MockDateTime), \
-         patch("artwork_uploader.datetime", MockDateTime), \
+    with patch("artwork_uploader.datetime", MockDateTime), \
          patch("services.scheduler_service.datetime", MockDateTime), \
          patch("models.bulk_schedule.datetime", MockDateTime), \
          patch("artwork_uploader.update_log"), \
@@ -2,32 +2,24 @@
 config.json schedule migration, missed-run catch-up logic and the overlap guard."""
 
 import json
+import threading
 from datetime import datetime
 from unittest.mock import patch
 
 import pytest
-import schedule
 
 from core.config import Config
 from models.bulk_schedule import BulkSchedule
 from services.scheduler_service import SchedulerService
 
 
-@pytest.fixture(autouse=True)
-def clean_schedule_registry():
-    """The `schedule` library keeps a module-level job registry, so clear it around every test."""
-    schedule.clear()
-    yield
-    schedule.clear()
-
-
 @pytest.fixture
 def service():
     return SchedulerService()
 
 
 def run_job(service, job_id):
-    """Directly invoke a scheduled job's function, without waiting for the schedule library's clock."""
+    """Directly invoke a scheduled job's function, without waiting for it to come due."""
     service.scheduled_jobs[job_id].job_func()
 
 
@@ -139,7 +131,7 @@ def test_rename_file_moves_every_schedule_for_that_file(service):
 
 @pytest.mark.unit
 def test_rename_file_does_not_recreate_the_underlying_job(service):
-    """Renaming should only touch metadata - the schedule library job stays the same object."""
+    """Renaming should only touch metadata - the scheduled job stays the same object."""
     job_id = service.add_schedule(BulkSchedule(file="old.txt", time="02:00"), lambda f: None)
     job_before = service.scheduled_jobs[job_id]
 
@@ -177,7 +169,7 @@ def test_clear_all_schedules(service):
 
     assert service.get_all_job_ids() == []
     assert service.schedule_meta == {}
-    assert len(schedule.jobs) == 0
+    assert service.run_pending() is None
 
 
 # ------------------------------- config.json migration -------------------------------
@@ -475,4 +467,99 @@ def test_overlap_guard_blocks_a_second_start_for_the_same_file():
 def test_overlap_guard_is_independent_per_file():
     service = SchedulerService()
     assert service.try_start("a.txt") is True
-    assert service.try_start("b.txt") is True
\ No newline at end of file
+    assert service.try_start("b.txt") is True
+
+# ------------------------------- run timing -------------------------------
+
+class FakeClock:
+    """A clock the test moves by hand, so when a job runs doesn't depend on when the test does."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+def test_a_daily_schedule_runs_exactly_at_its_time_and_then_tomorrow():
+    clock = FakeClock(datetime(2026, 8, 9, 1, 59, 30))
+    service = SchedulerService(clock=clock)
+    calls = []
+    job_id = service.add_schedule(BulkSchedule(file="bulk_a.txt", time="02:00"), calls.append)
+
+    assert service.run_pending() == 30
+    assert calls == []
+
+    clock.now = datetime(2026, 8, 9, 2, 0)
+    assert service.run_pending() == 24 * 60 * 60
+    assert calls == ["bulk_a.txt"]
+    assert service.scheduled_jobs[job_id].next_run == datetime(2026, 8, 10, 2, 0)
+
+
+@pytest.mark.unit
+def test_an_interval_schedule_repeats_from_when_it_ran():
+    clock = FakeClock(datetime(2026, 8, 9, 8, 0))
+    service = SchedulerService(clock=clock)
+    calls = []
+    sched = BulkSchedule(file="bulk_a.txt", interval_value=6, interval_unit="hours", next_run="2026-08-09T08:00:00")
+    job_id = service.add_schedule(sched, calls.append)
+
+    clock.now = datetime(2026, 8, 9, 8, 0, 5)
+    service.run_pending()
+
+    assert calls == ["bulk_a.txt"]
+    assert service.scheduled_jobs[job_id].last_run == datetime(2026, 8, 9, 8, 0, 5)
+    assert service.scheduled_jobs[job_id].next_run == datetime(2026, 8, 9, 14, 0, 5)
+
+
+@pytest.mark.unit
+def test_the_wait_is_until_the_earliest_schedule():
+    clock = FakeClock(datetime(2026, 8, 9, 1, 0))
+    service = SchedulerService(clock=clock)
+    service.add_schedule(BulkSchedule(file="late.txt", time="05:00"), lambda f: None)
+    assert service.run_pending() == 4 * 60 * 60
+
+    early = service.add_schedule(BulkSchedule(file="early.txt", time="01:10"), lambda f: None)
+    assert service.run_pending() == 10 * 60
+
+    service.remove_schedule(early)
+    assert service.run_pending() == 4 * 60 * 60
+
+
+@pytest.mark.unit
+def test_a_removed_schedule_never_runs():
+    clock = FakeClock(datetime(2026, 8, 9, 1, 0))
+    service = SchedulerService(clock=clock)
+    calls = []
+    job_id = service.add_schedule(BulkSchedule(file="bulk_a.txt", time="02:00"), calls.append)
+    service.remove_schedule(job_id)
+
+    clock.now = datetime(2026, 8, 9, 2, 0)
+
+    assert service.run_pending() is None
+    assert calls == []
+
+
+@pytest.mark.unit
+def test_an_invalid_time_of_day_is_refused():
+    with pytest.raises(ValueError):
+        SchedulerService().add_schedule(BulkSchedule(file="bulk_a.txt", time="25:00"), lambda f: None)
+
+
+@pytest.mark.unit
+def test_adding_a_schedule_wakes_the_sleeping_scheduler():
+    """With nothing scheduled the thread sleeps for max_sleep (an hour here); a schedule added
+    while it sleeps must run when it is due, not when the sleep runs out."""
+    clock = FakeClock(datetime(2026, 8, 9, 8, 0))
+    service = SchedulerService(max_sleep=3600, clock=clock)
+    ran = threading.Event()
+    service.start()
+    try:
+        sched = BulkSchedule(file="bulk_a.txt", interval_value=1, interval_unit="hours", next_run="2026-08-09T07:59:00")
+        service.add_schedule(sched, lambda f: ran.set())
+
+        assert ran.wait(timeout=5)
+    finally:
+        service.stop()
+    assert not service.scheduler_thread.is_alive()
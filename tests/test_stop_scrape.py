@@ -67,7 +67,7 @@ def test_cancel_scrape_breaks_crawl_and_blocks_partial_upload():
 
         calls = {"n": 0}
 
-        def fake_scrape_user_page(page):
+        def fake_scrape_user_page(page, parsed=None):
             calls["n"] += 1
             if calls["n"] == 2:
                 globals.cancel_scrape = True
@@ -0,0 +1,70 @@
+"""Tests for keeping ThePosterDB page requests spaced out when titles are processed in parallel.
+
+Title groups are processed on several threads at once, and each can fetch a poster page to read
+its TMDb ID. Those pages now wait their turn with ThePosterDB's images, and a page that several
+titles want at the same time is only fetched once.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from processors.upload_processor import UploadProcessor
+from utils import soup_utils
+
+pytestmark = pytest.mark.unit
+
+PAGE = '<html><div data-media-id="949"></div></html>'
+
+
+class _Response:
+    text = PAGE
+    content = PAGE.encode()
+
+    def raise_for_status(self):
+        pass
+
+
+def test_theposterdb_pages_wait_their_turn_with_its_images(monkeypatch):
+    waited, fetched = [], []
+    monkeypatch.setattr(soup_utils.rate_limiter, "wait", waited.append)
+    monkeypatch.setattr(soup_utils.requests, "get", lambda url, **kwargs: fetched.append(url) or _Response())
+
+    soup_utils.cook_soup("https://theposterdb.com/poster/1")
+    soup_utils.fetch_page("https://theposterdb.com/user/someone?section=uploads&page=2")
+
+    assert waited == fetched == ["https://theposterdb.com/poster/1",
+                                 "https://theposterdb.com/user/someone?section=uploads&page=2"]
+
+
+def test_a_poster_page_wanted_by_several_titles_at_once_is_fetched_once(monkeypatch):
+    processor = UploadProcessor.__new__(UploadProcessor)
+    processor._opening = threading.Lock()
+    processor._tpdb_media_ids = {}
+    processor._tpdb_page_locks = {}
+    processor._match_confirm_cache = {}
+    fetched = []
+
+    def cook_soup(url):
+        fetched.append(url)
+        time.sleep(0.05)  # Long enough for the other titles to ask while it is being fetched
+        return soup_utils.BeautifulSoup(PAGE, "html.parser")
+
+    monkeypatch.setattr(soup_utils, "cook_soup", cook_soup)
+    plex_item = MagicMock(guids=[MagicMock(id="tmdb://949")])
+    results = []
+
+    def confirm(year):
+        artwork = {"id": "670744", "title": "Heat", "year": year, "tmdb_id": None}
+        results.append(processor._artwork_matches_item(artwork, plex_item, "movie"))
+
+    threads = [threading.Thread(target=confirm, args=(1995 + n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetched == ["https://theposterdb.com/poster/670744"]
+    assert results == [True] * 4
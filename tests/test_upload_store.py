@@ -0,0 +1,159 @@
+"""Tests for ZIP uploads from the browser.
+
+Uploads used to arrive as base64 chunks over socket.io, each one decoded on the server thread and
+each one starting a timer thread. They now arrive over HTTP as raw bytes, a slice at a time,
+written straight to the upload's temp file. A browser that loses its connection asks where the
+server got to and carries on from there, and one reaper thread drops uploads that were abandoned.
+"""
+
+import os
+import re
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+import core.globals as globals
+import services.upload_store as upload_store
+import web_routes
+from services.upload_store import UploadStore
+from services.web_event_bus import WebEventBus
+
+pytestmark = pytest.mark.unit
+
+FILE = bytes(range(256)) * 4096  # 1 MB
+
+
+class _StubSocket:
+    """Records handlers registered via @socket.on(event) instead of a real Socket.IO server."""
+
+    def __init__(self):
+        self.handlers = {}
+        self.emit = MagicMock()
+
+    def on(self, event):
+        def register(func):
+            self.handlers[event] = func
+            return func
+        return register
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = UploadStore()
+    monkeypatch.setattr(upload_store, "_shared", store)
+    yield store
+    for upload_id in list(store._uploads):
+        store.discard(upload_id)
+
+
+@pytest.fixture
+def socket(monkeypatch):
+    socket = _StubSocket()
+    monkeypatch.setattr(globals, "web_socket", socket)
+    monkeypatch.setattr("services.web_event_bus._shared", WebEventBus(frame_seconds=60))
+    monkeypatch.setattr(globals, "config", None)  # No password protection
+    monkeypatch.setattr(globals, "scrapes_running", 0)
+    monkeypatch.setattr(globals, "cancel_scrape", False)
+    monkeypatch.setattr(globals, "scrape_type", "stopped")
+    monkeypatch.setattr(globals, "main_bar", {})
+    return socket
+
+
+@pytest.fixture
+def client(store, socket):
+    web_app = Flask(__name__)
+    web_routes.setup_routes(web_app, config=None)
+    return web_app.test_client()
+
+
+def _put(client, first, last, total=len(FILE), upload_id="abc123", body=None):
+    return client.put(f"/api/upload/{upload_id}", data=FILE[first:last + 1] if body is None else body, headers={
+        "Content-Range": f"bytes {first}-{last}/{total}",
+        "X-File-Name": "Heat%20(1995)%20set.zip",
+        "X-Instance-Id": "browser-1",
+    })
+
+
+def test_a_file_sent_in_slices_is_written_to_disk_as_sent(client, store):
+    half = len(FILE) // 2
+
+    first = _put(client, 0, half - 1)
+    assert (first.status_code, first.get_json()) == (200, {"received": half, "complete": False})
+    assert globals.scrapes_running == 1 and globals.scrape_type == "upload"
+
+    second = _put(client, half, len(FILE) - 1)
+    assert (second.status_code, second.get_json()) == (200, {"received": len(FILE), "complete": True})
+
+    upload = store.status("abc123")
+    assert upload.file_name == "Heat (1995) set.zip"
+    with open(upload.path, "rb") as upload_file:
+        assert upload_file.read() == FILE
+
+
+def test_a_browser_that_lost_its_connection_carries_on_from_where_the_server_got_to(client, store):
+    # The first slice only partly arrived before the connection dropped
+    _put(client, 0, 999, body=FILE[:600])
+
+    assert client.get("/api/upload/abc123").get_json() == {"received": 600, "complete": False}
+    refused = _put(client, 1000, len(FILE) - 1)
+    assert (refused.status_code, refused.get_json()["received"]) == (409, 600)
+
+    assert _put(client, 600, len(FILE) - 1).status_code == 200
+    with open(store.status("abc123").path, "rb") as upload_file:
+        assert upload_file.read() == FILE
+    assert globals.scrapes_running == 1  # Still the one upload
+
+
+@pytest.mark.parametrize("upload_id, content_range", [
+    ("../../etc", "bytes 0-9/10"),
+    ("abc123", ""),
+    ("abc123", "bytes 9-0/10"),
+    ("abc123", "bytes 0-10/10"),
+])
+def test_a_slice_with_a_bad_id_or_range_is_refused(client, store, upload_id, content_range):
+    response = client.put(f"/api/upload/{upload_id}", data=b"x" * 10,
+                          headers={"Content-Range": content_range, "X-File-Name": "set.zip"})
+
+    assert response.status_code in (400, 404)
+    assert store.status(upload_id) is None
+
+
+def test_a_canceled_upload_is_dropped_and_the_scrape_state_reset(client, store):
+    _put(client, 0, 999)
+    globals.cancel_scrape = True
+
+    assert _put(client, 1000, 1999).status_code == 410
+    assert store.status("abc123") is None
+    assert (globals.scrapes_running, globals.cancel_scrape, globals.scrape_type) == (0, False, "stopped")
+
+
+def test_one_reaper_drops_every_upload_left_idle():
+    expired = []
+    done = threading.Event()
+    store = UploadStore(timeout=0.05, on_expired=lambda upload: (expired.append(upload), len(expired) == 2 and done.set()))
+    uploads, reapers = [], set()
+    for n in range(2):
+        uploads.append(store.start(f"upload-{n}", "set.zip", 10)[0])
+        reapers.add(store._reaper)
+
+    assert done.wait(timeout=5)
+    assert len(reapers) == 1
+    assert sorted(upload.upload_id for upload in expired) == ["upload-0", "upload-1"]
+    assert not any(os.path.exists(upload.path) for upload in uploads)
+
+
+def test_a_finished_upload_is_processed_from_its_temp_file_and_then_deleted(client, store, socket):
+    _put(client, 0, len(FILE) - 1)
+    path = store.status("abc123").path
+    web_routes.setup_socket_handlers(config=None, filename_pattern=re.compile(r".*"))
+
+    with patch("web_routes.save_uploaded_file") as mock_save:
+        socket.handlers["upload_complete"]({"instance_id": "browser-1", "upload_id": "abc123",
+                                            "fileName": "Heat (1995) set.zip", "options": [], "filters": []})
+
+    assert mock_save.call_args.args[1] == "Heat (1995) set.zip"
+    assert mock_save.call_args.args[6] == path
+    assert store.status("abc123") is None
+    assert not os.path.exists(path)
@@ -42,7 +42,7 @@ def _fill(pages):
     """Return a fake scrape_user_page that fills the catalog from `pages` (dict page->id list)."""
     fetched = []
 
-    def fake(page, catalog=None):
+    def fake(page, catalog=None, parsed=None):
         fetched.append(page)
         for asset_id in pages.get(page, []):
             catalog.append(_asset(asset_id))
@@ -75,7 +75,7 @@ def test_a_failed_page_still_marks_the_crawl_unclean(tmp_path, monkeypatch):
     scraper.user_pages = 3
     index = AssetIndex(str(tmp_path / "idx.db"))
 
-    def fake(page, catalog=None):
+    def fake(page, catalog=None, parsed=None):
         if page == 1:
             return False                         # a genuine fetch failure, not an empty page
         for asset_id in range(page * 1000, page * 1000 + 24):
@@ -96,7 +96,7 @@ def test_a_cancelled_crawl_is_unclean_and_stops(tmp_path, monkeypatch):
 
     pages_fetched = []
 
-    def fake(page, catalog=None):
+    def fake(page, catalog=None, parsed=None):
         pages_fetched.append(page)
         for asset_id in range(page * 1000, page * 1000 + 24):
             catalog.append(_asset(asset_id))
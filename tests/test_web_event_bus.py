@@ -0,0 +1,159 @@
+"""Tests for the bus that sends events to the browser.
+
+Every log line, progress tick and upload chunk used to be its own socket.io event. The bus sends
+progress at most once a frame per bar, log lines together once a frame, and only the latest
+status, while keeping everything the browser is shown - and the order it is shown in - the same.
+Each event goes only to the pages of the instance it is for, unless it is for everyone.
+"""
+
+import re
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import core.globals as globals
+import web_routes
+from models.instance import Instance
+from services.web_event_bus import WebEventBus
+from utils.notifications import notify_web
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def socket(monkeypatch):
+    socket = MagicMock()
+    monkeypatch.setattr(globals, "web_socket", socket)
+    return socket
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    # A frame long enough that nothing is sent unless the test flushes
+    bus = WebEventBus(frame_seconds=60)
+    monkeypatch.setattr("services.web_event_bus._shared", bus)
+    return bus
+
+
+def _sent(socket):
+    return [(call.args[0], call.args[1]) for call in socket.emit.call_args_list]
+
+
+def _to(instance_id, **data):
+    return data | {"instance_id": instance_id, "instance_mode": "web", "broadcast": False}
+
+
+def test_a_thousand_updates_in_a_frame_go_out_as_one_of_each(socket, bus):
+    browser = Instance("browser-1", "web")
+    for n in range(1000):
+        notify_web(browser, "progress_bar", {"percent": n / 10, "message": f"Asset {n}", "bar_type": "main"})
+        notify_web(browser, "log_update", {"message": f"✅ Asset {n}"})
+        notify_web(browser, "status_update", {"message": f"Uploading asset {n}"})
+
+    assert socket.emit.call_count == 0
+    bus.flush()
+
+    sent = _sent(socket)
+    assert [event for event, _ in sent] == ["log_update", "status_update", "progress_bar"]
+    assert [line["message"] for line in sent[0][1]["lines"]] == [f"✅ Asset {n}" for n in range(1000)]
+    assert socket.emit.call_args_list[0].kwargs == {"to": "log:browser-1"}  # Only to its pages showing the log
+    assert sent[1][1]["message"] == "Uploading asset 999"
+    assert (sent[2][1]["percent"], sent[2][1]["message"]) == (99.9, "Asset 999")
+
+
+def test_each_bar_and_each_browser_keeps_its_own_updates(socket, bus):
+    bus.emit("progress_bar", _to("browser-1", percent=10, bar_type="main"))
+    bus.emit("progress_bar", _to("browser-1", percent=50, bar_type="bulk"))
+    bus.emit("progress_bar", _to("browser-2", percent=20, bar_type="main"))
+    bus.emit("log_update", _to("browser-1", message="one", seq=1))
+    bus.emit("log_update", _to("browser-2", message="two", seq=2))
+    bus.flush()
+
+    sent = _sent(socket)
+    assert [(data["instance_id"], data["percent"]) for event, data in sent if event == "progress_bar"] == \
+        [("browser-1", 10), ("browser-1", 50), ("browser-2", 20)]
+    assert [(data["instance_id"], data["lines"]) for event, data in sent if event == "log_update"] == \
+        [("browser-1", [{"seq": 1, "message": "one"}]), ("browser-2", [{"seq": 2, "message": "two"}])]
+
+
+def test_a_finished_bar_and_other_events_go_out_at_once_after_what_is_waiting(socket, bus):
+    bus.emit("log_update", _to("browser-1", message="🎬 Bulk process started"))
+    bus.emit("progress_bar", _to("browser-1", percent=95, bar_type="main"))
+    bus.emit("progress_bar", _to("browser-1", percent=40, bar_type="bulk"))
+    bus.emit("progress_bar", _to("browser-1", percent=100, bar_type="main"))
+    bus.emit("scrape_state", _to("browser-1", running=False))
+
+    sent = _sent(socket)
+    assert [event for event, _ in sent] == ["log_update", "progress_bar", "progress_bar", "scrape_state"]
+    assert [data["percent"] for event, data in sent if event == "progress_bar"] == [40, 100]  # 95 was superseded
+
+
+def test_what_is_waiting_is_sent_when_the_frame_ends(socket):
+    bus = WebEventBus(frame_seconds=0.05)
+    sent = threading.Event()
+    socket.emit.side_effect = lambda event, data, **kwargs: sent.set()
+
+    bus.emit("log_update", _to("browser-1", message="🔄 Processing", seq=7))
+
+    assert sent.wait(timeout=5)
+    assert _sent(socket) == [("log_update", _to("browser-1", lines=[{"seq": 7, "message": "🔄 Processing"}]))]
+
+
+def test_the_debug_line_is_only_built_in_debug_mode(socket, bus, monkeypatch):
+    monkeypatch.setattr(globals, "debug", False)
+    with patch("utils.notifications.debug_me") as mock_debug_me:
+        notify_web(Instance("browser-1", "web"), "progress_bar", {"percent": 5})
+
+    mock_debug_me.assert_not_called()
+
+
+def test_events_go_only_to_the_pages_of_their_instance_unless_they_are_for_everyone(socket, bus):
+    notify_web(Instance("browser-1", "web"), "load_bulk_import", {"loaded": True})
+    notify_web(Instance("browser-1", "web", broadcast=True), "add_to_bulk_list", {"url": "https://mediux.pro/sets/1"})
+    notify_web(Instance("browser-1", "web"), "scrape_state", {"running": True, "type": "bulk"})
+    notify_web(Instance("browser-1", "web"), "status_update", {"message": "Uploading"})
+    bus.flush()
+
+    assert [(call.args[0], call.kwargs.get("to")) for call in socket.emit.call_args_list] == [
+        ("load_bulk_import", "instance:browser-1"),
+        ("add_to_bulk_list", None),
+        ("scrape_state", None),
+        ("status_update", "instance:browser-1"),
+    ]
+
+
+def test_a_page_joins_its_instance_room_when_it_connects(monkeypatch):
+    handlers = {}
+    stub = MagicMock()
+    stub.on = lambda event: lambda func: handlers.setdefault(event, func)
+    monkeypatch.setattr(globals, "web_socket", stub)
+    web_routes.setup_socket_handlers(config=None, filename_pattern=re.compile(r".*"))
+
+    with patch("web_routes.join_room") as mock_join_room:
+        handlers["connect"]({"instance_id": "browser-1"})
+        handlers["connect"](None)  # An older page without an instance id still connects
+
+    mock_join_room.assert_called_once_with("instance:browser-1")
+
+
+def test_a_run_started_in_a_page_only_sends_its_progress_to_that_page(socket, bus, monkeypatch):
+    handlers = {}
+    stub = MagicMock()
+    stub.on = lambda event: lambda func: handlers.setdefault(event, func)
+    monkeypatch.setattr(globals, "web_socket", stub)
+    started = []
+
+    # Patched while the handlers are set up, which is when they import it
+    with patch("artwork_uploader.run_bulk_import_scrape_in_thread", side_effect=lambda instance, *args, **kwargs: started.append(instance)):
+        web_routes.setup_socket_handlers(config=None, filename_pattern=re.compile(r".*"))
+        handlers["start_bulk_import"]({"instance_id": "browser-1", "bulk_list": "https://mediux.pro/sets/1"})
+
+    monkeypatch.setattr(globals, "web_socket", socket)
+    notify_web(started[0], "progress_bar", {"percent": 100, "bar_type": "bulk"})
+    notify_web(started[0], "scrape_state", {"running": False, "type": "bulk"})
+
+    assert [(call.args[0], call.kwargs.get("to")) for call in socket.emit.call_args_list] == [
+        ("progress_bar", "instance:browser-1"),
+        ("scrape_state", None),  # Every page still hears that a run started or stopped
+    ]
@@ -0,0 +1,235 @@
+"""Tests for reading artwork out of an uploaded ZIP.
+
+Each image used to be read into memory whole and written out, read again to hash it, and opened
+with PIL up to three times to find its orientation. It is now copied once, a buffer at a time,
+hashed as it is copied, and its dimensions are read from the first buffer. Members the filters
+can't let through aren't extracted at all, the rest are extracted a few at a time, and each
+title is looked up in Plex once per ZIP. Unless extract_zip_uploads is on, nothing is extracted:
+the artwork is uploaded straight out of the ZIP.
+"""
+
+import hashlib
+import io
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+import core.globals as globals
+import web_routes
+from core.constants import VALID_FILENAME_PATTERN
+from services.artwork_processor import ArtworkProcessor
+from services.image_service import ImageService
+from services.utility_service import UtilityService
+from utils.zip_member import artwork_source, open_artwork
+from web_routes import extract_and_list_zip, extract_zip_member, memoized_media_lookup, save_uploaded_file
+
+pytestmark = pytest.mark.unit
+
+
+def _image(width, height, image_format="JPEG", **params):
+    image_bytes = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(image_bytes, format=image_format, **params)
+    return image_bytes.getvalue()
+
+
+def _zip(tmp_path, members):
+    zip_path = tmp_path / "Heat set.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, data in members.items():
+            zip_file.writestr(name, data)
+    return str(zip_path)
+
+
+@pytest.fixture
+def quiet(monkeypatch):
+    for name in ("notify_web", "update_log", "debug_me"):
+        monkeypatch.setattr(web_routes, name, MagicMock())
+    monkeypatch.setattr(globals, "cancel_scrape", False)
+    monkeypatch.setattr(globals, "main_bar", {})
+
+
+def test_a_member_is_hashed_and_measured_while_it_is_extracted(tmp_path):
+    poster = _image(1000, 1500)
+    # Image data well past the first buffer, so most of the file is copied after its header
+    background = _image(3840, 2160, image_format="PNG", compress_level=0)
+    zip_path = _zip(tmp_path, {"posters/Heat (1995).jpg": poster, "Heat (1995) - Background.png": background})
+
+    with zipfile.ZipFile(zip_path) as zip_ref:
+        results = [extract_zip_member(zip_ref, zip_info, str(tmp_path / f"member-{n}"))
+                   for n, zip_info in enumerate(zip_ref.infolist())]
+
+    assert results == [(hashlib.md5(poster).hexdigest(), (1000, 1500)),
+                       (hashlib.md5(background).hexdigest(), (3840, 2160))]
+    assert (tmp_path / "member-1").read_bytes() == background
+
+
+def test_a_header_that_is_not_an_image_has_no_dimensions():
+    assert ImageService.dimensions_from_header(b"not an image") is None
+    assert ImageService.dimensions_from_header(_image(20, 10)[:40]) is None  # Cut off before the size
+
+
+def test_orientation_comes_from_the_header_without_opening_the_file_again(tmp_path, quiet, monkeypatch):
+    zip_path = _zip(tmp_path, {
+        "source.txt": "Title: Heat\nAuthor: someone\n",
+        "Heat (1995).jpg": _image(1000, 1500),
+        "Heat (1995) - Background.jpg": _image(1920, 1080),
+        "Heat (1995) - Square.jpg": _image(1000, 1000),
+    })
+    monkeypatch.setattr(globals, "plex", MagicMock(movie_or_show=lambda title, year: ("Movie", 949, title, year)))
+    check_orientation = MagicMock(side_effect=ImageService.check_orientation)
+
+    artwork, skipped, title, author, source = extract_and_list_zip(
+        MagicMock(), zip_path, re.compile(VALID_FILENAME_PATTERN, re.IGNORECASE), [], None, None,
+        check_orientation, UtilityService.sort_key)
+
+    check_orientation.assert_not_called()
+    assert (title, author, skipped) == ("Heat", "someone", 0)
+    assert sorted(item["file_type"] for item in artwork) == ["background", "movie_poster", "square_art"]
+    for item in artwork:
+        with open(item["path"], "rb") as artwork_file:
+            assert item["checksum"] == hashlib.md5(artwork_file.read()).hexdigest()
+        os.remove(item["path"])
+    os.rmdir(os.path.dirname(artwork[0]["path"]))  # Nothing else, like source.txt, was left behind
+
+
+def test_only_members_the_filters_could_let_through_are_extracted_or_looked_up(tmp_path, quiet, monkeypatch):
+    members = {"source.txt": "Title: Breaking Bad\nAuthor: someone\n",
+               "Breaking Bad (2008).jpg": _image(1000, 1500),
+               "Breaking Bad (2008) - Background.jpg": _image(1920, 1080)}
+    for season in range(1, 4):
+        members[f"Breaking Bad (2008) - Season {season}.jpg"] = _image(1000, 1500)
+        for episode in range(1, 4):
+            members[f"Breaking Bad (2008) - S{season:02} E{episode:02}.jpg"] = _image(1920, 1080)
+    zip_path = _zip(tmp_path, members)
+    plex = MagicMock(movie_or_show=MagicMock(side_effect=lambda title, year: ("TV Show", 1396, title, year)))
+    monkeypatch.setattr(globals, "plex", plex)
+    extracted = MagicMock(side_effect=extract_zip_member)
+    monkeypatch.setattr(web_routes, "extract_zip_member", extracted)
+
+    def upload(filters):
+        artwork, skipped, *_ = extract_and_list_zip(
+            MagicMock(), zip_path, re.compile(VALID_FILENAME_PATTERN, re.IGNORECASE), filters, None, None,
+            ImageService.check_orientation, UtilityService.sort_key)
+        for item in artwork:
+            os.remove(item["path"])
+        return [(item["season"], item["episode"], item["file_type"]) for item in artwork], skipped
+
+    everything, _ = upload([])
+    extracted.reset_mock()
+    plex.movie_or_show.reset_mock()
+
+    title_cards, skipped = upload(["title_card"])
+
+    assert title_cards == [item for item in everything if item[2] == "title_card"]
+    assert skipped == 5  # The show's poster and background, and the season covers
+    assert extracted.call_count == 9
+    assert plex.movie_or_show.call_count == 1  # One show, looked up once for the whole ZIP
+
+
+def test_each_title_is_looked_up_once_however_many_threads_ask():
+    release = threading.Event()
+    calls = []
+
+    def movie_or_show(title, year):
+        calls.append((title, year))
+        release.wait(timeout=5)
+        return "Movie", 949, "Mission: Impossible", year
+
+    lookup = memoized_media_lookup(movie_or_show)
+    titles = ["Mission: Impossible", "Mission - Impossible", "mission impossible"] * 4
+    with ThreadPoolExecutor(max_workers=len(titles)) as pool:
+        results = [pool.submit(lookup, title, 1996) for title in titles]
+        release.set()
+
+    assert calls == [("Mission: Impossible", 1996)]
+    assert {result.result() for result in results} == {("Movie", 949, "Mission: Impossible", 1996)}
+    lookup("Mission: Impossible", 2023)
+    assert len(calls) == 2  # A different year is a different title
+
+
+def test_a_failed_lookup_is_tried_again_by_the_next_file():
+    answers = iter([("Error", None, None, None), ("TV Show", 1396, "Breaking Bad", 2008)])
+    lookup = memoized_media_lookup(lambda title, year: next(answers))
+
+    assert lookup("Breaking Bad", 2008)[0] == "Error"
+    assert lookup("Breaking Bad", 2008)[0] == "TV Show"
+
+
+def test_members_with_the_same_name_in_different_folders_each_keep_their_own_file(tmp_path, quiet, monkeypatch):
+    zip_path = _zip(tmp_path, {"posters/Heat (1995).jpg": _image(1000, 1500),
+                               "backgrounds/Heat (1995).jpg": _image(1920, 1080)})
+    monkeypatch.setattr(globals, "plex", MagicMock(movie_or_show=lambda title, year: ("Movie", 949, title, year)))
+
+    artwork, *_ = extract_and_list_zip(
+        MagicMock(), zip_path, re.compile(VALID_FILENAME_PATTERN, re.IGNORECASE), [], None, None,
+        ImageService.check_orientation, UtilityService.sort_key)
+
+    assert len({item["path"] for item in artwork}) == 2
+    assert sorted(item["file_type"] for item in artwork) == ["background", "movie_poster"]
+    for item in artwork:
+        assert os.path.basename(item["path"]) == "Heat (1995).jpg"
+        with open(item["path"], "rb") as artwork_file:
+            assert item["checksum"] == hashlib.md5(artwork_file.read()).hexdigest()
+
+
+def test_artwork_read_in_place_leaves_nothing_on_disk(tmp_path, quiet, monkeypatch):
+    poster, background = _image(1000, 1500), _image(1920, 1080)
+    zip_path = _zip(tmp_path, {"source.txt": "Title: Heat\nAuthor: someone\n",
+                               "posters/Heat (1995).jpg": poster,
+                               "Heat (1995) - Background.jpg": background})
+    monkeypatch.setattr(globals, "plex", MagicMock(movie_or_show=lambda title, year: ("Movie", 949, title, year)))
+    monkeypatch.setattr(web_routes.tempfile, "mkdtemp", MagicMock(side_effect=AssertionError("Nothing is extracted")))
+
+    with zipfile.ZipFile(zip_path) as archive:
+        artwork, *_ = extract_and_list_zip(
+            MagicMock(), zip_path, re.compile(VALID_FILENAME_PATTERN, re.IGNORECASE), [], None, None,
+            ImageService.check_orientation, UtilityService.sort_key, archive)
+
+        by_type = {item["file_type"]: item for item in artwork}
+        assert by_type["movie_poster"]["path"] == "posters/Heat (1995).jpg"
+        assert artwork_source(by_type["movie_poster"]) == poster
+        with open_artwork(by_type["background"]) as artwork_file:
+            assert artwork_file.read() == background
+        assert by_type["background"]["checksum"] == hashlib.md5(background).hexdigest()
+        ArtworkProcessor(MagicMock(), MagicMock())._remove_extracted_file(by_type["background"])  # Nothing to delete
+        assert zipfile.ZipFile(zip_path).namelist() == archive.namelist()
+
+
+def test_an_extracted_artwork_is_still_read_from_its_file(tmp_path):
+    path = tmp_path / "Heat (1995).jpg"
+    path.write_bytes(b"poster")
+
+    assert artwork_source({"path": str(path)}) == str(path)
+    with open_artwork({"path": str(path)}) as artwork_file:
+        assert artwork_file.read() == b"poster"
+
+
+@pytest.mark.parametrize("extract", [False, True])
+def test_the_uploaded_zip_is_deleted_once_its_artwork_is_processed(tmp_path, quiet, monkeypatch, extract):
+    upload_path = _zip(tmp_path, {"Heat (1995).jpg": _image(1000, 1500)})
+    monkeypatch.setattr(globals, "plex", MagicMock(movie_or_show=lambda title, year: ("Movie", 949, title, year)))
+    monkeypatch.setattr(globals, "config", MagicMock(extract_zip_uploads=extract))
+    monkeypatch.setattr(globals, "scrapes_running", 1)
+    monkeypatch.setattr(web_routes, "update_status", MagicMock())
+    processed = {}
+
+    def process_uploaded_artwork(instance, artwork, *args, **kwargs):
+        # Each artwork can be read while it is processed, from the ZIP or from its extracted file
+        with open_artwork(artwork[0]) as artwork_file:
+            processed[artwork[0]["path"]] = artwork_file.read()
+        ArtworkProcessor(MagicMock(), MagicMock())._remove_extracted_file(artwork[0])
+
+    monkeypatch.setattr("artwork_uploader.process_uploaded_artwork", process_uploaded_artwork)
+    save_uploaded_file(MagicMock(), "Heat set.zip", [], [], None, None, upload_path,
+                       re.compile(VALID_FILENAME_PATTERN, re.IGNORECASE), ImageService.check_orientation,
+                       UtilityService.sort_key)
+
+    assert list(processed.values()) == [_image(1000, 1500)]
+    assert os.path.isabs(next(iter(processed))) == extract
+    assert not os.path.exists(upload_path)
@@ -0,0 +1,140 @@
+"""
+Fetches artwork images for upload to Plex.
+
+Plex used to be handed the image URL and left to fetch it, once per library the item was in,
+so an item in a 4K and an HD library was fetched from ThePosterDB twice and waited out the
+rate limit delay twice. Images are now fetched here, once per asset, through one shared
+session and a per-host rate limiter, and the same bytes are uploaded to every library. With an
+ImageCache, an image fetched on an earlier run isn't fetched at all.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from core.constants import TPDB_RATE_LIMIT_DELAY, DEFAULT_KOMETA_DOWNLOAD_TIMEOUT, DEFAULT_UPLOAD_RETRY_ATTEMPTS, DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS
+from core.retry import call_with_retry
+from utils.notifications import debug_me
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+class HostRateLimiter:
+    """
+    Keeps requests to a host at least its interval apart, across every thread using it. Hosts
+    without an interval are not limited. clock and sleep can be swapped out in tests.
+    """
+
+    def __init__(self, intervals: Dict[str, float], clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.intervals = intervals
+        self.clock = clock
+        self.sleep = sleep
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _interval_for(self, host: str) -> Optional[tuple]:
+        for domain, interval in self.intervals.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return domain, interval
+        return None
+
+    def wait(self, url: str) -> None:
+        """Block until a request to url's host is allowed, and book the slot."""
+        match = self._interval_for(urlparse(url).hostname or "")
+        if match is None:
+            return
+        domain, interval = match
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next_allowed.get(domain, now))
+            self._next_allowed[domain] = start + interval
+        if start > now:
+            self.sleep(start - now)
+
+
+session = requests.Session()
+session.headers.update(_HEADERS)
+rate_limiter = HostRateLimiter({"theposterdb.com": TPDB_RATE_LIMIT_DELAY})
+
+
+def fetch_image(url: str, timeout: float = DEFAULT_KOMETA_DOWNLOAD_TIMEOUT,
+                attempts: int = DEFAULT_UPLOAD_RETRY_ATTEMPTS,
+                backoff: float = DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS) -> requests.Response:
+    """GET an image through the shared session and rate limiter, retrying a transient failure.
+       Each attempt waits its turn with the rate limiter, retries included."""
+    def _fetch():
+        rate_limiter.wait(url)
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response
+
+    response, _ = call_with_retry(_fetch, attempts, backoff)
+    return response
+
+
+class RemoteImage:
+    """
+    One artwork image, fetched the first time its bytes are asked for and kept for every upload
+    after that. A fetch that failed is remembered too, so the other libraries report the same
+    error rather than each trying again. Never fetched at all if nothing needs uploading.
+
+    Given an image cache, the cache is asked first and a fresh fetch is stored in it. The cache
+    only ever saves a download: if it can't be read or written, the image is fetched as usual.
+    """
+
+    def __init__(self, url: str, timeout: float = DEFAULT_KOMETA_DOWNLOAD_TIMEOUT,
+                 attempts: int = DEFAULT_UPLOAD_RETRY_ATTEMPTS,
+                 backoff: float = DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS, cache=None) -> None:
+        self.url = url
+        self.cache = cache
+        self.timeout = timeout
+        self.attempts = attempts
+        self.backoff = backoff
+        self._content: Optional[bytes] = None
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    def content(self) -> bytes:
+        with self._lock:
+            if self._content is None and self._error is None:
+                self._content = self._from_cache()
+            if self._content is None and self._error is None:
+                try:
+                    debug_me(f"Fetching image from '{self.url}'", "RemoteImage")
+                    response = fetch_image(self.url, self.timeout, self.attempts, self.backoff)
+                    self._content = response.content
+                except Exception as e:
+                    self._error = e
+                else:
+                    self._to_cache(response)
+            if self._error is not None:
+                raise self._error
+            return self._content
+
+    def _from_cache(self) -> Optional[bytes]:
+        if self.cache is None:
+            return None
+        try:
+            cached = self.cache.get(self.url)
+            if cached is not None:
+                debug_me(f"Using cached image for '{self.url}'", "RemoteImage")
+                return cached.read()
+        except Exception as e:
+            debug_me(f"Image cache could not be read, fetching instead: {e}", "RemoteImage")
+        return None
+
+    def _to_cache(self, response: requests.Response) -> None:
+        if self.cache is None:
+            return
+        try:
+            self.cache.put(self.url, response.content, response.headers.get("Content-Type"))
+        except Exception as e:
+            debug_me(f"Could not add '{self.url}' to the image cache: {e}", "RemoteImage")
@@ -3,8 +3,10 @@ from datetime import datetime
 from core import globals
 from pprint import pprint
 from models.instance import Instance
-from core.constants import BOOTSTRAP_COLORS, ANSI_RESET, ANSI_BOLD
+from core.constants import BOOTSTRAP_COLORS, ANSI_RESET, ANSI_BOLD, BROADCAST_EVENTS
 from services.notify_service import NotifyService
+from services.web_event_bus import shared_web_event_bus, instance_room
+from services.log_buffer import shared_log_buffer
 
 # For backwards compatibility
 bootstrap_colors = BOOTSTRAP_COLORS
@@ -104,11 +106,15 @@ def update_log(instance: Instance, update_text: str, broadcast: bool = False) ->
         if instance.mode == "web":
             if not instance.broadcast and broadcast:
                 instance.broadcast = broadcast
-            notify_web(
-                instance=instance,
-                event="log_update",
-                data_to_include={"message": update_text}
-            )
+            # Kept so a browser that reloads, or a tab that was hidden, can catch up on it
+            buffer = shared_log_buffer()
+            with buffer.in_order():
+                seq = buffer.append(update_text, instance.id, instance.broadcast)
+                notify_web(
+                    instance=instance,
+                    event="log_update",
+                    data_to_include={"message": update_text, "seq": seq}
+                )
     except Exception as e:
         # Fail silently for logging errors to avoid cascading failures
         if globals.debug:
@@ -125,9 +131,12 @@ def notify_web(instance: Instance, event, data_to_include = None, silent=False):
         }
         payload = data_to_include or {}
         merged_arguments = payload | instance_data
-        if not silent:
+        # Only build the debug line when it will be printed: for a busy run it is most of the cost
+        if not silent and globals.debug:
             debug_me(f"{ANSI_BOLD}{BOOTSTRAP_COLORS.get('secondary').get('ansi')}[{event}]{ANSI_RESET} {merged_arguments}")
-        globals.web_socket.emit(event, merged_arguments)
+        # Only the pages of this instance are sent it, unless it's for everyone
+        broadcast = instance.broadcast or instance.id is None or event in BROADCAST_EVENTS
+        shared_web_event_bus().emit(event, merged_arguments, room=None if broadcast else instance_room(instance.id))
 
 def send_notification(instance: Instance, message: str, event: str = None) -> None:
 
@@ -1,6 +1,7 @@
 import requests
 from bs4 import BeautifulSoup
 from core.exceptions import ScraperException
+from utils.image_fetcher import rate_limiter
 from utils.utils import is_valid_url
 
 
@@ -8,29 +9,41 @@ from utils.utils import is_valid_url
 # Cook Soup - Implements Beautiful Soup HTML Parser
 # -------------------------------------------------
 
-def cook_soup(url):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
-        'Sec-Ch-Ua-Mobile': '?0',
-        'Sec-Ch-Ua-Platform': 'Windows'
-    }
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
+    'Sec-Ch-Ua-Mobile': '?0',
+    'Sec-Ch-Ua-Platform': 'Windows'
+}
+
+
+def _get(url):
+    # ThePosterDB pages wait their turn with its images, however many titles are being processed at once
+    rate_limiter.wait(url)
+    try:
+        response = requests.get(url, headers=HEADERS, timeout=5)
+        response.raise_for_status()
+    except requests.exceptions.Timeout:
+        raise ScraperException(f"Connection timed out (5 seconds) for URL: {url}")
+    except requests.exceptions.ConnectionError:
+        raise ScraperException(f"Could not connect to server, check your internet connection or the site's status")
+    except requests.exceptions.HTTPError as e:
+        if response.status_code == 500 and "mediux.pro" in url:
+            pass
+        else:
+            raise ScraperException(f"Site returned an error (Status: {response.status_code})")
+    except requests.exceptions.RequestException as e:
+        raise ScraperException(f"Network error: {type(e).__name__}")
+    return response
+
 
+def fetch_page(url):
+    """The raw bytes of a page, unparsed, for the page parse pool to parse in another process."""
+    return _get(url).content
+
+
+def cook_soup(url):
     if is_valid_url(url):
-        try:
-            response = requests.get(url, headers=headers, timeout=5)
-            response.raise_for_status()
-        except requests.exceptions.Timeout:
-            raise ScraperException(f"Connection timed out (5 seconds) for URL: {url}")
-        except requests.exceptions.ConnectionError:
-            raise ScraperException(f"Could not connect to server, check your internet connection or the site's status")
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 500 and "mediux.pro" in url:
-                pass
-            else:
-                raise ScraperException(f"Site returned an error (Status: {response.status_code})")
-        except requests.exceptions.RequestException as e:
-            raise ScraperException(f"Network error: {type(e).__name__}")
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(_get(url).text, 'html.parser')
         return soup
 
     elif ".html" in url:
@@ -0,0 +1,50 @@
+"""
+Artwork read straight out of an uploaded ZIP, rather than extracted to disk first.
+
+An uploaded ZIP used to be extracted in full to a temporary folder before anything was uploaded,
+and the files deleted one by one as they were processed, so every image was written to disk and
+read back, and the upload needed as much free space as the ZIP held uncompressed. Unless
+extract_zip_uploads is on, the ZIP is now held open for the run instead, and each artwork carries
+a ZipMember in artwork["zip_member"]:
+
+- Plex is sent the member's bytes, read from the archive.
+- A Kometa asset is copied out of the archive straight into the asset directory.
+
+artwork["path"] is then the member's name inside the ZIP, which still gives its extension.
+"""
+
+import zipfile
+from typing import BinaryIO, Union
+
+
+class ZipMember:
+    """
+    A member of an open ZIP, standing in for an extracted file. The ZIP can be read from several
+    threads at once.
+    """
+
+    def __init__(self, archive: zipfile.ZipFile, name: str) -> None:
+        self.archive = archive
+        self.name = name
+
+    def open(self) -> BinaryIO:
+        return self.archive.open(self.name)
+
+    def read(self) -> bytes:
+        return self.archive.read(self.name)
+
+    def __repr__(self) -> str:
+        return f"ZipMember({self.name!r})"
+
+
+def artwork_source(artwork: dict) -> Union[str, bytes]:
+    """What plexapi's upload methods are given for an uploaded artwork: its bytes, when it is
+       read from its ZIP, or else the path of its file."""
+    member = artwork.get("zip_member")
+    return member.read() if member is not None else artwork["path"]
+
+
+def open_artwork(artwork: dict) -> BinaryIO:
+    """Open an uploaded artwork for reading, from its ZIP or from its file."""
+    member = artwork.get("zip_member")
+    return member.open() if member is not None else open(artwork["path"], "rb")
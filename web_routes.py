@@ -10,25 +10,35 @@ The routes are organized into:
 - Helper functions for file uploads and processing
 """
 
-import os, logging, flask.cli, sys, re, base64, hmac, tempfile, zipfile, subprocess, threading, uuid
+import os, logging, flask.cli, sys, re, contextlib, hashlib, hmac, io, tempfile, time, zipfile, subprocess, threading, uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import unquote
 from packaging import version
 from plexapi.server import PlexServer
 from flask import render_template, send_from_directory, request, redirect, url_for, session, jsonify
+from flask_socketio import join_room, leave_room
 from functools import wraps
+from typing import BinaryIO
 from core import globals
 from services.notify_service import NotifyService
-from utils.utils import calculate_file_md5, get_host_path
+from utils.utils import get_host_path
+from utils.zip_member import ZipMember
 from models.instance import Instance
 from models.bulk_schedule import BulkSchedule
 from core.config import Config, normalize_notification_channels
-from core.enums import FileType, MediaType, ScraperSource, StatusColor, RunType, IntervalUnit
+from core.enums import FileType, MediaType, ScraperSource, StatusColor, RunType, RunTrigger, IntervalUnit
 from processors.media_metadata import parse_title
+from plex.library_index import normalize_title
 from utils.notifications import update_log, update_status, notify_web, debug_me
-from services import UtilityService, AuthenticationService, RunHistory
+from services import UtilityService, AuthenticationService, RunHistory, ImageService
 from services.webhook_service import parse_event
-from core.constants import UPLOAD_CHUNK_SIZE, UPLOAD_CHUNK_TIMEOUT, WEBHOOK_TOKEN_HEADER, URL_SOURCE_MAP, URL_TYPE_MAP
+from services.upload_store import UPLOAD_ID_PATTERN, shared_upload_store
+from core.constants import UPLOAD_BUFFER_SIZE, ZIP_MEMBER_WORKERS, VALID_FILENAME_PATTERN, WEBHOOK_TOKEN_HEADER, URL_SOURCE_MAP, URL_TYPE_MAP, LOG_ROOM
+
+# Where a slice of an upload goes in the file: "bytes <first>-<last>/<total>"
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
 
 def login_required(f):
     """Decorator to require authentication for routes."""
@@ -139,6 +149,83 @@ def setup_routes(web_app, config: Config):
             "folders": folders
         })
 
+    def upload_timed_out(upload):
+        """Clean up after a browser stopped sending a file part-way through (called by the upload
+           store's reaper, which has already deleted what was received)."""
+        instance = Instance(upload.instance_id, "web")
+        debug_me(f"Upload timed out for {upload.file_name} after {upload.received} of {upload.total} bytes")
+        update_log(instance, f"⚠️ {upload.file_name} • Upload timed out after {uploads.timeout:g} seconds (connection lost)")
+        update_status(instance, "Upload timed out", color=StatusColor.DANGER.value)
+        end_upload(instance, f"{upload.file_name} • Upload timed out after {uploads.timeout:g} seconds")
+
+    uploads = shared_upload_store()
+    uploads.on_expired = upload_timed_out
+
+    def report_upload_progress(upload):
+        """Show how far an upload has got on the progress bar."""
+        instance = Instance(upload.instance_id, "web")
+        received_mb = round(upload.received / 1000000, 2)
+        total_mb = round(upload.total / 1000000, 2)
+        elapsed = time.monotonic() - upload.started
+        current_rate = round(received_mb / elapsed, 2) if elapsed > 0 else 0
+        percent = round(upload.received * 100 / upload.total, 2)
+        message = f"{upload.file_name} • {received_mb} MB of {total_mb} MB • {current_rate} MB/s"
+        notify_web(instance, "progress_bar", {"percent": percent, "message": message, "bar_speed": "fast"}, silent=True)
+
+        globals.main_bar["active"] = True
+        globals.main_bar["percent"] = percent
+        globals.main_bar["speed"] = "fast"
+        globals.main_bar["message"] = message
+
+    @web_app.route("/api/upload/<upload_id>", methods=["GET"])
+    @login_required
+    def upload_status(upload_id):
+        """How much of an upload the server has, for a browser carrying on after losing its connection."""
+        upload = uploads.status(upload_id)
+        if upload is None:
+            return jsonify({"received": 0, "complete": False}), 404
+        return jsonify({"received": upload.received, "complete": upload.complete})
+
+    @web_app.route("/api/upload/<upload_id>", methods=["PUT"])
+    @login_required
+    def upload_artwork(upload_id):
+        """
+        Receive a slice of a file as the raw request body and stream it into the upload's temp file.
+
+        The Content-Range header says where the slice goes, X-File-Name names the file and
+        X-Instance-Id the page sending it. A slice that doesn't start where the file has got to is
+        answered 409 with the number of bytes received, for the browser to carry on from.
+        """
+        match = CONTENT_RANGE_PATTERN.match(request.headers.get("Content-Range", ""))
+        file_name = os.path.basename(unquote(request.headers.get("X-File-Name", "")))
+        if not UPLOAD_ID_PATTERN.match(upload_id) or not match or not file_name:
+            return jsonify({"status": "bad request"}), 400
+        first, last, total = (int(value) for value in match.groups())
+        if last < first or last >= total:
+            return jsonify({"status": "bad request"}), 400
+        instance = Instance(request.headers.get("X-Instance-Id"), "web")
+
+        upload, started = uploads.start(upload_id, file_name, total, instance.id)
+        if started:
+            globals.cancel_scrape = False
+            globals.scrapes_running += 1
+            globals.scrape_type = "upload"
+            notify_web(instance, "scrape_state", { "running": True, "type": globals.scrape_type })
+
+        if globals.cancel_scrape:
+            debug_me(f"File upload canceled by user")
+            uploads.discard(upload_id)
+            update_log(instance, f"🛑 {file_name} • File upload canceled by user")
+            update_status(instance, f"File upload canceled by user", color=StatusColor.WARNING.value)
+            end_upload(instance, f"{file_name} • Upload canceled by user")
+            return jsonify({"status": "canceled"}), 410
+
+        received = uploads.write(upload, first, request.stream, report_upload_progress)
+        report_upload_progress(upload)
+        if received != last + 1:
+            return jsonify({"received": received, "complete": upload.complete}), 409
+        return jsonify({"received": received, "complete": upload.complete})
+
     def webhook_token_ok():
         """A webhook request is authorised when it carries the configured token, sent as the
            X-Webhook-Token header, the HTTP Basic password, or a ?token= query parameter."""
@@ -175,7 +262,14 @@ def setup_routes(web_app, config: Config):
         if not globals.config.webhook_tpdb_users:
             update_log(Instance(broadcast=True), "📥 Webhook received but no ThePosterDB users are configured (webhook_tpdb_users)")
             return {"status": "no users configured"}, 200
-        globals.webhook_service.enqueue(event)
+        if globals.run_worker:
+            # Applied next to the worker's runs, so it goes ahead of them and never writes an item one of them is writing
+            error = globals.run_worker.run("webhook", Instance(broadcast=True), event)
+            if error:
+                update_log(Instance(broadcast=True), f"❌ Webhook for {event.label()} could not be queued: {error}")
+                return {"status": "error"}, 503
+        else:
+            globals.webhook_service.enqueue(event)
         return {"status": "queued"}, 200
 
 
@@ -210,9 +304,9 @@ def setup_socket_handlers(
         check_image_orientation,
         sort_key
     )
-
-    # Temporary storage for chunked uploads
-    upload_chunks = {}
+    from services.bulk_queue import shared_bulk_queue
+    from services.log_buffer import shared_log_buffer
+    from services.web_event_bus import instance_room, log_room
 
     @globals.web_socket.on("debug_mode")
     def debug_mode(data):
@@ -298,7 +392,7 @@ def setup_socket_handlers(
     @globals.web_socket.on("start_scrape")
     def handle_scrape_from_web(data):
         """Handle scraping request from web UI."""
-        instance = Instance(data.get("instance_id"), "web", broadcast=True)
+        instance = Instance(data.get("instance_id"), "web")
         url = data.get("url").lower()
         options = data.get("options")
         filters = data.get("filters")
@@ -316,14 +410,18 @@ def setup_socket_handlers(
     @globals.web_socket.on("stop_scrape")
     def handle_stop_scrape(data):
         """Flag any in-flight scrape to stop cleanly (user pressed Stop in the web UI)."""
-        instance = Instance(data.get("instance_id"), "web", broadcast=True)
+        instance = Instance(data.get("instance_id"), "web")
+        running = globals.scrapes_running
         if not request_scrape_stop():
             update_log(instance, "ℹ️ Nothing to stop - no scrape is running")
+        elif running > 1:
+            # Runs share one stop flag, so two bulk imports running side by side both stop
+            update_log(instance, f"⏹️ Stopping all {running} runs in progress")
 
     @globals.web_socket.on("start_bulk_import")
     def handle_bulk_import_from_web(data):
         """Handle bulk import request from web UI."""
-        instance = Instance(data.get("instance_id"), "web", broadcast=True)
+        instance = Instance(data.get("instance_id"), "web")
         bulk_list = data.get("bulk_list").lower()
         filename = data.get("filename", "bulk_import.txt")
         notify = data.get("notify", False)
@@ -705,7 +803,7 @@ def setup_socket_handlers(
     @globals.web_socket.on("get_schedules")
     def get_schedules(data):
         """ Gets the list of schedules from the config file and sends it to the frontend """
-        instance = Instance(data.get("instance_id"), "web", broadcast=True)
+        instance = Instance(data.get("instance_id"), "web")
 
         schedules = []
         jobs = globals.scheduler_service.scheduled_jobs
@@ -849,165 +947,46 @@ def setup_socket_handlers(
             "running": globals.scrapes_running > 0,
             "type": globals.scrape_type,
             "main_bar": globals.main_bar,
-            "bulk_bar": globals.bulk_bar
+            "bulk_bar": globals.bulk_bar,
+            "bulk_queue": shared_bulk_queue().jobs()
         }
+        # With a worker process the runs (and so their progress) are over there
+        if globals.run_worker and globals.run_worker.running():
+            worker_state = globals.run_worker.scrape_state()
+            scrape_state.update({
+                "running": True,
+                "type": worker_state["scrape_type"],
+                "main_bar": worker_state["main_bar"],
+                "bulk_bar": worker_state["bulk_bar"]
+            })
         notify_web(instance, "get_scrape_state", scrape_state)
 
-    def abort_stale_upload(file_name):
-        """ Watchdog function that gets executed during a file upload if for some reason the next chunk
-        is not received within the timeout window determined by UPLOAD_CHUNK_TIMEOUT"""
-        debug_me(f"Upload timed out for {file_name}, cleaning up...")
-
-        if file_name not in upload_chunks:
-            return
-
-        upload_info = upload_chunks.pop(file_name)
-        instance = upload_info.get("instance")
-
-        try:
-            upload_info["temp_file"].close()
-            debug_me(f"Temp file successfully closed")
-            if os.path.exists(upload_info["temp_path"]):
-                os.remove(upload_info["temp_path"])
-                debug_me(f"Successfully deleted temp file at {upload_info["temp_path"]}")
-        except Exception as e:
-            debug_me(f"Error removing temp upload file: {str(e)}")
-
-        debug_me(f"CLEANING UP SCRAPE STATE. globals.scrapes_running is currently {globals.scrapes_running} | {globals.scrape_type}")
-        globals.scrapes_running -= 1
-        if globals.scrapes_running <= 0:
-            debug_me(f"Cleanup!")
-            globals.scrapes_running = 0
-            globals.cancel_scrape = False
-            globals.scrape_type = "stopped"
-            globals.main_bar["active"] = False
-
-            if instance:
-                update_log(instance, f"⚠️ {file_name} • Upload timed out after {UPLOAD_CHUNK_TIMEOUT} seconds (connection lost)")
-                update_status(instance, "Upload timed out", color=StatusColor.DANGER.value)
-                notify_web(instance, "scrape_state", {
-                    "running": False,
-                    "type": "upload"
-                })
-                notify_web(instance, "progress_bar", {
-                    "percent": 100,
-                    "message": f"{file_name} • Upload timed out after {UPLOAD_CHUNK_TIMEOUT} seconds",
-                    "bar_speed": "smooth"
-                })
-
-    @globals.web_socket.on("disconnect")
-    def handle_disconnect():
-        # If a socket disconnects mid-upload, abort all active chunks
-        stale_files = list(upload_chunks.keys())
-        for file_name in stale_files:
-            debug_me(f"Client disconnected during upload of '{file_name}'. Aborting immediately.")
-            if upload_chunks[file_name].get("watchdog"):
-                upload_chunks[file_name]["watchdog"].cancel()
-            
-            abort_stale_upload(file_name)
-            
-    @globals.web_socket.on("upload_artwork_chunk")
-    def handle_upload_chunk(data):
-        """Handle chunked file upload - writes directly to temp file for memory efficiency."""
-        
-        instance = Instance(data.get("instance_id"), "web", broadcast=True)
-        file_name = data["fileName"]
-        chunk_data = data["chunkData"]
-        chunk_index = data["chunkIndex"]
-        total_chunks = data["totalChunks"]
-        total_size = data["totalSize"].__round__(2)
-        bar_speed = "fast"
-        progress_MB = ((chunk_index * UPLOAD_CHUNK_SIZE ) / 1000000).__round__(2)
-        start_time = data["startTime"]
-        current_time = data["currentTime"]
-
-        if chunk_index == 0:
-            globals.cancel_scrape = False
-            globals.scrapes_running += 1
-            globals.scrape_type = "upload"
-            notify_web(instance, "scrape_state", { "running": True, "type": globals.scrape_type })
-
-        if globals.cancel_scrape:
-            debug_me(f"File upload canceled by user")
-            update_log(instance, f"🛑 {file_name} • File upload canceled by user")
-            update_status(instance, f"File upload canceled by user", color=StatusColor.WARNING.value)
-            if file_name in upload_chunks:
-                try:
-                    upload_chunks[file_name]["temp_file"].close()
-                    if os.path.exists(upload_chunks[file_name]["temp_path"]):
-                        os.remove(upload_chunks[file_name]["temp_path"])
-                except Exception:
-                    pass
-                del upload_chunks[file_name]            
-            globals.scrapes_running -= 1
-            if globals.scrapes_running <= 0:
-                globals.scrapes_running = 0
-                globals.cancel_scrape = False
-                notify_web(instance, "scrape_state", { "running": False, "type": globals.scrape_type })
-                globals.scrape_type = "stopped"
-                globals.main_bar["active"] = False
-                notify_web(instance, "progress_bar", { "percent": 100, "message": f"{file_name} • Upload canceled by user", "bar_speed": "smooth" })
-                globals.last_emit_time = 0
-            return "abort"
-
-        if file_name not in upload_chunks:
-            # Create a temporary file to stream chunks to disk instead of memory
-            temp_file = tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.upload')            
-            upload_chunks[file_name] = {
-                "temp_file": temp_file,
-                "temp_path": temp_file.name,
-                "chunks_received": 0,
-                "total_chunks": total_chunks,
-                "instance": instance,
-                "watchdog": None
-            }
-
-        # When a chunk is processed, we reset the watchdog
-        if upload_chunks[file_name].get("watchdog"):
-            upload_chunks[file_name]["watchdog"].cancel()
-
-        # And we re-start it immediately
-        timer = threading.Timer(
-            interval=UPLOAD_CHUNK_TIMEOUT,
-            function=abort_stale_upload,
-            args=[file_name]
-        )
-        timer.daemon = True
-        timer.start()
-        upload_chunks[file_name]["watchdog"] = timer
-
-        # Decode and write chunks directly to disk
-        try:
-            decoded_chunk = base64.b64decode(chunk_data)
-            upload_chunks[file_name]["temp_file"].write(decoded_chunk)
-            upload_chunks[file_name]["chunks_received"] += 1
-            percent = (progress_MB * 100 / total_size).__round__(2)
-            current_rate = ((progress_MB * 1000) / (current_time - start_time)).__round__(2)
-            message = f"{file_name} • {progress_MB} MB of {total_size} MB • {current_rate} MB/s"
-            notify_web(instance, "progress_bar", { "percent": percent, "message": message, "bar_speed": bar_speed}, silent=True )
-                
-            globals.main_bar["active"] = True
-            globals.main_bar["percent"] = percent
-            globals.main_bar["speed"] = bar_speed
-            globals.main_bar["message"] = message
+    @globals.web_socket.on("connect")
+    def handle_connect(auth=None):
+        """Put a page in its instance's room, so it is only sent its own events and broadcasts."""
+        instance_id = (auth or {}).get("instance_id")
+        if instance_id:
+            join_room(instance_room(instance_id))
+
+    @globals.web_socket.on("get_log")
+    def get_log(data):
+        """Send a browser the log lines it missed and start sending it new ones. Called when a page
+        loads and when a hidden tab is shown again."""
+        instance = Instance(data.get("instance_id"), "web")
+        join_room(LOG_ROOM)
+        join_room(log_room(instance.id, False))
+        notify_web(instance, "log_replay", {"lines": shared_log_buffer().since(int(data.get("after") or 0), instance.id)}, silent=True)
 
-            return "ok"
-        except Exception as e:
-            debug_me(f"Error decoding chunk {chunk_index + 1}: {str(e)}")
-            globals.scrapes_running -= 1
-            if globals.scrapes_running <= 0:
-                globals.scrapes_running = 0
-                globals.cancel_scrape = False
-                notify_web(instance, "scrape_state", { "running": False, "type": globals.scrape_type })
-                globals.scrape_type = "stopped"
-                globals.main_bar["active"] = False
-                notify_web(instance, "progress_bar", { "percent": 100, "message": f"{file_name} • Error uploading file", "bar_speed": "fast"} )
-            return "error"
+    @globals.web_socket.on("hide_log")
+    def hide_log(data):
+        """Stop sending new log lines to a tab that has been hidden. It catches up when it is shown."""
+        leave_room(LOG_ROOM)
+        leave_room(log_room(data.get("instance_id"), False))
 
     @globals.web_socket.on("upload_complete")
     def handle_upload_complete(data):
-        """Finalize the upload once all chunks are received."""
-        instance = Instance(data.get("instance_id"), "web", broadcast=True)
+        """Process an upload once the browser has sent all of it."""
+        instance = Instance(data.get("instance_id"), "web")
         file_name = data.get("fileName")
 
         notify_web(instance, "progress_bar", { "percent": 100, "message": f"{file_name} • Upload complete!", "bar_speed": "fast"} )
@@ -1019,59 +998,80 @@ def setup_socket_handlers(
         debug_me(f"Obtained filters from web form: {filters}")
         debug_me(f"Obtained options from web form: {options}")
 
+        upload = shared_upload_store().take(str(data.get("upload_id") or ""))
+        if upload is None:
+            debug_me(f"Upload complete event received for {file_name}, but it is not being uploaded (it may have timed out).")
+            return
 
-        if file_name in upload_chunks:
-            if upload_chunks[file_name].get("watchdog"):
-                upload_chunks[file_name]["watchdog"].cancel()
-            try:
-                upload_chunks[file_name]["temp_file"].close()
-            except Exception as e:
-                debug_me(f"Unable to close temp file: {str(e)}")
-
-            if upload_chunks[file_name]["chunks_received"] == int(upload_chunks[file_name]["total_chunks"]):
-                temp_path = upload_chunks[file_name]["temp_path"]
-                debug_me(f"Uploaded {file_name} to {temp_path}, processing file...")
-                upload_chunks[file_name]["temp_file"].close()
-                update_log(instance, f"✔️ {file_name} • Upload completed successfully")
-                save_uploaded_file(
-                    instance,
-                    file_name,
-                    options,
-                    filters,
-                    plex_title,
-                    plex_year,
-                    upload_chunks,
-                    filename_pattern,
-                    check_image_orientation,
-                    sort_key
-                )
+        if upload.complete:
+            debug_me(f"Uploaded {file_name} to {upload.path}, processing file...")
+            update_log(instance, f"✔️ {file_name} • Upload completed successfully")
+            save_uploaded_file(
+                instance,
+                upload.file_name,
+                options,
+                filters,
+                plex_title,
+                plex_year,
+                upload.path,
+                filename_pattern,
+                check_image_orientation,
+                sort_key
+            )
+        else:
+            debug_me(
+                f'Upload complete event received for {file_name}, but with '
+                f'{upload.received} of {upload.total} bytes, some of the file is missing.'
+            )
+            end_upload(instance, f"{file_name} • Upload incomplete")
 
-                # Cleanup after saving the file
-                try:
-                    temp_path = upload_chunks[file_name]["temp_path"]
-                    # Delete the temp file if it still exists
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                    # Delete the metadata for the file
-                    del upload_chunks[file_name]
-                except OSError as e:
-                    debug_me(f"Error during cleanup: {str(e)}")
-            else:
-                chunks_received = upload_chunks[file_name]["chunks_received"] if file_name in upload_chunks else 0
-                expected_chunks = upload_chunks[file_name]["total_chunks"] if file_name in upload_chunks else 0
-                debug_me(
-                    f'Upload complete event received for {file_name}, but with '
-                    f'{chunks_received} of {expected_chunks}, some chunks are missing.'
-                )
-                try:
-                    # Clean up temp file
-                    if file_name in upload_chunks:
-                        upload_chunks[file_name]["temp_file"].close()
-                        temp_path = upload_chunks[file_name]["temp_path"]
-                        if os.path.exists(temp_path):
-                            os.remove(temp_path)
-                except OSError as e:
-                    debug_me(f"Error during cleanup: {str(e)}")
+        # Cleanup after saving the file: delete the temp file if it still exists
+        try:
+            if os.path.exists(upload.path):
+                os.remove(upload.path)
+        except OSError as e:
+            debug_me(f"Error during cleanup: {str(e)}")
+
+    @globals.web_socket.on("process_folder")
+    def handle_process_folder(data):
+        """Process the artwork in a folder on the server, picked with /api/browse, in place."""
+        instance = Instance(data.get("instance_id"), "web")
+        folder_path = os.path.abspath(data.get("path") or "")
+        if not data.get("path") or not os.path.isdir(folder_path):
+            update_log(instance, f"❌ {data.get('path')} • Folder not found on the server")
+            return
+
+        globals.cancel_scrape = False
+        globals.scrapes_running += 1
+        globals.scrape_type = "upload"
+        notify_web(instance, "scrape_state", { "running": True, "type": globals.scrape_type })
+        debug_me(f"Obtained filters from web form: {data.get('filters')}")
+        debug_me(f"Obtained options from web form: {data.get('options')}")
+
+        process_folder(
+            instance,
+            folder_path,
+            data.get("options") or [],
+            data.get("filters"),
+            data.get("plex_title"),
+            data.get("plex_year"),
+            filename_pattern,
+            check_image_orientation,
+            sort_key
+        )
+
+
+def end_upload(instance: Instance, message: str):
+    """Take an upload that stopped short off the running count, and reset the scrape state and
+       the progress bar if nothing else is running."""
+    globals.scrapes_running -= 1
+    if globals.scrapes_running <= 0:
+        globals.scrapes_running = 0
+        globals.cancel_scrape = False
+        notify_web(instance, "scrape_state", { "running": False, "type": globals.scrape_type })
+        globals.scrape_type = "stopped"
+        globals.main_bar["active"] = False
+        notify_web(instance, "progress_bar", { "percent": 100, "message": message, "bar_speed": "smooth" })
 
 
 def save_uploaded_file(
@@ -1081,7 +1081,7 @@ def save_uploaded_file(
     filters: list,
     plex_title: str,
     plex_year: int,
-    upload_chunks: dict,
+    temp_upload_path: str,
     filename_pattern: re.Pattern,
     check_image_orientation_func,
     sort_key_func
@@ -1095,15 +1095,11 @@ def save_uploaded_file(
         filters: List of filters to apply
         plex_title: Optional title override
         plex_year: Optional year override
-        upload_chunks: Dictionary with temp file metadata
+        temp_upload_path: Temp file the upload was written to
         filename_pattern: Regex pattern for validating filenames
         check_image_orientation_func: Function to check image orientation
         sort_key_func: Function to generate sort keys
     """
-    from artwork_uploader import process_uploaded_artwork
-
-    # Get the temp file path that was used during chunk uploads
-    temp_upload_path = upload_chunks[file_name]["temp_path"]
     debug_me(f"Processing uploaded file {file_name} from temp path: {temp_upload_path}")
 
     # Move to a proper file location with correct filename for processing
@@ -1116,7 +1112,60 @@ def save_uploaded_file(
 
     debug_me(f"Saved ZIP file: {temp_zip_path}")
 
-    update_log(instance, f"📦 {os.path.basename(temp_zip_path)} • Extracting ZIP file and parsing files...")
+    # Unless extract_zip_uploads is on, the artwork isn't extracted: the ZIP is held open for the
+    # run and each file is uploaded straight from it (see ZipMember), then the ZIP is deleted
+    archive = None if globals.config and globals.config.extract_zip_uploads else zipfile.ZipFile(temp_zip_path, 'r')
+    try:
+        process_uploaded_zip(
+            instance,
+            temp_zip_path,
+            archive,
+            options,
+            filters,
+            plex_title,
+            plex_year,
+            filename_pattern,
+            check_image_orientation_func,
+            sort_key_func
+        )
+    finally:
+        if archive is not None:
+            archive.close()
+            try:
+                os.remove(temp_zip_path)
+                os.rmdir(os.path.dirname(temp_zip_path))
+                debug_me(f"Deleted temporary ZIP file: {temp_zip_path}")
+            except Exception as e:
+                debug_me(f"Error deleting temporary ZIP file: {e}")
+
+
+def process_uploaded_zip(
+    instance: Instance,
+    temp_zip_path: str,
+    archive: zipfile.ZipFile | None,
+    options: list,
+    filters: list,
+    plex_title: str,
+    plex_year: int,
+    filename_pattern: re.Pattern,
+    check_image_orientation_func,
+    sort_key_func
+):
+    """
+    List the artwork in an uploaded ZIP and process it.
+
+    Args:
+        instance: Instance object for web notifications
+        temp_zip_path: Path of the uploaded ZIP
+        archive: The ZIP, open, to upload the artwork straight out of; None to extract it first
+        filters: List of filters to apply
+        plex_title: Optional title override
+        plex_year: Optional year override
+        filename_pattern: Regex pattern for validating filenames
+        check_image_orientation_func: Function to check image orientation
+        sort_key_func: Function to generate sort keys
+    """
+    update_log(instance, f"📦 {os.path.basename(temp_zip_path)} • {'Extracting ZIP file and parsing' if archive is None else 'Parsing'} files...")
     extracted_files, skipped, zip_title, zip_author, zip_source = extract_and_list_zip(
         instance,
         temp_zip_path,
@@ -1125,42 +1174,284 @@ def save_uploaded_file(
         plex_title,
         plex_year,
         check_image_orientation_func,
-        sort_key_func
+        sort_key_func,
+        archive
     )
-    if globals.cancel_scrape:
-        notify_web(instance, "progress_bar", {"message": "Parsing canceled by user...", "percent": 100})#, "bar_type": bar_type, "bar_speed": bar_speed})
-        globals.main_bar["active"] = False
-        update_log(instance, f"🛑 {os.path.basename(temp_zip_path)} • ZIP file parsing canceled by user")
-        update_status(instance, f"ZIP file parsing canceled by user", color=StatusColor.WARNING.value)
+    # Delete the ZIP file after extraction
+    if archive is None:
+        try:
+            os.remove(temp_zip_path)
+            os.rmdir(os.path.dirname(temp_zip_path))
+            debug_me(f"Deleted temporary ZIP file: {temp_zip_path}")
+        except Exception as e:
+            debug_me(f"Error deleting temporary ZIP file: {e}")
+
+    process_listed_artwork(instance, os.path.basename(temp_zip_path), "ZIP file", "uploaded file",
+                           (extracted_files, skipped, zip_title, zip_author, zip_source),
+                           options, filters, plex_title, plex_year)
+
+
+def process_folder(
+    instance: Instance,
+    folder_path: str,
+    options: list,
+    filters: list,
+    plex_title: str,
+    plex_year: int,
+    filename_pattern: re.Pattern,
+    check_image_orientation_func,
+    sort_key_func,
+    files: list[str] | None = None,
+    trigger: str = RunTrigger.MANUAL.value
+):
+    """
+    Process the artwork in a folder on the server, such as a mounted volume, as an uploaded ZIP
+    would be, without uploading, copying or deleting anything.
+
+    Args:
+        instance: Instance object for web notifications
+        folder_path: The folder to process
+        filters: List of filters to apply
+        plex_title: Optional title override
+        plex_year: Optional year override
+        filename_pattern: Regex pattern for validating filenames
+        check_image_orientation_func: Function to check image orientation
+        sort_key_func: Function to generate sort keys
+        files: Only these files in the folder, rather than all of it
+        trigger: What started the run, for the run history
+
+    Returns:
+        True if the run finished, False if the user canceled it
+    """
+    folder_name = os.path.basename(os.path.normpath(folder_path))
+    what = f"{len(files)} new or changed files" if files is not None else "files"
+    update_log(instance, f"📂 {folder_name} • Parsing {what}...")
+    try:
+        listing = list_folder_artwork(
+            instance,
+            folder_path,
+            filename_pattern,
+            filters,
+            plex_title,
+            plex_year,
+            check_image_orientation_func,
+            sort_key_func,
+            files
+        )
+    except Exception:
+        # Not handed to process_listed_artwork yet, so it's taken off the running count here
+        end_upload(instance, f"{folder_name} • Folder could not be read")
+        raise
+    return process_listed_artwork(instance, folder_name, "Folder", "folder", listing, options, filters, plex_title, plex_year,
+                                  trigger=trigger, label=folder_name)
+
+
+def process_watched_files(folder_path: str, files: list[str]):
+    """
+    Process a batch of new and changed files in the watched folder (see FolderWatcher) as one
+    run, in place, with no options or filters, as if their folder had been picked on the upload
+    tab.
+
+    Args:
+        folder_path: The watched folder
+        files: The files that arrived or changed
+
+    Returns:
+        True if the run finished, False if the user canceled it or another run was going, in
+        which case the files are handed over again
+    """
+    from artwork_uploader import check_image_orientation, sort_key
+
+    # Waits for other runs to finish rather than joining them, so a Stop the user just pressed
+    # stays in force until the last of them has ended
+    if globals.scrapes_running > 0:
+        debug_me(f"{len(files)} watched folder file(s) held back until the {globals.scrapes_running} run(s) in progress finish")
+        return False
+
+    instance = Instance(broadcast=True)
+    # The folder the files arrived in (when they all arrived in one) names the set, as a ZIP's name would
+    source_path = os.path.commonpath([os.path.dirname(path) for path in files])
+
+    globals.scrapes_running += 1
+    globals.scrape_type = "upload"
+    notify_web(instance, "scrape_state", { "running": True, "type": globals.scrape_type })
+    update_log(instance, f"👀 {os.path.basename(os.path.normpath(folder_path))} • {len(files)} new or changed file(s) in the watched folder")
+    return process_folder(
+        instance,
+        source_path,
+        [],
+        [],
+        None,
+        None,
+        re.compile(VALID_FILENAME_PATTERN, re.IGNORECASE),
+        check_image_orientation,
+        sort_key,
+        files,
+        trigger=RunTrigger.WATCH.value
+    )
+
+
+def process_listed_artwork(
+    instance: Instance,
+    name: str,
+    kind: str,
+    item: str,
+    listing: tuple[list, int, str, str, str],
+    options: list,
+    filters: list,
+    plex_title: str,
+    plex_year: int,
+    trigger: str = RunTrigger.MANUAL.value,
+    label: str | None = None
+):
+    """
+    Upload the artwork listed in a ZIP or a folder, or stop if the user canceled while it was
+    being listed, and then take it off the running count.
+
+    Args:
+        instance: Instance object for web notifications
+        name: The name of the ZIP or folder
+        kind: What it is, for the log (e.g. "ZIP file")
+        item: What is processed, for the status (e.g. "uploaded file")
+        listing: What list_artwork returned
+        filters: List of filters to apply
+        plex_title: Optional title override
+        plex_year: Optional year override
+        trigger: What started the run, for the run history
+        label: What the run history calls it if nothing better is known
+
+    Returns:
+        True if the run finished, False if the user canceled it
+    """
+    from artwork_uploader import process_uploaded_artwork
+
+    try:
+        if globals.cancel_scrape:
+            notify_web(instance, "progress_bar", {"message": "Parsing canceled by user...", "percent": 100})#, "bar_type": bar_type, "bar_speed": bar_speed})
+            globals.main_bar["active"] = False
+            update_log(instance, f"🛑 {name} • {kind} parsing canceled by user")
+            update_status(instance, f"{kind} parsing canceled by user", color=StatusColor.WARNING.value)
+            return False
+
+        extracted_files, skipped, zip_title, zip_author, zip_source = listing
+        process_uploaded_artwork(instance, extracted_files, skipped, zip_title, zip_author, zip_source, options, filters, plex_title, plex_year,
+                                 trigger=trigger, label=label)
+
+        # Read the cancel flag here, not in the finally below - that's where it gets cleared
+        if globals.cancel_scrape:
+            update_status(instance, f"{item.capitalize()} processing canceled by user", color=StatusColor.WARNING.value)
+            return False
+        update_status(instance, f"Finished processing {item}", color=StatusColor.SUCCESS.value)
+        return True
+
+    finally:
         globals.scrapes_running -= 1
         if globals.scrapes_running <= 0:
             globals.scrapes_running = 0
             globals.cancel_scrape = False
             notify_web(instance, "scrape_state", { "running": False, "type": globals.scrape_type })
             globals.scrape_type = "stopped"
-        return
 
-    # Delete the ZIP file after extraction
-    try:
-        os.remove(temp_zip_path)
-        os.rmdir(temp_zip_folder)
-        debug_me(f"Deleted temporary ZIP file: {temp_zip_path}")
-    except Exception as e:
-        debug_me(f"Error deleting temporary ZIP file: {e}")
+def copy_and_measure(source: BinaryIO, target: BinaryIO | None = None) -> tuple[str, tuple[int, int] | None]:
+    """
+    Read an image in a single pass, a buffer at a time, hashing it as it goes and reading its
+    dimensions from the first buffer, and copy it to a target if there is one.
+
+    Args:
+        source: The image, open for reading
+        target: Where to copy it, or None
+
+    Returns:
+        The image's MD5 hex digest, and its (width, height) if they could be read from its header
+    """
+    md5_hash = hashlib.md5()
+    dimensions = None
+    buffer = source.read(UPLOAD_BUFFER_SIZE)
+    if buffer:
+        dimensions = ImageService.dimensions_from_header(buffer)
+    while buffer:
+        md5_hash.update(buffer)
+        if target is not None:
+            target.write(buffer)
+        buffer = source.read(UPLOAD_BUFFER_SIZE)
+    return md5_hash.hexdigest(), dimensions
+
+
+def extract_zip_member(zip_ref: zipfile.ZipFile, zip_info: zipfile.ZipInfo, target_path: str | None = None) -> tuple[str, tuple[int, int] | None]:
+    """
+    Extract a ZIP member to disk in a single pass (see copy_and_measure). Without a target path
+    the member is only read, for artwork uploaded straight from the ZIP.
+
+    Args:
+        zip_ref: The open ZIP file
+        zip_info: The member to extract
+        target_path: Where to write it, or None
+
+    Returns:
+        The member's MD5 hex digest, and its (width, height) if they could be read from its header
+    """
+    with zip_ref.open(zip_info) as source, (open(target_path, "wb") if target_path else contextlib.nullcontext()) as target:
+        return copy_and_measure(source, target)
+
+
+def memoized_media_lookup(movie_or_show):
+    """
+    Wrap a Plex movie_or_show lookup so each title and year is looked up only once, however many
+    files (and threads) ask for it. Titles that differ only in styling share a lookup. An error
+    isn't remembered, so the next file asks Plex again.
+
+    Args:
+        movie_or_show: The lookup to wrap, taking a title and a year
+
+    Returns:
+        A function taking a title and a year, returning what movie_or_show does
+    """
+    lookups: dict[tuple, Future] = {}
+    lock = threading.Lock()
+
+    def lookup(title, year):
+        key = (normalize_title(title or ""), year)
+        with lock:
+            future = lookups.get(key)
+            first = future is None
+            if first:
+                future = lookups[key] = Future()
+        if first:
+            try:
+                result = movie_or_show(title, year)
+            except Exception as e:
+                result = None
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            if result is None or "Error" in (result[0] or ""):
+                with lock:
+                    lookups.pop(key, None)
+        return future.result()
+
+    return lookup
+
+
+def possible_file_types(artwork: dict) -> set[str]:
+    """
+    The file types a ZIP member could end up as, going by its parsed file name alone. What Plex
+    says the title is and the image's orientation can still change it, so this includes every
+    type they could turn it into.
+
+    Args:
+        artwork: The member's file name, as parsed by parse_title
+
+    Returns:
+        Set of file type values
+    """
+    possible = {artwork["file_type"], FileType.BACKGROUND.value, FileType.SQUARE_ART.value}
+    if artwork["media"] != MediaType.COLLECTION.value:
+        # Plex may find a movie by that title, or nothing at all
+        possible |= {FileType.MOVIE_POSTER.value, FileType.POSTER.value}
+        if artwork["season"] is None:
+            possible.add(FileType.SHOW_COVER.value)
+    return possible
 
-    process_uploaded_artwork(instance, extracted_files, skipped, zip_title, zip_author, zip_source, options, filters, plex_title, plex_year)
-    
-    if globals.cancel_scrape:
-        update_status(instance, "Uploaded file processing canceled by user", color=StatusColor.WARNING.value)
-    else:
-        update_status(instance, "Finished processing uploaded file", color=StatusColor.SUCCESS.value)
-    
-    globals.scrapes_running -= 1
-    if globals.scrapes_running <= 0:
-        globals.scrapes_running = 0
-        globals.cancel_scrape = False
-        notify_web(instance, "scrape_state", { "running": False, "type": globals.scrape_type })
-        globals.scrape_type = "stopped"
 
 def extract_and_list_zip(
     instance: Instance,
@@ -1170,7 +1461,8 @@ def extract_and_list_zip(
     plex_title: str,
     plex_year: int,
     check_image_orientation_func,
-    sort_key_func
+    sort_key_func,
+    archive: zipfile.ZipFile | None = None
 ) -> tuple[list, int, str, str, str]:
     """
     Extract a ZIP file, flatten directories, and return a list of valid image files.
@@ -1180,22 +1472,167 @@ def extract_and_list_zip(
         filename_pattern: Regex pattern for validating filenames
         check_image_orientation_func: Function to check image orientation
         sort_key_func: Function to generate sort keys
+        archive: The ZIP, already open, to list the artwork in without extracting it. Each
+                 artwork then carries a ZipMember to be read from instead of a file.
+
+    Returns:
+        List of artwork dictionaries sorted by media type, season, episode
+    """
+    extract_dir = tempfile.mkdtemp() if archive is None else None
+    debug_me(f"Extracting ZIP file: {zip_path} to {extract_dir}" if archive is None else f"Reading ZIP file in place: {zip_path}")
+
+    with (contextlib.nullcontext(archive) if archive is not None else zipfile.ZipFile(zip_path, 'r')) as zip_ref:
+        zip_infos = [zip_info for zip_info in zip_ref.infolist() if os.path.basename(zip_info.filename) and not os.path.basename(zip_info.filename).startswith(".") and os.path.basename(zip_info.filename) not in {"ds_store", "__macosx"}]
+
+        def extract_member(zip_info, extract_name):
+            if archive is None:
+                full_path = os.path.join(extract_dir, extract_name)
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                md5, dimensions = extract_zip_member(zip_ref, zip_info, full_path)
+                read = {"path": full_path, "checksum": md5}
+            else:
+                # Only read, to hash it and measure it: it is uploaded straight from the ZIP
+                md5, dimensions = extract_zip_member(zip_ref, zip_info)
+                read = {"path": zip_info.filename, "checksum": md5, "zip_member": ZipMember(zip_ref, zip_info.filename)}
+            # Worked out once per file, from the header read while extracting it where possible
+            if dimensions:
+                return read, ImageService.orientation(*dimensions)
+            if archive is None:
+                return read, check_image_orientation_func(read["path"])
+            with zip_ref.open(zip_info) as member_file:
+                return read, check_image_orientation_func(member_file)
+
+        return list_artwork(
+            instance,
+            zip_path,
+            [(zip_info, os.path.basename(zip_info.filename)) for zip_info in zip_infos],
+            zip_ref.open,
+            extract_member,
+            filename_pattern,
+            filters,
+            plex_title,
+            plex_year,
+            sort_key_func
+        )
+
+
+def scan_artwork_folder(folder_path: str) -> list[os.DirEntry]:
+    """
+    The files in a folder and the folders below it, in name order, leaving out hidden files and
+    folders and the __MACOSX folder a Mac adds to a ZIP it was extracted from.
+
+    Args:
+        folder_path: The folder to scan
+
+    Returns:
+        List of os.DirEntry, one per file
+    """
+    files = []
+    folders = [folder_path]
+    while folders:
+        with os.scandir(folders.pop()) as scan:
+            entries = sorted(scan, key=lambda entry: entry.name.lower())
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name.lower() in {"ds_store", "__macosx"}:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                folders.append(entry.path)
+            elif entry.is_file():
+                files.append(entry)
+    return sorted(files, key=lambda entry: entry.path.lower())
+
+
+def list_folder_artwork(
+    instance: Instance,
+    folder_path: str,
+    filename_pattern: re.Pattern,
+    filters: list,
+    plex_title: str,
+    plex_year: int,
+    check_image_orientation_func,
+    sort_key_func,
+    files: list[str] | None = None
+) -> tuple[list, int, str, str, str]:
+    """
+    List the artwork in a folder on the server, just as the artwork in a ZIP is listed, but
+    reading each image where it is: nothing is copied, and nothing is deleted afterwards.
+
+    Args:
+        folder_path: The folder, which may hold the artwork in folders of its own
+        filename_pattern: Regex pattern for validating filenames
+        check_image_orientation_func: Function to check image orientation
+        sort_key_func: Function to generate sort keys
+        files: Only these files in the folder, along with any source.txt beside them, rather
+               than all of it (for new files in the watched folder)
+
+    Returns:
+        List of artwork dictionaries sorted by media type, season, episode
+    """
+    debug_me(f"Reading folder in place: {folder_path}")
+
+    if files is None:
+        paths = [entry.path for entry in scan_artwork_folder(folder_path)]
+    else:
+        beside = {os.path.join(os.path.dirname(path), "source.txt") for path in files}
+        paths = sorted(path for path in beside if os.path.isfile(path)) + list(files)
+
+    def read_file(path, extract_name):
+        with open(path, "rb") as image_file:
+            md5, dimensions = copy_and_measure(image_file)
+        read = {"path": path, "checksum": md5, "keep_file": True}
+        return read, ImageService.orientation(*dimensions) if dimensions else check_image_orientation_func(path)
+
+    return list_artwork(
+        instance,
+        folder_path,
+        [(path, os.path.basename(path)) for path in paths],
+        lambda path: open(path, "rb"),
+        read_file,
+        filename_pattern,
+        filters,
+        plex_title,
+        plex_year,
+        sort_key_func
+    )
+
+
+def list_artwork(
+    instance: Instance,
+    source_path: str,
+    entries: list,
+    open_entry,
+    prepare_entry,
+    filename_pattern: re.Pattern,
+    filters: list,
+    plex_title: str,
+    plex_year: int,
+    sort_key_func
+) -> tuple[list, int, str, str, str]:
+    """
+    Parse, identify and filter the artwork in a ZIP or a folder, and return it in upload order.
+
+    Args:
+        source_path: The ZIP or folder, whose name may say the ThePosterDB set and author
+        entries: (entry, file name) for each file in it
+        open_entry: Function opening an entry for reading, for source.txt
+        prepare_entry: Function taking an entry and a name unique within the listing, returning
+                       what to add to its artwork (at least path and checksum) and its orientation.
+                       Called on the pool, for the entries the filters could let through.
+        filename_pattern: Regex pattern for validating filenames
+        sort_key_func: Function to generate sort keys
 
     Returns:
         List of artwork dictionaries sorted by media type, season, episode
     """
-    extract_dir = tempfile.mkdtemp()
     file_list = []
     zip_title = ""
     zip_author = ""
     filtered_files = 0
     errored_files = 0
 
-    debug_me(f"Extracting ZIP file: {zip_path} to {extract_dir}")
-
     # For ThePosterDB, extract title and author from filename
     pattern = r"^(?P<title>.+?)\s+set by\s+(?P<author>.+?)\s*-"
-    match = re.search(pattern, os.path.basename(zip_path), re.IGNORECASE)
+    match = re.search(pattern, os.path.basename(os.path.normpath(source_path)), re.IGNORECASE)
     if match:
         zip_source = ScraperSource.THEPOSTERDB.value
         zip_title = match.group("title").strip()
@@ -1205,158 +1642,190 @@ def extract_and_list_zip(
         debug_me(f"Detected ZIP author: {zip_author}")
     else:
         zip_source = ScraperSource.MEDIUX.value
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        # Pre-process the file list to determine source and extract valid files
-        zip_infos = [zip_info for zip_info in zip_ref.infolist() if os.path.basename(zip_info.filename) and not os.path.basename(zip_info.filename).startswith(".") and os.path.basename(zip_info.filename) not in {"ds_store", "__macosx"}]
-        total_files_in_zip = len(zip_infos)
-        
-        notify_web(instance, "progress_bar", { "percent": 0, "message": "Parsing...", "bar_type": "main", "bar_speed": "fast" })
-        globals.main_bar["active"] = False
-       
-        identified_media_map = {}
-
-        for n, zip_info in enumerate(zip_infos, 1):
-            if globals.cancel_scrape:
+    total_files = len(entries)
+
+    identified_media_map = {}
+    members_to_extract = []
+    extract_names = set()
+
+    # Everything the file names can tell us is worked out before any image is read: the Mediux
+    # source.txt, which files are artwork, what their names say they are, and whether the
+    # filters could let them through at all
+    for entry, filename in entries:
+
+        # Mediux ZIP files contain a source.txt file with metadata, we obtain title and author from there
+        if filename == "source.txt":
+            debug_me("Detected Mediux source")
+            zip_source = ScraperSource.MEDIUX.value
+            with open_entry(entry) as source, io.TextIOWrapper(source, encoding="utf-8") as source_file:
+                for line in source_file:
+                    if line.startswith("Title:"):
+                        zip_title = line.split("Title:")[1].strip()
+                        debug_me(f"Detected ZIP title: {zip_title}")
+                    if line.startswith("Author:"):
+                        zip_author = line.split("Author:")[1].strip()
+                        debug_me(f"Detected ZIP author: {zip_author}")
+                        break
+
+        elif filename_pattern.match(filename):
+            # Obtain artwork title, year, media type, season, episode and artwork type by parsing the filename
+            debug_me(f"Parsing artwork metadata from filename: {filename}")
+            artwork = parse_title(os.path.splitext(filename)[0])
+
+            if artwork["media"] == "unable_to_parse":
+                update_log(instance, f"❌ {filename} • {zip_author} | Unable to parse file name, format unrecognized")
+                errored_files += 1
+                continue
+
+            # We start building a Title -> Media map with the media type (Movie, TV, Collection) correctly parsed by parse_title
+            if artwork["media"] != "Unknown" and artwork["title"] not in identified_media_map:
+                identified_media_map[artwork["title"]] = artwork["media"]
+
+            # A file the filters can't let through, whatever Plex or its orientation turn out to say, isn't read at all
+            if filters and not possible_file_types(artwork) & set(filters):
+                debug_me(f"⏩ Skipping '{filename}' based on filters, it can't be any of {filters}.")
+                filtered_files += 1
+                continue
+
+            # Files are extracted side by side, so two with the same name (in different
+            # folders) each get a folder of their own rather than sharing a path
+            extract_name = filename if filename not in extract_names else os.path.join(str(len(members_to_extract)), filename)
+            extract_names.add(filename)
+            members_to_extract.append((entry, filename, artwork, extract_name))
+
+    total_to_extract = len(members_to_extract)
+    notify_web(instance, "progress_bar", { "percent": 0, "message": "Parsing...", "bar_type": "main", "bar_speed": "fast" })
+    globals.main_bar["active"] = False
+
+    # Each title is looked up in Plex once for the whole listing, rather than once per file
+    lookup_media = memoized_media_lookup(globals.plex.movie_or_show)
+
+    def prepare_member(member):
+        """Read one file and look its title up in Plex. Runs on the pool, so it only touches its
+           own artwork; everything that depends on the other files is done in order afterwards."""
+        entry, filename, artwork, extract_name = member
+        if globals.cancel_scrape:
+            return None
+        try:
+            read, orientation = prepare_entry(entry, extract_name)
+        except Exception as e:
+            return artwork, None, None, e
+        artwork.update(read)
+
+        # Override title and year if provided
+        artwork["title"] = plex_title if plex_title else artwork["title"]
+        artwork["year"] = plex_year if plex_year else artwork.get("year")
+        # Add additional metadata
+        artwork["source"] = zip_source
+        artwork["id"] = "Upload"
+        artwork["author"] = zip_author
+        # Determine media type via Plex lookup if not a collection, find TMDb ID, title
+        # and year in the process for better matching later when processing artwork items
+        lookup = lookup_media(artwork.get('title'), artwork.get('year')) if artwork["media"] != "Collection" else None
+        return artwork, orientation, lookup, None
+
+    with ThreadPoolExecutor(max_workers=ZIP_MEMBER_WORKERS, thread_name_prefix="zip-member") as pool:
+        # map() hands the results back in order, however the pool finishes them
+        for n, prepared in enumerate(pool.map(prepare_member, members_to_extract), 1):
+            if globals.cancel_scrape or prepared is None:
                 break
-            filename = os.path.basename(zip_info.filename)  # Get filename only (ignore paths)
-            debug_me(f"{n} / {total_files_in_zip} • Processing '{filename}'")
-            percent = (n/total_files_in_zip)*100 if total_files_in_zip > 0 else 0
-            message = f"Parsing {n} of {total_files_in_zip} • {filename}"
+            artwork, orientation, lookup, error = prepared
+            filename = members_to_extract[n - 1][1]
+            debug_me(f"{n} / {total_to_extract} • Processing '{filename}'")
+            percent = (n/total_to_extract)*100
+            message = f"Parsing {n} of {total_to_extract} • {filename}"
             notify_web(instance, "progress_bar", { "percent": percent, "message": message, "bar_type": "main", "bar_speed": "fast" })
             globals.main_bar["active"] = True
             globals.main_bar["percent"] = percent
             globals.main_bar["message"] = message
             globals.main_bar["speed"] = "fast"
 
-            # Mediux ZIP files contain a source.txt file with metadata, we obtain title and author from there
-            if filename == "source.txt":
-                debug_me("Detected Mediux source")
-                zip_source = ScraperSource.MEDIUX.value
-                with zip_ref.open(zip_info) as source, open(os.path.join(extract_dir, "source.txt"), "wb") as target:
-                    target.write(source.read())
-                with open(os.path.join(extract_dir, "source.txt"), "r", encoding="utf-8") as source_file:
-                    for line in source_file:
-                        if line.startswith("Title:"):
-                            zip_title = line.split("Title:")[1].strip()
-                            debug_me(f"Detected ZIP title: {zip_title}")
-                        if line.startswith("Author:"):
-                            zip_author = line.split("Author:")[1].strip()
-                            debug_me(f"Detected ZIP author: {zip_author}")
-                            break
-                os.remove(os.path.join(extract_dir, "source.txt"))  # Clean up source.txt after obtaining author info
-                
-            elif filename_pattern.match(filename):
-                full_path = os.path.join(extract_dir, filename)
-
-                with zip_ref.open(zip_info) as source, open(full_path, "wb") as target:
-                    target.write(source.read())
-
-                md5 = calculate_file_md5(full_path)
-
-                # Obtain artwork title, year, media type, season, episode and artwork type by parsing the filename
-                debug_me(f"Parsing artwork metadata from filename: {filename}")
-                artwork = parse_title(os.path.splitext(filename)[0])
-
-                if artwork["media"] == "unable_to_parse":
-                    update_log(instance, f"❌ {filename} • {zip_author} | Unable to parse file name, format unrecognized")
+            if error is not None:
+                debug_me(f"Unable to read image {filename}: {error}")
+                update_log(instance, f"❌ {filename} • {zip_author} | Unable to read image")
+                errored_files += 1
+                continue
+
+            if lookup is not None:
+                media_type, tmdb_id, title, year = lookup
+                if "Error" in media_type:
+                    update_log(instance, f"❌ {filename} • {zip_author} | Error searching Plex")
                     errored_files += 1
                     continue
-                
-                # We start building a Title -> Media map with the media type (Movie, TV, Collection) correctly parsed by parse_title
-                if artwork["media"] != "Unknown" and artwork["title"] not in identified_media_map:
-                    identified_media_map[artwork["title"]] = artwork["media"]
-
-                # Override title and year if provided
-                artwork["title"] = plex_title if plex_title else artwork["title"]
-                artwork["year"] = plex_year if plex_year else artwork.get("year")
-                # Add additional metadata
-                artwork["source"] = zip_source
-                artwork["path"] = full_path
-                artwork["checksum"] = md5
-                artwork["id"] = "Upload"
-                artwork["author"] = zip_author
-                # Determine media type via Plex lookup if not a collection, find TMDb ID, title
-                # and year in the process for better matching later when processing artwork items
-                if artwork["media"] != "Collection":
-                    media_type, tmdb_id, title, year = globals.plex.movie_or_show(artwork.get('title'), artwork.get('year'))
-                    if "Error" in media_type:
-                        update_log(instance, f"❌ {filename} • {zip_author} | Error searching Plex")
-                        errored_files += 1
-                        continue
-
-                    # If we got a result from movie_or_show, we use that media type and we update the identified media map because the movie_or_show method is more accurate
-                    if media_type != "unavailable":
-                        artwork["media"] = media_type
-                        identified_media_map[artwork["title"]] = media_type
-
-                    # If we got "unavailable" from movie_or_show and we've already identified that title as a certain media type from another file, we use that
-                    elif artwork["title"] in identified_media_map:
-                        artwork["media"] = identified_media_map[artwork["title"]]
-
-                    # Otherwise we set it to "unavailable"
-                    # If we got "unavailable" from movie_or_show and we got "Unknown" from parse_title, we set it to "unavailable"
-                    elif media_type == "unavailable" and artwork["media"] == "Unknown":
-                        artwork["media"] = media_type
-                    # If we get here and none of fhe above conditions are met, we have kept whatever media_type was determined by parse_title
-
-                    artwork["title"] = title if title and title != artwork.get('title') else artwork.get('title')
-                    artwork["tmdb_id"] = tmdb_id
-                    if artwork.get('year') is None and year is not None:
-                        artwork['year'] = year
-                if artwork['media'] == "TV Show":
-                    if artwork['season'] is None:
-                        artwork['season'] = "Cover"
-                        artwork['file_type'] = "show_cover"
-                    if artwork['season'] == "Cover" and check_image_orientation_func(artwork["path"]) == "landscape":
-                        artwork['season'] = "Backdrop"
-                        artwork['file_type'] = "background"
-                if artwork['media'] == "Movie":
-                    if check_image_orientation_func(artwork["path"]) == "landscape":
-                        artwork['file_type'] = "background"
-                    elif artwork['file_type'] == "square_art" or check_image_orientation_func(artwork["path"]) == "square":
-                        artwork['file_type'] = "square_art"
-                    else:
-                        artwork['file_type'] = "movie_poster"
-                if artwork['media'] == "Collection":
-                    if check_image_orientation_func(artwork["path"]) == "landscape":
-                        artwork['file_type'] = "background"
-                    elif check_image_orientation_func(artwork["path"]) == "square":
-                        artwork['file_type'] = "square_art"
-                if artwork['media'] == "unavailable":
-                    if check_image_orientation_func(artwork["path"]) == "landscape":
-                        artwork['file_type'] = "background"
-                    elif check_image_orientation_func(artwork["path"]) == "square" or "OST" in artwork["path"]:
-                        artwork['file_type'] = "square_art"
-                    elif artwork['file_type'] == "season_cover":
-                        artwork['media'] = "TV Show"
-                    else:
-                        # If we get to this point, there is no way to determine if it's a TV show or Movie, so default to poster
-                        # However this won't pass any filters (becuase it's either "movie_poster" or "show_cover"), so this artwork won't be 
-                        # processed further if any filters are specified. It will only be processed if no filters are set.
-                        artwork['file_type'] = "poster"  
-
-                # Check for filters and exclusions
-                if not filters or artwork["file_type"] in filters:
-                    debug_me(
-                        f"✅ Including {artwork["file_type"].replace('_', ' ')} "
-                        f"for '{artwork['title']}"
-                        + (f" ({artwork['year']})'" if artwork['year'] is not None else "")
-                        + (f", Season {artwork['season']}" if isinstance(artwork['season'], int) else "")
-                        + (f", Episode {artwork['episode']}" if isinstance(artwork['episode'], int) else "")
-                        + f". Type is {artwork['file_type']}."
-                    )
 
-                    file_list.append(artwork)
+                # If we got a result from movie_or_show, we use that media type and we update the identified media map because the movie_or_show method is more accurate
+                if media_type != "unavailable":
+                    artwork["media"] = media_type
+                    identified_media_map[artwork["title"]] = media_type
+
+                # If we got "unavailable" from movie_or_show and we've already identified that title as a certain media type from another file, we use that
+                elif artwork["title"] in identified_media_map:
+                    artwork["media"] = identified_media_map[artwork["title"]]
+
+                # Otherwise we set it to "unavailable"
+                # If we got "unavailable" from movie_or_show and we got "Unknown" from parse_title, we set it to "unavailable"
+                elif media_type == "unavailable" and artwork["media"] == "Unknown":
+                    artwork["media"] = media_type
+                # If we get here and none of fhe above conditions are met, we have kept whatever media_type was determined by parse_title
+
+                artwork["title"] = title if title and title != artwork.get('title') else artwork.get('title')
+                artwork["tmdb_id"] = tmdb_id
+                if artwork.get('year') is None and year is not None:
+                    artwork['year'] = year
+            if artwork['media'] == "TV Show":
+                if artwork['season'] is None:
+                    artwork['season'] = "Cover"
+                    artwork['file_type'] = "show_cover"
+                if artwork['season'] == "Cover" and orientation == "landscape":
+                    artwork['season'] = "Backdrop"
+                    artwork['file_type'] = "background"
+            if artwork['media'] == "Movie":
+                if orientation == "landscape":
+                    artwork['file_type'] = "background"
+                elif artwork['file_type'] == "square_art" or orientation == "square":
+                    artwork['file_type'] = "square_art"
                 else:
-                    debug_me(
-                        f"⏩ Skipping {artwork["file_type"].replace('_', ' ')} "
-                        f"for '{artwork['title']}"
-                        + (f" ({artwork['year']})'" if artwork['year'] is not None else "")
-                        + (f", Season {artwork['season']}" if isinstance(artwork['season'], int) else "")
-                        + (f", Episode {artwork['episode']}" if isinstance(artwork['episode'], int) else "")
-                        + f" based on filters. Type is {artwork['file_type']} and filters are {filters}."
-                    )
-                    filtered_files += 1
+                    artwork['file_type'] = "movie_poster"
+            if artwork['media'] == "Collection":
+                if orientation == "landscape":
+                    artwork['file_type'] = "background"
+                elif orientation == "square":
+                    artwork['file_type'] = "square_art"
+            if artwork['media'] == "unavailable":
+                if orientation == "landscape":
+                    artwork['file_type'] = "background"
+                elif orientation == "square" or "OST" in os.path.basename(artwork["path"]):
+                    artwork['file_type'] = "square_art"
+                elif artwork['file_type'] == "season_cover":
+                    artwork['media'] = "TV Show"
+                else:
+                    # If we get to this point, there is no way to determine if it's a TV show or Movie, so default to poster
+                    # However this won't pass any filters (becuase it's either "movie_poster" or "show_cover"), so this artwork won't be 
+                    # processed further if any filters are specified. It will only be processed if no filters are set.
+                    artwork['file_type'] = "poster"  
+
+            # Check for filters and exclusions
+            if not filters or artwork["file_type"] in filters:
+                debug_me(
+                    f"✅ Including {artwork["file_type"].replace('_', ' ')} "
+                    f"for '{artwork['title']}"
+                    + (f" ({artwork['year']})'" if artwork['year'] is not None else "")
+                    + (f", Season {artwork['season']}" if isinstance(artwork['season'], int) else "")
+                    + (f", Episode {artwork['episode']}" if isinstance(artwork['episode'], int) else "")
+                    + f". Type is {artwork['file_type']}."
+                )
+
+                file_list.append(artwork)
+            else:
+                debug_me(
+                    f"⏩ Skipping {artwork["file_type"].replace('_', ' ')} "
+                    f"for '{artwork['title']}"
+                    + (f" ({artwork['year']})'" if artwork['year'] is not None else "")
+                    + (f", Season {artwork['season']}" if isinstance(artwork['season'], int) else "")
+                    + (f", Episode {artwork['episode']}" if isinstance(artwork['episode'], int) else "")
+                    + f" based on filters. Type is {artwork['file_type']} and filters are {filters}."
+                )
+                filtered_files += 1
 
     # Final clean-up in an effort to leave as few assets as possible unidentified
     final_file_list = []
@@ -1379,8 +1848,6 @@ def extract_and_list_zip(
         
         final_file_list.append(artwork)
 
-    total_files = len(os.listdir(extract_dir))
-
     sorted_data = sorted(final_file_list, key=sort_key_func)
 
     debug_me(f"❌ Encountered {errored_files} error(s) parsing filenames")